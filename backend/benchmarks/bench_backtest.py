@@ -0,0 +1,65 @@
+"""
+전체 시장 규모 백테스트 벤치마크 (memmap 저장소 -> 시그널 -> 체결 시뮬레이션)
+
+    cd backend
+    uv run python benchmarks/bench_backtest.py --symbols 2500 --days 2520
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from a_stocks._utils.backtest import (  # noqa: E402
+    momentum_top_n,
+    run_backtest_from_store,
+    sma_crossover,
+)
+from a_stocks._utils.history_store import HistoryStore  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=2500)
+    parser.add_argument("--days", type=int, default=2520)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0.0002, 0.02, size=(args.symbols, args.days))
+    close = 10000 * np.exp(np.cumsum(returns, axis=1))
+    dates = np.arange(args.days, dtype=np.int32) + 20100101
+
+    with tempfile.TemporaryDirectory() as root:
+        store = HistoryStore(root)
+        start = time.perf_counter()
+        store.merge(
+            "ka10015",
+            {
+                f"{i:06d}": {"dt": dates, "close_pric": close[i]}
+                for i in range(args.symbols)
+            },
+        )
+        print(
+            f"store: {args.symbols} x {args.days} -> {time.perf_counter() - start:.2f} s"
+        )
+
+        for name, signal in (
+            ("sma_crossover", sma_crossover(20, 60)),
+            ("momentum_top_n", momentum_top_n(120, 50)),
+        ):
+            start = time.perf_counter()
+            result = run_backtest_from_store(store, signal)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{name}: {elapsed:.2f} s "
+                f"(cagr {result.stats['cagr']:.2%}, mdd {result.stats['max_drawdown']:.2%})"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+전체 시장 규모 기술적 지표 계산 벤치마크
+
+    cd backend
+    uv run python benchmarks/bench_indicators.py --symbols 2500 --days 2520
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from a_stocks._utils.indicators import IndicatorState, compute_indicators  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=2500)
+    parser.add_argument("--days", type=int, default=2520)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0, 0.02, size=(args.symbols, args.days))
+    close = 10000 * np.exp(np.cumsum(returns, axis=1))
+
+    best = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        compute_indicators(close)
+        best = min(best, time.perf_counter() - start)
+    print(f"batch: {args.symbols} symbols x {args.days} days -> {best * 1000:.1f} ms")
+
+    state = IndicatorState.from_history(close[:, :-1])
+    start = time.perf_counter()
+    state.update(close[:, -1])
+    elapsed = time.perf_counter() - start
+    print(f"incremental: 1 day x {args.symbols} symbols -> {elapsed * 1e6:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+배치 적재 중 대화형 요청 대기 시간 벤치마크 (TokenBucket FIFO vs PriorityRateLimiter)
+
+    cd backend
+    uv run python benchmarks/bench_rate_limiter.py --rate 50 --workers 8 --requests 200
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from a_stocks._utils.rate_limiter import (  # noqa: E402
+    BATCH,
+    PriorityRateLimiter,
+    TokenBucket,
+    request_priority,
+)
+
+
+def measure(
+    acquire: Callable[[], object], workers: int, requests: int, interval: float
+) -> List[float]:
+    """
+    workers 개 배치 스레드가 쉬지 않고 요청하는 동안 대화형 요청의 대기 시간을 잽니다.
+    """
+    stop = threading.Event()
+
+    def backfill() -> None:
+        with request_priority(BATCH):
+            while not stop.is_set():
+                acquire()
+
+    threads = [threading.Thread(target=backfill) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    waits: List[float] = []
+    try:
+        for _ in range(requests):
+            start = time.perf_counter()
+            acquire()
+            waits.append(time.perf_counter() - start)
+            time.sleep(interval)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    return waits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rate", type=float, default=50.0)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--interval", type=float, default=0.05)
+    args = parser.parse_args()
+
+    bucket = TokenBucket(args.rate, burst=1.0)
+    limiter = PriorityRateLimiter(args.rate, burst=1.0)
+    limiters: List[Tuple[str, Callable[[], object]]] = [
+        ("fifo", bucket.acquire),
+        ("priority", limiter.acquire),
+    ]
+    for name, acquire in limiters:
+        waits = (
+            np.array(measure(acquire, args.workers, args.requests, args.interval))
+            * 1000.0
+        )
+        p50, p99 = np.percentile(waits, [50, 99])
+        print(
+            f"{name:>8}: interactive wait p50 {p50:.1f} ms, p99 {p99:.1f} ms,"
+            f" max {waits.max():.1f} ms ({args.workers} batch workers,"
+            f" {args.rate:g} req/s)"
+        )
+    for row in limiter.stats()["classes"]:
+        print(
+            f"{row['priority']:>11}: count {row['count']}, p50 {row['p50_ms']} ms,"
+            f" p99 {row['p99_ms']} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
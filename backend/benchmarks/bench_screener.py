@@ -0,0 +1,90 @@
+"""
+전 종목 스크리너 벤치마크 (순위 TR 5종, 캐시 적중 전후)
+
+    cd backend
+    uv run python benchmarks/bench_screener.py --rows 2500 --latency 0.2
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Callable, Dict
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from a_stocks._service.screener_service import (  # noqa: E402
+    SCREEN_SOURCES,
+    ScreenerService,
+)
+
+
+class SyntheticAPI:
+    """
+    소스별로 무작위 종목 rows 개를 돌려주는 가짜 API 입니다.
+    """
+
+    def __init__(self, rows: int, latency: float) -> None:
+        rng = np.random.default_rng(0)
+        universe = [f"{code:06d}" for code in range(rows * 2)]
+        self.responses: Dict[str, Dict[str, Any]] = {}
+        for source in SCREEN_SOURCES.values():
+            codes = rng.choice(universe, size=rows, replace=False)
+            self.responses[source.method] = {
+                source.list_key: [
+                    {
+                        "stk_cd": code,
+                        "stk_nm": f"종목{code}",
+                        **{
+                            field: f"{rng.normal(0, 5):+.2f}" for field in source.fields
+                        },
+                    }
+                    for code in codes
+                ]
+            }
+        self.latency = latency
+
+    def __getattr__(self, name: str) -> Callable[..., Dict[str, Any]]:
+        response = self.responses[name]
+
+        def request(**kwargs: Any) -> Dict[str, Any]:
+            time.sleep(self.latency)
+            return response
+
+        return request
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2500)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    service = ScreenerService(SyntheticAPI(args.rows, args.latency), ttl=60)  # type: ignore[arg-type]
+    where = (
+        "(surge.jmp_rt > 1 or new_high) and open_change.cntr_str > 0"
+        " and near_high.flu_rt > -3 and not limit_up"
+    )
+    score = "rank(surge.jmp_rt) + rank(open_change.cntr_str) + zscore(near_high.flu_rt)"
+
+    start = time.perf_counter()
+    result = service.screen(where=where, score=score)
+    cold = time.perf_counter() - start
+    print(
+        f"cold: 5 TRs x {args.rows} rows -> {cold * 1000:.1f} ms ({result['count']} matched)"
+    )
+
+    best = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        service.screen(where=where, score=score)
+        best = min(best, time.perf_counter() - start)
+    print(f"cached: {best * 1000:.2f} ms")
+    service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+파라미터 스윕 병렬 확장성 벤치마크 (공유 메모리 패널)
+
+    cd backend
+    uv run python benchmarks/bench_sweep.py --symbols 500 --days 2520 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from a_stocks._utils.backtest import sma_crossover  # noqa: E402
+from a_stocks._utils.sweep import SharedPanel, param_grid, run_sweep  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--days", type=int, default=2520)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1]
+    )
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0.0002, 0.02, size=(args.symbols, args.days))
+    close = 10000 * np.exp(np.cumsum(returns, axis=1))
+    grid = param_grid(fast=[5, 10, 20, 30], slow=[60, 120, 200])
+
+    baseline = None
+    with SharedPanel({"close_pric": close}) as shared:
+        for workers in args.workers:
+            start = time.perf_counter()
+            table = run_sweep(shared.spec(), sma_crossover, grid, max_workers=workers)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(
+                f"workers={workers}: {len(table)} runs -> {elapsed:.2f} s "
+                f"(x{baseline / elapsed:.2f})"
+            )
+
+
+if __name__ == "__main__":
+    main()
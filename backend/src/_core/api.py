@@ -1,7 +1,10 @@
-from backend.src._core.router import router as core_router
-from backend.src.a_stocks._router import stocks as stocks_router
 from ninja import NinjaAPI
 
+from _core.router import router as core_router
+from a_stocks._router.paper import router as paper_router
+from a_stocks._router.portfolio import router as portfolio_router
+from a_stocks._router.stocks import router as stocks_router
+
 api = NinjaAPI(
     title="A Stocks API",
     description="API for A Stocks",
@@ -10,3 +13,5 @@ api = NinjaAPI(
 
 api.add_router("/", core_router, tags=["core"])
 api.add_router("/stocks", stocks_router, tags=["stocks"])
+api.add_router("/paper", paper_router, tags=["paper"])
+api.add_router("/portfolio", portfolio_router, tags=["portfolio"])
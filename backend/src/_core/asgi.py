@@ -7,10 +7,52 @@ For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
 
+import asyncio
 import os
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
 
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "_core.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Mapping[str, Any]], Awaitable[None]]
+
+
+async def lifespan(scope: Scope, receive: Receive, send: Send) -> None:
+    """
+    ASGI lifespan 이벤트를 처리합니다.
+
+    Django 4.2 는 lifespan 을 지원하지 않으므로 여기서 직접 처리합니다.
+    startup 시 워커마다 장 시작 전 워밍업 스케줄러를 태스크로 띄우고, shutdown 시
+    스케줄러를 멈춘 뒤 워커 프로세스가 가진 서비스(httpx.Client 등)를 정리합니다.
+    """
+    from a_stocks._service.provider import close_all
+    from a_stocks._service.warmup import worker_scheduler
+
+    stop = asyncio.Event()
+    warmup: Optional[asyncio.Task[None]] = None
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            scheduler = worker_scheduler()
+            if scheduler is not None:
+                warmup = asyncio.create_task(scheduler.run_forever(stop))
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            stop.set()
+            if warmup is not None:
+                await warmup
+            close_all()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def application(scope: Scope, receive: Receive, send: Send) -> None:
+    if scope["type"] == "lifespan":
+        await lifespan(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
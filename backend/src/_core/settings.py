@@ -30,6 +30,84 @@ KIWOOM_APP_KEY = os.getenv("KIWOOM_APP_KEY")
 KIWOOM_SECRET_KEY = os.getenv("KIWOOM_SECRET_KEY")
 KIWOOM_API_BASE_URL = os.getenv("KIWOOM_API_BASE_URL")
 
+# 시세 스트리밍(SSE) 폴링 주기(초)와 ka10095 한 번에 조회할 종목 수
+KIWOOM_STREAM_POLL_INTERVAL = float(os.getenv("KIWOOM_STREAM_POLL_INTERVAL", "1.0"))
+KIWOOM_STREAM_BATCH_SIZE = int(os.getenv("KIWOOM_STREAM_BATCH_SIZE", "100"))
+
+# 시세 응답 캐시 TTL(초). ETag 조건부 요청과 함께 사용됩니다.
+KIWOOM_QUOTE_CACHE_TTL = float(os.getenv("KIWOOM_QUOTE_CACHE_TTL", "1.0"))
+
+# 동시호가 중 시세 캐시 TTL 상한(초)과 시간외/프리·애프터마켓 중 캐시 TTL/폴링 주기 하한(초)
+KIWOOM_AUCTION_CACHE_TTL = float(os.getenv("KIWOOM_AUCTION_CACHE_TTL", "0.5"))
+KIWOOM_OFF_HOURS_CACHE_TTL = float(os.getenv("KIWOOM_OFF_HOURS_CACHE_TTL", "30.0"))
+
+# 키움 REST API 초당 요청 수 제한 (0 이하이면 제한하지 않음)
+KIWOOM_RATE_LIMIT = float(os.getenv("KIWOOM_RATE_LIMIT", "5"))
+
+# 스크리너가 순위 TR 응답을 재사용하는 시간(초)
+KIWOOM_SCREENER_CACHE_TTL = float(os.getenv("KIWOOM_SCREENER_CACHE_TTL", "5.0"))
+
+# 전략 런타임의 VI(ka10054)/프로그램매매(ka90004) 폴링 주기(초)와 동시 조회 수
+KIWOOM_RUNTIME_VI_INTERVAL = float(os.getenv("KIWOOM_RUNTIME_VI_INTERVAL", "2.0"))
+KIWOOM_RUNTIME_PROGRAM_INTERVAL = float(
+    os.getenv("KIWOOM_RUNTIME_PROGRAM_INTERVAL", "10.0")
+)
+KIWOOM_RUNTIME_MAX_CONCURRENCY = int(os.getenv("KIWOOM_RUNTIME_MAX_CONCURRENCY", "4"))
+
+# 전 종목 수집(투자자별 순매수 등)에 쓰는 동시 조회 스레드 수
+KIWOOM_COLLECT_MAX_WORKERS = int(os.getenv("KIWOOM_COLLECT_MAX_WORKERS", "4"))
+
+# 프로그램매매 모니터 스냅샷 주기(초)와 세션당 보관 종목 수/스냅샷 수 (메모리 상한)
+KIWOOM_PROGRAM_SNAPSHOT_INTERVAL = float(
+    os.getenv("KIWOOM_PROGRAM_SNAPSHOT_INTERVAL", "60.0")
+)
+KIWOOM_PROGRAM_MAX_CODES = int(os.getenv("KIWOOM_PROGRAM_MAX_CODES", "4000"))
+KIWOOM_PROGRAM_MAX_SNAPSHOTS = int(os.getenv("KIWOOM_PROGRAM_MAX_SNAPSHOTS", "420"))
+# 첫 스냅샷 전 조회 요청이 모니터 스레드의 첫 스냅샷을 기다리는 최대 시간(초)
+KIWOOM_PROGRAM_READY_TIMEOUT = float(os.getenv("KIWOOM_PROGRAM_READY_TIMEOUT", "10.0"))
+
+# 거래량 급증/매물대 집중 탐지 폴링 주기(초), 기준선 폴링 수, z-score 임계값,
+# 추적 종목 수 상한, 같은 종목 경보 재전송 간격(초)
+KIWOOM_SPIKE_INTERVAL = float(os.getenv("KIWOOM_SPIKE_INTERVAL", "10.0"))
+KIWOOM_SPIKE_WINDOW = int(os.getenv("KIWOOM_SPIKE_WINDOW", "30"))
+KIWOOM_SPIKE_THRESHOLD = float(os.getenv("KIWOOM_SPIKE_THRESHOLD", "3.0"))
+KIWOOM_SPIKE_MAX_CODES = int(os.getenv("KIWOOM_SPIKE_MAX_CODES", "4000"))
+KIWOOM_SPIKE_COOLDOWN = float(os.getenv("KIWOOM_SPIKE_COOLDOWN", "300.0"))
+# 이상치 경보를 추가로 보낼 AlertSink 클래스 경로(쉼표 구분)
+KIWOOM_SPIKE_ALERT_SINKS = os.getenv("KIWOOM_SPIKE_ALERT_SINKS", "")
+
+# 시세 응답/마스터 데이터 캐시 백엔드 (local: 프로세스 내 LRU, shared: 같은 호스트
+# 워커 간 공유 메모리(mmap), redis: Redis 프로토콜 서버, 그 밖의 값은 CacheBackend 클래스 경로)
+KIWOOM_CACHE_BACKEND = os.getenv("KIWOOM_CACHE_BACKEND", "local")
+# shared 백엔드 디렉터리(비우면 /dev/shm 아래, 없으면 임시 디렉터리)와 redis 백엔드 주소
+KIWOOM_CACHE_DIR = os.getenv("KIWOOM_CACHE_DIR", "")
+KIWOOM_REDIS_URL = os.getenv("KIWOOM_REDIS_URL", "redis://localhost:6379/0")
+
+# 모의투자 계좌 초기 현금(원)
+KIWOOM_PAPER_INITIAL_CASH = float(os.getenv("KIWOOM_PAPER_INITIAL_CASH", "100000000"))
+
+# 포트폴리오 실현손익 조회(ka10072/ka10073)에 쓰는 계좌번호
+KIWOOM_ACCOUNT_NUMBER = os.getenv("KIWOOM_ACCOUNT_NUMBER", "")
+
+# 장 시작 전 워밍업 시각(KST, HH:MM), 시세 캐시를 채울 관심종목(쉼표 구분)
+KIWOOM_WARMUP_TIME = os.getenv("KIWOOM_WARMUP_TIME", "08:30")
+KIWOOM_WARMUP_WATCHLIST = os.getenv("KIWOOM_WARMUP_WATCHLIST", "")
+# 서버 워커마다 워밍업 스케줄러(토큰 발급, 관심종목 시세 캐시)를 띄울지 여부
+KIWOOM_WARMUP_IN_WORKERS = os.getenv("KIWOOM_WARMUP_IN_WORKERS", "1") == "1"
+
+# 내장 휴장일(krx_calendar.KRX_HOLIDAYS) 외에 더할 휴장일(YYYYMMDD, 쉼표 구분)
+KIWOOM_MARKET_HOLIDAYS = os.getenv("KIWOOM_MARKET_HOLIDAYS", "")
+
+# 일봉 등 시계열 저장소(.npy) 경로
+KIWOOM_HISTORY_DIR = os.getenv(
+    "KIWOOM_HISTORY_DIR", str(BASE_DIR.parent / "data" / "history")
+)
+
+# 종목/업종/회원사 마스터 데이터 스냅샷(JSON) 경로
+KIWOOM_MASTER_DATA_PATH = os.getenv(
+    "KIWOOM_MASTER_DATA_PATH", str(BASE_DIR.parent / "data" / "master.json")
+)
+
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
@@ -0,0 +1,86 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ninja import Router
+
+from a_stocks._schema.paper_schema import PaperAccountOut, PaperOrderIn, PaperOrderOut
+from a_stocks._schema.stock_schema import ErrorOut
+from a_stocks._service.paper_trading import get_paper_trading
+
+router = Router()
+
+
+@router.post("/orders", response={200: PaperOrderOut, 400: ErrorOut})
+def submit_paper_order(
+    request: Any, data: PaperOrderIn
+) -> Tuple[int, Union[Dict[str, Any], Dict[str, str]]]:
+    """
+    모의 주문을 접수합니다. price 가 없으면 시장가 주문입니다.
+
+    미체결 주문은 관심종목정보요청(ka10095) 시세의 호가로 체결됩니다.
+    """
+    try:
+        order = get_paper_trading().submit(
+            data.code, data.side, data.quantity, data.price
+        )
+        return 200, order.to_dict()
+    except Exception as e:
+        return 400, {"message": str(e)}
+
+
+@router.get("/orders", response={200: List[PaperOrderOut]})
+def list_paper_orders(
+    request: Any, code: Optional[str] = None, status: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    모의 주문 목록을 반환합니다. code, status(open/filled/cancelled/rejected)로 거를 수 있습니다.
+    """
+    return [order.to_dict() for order in get_paper_trading().orders(code, status)]
+
+
+@router.get("/orders/{order_id}", response={200: PaperOrderOut, 404: ErrorOut})
+def get_paper_order(
+    request: Any, order_id: int
+) -> Tuple[int, Union[Dict[str, Any], Dict[str, str]]]:
+    """
+    모의 주문 한 건을 반환합니다.
+    """
+    order = get_paper_trading().get(order_id)
+    if order is None:
+        return 404, {"message": f"{order_id}번 주문이 없습니다."}
+    return 200, order.to_dict()
+
+
+@router.delete(
+    "/orders/{order_id}", response={200: PaperOrderOut, 400: ErrorOut, 404: ErrorOut}
+)
+def cancel_paper_order(
+    request: Any, order_id: int
+) -> Tuple[int, Union[Dict[str, Any], Dict[str, str]]]:
+    """
+    미체결 모의 주문을 취소합니다.
+    """
+    try:
+        order = get_paper_trading().cancel(order_id)
+        return 200, order.to_dict()
+    except KeyError as e:
+        return 404, {"message": str(e.args[0])}
+    except Exception as e:
+        return 400, {"message": str(e)}
+
+
+@router.get("/account", response={200: PaperAccountOut})
+def get_paper_account(request: Any) -> Dict[str, Any]:
+    """
+    모의 계좌의 현금, 보유 종목, 평가금액을 반환합니다.
+    """
+    return get_paper_trading().account()
+
+
+@router.post("/reset", response={200: PaperAccountOut})
+def reset_paper_account(request: Any) -> Dict[str, Any]:
+    """
+    모의 계좌와 주문을 모두 초기화합니다.
+    """
+    service = get_paper_trading()
+    service.reset()
+    return service.account()
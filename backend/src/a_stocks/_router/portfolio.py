@@ -0,0 +1,73 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ninja import Router
+
+from a_stocks._schema.portfolio_schema import (
+    FillIn,
+    HoldingIn,
+    PortfolioOut,
+    PortfolioSyncOut,
+)
+from a_stocks._schema.stock_schema import ErrorOut
+from a_stocks._service.portfolio_service import get_portfolio_tracker
+
+router = Router()
+
+
+@router.get("", response={200: PortfolioOut})
+def get_portfolio(request: Any) -> Dict[str, Any]:
+    """
+    캐시된 시세 기준 보유 종목과 평가/실현손익을 반환합니다. 키움을 호출하지 않습니다.
+    """
+    return get_portfolio_tracker().snapshot()
+
+
+@router.put("/holdings", response={200: PortfolioOut, 400: ErrorOut})
+def load_holdings(
+    request: Any, data: List[HoldingIn]
+) -> Tuple[int, Union[Dict[str, Any], Dict[str, str]]]:
+    """
+    보유 종목(수량, 평균 매입가)을 통째로 바꿉니다.
+    """
+    try:
+        tracker = get_portfolio_tracker()
+        tracker.load_holdings(holding.model_dump() for holding in data)
+        return 200, tracker.snapshot()
+    except Exception as e:
+        return 400, {"message": str(e)}
+
+
+@router.post("/fills", response={200: PortfolioOut, 400: ErrorOut})
+def apply_fill(
+    request: Any, data: FillIn
+) -> Tuple[int, Union[Dict[str, Any], Dict[str, str]]]:
+    """
+    체결 한 건을 반영합니다. 같은 fill_id 는 한 번만 반영합니다.
+    """
+    try:
+        tracker = get_portfolio_tracker()
+        tracker.apply_fill(
+            data.code,
+            data.side,
+            data.quantity,
+            data.price,
+            fee=data.fee,
+            fill_id=data.fill_id,
+            name=data.name,
+        )
+        return 200, tracker.snapshot()
+    except Exception as e:
+        return 400, {"message": str(e)}
+
+
+@router.post("/sync", response={200: PortfolioSyncOut, 400: ErrorOut})
+def sync_realized(
+    request: Any, start_date: Optional[str] = None, end_date: Optional[str] = None
+) -> Tuple[int, Dict[str, Any]]:
+    """
+    키움 실현손익(당일 ka10072, 기간 ka10073)을 조회해 새 행만 반영합니다.
+    """
+    try:
+        return 200, {"added": get_portfolio_tracker().sync(start_date, end_date)}
+    except Exception as e:
+        return 400, {"message": str(e)}
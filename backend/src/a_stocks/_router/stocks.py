@@ -1,24 +1,62 @@
-from typing import Any, Dict, Tuple, Union
+from typing import Any, Dict, Optional, Tuple, Union
 
+from django.http import HttpResponse, StreamingHttpResponse
 from ninja import Router
 
-from a_stocks._schema.stock_schema import ErrorOut, StockCodeIn, StockPriceOut
-from a_stocks._service.stock_service import StockService
+from a_stocks._schema.stock_schema import (
+    BrokerFlowOut,
+    CreditSurgeOut,
+    ErrorOut,
+    InvestorFlowTopOut,
+    ProgramMoversOut,
+    RateLimiterStatsOut,
+    ScreenerOut,
+    SpikeAlertsOut,
+    StockCodeIn,
+    StockIndicatorsOut,
+    StockPriceOut,
+    ValuationScreenOut,
+)
+from a_stocks._service.broker_flow_service import get_broker_flow_service
+from a_stocks._service.credit_service import get_credit_service
+from a_stocks._service.indicator_service import IndicatorService
+from a_stocks._service.investor_flow_service import get_investor_flow_service
+from a_stocks._service.price_cache import get_price_cache, store_price
+from a_stocks._service.program_monitor import get_program_monitor
+from a_stocks._service.quote_stream import get_quote_hub, stream_quotes
+from a_stocks._service.screener_service import get_screener_service
+from a_stocks._service.spike_monitor import get_spike_monitor
+from a_stocks._service.stock_service import get_stock_service
+from a_stocks._service.valuation_service import get_valuation_service
+from a_stocks._utils.response_cache import CachedResponse, conditional_json_response
+from a_stocks._utils.valuation import parse_ranges
 
 router = Router()
-stock_service = StockService()
+
+
+def _cache_stock_price(stock_code: str) -> CachedResponse:
+    """
+    시세를 조회해 직렬화된 본문과 ETag 를 캐시에 저장합니다.
+    """
+    return store_price(stock_code, get_stock_service().get_stock_price(stock_code))
 
 
 @router.get("/price/{stock_code}", response={200: StockPriceOut, 400: ErrorOut})
 def get_stock_price(
     request: Any, stock_code: str
-) -> Tuple[int, Union[Dict[str, Any], Dict[str, str]]]:
+) -> Union[HttpResponse, Tuple[int, Dict[str, str]]]:
     """
     종목 코드를 받아 해당 주식의 현재 시세 정보를 반환합니다.
+
+    ETag/Cache-Control 을 함께 반환하며, If-None-Match 가 일치하면 304 를 반환합니다.
     """
     try:
-        result = stock_service.get_stock_price(stock_code)
-        return 200, result
+        return conditional_json_response(
+            request,
+            get_price_cache(),
+            f"price:{stock_code}",
+            lambda: _cache_stock_price(stock_code),
+        )
     except Exception as e:
         return 400, {"message": str(e)}
 
@@ -31,7 +69,240 @@ def get_stock_price_by_post(
     POST 요청으로 종목 코드를 받아 해당 주식의 현재 시세 정보를 반환합니다.
     """
     try:
-        result = stock_service.get_stock_price(data.code)
+        result = get_stock_service().get_stock_price(data.code)
+        return 200, result
+    except Exception as e:
+        return 400, {"message": str(e)}
+
+
+@router.get("/stream", response={400: ErrorOut})
+def stream_stock_prices(
+    request: Any, codes: str
+) -> Union[StreamingHttpResponse, Tuple[int, Dict[str, str]]]:
+    """
+    쉼표로 구분된 종목 코드들의 시세 변경을 Server-Sent Events 로 전달합니다.
+
+    모든 구독자가 하나의 공유 폴러(ka10095 배치 조회)를 사용합니다.
+    비동기 스트리밍이므로 ASGI 서버(uvicorn)에서 실행해야 합니다.
+    """
+    stock_codes = sorted({code.strip() for code in codes.split(",") if code.strip()})
+    if not stock_codes:
+        return 400, {"message": "종목 코드를 하나 이상 입력해야 합니다."}
+
+    response = StreamingHttpResponse(
+        stream_quotes(get_quote_hub(), stock_codes),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@router.get("/screener", response={200: ScreenerOut, 400: ErrorOut})
+def screen_stocks(
+    request: Any,
+    where: Optional[str] = None,
+    score: Optional[str] = None,
+    limit: int = 50,
+    sources: Optional[str] = None,
+) -> Tuple[int, Union[Dict[str, Any], Dict[str, str]]]:
+    """
+    순위 TR(신고저가/상하한가/근접고저가/가격급등락/시가대비등락률)을 조인해
+    조건(where)과 점수(score) 표현식으로 종목을 거르고 순위를 매깁니다.
+
+    예: where="surge.jmp_rt > 2 and open_change.cntr_str >= 120"
+        score="rank(surge.jmp_rt) + rank(open_change.cntr_str)"
+    """
+    source_names = (
+        [name.strip() for name in sources.split(",") if name.strip()]
+        if sources
+        else None
+    )
+    try:
+        result = get_screener_service().screen(
+            where=where, score=score, limit=limit, sources=source_names
+        )
+        return 200, result
+    except Exception as e:
+        return 400, {"message": str(e)}
+
+
+@router.get("/valuation/screen", response={200: ValuationScreenOut, 400: ErrorOut})
+def screen_valuation(
+    request: Any,
+    where: str = "",
+    sort: Optional[str] = None,
+    ascending: bool = True,
+    limit: int = 50,
+    columns: Optional[str] = None,
+) -> Tuple[int, Union[Dict[str, Any], Dict[str, str]]]:
+    """
+    PER/PBR/ROE(ka10026)와 기본정보(ka10001) 컬럼의 범위 조건으로 종목을 거릅니다.
+
+    where 는 "컬럼:하한:상한" 을 쉼표로 잇고 빈 경계는 제한 없음입니다.
+    예: where="per:5:10,roe:15:", sort="roe", ascending=false
+    테이블은 거래일마다 한 번 만들며 조건만 바꾼 질의는 Kiwoom 을 조회하지 않습니다.
+    """
+    column_names = (
+        [name.strip() for name in columns.split(",") if name.strip()]
+        if columns
+        else None
+    )
+    try:
+        result = get_valuation_service().screen(
+            parse_ranges(where), sort, ascending, limit, column_names
+        )
+        return 200, result
+    except Exception as e:
+        return 400, {"message": str(e)}
+
+
+@router.get("/investor-flow/top", response={200: InvestorFlowTopOut, 400: ErrorOut})
+def get_investor_flow_top(
+    request: Any,
+    investor: str = "foreign",
+    window: int = 20,
+    limit: int = 20,
+    ascending: bool = False,
+) -> Tuple[int, Union[Dict[str, Any], Dict[str, str]]]:
+    """
+    투자자(foreign/institution/individual)별 기간 누적 순매수 상위 종목을 반환합니다.
+
+    수집 시점에 미리 계산된 인덱스에서 읽으므로 API 를 호출하지 않습니다.
+    ascending=true 면 순매도 상위 종목을 반환합니다.
+    """
+    try:
+        result = get_investor_flow_service().top(investor, window, limit, ascending)
+        return 200, result
+    except Exception as e:
+        return 400, {"message": str(e)}
+
+
+@router.get("/credit/surge", response={200: CreditSurgeOut, 400: ErrorOut})
+def get_credit_surge(
+    request: Any,
+    kind: str = "loan",
+    window: int = 5,
+    limit: int = 20,
+    by: str = "change_pct",
+    ascending: bool = False,
+) -> Tuple[int, Union[Dict[str, Any], Dict[str, str]]]:
+    """
+    신용융자(loan)/대주(short)/대차(lending) 잔고가 기간 동안 가장 크게 늘어난 종목을 반환합니다.
+
+    by: change_pct(증감률), change(증감 주수)
+    수집 시점에 증분 갱신된 인덱스에서 읽으므로 API 를 호출하지 않습니다.
+    ascending=true 면 잔고 감소 상위 종목을 반환합니다.
+    """
+    try:
+        result = get_credit_service().surge(kind, window, limit, by, ascending)
+        return 200, result
+    except Exception as e:
+        return 400, {"message": str(e)}
+
+
+@router.get("/brokers/flow", response={200: BrokerFlowOut, 400: ErrorOut})
+def get_broker_flow(
+    request: Any, codes: str, sort: str = "net", limit: int = 20
+) -> Tuple[int, Union[Dict[str, Any], Dict[str, str]]]:
+    """
+    종목들(쉼표로 구분)의 상위 거래원(ka10002)을 모아 거래원별로 집계합니다.
+
+    sort: net(순매수), total(거래량), buy, sell, symbols(거래 종목 수), share(비중)
+    """
+    try:
+        stock_codes = [code.strip() for code in codes.split(",") if code.strip()]
+        result = get_broker_flow_service().market_flows(stock_codes, sort, limit)
+        return 200, result
+    except Exception as e:
+        return 400, {"message": str(e)}
+
+
+@router.get("/program-flow/movers", response={200: ProgramMoversOut, 400: ErrorOut})
+def get_program_flow_movers(
+    request: Any, window: int = 5, limit: int = 20, direction: str = "abs"
+) -> Tuple[int, Union[Dict[str, Any], Dict[str, str]]]:
+    """
+    최근 window 스냅샷 동안 프로그램 순매수 금액이 가장 크게 변한 종목을 반환합니다.
+
+    direction: abs(변화 절대값), buy(순매수 증가), sell(순매도 증가)
+    스냅샷은 백그라운드 스레드가 KIWOOM_PROGRAM_SNAPSHOT_INTERVAL 주기로 기록합니다.
+    첫 스냅샷 전이면 KIWOOM_PROGRAM_READY_TIMEOUT 까지 기다리고, 그래도 없으면
+    snapshots 0 인 빈 결과를 반환합니다.
+    """
+    try:
+        monitor = get_program_monitor()
+        monitor.ensure_running()
+        if monitor.snapshots == 0:
+            monitor.wait_ready()
+        return 200, monitor.movers(window=window, limit=limit, direction=direction)
+    except Exception as e:
+        return 400, {"message": str(e)}
+
+
+@router.get("/spikes/alerts", response={200: SpikeAlertsOut, 400: ErrorOut})
+def get_spike_alerts(
+    request: Any, limit: int = 50, metric: Optional[str] = None
+) -> Tuple[int, Union[Dict[str, Any], Dict[str, str]]]:
+    """
+    거래량 급증(volume)/매물대 집중(concentration) 이상치 경보를 최신 순서로 반환합니다.
+
+    경보는 백그라운드 스레드가 KIWOOM_SPIKE_INTERVAL 주기로 ka10024/ka10025 를 조회하며
+    종목별 기준선 대비 z-score 가 KIWOOM_SPIKE_THRESHOLD 이상일 때 만듭니다.
+    """
+    try:
+        monitor = get_spike_monitor()
+        monitor.ensure_running()
+        return 200, monitor.recent(limit, metric)
+    except Exception as e:
+        return 400, {"message": str(e)}
+
+
+@router.get("/limiter/stats", response={200: RateLimiterStatsOut, 400: ErrorOut})
+def get_rate_limiter_stats(
+    request: Any,
+) -> Tuple[int, Union[Dict[str, Any], Dict[str, str]]]:
+    """
+    키움 요청 제한기의 우선순위 클래스별(interactive, batch) 대기 시간 지표를 반환합니다.
+
+    대기 시간은 제한기에서 토큰을 받기까지 걸린 시간이며, 최근 요청 표본의
+    p50/p99/최대값(ms)입니다. 배치 작업 중에도 interactive 의 p99 는 한 토큰
+    간격(1/KIWOOM_RATE_LIMIT 초) 안에 머물러야 합니다.
+    """
+    try:
+        return 200, get_stock_service().api.rate_limiter.stats()
+    except Exception as e:
+        return 400, {"message": str(e)}
+
+
+@router.get(
+    "/{stock_code}/indicators", response={200: StockIndicatorsOut, 400: ErrorOut}
+)
+def get_stock_indicators(
+    request: Any,
+    stock_code: str,
+    start_date: Optional[str] = None,
+    limit: int = 60,
+    sma_window: int = 20,
+    ema_span: int = 20,
+    rsi_period: int = 14,
+    bb_window: int = 20,
+    bb_std: float = 2.0,
+) -> Tuple[int, Union[Dict[str, Any], Dict[str, str]]]:
+    """
+    일별 종가(ka10015)로 계산한 기술적 지표(SMA/EMA/RSI/MACD/볼린저)를 반환합니다.
+    """
+    try:
+        result = IndicatorService(get_stock_service().api).get_indicators(
+            stock_code,
+            start_date=start_date,
+            limit=limit,
+            sma_window=sma_window,
+            ema_span=ema_span,
+            rsi_period=rsi_period,
+            bb_window=bb_window,
+            bb_std=bb_std,
+        )
         return 200, result
     except Exception as e:
         return 400, {"message": str(e)}
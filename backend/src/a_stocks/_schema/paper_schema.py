@@ -0,0 +1,42 @@
+from typing import List, Optional
+
+from ninja import Schema
+
+
+class PaperOrderIn(Schema):
+    code: str
+    side: str
+    quantity: int
+    # 없으면 시장가 주문
+    price: Optional[float] = None
+
+
+class PaperOrderOut(Schema):
+    order_id: int
+    code: str
+    side: str
+    order_type: str
+    price: Optional[float] = None
+    quantity: int
+    status: str
+    fill_price: Optional[float] = None
+    reason: Optional[str] = None
+    created_at: float
+    updated_at: float
+
+
+class PaperPositionOut(Schema):
+    code: str
+    quantity: int
+    available: int
+    average_price: float
+    last_price: float
+    value: float
+
+
+class PaperAccountOut(Schema):
+    cash: float
+    reserved_cash: float
+    equity: float
+    open_orders: int
+    positions: List[PaperPositionOut]
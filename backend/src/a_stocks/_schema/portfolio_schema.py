@@ -0,0 +1,52 @@
+from typing import List, Optional
+
+from ninja import Schema
+
+
+class PortfolioPositionOut(Schema):
+    code: str
+    name: str
+    quantity: int
+    average_price: float
+    last_price: float
+    cost: float
+    value: float
+    unrealized: float
+    unrealized_rate: Optional[float] = None
+    realized: float
+
+
+class PortfolioOut(Schema):
+    updated_at: Optional[float] = None
+    cost: float
+    market_value: float
+    unrealized: float
+    unrealized_rate: Optional[float] = None
+    realized: float
+    fees: float
+    reported_realized: float
+    reported_fees: float
+    positions: List[PortfolioPositionOut]
+
+
+class HoldingIn(Schema):
+    code: str
+    name: str = ""
+    quantity: int
+    average_price: float
+    last_price: Optional[float] = None
+
+
+class FillIn(Schema):
+    code: str
+    side: str
+    quantity: int
+    price: float
+    # 수수료 + 세금
+    fee: float = 0.0
+    fill_id: Optional[str] = None
+    name: str = ""
+
+
+class PortfolioSyncOut(Schema):
+    added: int
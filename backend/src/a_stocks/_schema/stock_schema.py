@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, List, Optional
 
 from ninja import Schema
 
@@ -20,3 +20,144 @@ class StockPriceOut(Schema):
 
 class ErrorOut(Schema):
     message: str
+
+
+class IndicatorPointOut(Schema):
+    date: str
+    close: float
+    sma: Optional[float] = None
+    ema: Optional[float] = None
+    rsi: Optional[float] = None
+    macd: Optional[float] = None
+    macd_signal: Optional[float] = None
+    macd_hist: Optional[float] = None
+    bb_upper: Optional[float] = None
+    bb_middle: Optional[float] = None
+    bb_lower: Optional[float] = None
+
+
+class StockIndicatorsOut(Schema):
+    code: str
+    indicators: List[IndicatorPointOut]
+
+
+class ScreenerResultOut(Schema):
+    code: str
+    name: str
+    score: Optional[float] = None
+    values: Dict[str, Optional[float]]
+
+
+class ScreenerOut(Schema):
+    sources: List[str]
+    count: int
+    results: List[ScreenerResultOut]
+
+
+class ValuationRowOut(Schema):
+    code: str
+    name: str
+    values: Dict[str, Optional[float]]
+
+
+class ValuationScreenOut(Schema):
+    date: Optional[str] = None
+    total: int
+    count: int
+    failed: List[str]
+    results: List[ValuationRowOut]
+
+
+class InvestorFlowRowOut(Schema):
+    code: str
+    net: Optional[float] = None
+    rank: Optional[float] = None
+    zscore: Optional[float] = None
+    streak: int
+
+
+class InvestorFlowTopOut(Schema):
+    investor: str
+    window: int
+    date: Optional[int] = None
+    results: List[InvestorFlowRowOut]
+
+
+class CreditSurgeRowOut(Schema):
+    code: str
+    balance: Optional[float] = None
+    change: Optional[float] = None
+    change_pct: Optional[float] = None
+    ratio: Optional[float] = None
+
+
+class CreditSurgeOut(Schema):
+    kind: str
+    window: int
+    by: str
+    date: Optional[int] = None
+    results: List[CreditSurgeRowOut]
+
+
+class BrokerFlowRowOut(Schema):
+    broker: str
+    name: str
+    buy: float
+    sell: float
+    net: float
+    total: float
+    symbols: int
+    share: float
+
+
+class BrokerFlowOut(Schema):
+    records: int
+    brokers: int
+    failed: List[str]
+    results: List[BrokerFlowRowOut]
+
+
+class SpikeAlertOut(Schema):
+    code: str
+    name: str
+    metric: str
+    value: float
+    baseline: float
+    zscore: float
+    at: float
+
+
+class SpikeAlertsOut(Schema):
+    session: Optional[str] = None
+    polls: int
+    results: List[SpikeAlertOut]
+
+
+class RateLimiterClassOut(Schema):
+    priority: str
+    waiting: int
+    count: int
+    p50_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+class RateLimiterStatsOut(Schema):
+    rate: float
+    classes: List[RateLimiterClassOut]
+
+
+class ProgramMoverOut(Schema):
+    code: str
+    name: str
+    net: float
+    delta: float
+    rate: Optional[float] = None
+
+
+class ProgramMoversOut(Schema):
+    session: Optional[str] = None
+    snapshots: int
+    window: int
+    elapsed: Optional[float] = None
+    results: List[ProgramMoverOut]
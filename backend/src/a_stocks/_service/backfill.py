@@ -0,0 +1,378 @@
+"""
+과거 데이터 일괄 적재 (ka10015, ka10013, ka10059)
+
+- 작업을 (TR, 종목코드, 기간) 단위(BackfillUnit)로 나눠 DB 에 기록합니다. 같은
+  범위로 다시 계획하면 이미 있는 단위는 그대로 두므로, 중단된 뒤 다시 실행하면
+  done 이 아닌 단위만 처리합니다.
+- 단위 조회는 스레드 풀에서 동시에 실행하고, 전체 요청 속도는 KiwoomAPI 의 요청
+  제한기가 제한합니다. 풀에 넣어 두는 단위 수도 작업자 수의 두 배로 제한합니다.
+  요청은 배치 우선순위로 보내므로 적재 중에도 대화형 요청은 먼저 처리됩니다.
+- 조회 결과는 모아 두었다가 batch_size 단위마다 시계열 저장소에 한 번에 병합하고,
+  병합이 끝난 단위만 done 으로 기록합니다. (병합 전에 죽으면 그 단위는 다시
+  조회합니다. 병합은 같은 값을 덮어쓰므로 다시 해도 결과가 같습니다.)
+- DB 는 호출한 스레드에서만 접근합니다. (작업 스레드는 조회와 변환만 합니다.)
+"""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Count
+from django.utils import timezone
+
+from a_stocks._service.credit_service import CREDIT_LOAN_DATASET
+from a_stocks._service.history_service import DAILY_DATASET, get_history_store
+from a_stocks._service.investor_flow_service import FLOW_DATASET
+from a_stocks._utils.history_store import HistoryStore
+from a_stocks._utils.kiwoom_api import KiwoomAPI
+from a_stocks._utils.rate_limiter import BATCH, request_priority
+from a_stocks._utils.tr_decoders import (
+    Columns,
+    decode_credit_trend_ka10013,
+    decode_daily_transactions_ka10015,
+    decode_investor_flow_ka10059,
+)
+from a_stocks.models import BackfillUnit
+
+logger = logging.getLogger(__name__)
+
+# TR -> (저장소 데이터셋, 응답 목록 키, 디코더)
+BACKFILL_SPECS: Dict[str, Tuple[str, str, Callable[[Mapping[str, Any]], Columns]]] = {
+    "ka10015": (DAILY_DATASET, "daly_trde_dtl", decode_daily_transactions_ka10015),
+    "ka10013": (CREDIT_LOAN_DATASET, "crd_trde_trend", decode_credit_trend_ka10013),
+    "ka10059": (FLOW_DATASET, "stk_invsr_orgn", decode_investor_flow_ka10059),
+}
+BACKFILL_TRS = tuple(BACKFILL_SPECS)
+
+# 한 단위에서 보낼 최대 요청 수 (응답이 기간을 끝내 채우지 못할 때의 안전장치)
+MAX_REQUESTS_PER_UNIT = 100
+
+UnitKey = Tuple[str, str, str, str]
+
+
+def _parse_date(value: str) -> datetime:
+    return datetime.strptime(value, "%Y%m%d")
+
+
+def plan_units(
+    trs: Sequence[str],
+    codes: Sequence[str],
+    start_date: str,
+    end_date: str,
+    chunk_days: int = 90,
+) -> List[UnitKey]:
+    """
+    (TR, 종목코드, 시작일자, 종료일자) 작업 단위 목록을 만듭니다.
+
+    기간은 start_date 부터 chunk_days 일씩 나누며 양 끝을 포함합니다. 같은 인자로
+    다시 만들면 같은 단위가 나옵니다.
+    """
+    unknown = [tr for tr in trs if tr not in BACKFILL_SPECS]
+    if unknown:
+        raise ValueError(f"지원하지 않는 TR 입니다: {', '.join(unknown)}")
+    if chunk_days <= 0:
+        raise ValueError("chunk_days 는 1 이상이어야 합니다.")
+    start, end = _parse_date(start_date), _parse_date(end_date)
+    if start > end:
+        raise ValueError("시작일자가 종료일자보다 늦습니다.")
+
+    ranges: List[Tuple[str, str]] = []
+    while start <= end:
+        chunk_end = min(start + timedelta(days=chunk_days - 1), end)
+        ranges.append((start.strftime("%Y%m%d"), chunk_end.strftime("%Y%m%d")))
+        start = chunk_end + timedelta(days=1)
+    return [(tr, code, s, e) for tr in trs for code in codes for s, e in ranges]
+
+
+class BackfillProgress:
+    """
+    이번 실행의 처리량과 남은 시간을 계산합니다.
+    """
+
+    def __init__(self, total: int, clock: Callable[[], float] = time.monotonic) -> None:
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.rows = 0
+        self._clock = clock
+        self._started = clock()
+
+    def record(self, units: int, rows: int = 0, failed: int = 0) -> None:
+        self.done += units
+        self.rows += rows
+        self.failed += failed
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict[str, Any]: 완료/실패/남은 단위 수, 경과 시간, 초당 단위/행 수,
+                남은 시간 추정(초, 처리한 단위가 없으면 None)
+        """
+        elapsed = max(self._clock() - self._started, 1e-9)
+        finished = self.done + self.failed
+        remaining = max(self.total - finished, 0)
+        units_per_sec = finished / elapsed
+        return {
+            "total": self.total,
+            "done": self.done,
+            "failed": self.failed,
+            "remaining": remaining,
+            "rows": self.rows,
+            "elapsed": round(elapsed, 3),
+            "units_per_sec": round(units_per_sec, 3),
+            "rows_per_sec": round(self.rows / elapsed, 3),
+            "eta": round(remaining / units_per_sec, 1) if units_per_sec else None,
+        }
+
+
+class BackfillService:
+    """
+    작업 단위를 계획/기록하고 동시에 조회해 시계열 저장소에 적재합니다.
+    """
+
+    def __init__(
+        self,
+        api: KiwoomAPI,
+        store: Optional[HistoryStore] = None,
+        max_workers: Optional[int] = None,
+        batch_size: int = 50,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.api = api
+        self.store = store if store is not None else get_history_store()
+        self.max_workers: int = (
+            max_workers
+            if max_workers is not None
+            else getattr(settings, "KIWOOM_COLLECT_MAX_WORKERS", 4)
+        )
+        self.batch_size = batch_size
+        self._clock = clock
+
+    def plan(
+        self,
+        trs: Sequence[str],
+        codes: Sequence[str],
+        start_date: str,
+        end_date: str,
+        chunk_days: int = 90,
+        retry_failed: bool = False,
+    ) -> List[BackfillUnit]:
+        """
+        작업 단위를 DB 에 기록하고 아직 끝나지 않은 단위를 반환합니다.
+
+        Args:
+            retry_failed (bool): True 면 실패한 단위도 다시 대기 상태로 돌립니다.
+
+        Returns:
+            List[BackfillUnit]: 처리할 (대기 상태) 단위 목록
+        """
+        keys = plan_units(trs, codes, start_date, end_date, chunk_days)
+        BackfillUnit.objects.bulk_create(
+            [
+                BackfillUnit(tr=tr, code=code, start_date=s, end_date=e)
+                for tr, code, s, e in keys
+            ],
+            batch_size=500,
+            ignore_conflicts=True,
+        )
+        wanted = set(keys)
+        units = BackfillUnit.objects.filter(
+            tr__in=trs,
+            start_date__gte=start_date,
+            end_date__lte=end_date,
+        )
+        if retry_failed:
+            units.filter(status=BackfillUnit.FAILED).update(
+                status=BackfillUnit.PENDING, updated_at=timezone.now()
+            )
+        return [
+            unit
+            for unit in units.filter(status=BackfillUnit.PENDING).order_by("id")
+            if (unit.tr, unit.code, unit.start_date, unit.end_date) in wanted
+        ]
+
+    def _pages(self, tr: str, code: str, date: str) -> Iterator[Dict[str, Any]]:
+        if tr == "ka10015":
+            yield from self.api.paginate(
+                self.api.daily_transaction_details_request_ka10015,
+                code,
+                date,
+                max_pages=MAX_REQUESTS_PER_UNIT,
+            )
+        elif tr == "ka10013":
+            yield self.api.credit_trading_trend_request_ka10013(code, date, "1")
+        else:
+            yield self.api.stock_data_by_investor_institution_request_ka10059(
+                date, code, "1", "0", "1000"
+            )
+
+    def fetch_unit(self, tr: str, code: str, start_date: str, end_date: str) -> Columns:
+        """
+        한 단위의 기간을 채울 때까지 조회해 기간 안의 값만 컬럼으로 반환합니다.
+
+        ka10015 는 start_date 를 시작일자로 주고 최근 거래일부터 start_date 까지 오는
+        페이지를 연속조회합니다. (daily_transaction_details_request_ka10015 참고)
+        ka10013/ka10059 는 기준일자부터 과거 방향으로 오므로 end_date 부터 요청하고,
+        받은 가장 오래된 일자의 전날을 기준일자로 다시 요청합니다.
+        """
+        _, list_key, decode = BACKFILL_SPECS[tr]
+        rows: List[Dict[str, Any]] = []
+        date = start_date if tr == "ka10015" else end_date
+        # 배치 우선순위로 보내 대화형 요청이 제한기에서 먼저 토큰을 받게 합니다.
+        with request_priority(BATCH):
+            for _ in range(MAX_REQUESTS_PER_UNIT):
+                oldest: Optional[str] = None
+                for page in self._pages(tr, code, date):
+                    page_rows = [row for row in page.get(list_key, []) if row.get("dt")]
+                    # ka10015 는 end_date 이후 페이지도 지나오므로 기간 안의 행만 모읍니다.
+                    rows.extend(
+                        row for row in page_rows if start_date <= row["dt"] <= end_date
+                    )
+                    if page_rows:
+                        page_oldest = min(row["dt"] for row in page_rows)
+                        oldest = (
+                            page_oldest if oldest is None else min(oldest, page_oldest)
+                        )
+                    if oldest is not None and oldest <= start_date:
+                        break
+                # 데이터 끝, 기간을 다 채움, 연속조회를 다 받음, 진행 없음
+                if (
+                    oldest is None
+                    or oldest <= start_date
+                    or tr == "ka10015"
+                    or oldest >= date
+                ):
+                    break
+                date = (_parse_date(oldest) - timedelta(days=1)).strftime("%Y%m%d")
+
+        columns = decode({list_key: rows})
+        mask = (columns["dt"] >= int(start_date)) & (columns["dt"] <= int(end_date))
+        return {name: values[mask] for name, values in columns.items()}
+
+    def _flush(
+        self, buffered: List[Tuple[BackfillUnit, Columns]], progress: BackfillProgress
+    ) -> None:
+        updates: Dict[str, Dict[str, List[Columns]]] = {}
+        for unit, columns in buffered:
+            dataset = BACKFILL_SPECS[unit.tr][0]
+            updates.setdefault(dataset, {}).setdefault(unit.code, []).append(columns)
+        for dataset, by_code in updates.items():
+            self.store.merge(
+                dataset,
+                {
+                    code: {
+                        name: np.concatenate([part[name] for part in parts])
+                        for name in parts[0]
+                    }
+                    for code, parts in by_code.items()
+                },
+            )
+
+        now = timezone.now()
+        rows = 0
+        for unit, columns in buffered:
+            unit.status = BackfillUnit.DONE
+            unit.rows = int(columns["dt"].size)
+            unit.error = ""
+            unit.updated_at = now
+            rows += unit.rows
+        BackfillUnit.objects.bulk_update(
+            [unit for unit, _ in buffered],
+            ["status", "rows", "attempts", "error", "updated_at"],
+        )
+        progress.record(len(buffered), rows=rows)
+
+    def run(
+        self,
+        units: Sequence[BackfillUnit],
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        단위들을 동시에 조회해 저장소에 병합하고 DB 에 진행 상황을 기록합니다.
+
+        조회에 실패한 단위는 failed 로 기록하고 나머지를 계속 처리합니다.
+
+        Args:
+            units (Sequence[BackfillUnit]): plan() 이 반환한 단위 목록
+            on_progress (Callable, optional): 병합할 때마다 진행 보고를 받는 함수
+
+        Returns:
+            Dict[str, Any]: 마지막 진행 보고 (BackfillProgress.report)
+        """
+        progress = BackfillProgress(len(units), self._clock)
+        queue = iter(units)
+        running: Dict[Future[Columns], BackfillUnit] = {}
+        buffered: List[Tuple[BackfillUnit, Columns]] = []
+
+        def submit(executor: ThreadPoolExecutor) -> None:
+            for unit in queue:
+                unit.attempts += 1
+                future = executor.submit(
+                    self.fetch_unit, unit.tr, unit.code, unit.start_date, unit.end_date
+                )
+                running[future] = unit
+                if len(running) >= self.max_workers * 2:
+                    return
+
+        def flush() -> None:
+            if buffered:
+                self._flush(buffered, progress)
+                buffered.clear()
+                if on_progress is not None:
+                    on_progress(progress.report())
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="backfill"
+        ) as executor:
+            submit(executor)
+            while running:
+                finished: Set[Future[Columns]]
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    unit = running.pop(future)
+                    try:
+                        buffered.append((unit, future.result()))
+                    except Exception as e:
+                        logger.exception(
+                            "%s %s %s~%s 적재 중 오류 발생",
+                            unit.tr,
+                            unit.code,
+                            unit.start_date,
+                            unit.end_date,
+                        )
+                        unit.status = BackfillUnit.FAILED
+                        unit.error = str(e)
+                        unit.save(
+                            update_fields=["status", "attempts", "error", "updated_at"]
+                        )
+                        progress.record(0, failed=1)
+                if len(buffered) >= self.batch_size:
+                    flush()
+                submit(executor)
+        flush()
+        return progress.report()
+
+
+def backfill_status() -> Dict[str, Dict[str, int]]:
+    """
+    TR 별 상태별 단위 수
+    """
+    counts: Dict[str, Dict[str, int]] = {}
+    for row in BackfillUnit.objects.values("tr", "status").annotate(n=Count("id")):
+        counts.setdefault(row["tr"], {})[row["status"]] = row["n"]
+    return counts
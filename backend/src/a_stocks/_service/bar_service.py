@@ -0,0 +1,56 @@
+from typing import Any, Dict, List, Optional
+
+from a_stocks._utils.bar_builder import BarBuilder
+from a_stocks._utils.kiwoom_api import KiwoomAPI
+from a_stocks._utils.krx_calendar import now_kst
+
+
+class BarService:
+    """
+    금일전일체결비교요청(ka10084)을 폴링해 분봉을 증분 갱신합니다.
+    """
+
+    def __init__(self, api: KiwoomAPI, builder: Optional[BarBuilder] = None) -> None:
+        self.api = api
+        self.builder = builder or BarBuilder()
+
+    def poll(
+        self,
+        stock_code: str,
+        tick_minute: str = "0",
+        max_pages: Optional[int] = None,
+    ) -> int:
+        """
+        최신 체결부터 연속조회하며, 이미 반영한 체결에 도달하면 조회를 멈춥니다.
+        당일(KST) 체결을 조회하므로 날짜가 바뀌면 그 종목의 분봉을 새로 시작합니다.
+
+        Args:
+            stock_code (str): 종목코드
+            tick_minute (str): 틱분 (0:틱, 1:분)
+            max_pages (int, optional): 한 번에 조회할 최대 페이지 수
+
+        Returns:
+            int: 새로 반영한 체결 수
+        """
+        pages = self.api.paginate(
+            self.api.today_vs_previous_day_execution_request_ka10084,
+            stock_code=stock_code,
+            today_previous="0",
+            tick_minute=tick_minute,
+            time="",
+            max_pages=max_pages,
+        )
+        try:
+            return self.builder.ingest(
+                stock_code, pages, date=now_kst().strftime("%Y%m%d")
+            )
+        except Exception as e:
+            raise Exception(f"체결 데이터 집계 중 오류 발생: {str(e)}")
+
+    def get_bars(
+        self, stock_code: str, minutes: int = 1, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        집계된 분봉을 반환합니다.
+        """
+        return self.builder.bars(stock_code, minutes, limit)
@@ -0,0 +1,222 @@
+"""
+거래원(회원사)별 매매 흐름 조회와 시장 전체 집계
+
+- ka10002(종목별 상위 거래원)와 ka10052(거래원별 순간거래량)는 스레드 풀로 동시에
+  조회하고, 응답을 한꺼번에 BrokerFlows 로 변환한 뒤 aggregate_by_broker() 로 한 번에
+  집계합니다. 전체 요청 속도는 KiwoomAPI 의 요청 제한기가 제한합니다.
+- 거래원 이름은 마스터 데이터의 회원사 리스트(ka10102)로 붙입니다. 마스터 데이터가
+  바뀌면(거래일마다) 거래원 조회표를 다시 만듭니다.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+from a_stocks._service.master_data import MasterDataService, get_master_data
+from a_stocks._service.provider import ProcessLocal
+from a_stocks._service.stock_service import get_stock_service
+from a_stocks._utils.broker_flow import (
+    BrokerDirectory,
+    BrokerFlows,
+    aggregate_by_broker,
+    decode_agent_analysis_ka10043,
+    decode_instant_volume_ka10052,
+    decode_trading_agents_ka10002,
+)
+from a_stocks._utils.kiwoom_api import KiwoomAPI
+
+logger = logging.getLogger(__name__)
+
+BROKER_SORT_KEYS = ("net", "total", "buy", "sell", "symbols", "share")
+
+
+class BrokerFlowService:
+    """
+    거래원별 매매 흐름을 조회해 시장 전체 거래원별로 집계합니다.
+    """
+
+    def __init__(
+        self,
+        api: KiwoomAPI,
+        master: Optional[MasterDataService] = None,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        self.api = api
+        self._master = master
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers
+            or getattr(settings, "KIWOOM_COLLECT_MAX_WORKERS", 4),
+            thread_name_prefix="broker-flow",
+        )
+        self._lock = threading.Lock()
+        self._directory: Optional[BrokerDirectory] = None
+        self._directory_date: Optional[str] = None
+
+    def directory(self) -> BrokerDirectory:
+        """
+        회원사 리스트로 만든 거래원 조회표. 마스터 데이터를 읽지 못하면 빈 조회표로
+        시작하고 TR 응답의 거래원명을 씁니다.
+        """
+        master = self._master if self._master is not None else get_master_data()
+        with self._lock:
+            try:
+                members = master.members()
+            except Exception:
+                logger.exception("회원사 리스트 조회 중 오류 발생")
+                members = None
+            if self._directory is None or (
+                members is not None and master.date != self._directory_date
+            ):
+                self._directory = BrokerDirectory(members or [])
+                self._directory_date = master.date if members is not None else None
+            return self._directory
+
+    def _fetch_all(
+        self, keys: Sequence[str], fetch: Callable[[str], Dict[str, Any]], label: str
+    ) -> Tuple[List[Tuple[str, Dict[str, Any]]], List[str]]:
+        def run(key: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+            try:
+                return key, fetch(key)
+            except Exception:
+                logger.exception("%s %s 조회 중 오류 발생", key, label)
+                return key, None
+
+        responses: List[Tuple[str, Dict[str, Any]]] = []
+        failed: List[str] = []
+        for key, response in self._executor.map(run, keys):
+            if response is None:
+                failed.append(key)
+            else:
+                responses.append((key, response))
+        return responses, failed
+
+    def _summarize(
+        self,
+        flows: BrokerFlows,
+        directory: BrokerDirectory,
+        sort: str,
+        limit: int,
+        failed: List[str],
+    ) -> Dict[str, Any]:
+        if sort not in BROKER_SORT_KEYS:
+            raise ValueError(
+                f"정렬 기준은 {', '.join(BROKER_SORT_KEYS)} 중 하나여야 합니다."
+            )
+        table = aggregate_by_broker(flows)
+        order = table[sort].argsort(kind="stable")[::-1][:limit]
+        brokers = table["broker"][order]
+        names = directory.names(brokers)
+        codes = directory.codes(brokers)
+        results = [
+            {
+                "broker": str(codes[k]),
+                "name": names[k],
+                "buy": float(table["buy"][i]),
+                "sell": float(table["sell"][i]),
+                "net": float(table["net"][i]),
+                "total": float(table["total"][i]),
+                "symbols": int(table["symbols"][i]),
+                "share": round(float(table["share"][i]), 4),
+            }
+            for k, i in enumerate(order)
+        ]
+        return {
+            "records": len(flows),
+            "brokers": int(table["broker"].size),
+            "failed": failed,
+            "results": results,
+        }
+
+    def market_flows(
+        self, stock_codes: Sequence[str], sort: str = "net", limit: int = 20
+    ) -> Dict[str, Any]:
+        """
+        종목들의 상위 거래원(ka10002)을 모아 거래원별 매수/매도/순매수를 집계합니다.
+
+        일부 종목 조회가 실패해도 나머지로 집계합니다.
+        """
+        directory = self.directory()
+        responses, failed = self._fetch_all(
+            stock_codes, self.api.stock_trading_agent_request_ka10002, "주식거래원"
+        )
+        # 응답에 종목코드가 없으면 요청한 종목코드를 씁니다.
+        flows = decode_trading_agents_ka10002(
+            [{"stk_cd": code, **response} for code, response in responses], directory
+        )
+        return self._summarize(flows, directory, sort, limit, failed)
+
+    def instant_flows(
+        self,
+        member_codes: Sequence[str],
+        market_type: str = "0",
+        sort: str = "net",
+        limit: int = 20,
+    ) -> Dict[str, Any]:
+        """
+        거래원들의 순간거래량(ka10052)을 모아 거래원별로 집계합니다.
+        """
+        directory = self.directory()
+        responses, failed = self._fetch_all(
+            member_codes,
+            lambda member: (
+                self.api.trading_agent_instant_trading_volume_request_ka10052(
+                    member, market_type=market_type
+                )
+            ),
+            "거래원순간거래량",
+        )
+        flows = BrokerFlows.concat(
+            [
+                decode_instant_volume_ka10052(response, member, directory)
+                for member, response in responses
+            ]
+        )
+        return self._summarize(flows, directory, sort, limit, failed)
+
+    def stock_flows(
+        self,
+        stock_code: str,
+        member_codes: Sequence[str],
+        start_date: str,
+        end_date: str,
+        sort: str = "net",
+        limit: int = 20,
+    ) -> Dict[str, Any]:
+        """
+        한 종목의 기간 거래원별 매수/매도량(ka10043)을 거래원별로 집계합니다.
+        """
+        directory = self.directory()
+        responses, failed = self._fetch_all(
+            member_codes,
+            lambda member: (
+                self.api.trading_agent_supply_demand_analysis_request_ka10043(
+                    stock_code, start_date, end_date, "1", "0", "", "2", member, "1"
+                )
+            ),
+            "거래원매물대분석",
+        )
+        flows = BrokerFlows.concat(
+            [
+                decode_agent_analysis_ka10043(response, stock_code, member, directory)
+                for member, response in responses
+            ]
+        )
+        return self._summarize(flows, directory, sort, limit, failed)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+_broker_flow_service: ProcessLocal[BrokerFlowService] = ProcessLocal(
+    lambda: BrokerFlowService(get_stock_service().api), BrokerFlowService.close
+)
+
+
+def get_broker_flow_service() -> BrokerFlowService:
+    """
+    현재 워커 프로세스의 BrokerFlowService 를 반환합니다.
+    """
+    return _broker_flow_service.get()
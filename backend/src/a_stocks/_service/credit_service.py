@@ -0,0 +1,254 @@
+"""
+신용융자/대주 잔고(ka10013)와 대차 잔고(ka90012) 수집과 급증 종목 조회
+
+- ka10013 은 종목별로 일자 목록을 주므로 스레드 풀로 동시에 조회하고, ka90012 는
+  한 일자의 전 종목을 시장별 연속조회로 받습니다. 둘 다 시계열 저장소의 종목 x 일자
+  데이터셋에 병합합니다.
+- 병합이 끝나면 종류별 CreditSurgeIndex 에 인덱스의 마지막 일자 이후 열만 읽어
+  더합니다. (프로세스가 처음 조회할 때는 저장소 꼬리로 인덱스를 만듭니다.) 수집은
+  kiwoom_collect 명령이 다른 프로세스에서 실행하므로, 조회할 때 저장소의 마지막
+  일자가 인덱스보다 새로우면 같은 방식으로 갱신합니다.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+from a_stocks._service.history_service import get_history_store
+from a_stocks._service.provider import ProcessLocal
+from a_stocks._service.stock_service import get_stock_service
+from a_stocks._utils.credit_analytics import CreditSurgeIndex
+from a_stocks._utils.history_store import HistoryStore
+from a_stocks._utils.kiwoom_api import KiwoomAPI
+from a_stocks._utils.krx_calendar import now_kst
+from a_stocks._utils.rate_limiter import BATCH, request_priority
+from a_stocks._utils.tr_decoders import (
+    Columns,
+    decode_credit_trend_ka10013,
+    decode_lending_ka90012,
+    merge_pages,
+)
+
+logger = logging.getLogger(__name__)
+
+CREDIT_LOAN_DATASET = "ka10013"
+CREDIT_SHORT_DATASET = "ka10013_short"
+LENDING_DATASET = "ka90012"
+
+# 잔고 종류 -> (데이터셋, 잔고 필드, 잔고비율 필드)
+CREDIT_KINDS: Dict[str, Tuple[str, str, Optional[str]]] = {
+    "loan": (CREDIT_LOAN_DATASET, "remn", "remn_rt"),
+    "short": (CREDIT_SHORT_DATASET, "remn", "remn_rt"),
+    "lending": (LENDING_DATASET, "rmnd", None),
+}
+
+# ka10013 조회구분 (1:융자, 2:대주)
+CREDIT_QUERY_TYPES = {"loan": "1", "short": "2"}
+
+# ka90012 시장구분 (001:코스피, 101:코스닥)
+LENDING_MARKETS = ("001", "101")
+
+
+def resolve_kind(kind: str) -> Tuple[str, str, Optional[str]]:
+    if kind not in CREDIT_KINDS:
+        raise ValueError(
+            f"잔고 종류는 {', '.join(CREDIT_KINDS)} 중 하나여야 합니다: {kind}"
+        )
+    return CREDIT_KINDS[kind]
+
+
+class CreditService:
+    """
+    신용/대차 잔고를 수집해 저장하고 종류별 급증 인덱스를 증분 갱신합니다.
+    """
+
+    def __init__(
+        self,
+        api: KiwoomAPI,
+        store: Optional[HistoryStore] = None,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        self.api = api
+        self.store = store if store is not None else get_history_store()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers
+            or getattr(settings, "KIWOOM_COLLECT_MAX_WORKERS", 4),
+            thread_name_prefix="credit",
+        )
+        self._lock = threading.Lock()
+        self._indexes: Dict[str, CreditSurgeIndex] = {}
+
+    def collect_credit(
+        self,
+        stock_codes: Sequence[str],
+        date: Optional[str] = None,
+        kind: str = "loan",
+    ) -> Dict[str, Any]:
+        """
+        종목별 신용융자(loan) 또는 대주(short) 매매동향을 동시에 조회해 병합합니다.
+
+        일부 종목 조회가 실패해도 나머지는 병합합니다.
+
+        Returns:
+            Dict[str, Any]: {"merged": 병합한 값 수, "failed": 실패한 종목코드 목록}
+        """
+        if kind not in CREDIT_QUERY_TYPES:
+            raise ValueError(
+                f"ka10013 잔고 종류는 {', '.join(CREDIT_QUERY_TYPES)} 중 하나여야 합니다."
+            )
+        date = date or now_kst().strftime("%Y%m%d")
+        query_type = CREDIT_QUERY_TYPES[kind]
+
+        def fetch(stock_code: str) -> Tuple[str, Optional[Columns]]:
+            # 우선순위는 스레드마다 따로이므로 풀 스레드 안에서 배치로 지정합니다.
+            try:
+                with request_priority(BATCH):
+                    response = self.api.credit_trading_trend_request_ka10013(
+                        stock_code, date, query_type
+                    )
+                return stock_code, decode_credit_trend_ka10013(response)
+            except Exception:
+                logger.exception("%s 신용매매동향 조회 중 오류 발생", stock_code)
+                return stock_code, None
+
+        updates: Dict[str, Columns] = {}
+        failed: List[str] = []
+        for stock_code, columns in self._executor.map(fetch, stock_codes):
+            if columns is None:
+                failed.append(stock_code)
+            elif columns["dt"].size:
+                updates[stock_code] = columns
+
+        merged = self.store.merge(CREDIT_KINDS[kind][0], updates) if updates else 0
+        self.refresh(kind)
+        return {"merged": merged, "failed": failed}
+
+    def collect_lending(
+        self, date: Optional[str] = None, markets: Sequence[str] = LENDING_MARKETS
+    ) -> Dict[str, Any]:
+        """
+        한 일자의 전 종목 대차거래내역(ka90012)을 시장별로 조회해 병합합니다.
+
+        Returns:
+            Dict[str, Any]: {"merged": 병합한 값 수}
+        """
+        date = date or now_kst().strftime("%Y%m%d")
+        updates: Dict[str, Columns] = {}
+        try:
+            with request_priority(BATCH):
+                for market in markets:
+                    response = merge_pages(
+                        self.api.paginate(
+                            self.api.margin_trading_transaction_details_request_ka90012,
+                            date,
+                            market,
+                        ),
+                        "dbrt_trde_prps",
+                    )
+                    updates.update(decode_lending_ka90012(response, date))
+        except Exception as e:
+            raise Exception(f"대차거래내역 조회 중 오류 발생: {str(e)}")
+
+        merged = self.store.merge(LENDING_DATASET, updates) if updates else 0
+        self.refresh("lending")
+        return {"merged": merged}
+
+    def refresh(self, kind: str) -> CreditSurgeIndex:
+        """
+        저장소에서 인덱스의 마지막 일자 이후(같은 일자 포함) 열만 읽어 인덱스에 더합니다.
+        """
+        dataset, balance_field, ratio_field = resolve_kind(kind)
+        with self._lock:
+            index = self._indexes.get(kind)
+            if index is None:
+                index = CreditSurgeIndex()
+                self._indexes[kind] = index
+            if not self.store.exists(dataset):
+                return index
+            dates = self.store.dates(dataset)
+            if not dates.size:
+                return index
+            # 처음이면 지표 계산에 필요한 꼬리만, 이후에는 마지막 일자부터 읽습니다.
+            start = (
+                index.date
+                if index.date is not None
+                else int(dates[max(dates.size - index.depth, 0)])
+            )
+            if int(dates[-1]) < start:
+                return index
+            available = self.store.field_names(dataset)
+            fields = [
+                name for name in (balance_field, ratio_field) if name in available
+            ]
+            if balance_field not in fields:
+                return index
+            panel = self.store.load(dataset, fields=fields, start=start)
+            index.extend(
+                panel.dates,
+                panel.codes,
+                panel[balance_field],
+                panel[ratio_field]
+                if ratio_field is not None and ratio_field in fields
+                else None,
+            )
+            return index
+
+    def index(self, kind: str) -> CreditSurgeIndex:
+        """
+        종류별 인덱스를 반환합니다. 저장소에 인덱스보다 새로운 일자가 병합됐으면
+        refresh 로 갱신합니다.
+        """
+        dataset = resolve_kind(kind)[0]
+        with self._lock:
+            index = self._indexes.get(kind)
+            date = index.date if index is not None else None
+        if index is None:
+            return self.refresh(kind)
+        dates = self.store.dates(dataset)
+        if dates.size and (date is None or int(dates[-1]) > date):
+            return self.refresh(kind)
+        return index
+
+    def surge(
+        self,
+        kind: str = "loan",
+        window: int = 5,
+        limit: int = 20,
+        by: str = "change_pct",
+        ascending: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        미리 계산된 인덱스에서 기간 잔고 급증 상위 종목을 반환합니다.
+        """
+        index = self.index(kind)
+        with self._lock:
+            try:
+                results = index.top(window, limit, by, ascending)
+            except KeyError as e:
+                raise ValueError(str(e.args[0]))
+            date = index.date
+        return {
+            "kind": kind,
+            "window": window,
+            "by": by,
+            "date": date,
+            "results": results,
+        }
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+_credit_service: ProcessLocal[CreditService] = ProcessLocal(
+    lambda: CreditService(get_stock_service().api), CreditService.close
+)
+
+
+def get_credit_service() -> CreditService:
+    """
+    현재 워커 프로세스의 CreditService 를 반환합니다.
+    """
+    return _credit_service.get()
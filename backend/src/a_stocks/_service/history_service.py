@@ -0,0 +1,82 @@
+from typing import Any, Dict, Optional, Sequence
+
+from django.conf import settings
+
+from a_stocks._service.provider import ProcessLocal
+from a_stocks._utils.backtest import BacktestResult, Signal, run_backtest_from_store
+from a_stocks._utils.history_store import HistoryStore
+from a_stocks._utils.kiwoom_api import KiwoomAPI
+from a_stocks._utils.tr_decoders import decode_daily_transactions_ka10015, merge_pages
+
+DAILY_DATASET = "ka10015"
+
+
+class HistoryService:
+    """
+    일별거래상세(ka10015)를 로컬 시계열 저장소에 적재하고 백테스트에 공급합니다.
+    """
+
+    def __init__(self, api: KiwoomAPI, store: Optional[HistoryStore] = None) -> None:
+        self.api = api
+        self.store = store or get_history_store()
+
+    def sync_daily(
+        self,
+        stock_codes: Sequence[str],
+        start_date: str,
+        max_pages: Optional[int] = None,
+    ) -> int:
+        """
+        종목들의 일별 거래 상세를 조회해 저장소에 병합합니다.
+
+        모든 종목을 조회한 뒤 한 번에 병합하므로 저장소 배열은 한 번만 다시 씁니다.
+
+        Args:
+            stock_codes (Sequence[str]): 종목코드 목록
+            start_date (str): 조회 시작일자 (YYYYMMDD)
+            max_pages (int, optional): 종목별 최대 연속조회 페이지 수
+
+        Returns:
+            int: 병합한 (종목, 일자) 값의 수
+        """
+        updates: Dict[str, Any] = {}
+        for stock_code in stock_codes:
+            try:
+                pages = self.api.paginate(
+                    self.api.daily_transaction_details_request_ka10015,
+                    stock_code,
+                    start_date,
+                    max_pages=max_pages,
+                )
+                response = merge_pages(pages, "daly_trde_dtl")
+            except Exception as e:
+                raise Exception(f"일별 거래 상세 조회 중 오류 발생: {str(e)}")
+            updates[stock_code] = decode_daily_transactions_ka10015(response)
+
+        return self.store.merge(DAILY_DATASET, updates)
+
+    def backtest(
+        self,
+        signal: Signal,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        **kwargs: Any,
+    ) -> BacktestResult:
+        """
+        저장소의 일봉 패널로 백테스트를 실행합니다.
+        """
+        return run_backtest_from_store(
+            self.store, signal, dataset=DAILY_DATASET, start=start, end=end, **kwargs
+        )
+
+
+_history_store: ProcessLocal[HistoryStore] = ProcessLocal(
+    lambda: HistoryStore(getattr(settings, "KIWOOM_HISTORY_DIR"))
+)
+
+
+def get_history_store() -> HistoryStore:
+    """
+    설정(KIWOOM_HISTORY_DIR)의 경로를 사용하는 시계열 저장소를 반환합니다.
+    """
+    return _history_store.get()
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional
+
+import numpy as np
+
+from a_stocks._utils.indicators import compute_indicators
+from a_stocks._utils.kiwoom_api import KiwoomAPI
+from a_stocks._utils.tr_decoders import (
+    decode_daily_transactions_ka10015,
+    merge_pages,
+)
+
+# 조회 시작일자까지 닿지 않을 때의 최대 연속조회 페이지 수
+MAX_INDICATOR_PAGES = 20
+
+
+def _until_covered(
+    pages: Iterable[Mapping[str, Any]], start_date: str
+) -> Iterator[Mapping[str, Any]]:
+    # 응답은 최신 일자부터 오므로 start_date 이전 일자가 나온 페이지에서 멈춥니다.
+    for page in pages:
+        yield page
+        if any(
+            row.get("dt") and row["dt"] <= start_date
+            for row in page.get("daly_trde_dtl", [])
+        ):
+            return
+
+
+def _to_optional(value: float) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 4)
+
+
+class IndicatorService:
+    """
+    일별거래상세(ka10015) 종가로 기술적 지표를 계산합니다.
+    """
+
+    def __init__(self, api: KiwoomAPI) -> None:
+        self.api = api
+
+    def get_indicators(
+        self,
+        stock_code: str,
+        start_date: Optional[str] = None,
+        limit: int = 60,
+        **params: Any,
+    ) -> Dict[str, Any]:
+        """
+        종목의 일별 종가로 SMA/EMA/RSI/MACD/볼린저 밴드를 계산합니다.
+
+        첫 페이지가 지표 기간보다 짧을 수 있으므로 start_date 까지 연속조회합니다.
+
+        Args:
+            stock_code (str): 종목코드 (예: '005930')
+            start_date (str, optional): 조회 시작일자 (YYYYMMDD). 기본값은 200일 전
+            limit (int): 반환할 최근 일수
+            **params: compute_indicators 의 기간 파라미터
+
+        Returns:
+            Dict[str, Any]: 종목코드와 날짜별 지표 목록
+        """
+        if start_date is None:
+            start_date = (datetime.now() - timedelta(days=200)).strftime("%Y%m%d")
+
+        try:
+            pages = self.api.paginate(
+                self.api.daily_transaction_details_request_ka10015,
+                stock_code,
+                start_date,
+                max_pages=MAX_INDICATOR_PAGES,
+            )
+            response = merge_pages(_until_covered(pages, start_date), "daly_trde_dtl")
+        except Exception as e:
+            raise Exception(f"일별 거래 상세 조회 중 오류 발생: {str(e)}")
+
+        columns = decode_daily_transactions_ka10015(response)
+        close = columns["close_pric"]
+        indicators = {
+            name: values[0]
+            for name, values in compute_indicators(close, **params).items()
+        }
+
+        start = max(close.size - limit, 0) if limit > 0 else 0
+        points: List[Dict[str, Any]] = []
+        for i in range(start, close.size):
+            point: Dict[str, Any] = {
+                "date": str(columns["dt"][i]),
+                "close": float(close[i]),
+            }
+            for name, values in indicators.items():
+                point[name] = _to_optional(values[i])
+            points.append(point)
+
+        return {"code": stock_code, "indicators": points}
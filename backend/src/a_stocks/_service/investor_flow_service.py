@@ -0,0 +1,269 @@
+"""
+투자자별 순매수(외국인/기관/개인) 수집과 분석
+
+- ka10059 (종목별 일별 투자자 순매수)를 전 종목에 대해 스레드 풀로 동시에 조회해
+  시계열 저장소의 "ka10059" 데이터셋(종목 x 일자 컬럼 배열)에 병합합니다.
+  전체 요청 속도는 KiwoomAPI 의 요청 제한기가 제한합니다.
+- ka10061 (기간 합계)과 ka10058 (투자자별 순매수 상위)은 종목코드를 키로 하는
+  ColumnTable 로 변환합니다.
+- 병합이 끝나면 FlowIndex 를 다시 만들어 상위 종목 질의를 미리 계산된 순서로
+  응답합니다. 수집은 kiwoom_collect 명령이 다른 프로세스에서 실행하므로, 조회할 때
+  저장소의 마지막 일자가 인덱스보다 새로우면 인덱스를 다시 만듭니다.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+from a_stocks._service.history_service import get_history_store
+from a_stocks._service.provider import ProcessLocal
+from a_stocks._service.stock_service import get_stock_service
+from a_stocks._utils.columnar import ColumnTable
+from a_stocks._utils.flow_analytics import DEFAULT_INVESTORS, FlowIndex
+from a_stocks._utils.history_store import HistoryStore
+from a_stocks._utils.kiwoom_api import KiwoomAPI
+from a_stocks._utils.krx_calendar import now_kst
+from a_stocks._utils.parsers import parse_number, parse_price
+from a_stocks._utils.rate_limiter import BATCH, request_priority
+from a_stocks._utils.tr_decoders import (
+    INVESTOR_FIELDS,
+    Columns,
+    decode_investor_flow_ka10059,
+)
+
+logger = logging.getLogger(__name__)
+
+FLOW_DATASET = "ka10059"
+
+# API 에서 쓰는 투자자 이름 -> ka10059/ka10061 필드
+INVESTOR_ALIASES = {
+    "foreign": "frgnr_invsr",
+    "institution": "orgn",
+    "individual": "ind_invsr",
+}
+
+# ka10058 투자자구분 코드
+INVESTOR_TYPE_CODES = {
+    "frgnr_invsr": "9000",
+    "orgn": "9999",
+    "ind_invsr": "8000",
+}
+
+
+def resolve_investor(name: str) -> str:
+    """
+    투자자 별칭(foreign/institution/individual) 또는 필드명을 필드명으로 바꿉니다.
+    """
+    field = INVESTOR_ALIASES.get(name, name)
+    if field not in INVESTOR_FIELDS:
+        raise ValueError(f"알 수 없는 투자자 구분입니다: {name}")
+    return field
+
+
+class InvestorFlowService:
+    """
+    투자자별 순매수를 수집해 저장하고 미리 계산된 인덱스로 조회합니다.
+    """
+
+    def __init__(
+        self,
+        api: KiwoomAPI,
+        store: Optional[HistoryStore] = None,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        self.api = api
+        self.store = store or get_history_store()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers
+            or getattr(settings, "KIWOOM_COLLECT_MAX_WORKERS", 4),
+            thread_name_prefix="investor-flow",
+        )
+        self._lock = threading.Lock()
+        self._index: Optional[FlowIndex] = None
+
+    def _fetch_daily(
+        self, stock_code: str, date: str, amount_quantity_type: str
+    ) -> Columns:
+        response = self.api.stock_data_by_investor_institution_request_ka10059(
+            date, stock_code, amount_quantity_type, "0", "1000"
+        )
+        return decode_investor_flow_ka10059(response)
+
+    def collect(
+        self,
+        stock_codes: Sequence[str],
+        date: Optional[str] = None,
+        amount_quantity_type: str = "1",
+    ) -> Dict[str, Any]:
+        """
+        종목별 일별 투자자 순매수를 동시에 조회해 저장소에 병합하고 인덱스를 갱신합니다.
+
+        일부 종목 조회가 실패해도 나머지는 병합합니다.
+
+        Args:
+            stock_codes (Sequence[str]): 종목코드 목록
+            date (str, optional): 기준일자 (YYYYMMDD). 기본값은 오늘
+            amount_quantity_type (str): 금액수량구분 (1:금액, 2:수량)
+
+        Returns:
+            Dict[str, Any]: {"merged": 병합한 값 수, "failed": 실패한 종목코드 목록}
+        """
+        date = date or now_kst().strftime("%Y%m%d")
+
+        def fetch(stock_code: str) -> Tuple[str, Optional[Columns]]:
+            # 풀 스레드마다 배치 우선순위로 보내 대화형 요청이 먼저 토큰을 받게 합니다.
+            try:
+                with request_priority(BATCH):
+                    return stock_code, self._fetch_daily(
+                        stock_code, date, amount_quantity_type
+                    )
+            except Exception:
+                logger.exception("%s 투자자별 순매수 조회 중 오류 발생", stock_code)
+                return stock_code, None
+
+        updates: Dict[str, Columns] = {}
+        failed: List[str] = []
+        for stock_code, columns in self._executor.map(fetch, stock_codes):
+            if columns is None:
+                failed.append(stock_code)
+            elif columns["dt"].size:
+                updates[stock_code] = columns
+
+        merged = self.store.merge(FLOW_DATASET, updates) if updates else 0
+        self.rebuild_index()
+        return {"merged": merged, "failed": failed}
+
+    def collect_totals(
+        self,
+        stock_codes: Sequence[str],
+        start_date: str,
+        end_date: str,
+        amount_quantity_type: str = "1",
+    ) -> ColumnTable:
+        """
+        종목별 기간 투자자 순매수 합계(ka10061)를 동시에 조회해 컬럼 테이블로 반환합니다.
+        """
+
+        def fetch(stock_code: str) -> Dict[str, Any]:
+            request = (
+                self.api.aggregate_stock_data_by_investor_institution_request_ka10061
+            )
+            with request_priority(BATCH):
+                response = request(
+                    stock_code, start_date, end_date, amount_quantity_type, "0", "1000"
+                )
+            rows = response.get("stk_invsr_orgn_tot", [])
+            return {"stk_cd": stock_code, **(rows[0] if rows else {})}
+
+        try:
+            rows = list(self._executor.map(fetch, stock_codes))
+        except Exception as e:
+            raise Exception(f"투자자별 순매수 합계 조회 중 오류 발생: {str(e)}")
+        return ColumnTable.from_rows(rows, INVESTOR_FIELDS)
+
+    def leaders(
+        self,
+        investor: str,
+        start_date: str,
+        end_date: str,
+        market_type: str = "001",
+        trade_type: str = "2",
+    ) -> ColumnTable:
+        """
+        투자자별 기간 순매수(또는 순매도) 상위 종목(ka10058)을 컬럼 테이블로 반환합니다.
+        """
+        field = resolve_investor(investor)
+        try:
+            response = self.api.daily_trading_stocks_by_investor_type_request_ka10058(
+                start_date,
+                end_date,
+                trade_type,
+                market_type,
+                INVESTOR_TYPE_CODES.get(field, "9000"),
+                "3",
+            )
+        except Exception as e:
+            raise Exception(f"투자자별 순매수 상위 조회 중 오류 발생: {str(e)}")
+        return ColumnTable.from_rows(
+            response.get("invsr_daly_trde_stk", []),
+            {
+                "netslmt_qty": parse_number,
+                "netslmt_amt": parse_number,
+                "prsm_avg_pric": parse_price,
+                "cur_prc": parse_price,
+            },
+            text_fields=("stk_nm",),
+        )
+
+    def rebuild_index(self) -> FlowIndex:
+        """
+        저장소의 ka10059 패널로 FlowIndex 를 다시 만듭니다.
+        """
+        if self.store.exists(FLOW_DATASET):
+            fields = [
+                name
+                for name in DEFAULT_INVESTORS
+                if name in self.store.field_names(FLOW_DATASET)
+            ]
+            panel = self.store.load(FLOW_DATASET, fields=fields)
+            index = FlowIndex.build(panel.codes, panel.dates, panel.fields)
+        else:
+            index = FlowIndex.build([], self.store.dates(FLOW_DATASET), {})
+        with self._lock:
+            self._index = index
+        return index
+
+    @property
+    def index(self) -> FlowIndex:
+        """
+        인덱스를 반환합니다. 저장소에 인덱스보다 새로운 일자가 병합됐으면 다시 만듭니다.
+        """
+        with self._lock:
+            index = self._index
+        if index is None:
+            return self.rebuild_index()
+        dates = self.store.dates(FLOW_DATASET)
+        if dates.size and (index.date is None or int(dates[-1]) > index.date):
+            return self.rebuild_index()
+        return index
+
+    def top(
+        self,
+        investor: str,
+        window: int = 20,
+        limit: int = 20,
+        ascending: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        미리 계산된 인덱스에서 기간 누적 순매수 상위 종목을 반환합니다.
+        """
+        field = resolve_investor(investor)
+        index = self.index
+        try:
+            results = index.top(field, window, limit, ascending)
+        except KeyError as e:
+            raise ValueError(str(e.args[0]))
+        return {
+            "investor": field,
+            "window": window,
+            "date": index.date,
+            "results": results,
+        }
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+_investor_flow_service: ProcessLocal[InvestorFlowService] = ProcessLocal(
+    lambda: InvestorFlowService(get_stock_service().api), InvestorFlowService.close
+)
+
+
+def get_investor_flow_service() -> InvestorFlowService:
+    """
+    현재 워커 프로세스의 InvestorFlowService 를 반환합니다.
+    """
+    return _investor_flow_service.get()
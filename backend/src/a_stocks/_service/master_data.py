@@ -0,0 +1,196 @@
+"""
+종목/업종/회원사 마스터 데이터 (ka10099, ka10101, ka10102)
+
+연속조회로 전체 목록을 받아 프로세스 메모리에 두고, 같은 내용을 거래일 단위
+JSON 스냅샷으로 저장합니다. 장 시작 전 워밍업이 스냅샷을 만들어 두면 다른 워커
+프로세스는 키움을 호출하지 않고 파일에서 읽습니다. 공유 캐시 백엔드(shared, redis)가
+설정되어 있으면 파일보다 먼저 캐시에서 찾습니다.
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from django.conf import settings
+
+from a_stocks._service.provider import ProcessLocal
+from a_stocks._service.stock_service import get_stock_service
+from a_stocks._utils.cache_backends import (
+    CacheBackend,
+    create_shared_cache_backend,
+)
+from a_stocks._utils.kiwoom_api import KiwoomAPI
+from a_stocks._utils.krx_calendar import now_kst
+from a_stocks._utils.tr_decoders import merge_pages
+
+logger = logging.getLogger(__name__)
+
+# ka10099 시장구분 (0:코스피, 10:코스닥, 8:ETF)
+MASTER_STOCK_MARKETS = ("0", "10", "8")
+# ka10101 시장구분 (0:코스피, 1:코스닥, 2:KOSPI200, 4:KOSPI100, 7:KRX100)
+MASTER_INDUSTRY_MARKETS = ("0", "1", "2", "4", "7")
+MASTER_LIST_KEY = "list"
+# 공유 캐시 키 접두어 (뒤에 거래일 YYYYMMDD)와 보관 시간(초)
+MASTER_CACHE_KEY = "master"
+MASTER_CACHE_TTL = 86400.0
+
+
+class MasterDataService:
+    """
+    마스터 데이터를 거래일마다 한 번만 조회합니다.
+    """
+
+    def __init__(
+        self,
+        api: KiwoomAPI,
+        path: Optional[Union[str, Path]] = None,
+        stock_markets: Sequence[str] = MASTER_STOCK_MARKETS,
+        industry_markets: Sequence[str] = MASTER_INDUSTRY_MARKETS,
+        cache: Optional[CacheBackend] = None,
+    ) -> None:
+        self.api = api
+        self.cache = cache
+        self.path = Path(
+            path
+            if path is not None
+            else getattr(settings, "KIWOOM_MASTER_DATA_PATH", "master.json")
+        )
+        self.stock_markets = tuple(stock_markets)
+        self.industry_markets = tuple(industry_markets)
+        self._lock = threading.Lock()
+        self.date: Optional[str] = None
+        self._stocks: Dict[str, Dict[str, Any]] = {}
+        self._industries: List[Dict[str, Any]] = []
+        self._members: List[Dict[str, Any]] = []
+
+    def _fetch_list(self, request: Any, *args: Any) -> List[Dict[str, Any]]:
+        rows: List[Dict[str, Any]] = merge_pages(
+            self.api.paginate(request, *args), MASTER_LIST_KEY
+        )[MASTER_LIST_KEY]
+        return rows
+
+    def _apply(self, data: Dict[str, Any]) -> None:
+        self.date = data["date"]
+        self._stocks = {row["code"]: row for row in data["stocks"]}
+        self._industries = data["industries"]
+        self._members = data["members"]
+
+    def refresh(self) -> Dict[str, int]:
+        """
+        키움에서 전체 마스터 데이터를 다시 받아 메모리, 스냅샷 파일, 공유 캐시를
+        갱신합니다.
+
+        Returns:
+            Dict[str, int]: 종류별 건수
+        """
+        try:
+            stocks: List[Dict[str, Any]] = []
+            for market in self.stock_markets:
+                stocks.extend(
+                    self._fetch_list(
+                        self.api.stock_information_list_request_ka10099, market
+                    )
+                )
+            industries: List[Dict[str, Any]] = []
+            for market in self.industry_markets:
+                industries.extend(
+                    self._fetch_list(self.api.industry_code_list_ka10101, market)
+                )
+            members = self._fetch_list(self.api.member_company_list_ka10102)
+        except Exception as e:
+            raise Exception(f"마스터 데이터 조회 중 오류 발생: {str(e)}")
+
+        data = {
+            "date": now_kst().strftime("%Y%m%d"),
+            "stocks": stocks,
+            "industries": industries,
+            "members": members,
+        }
+        with self._lock:
+            self._apply(data)
+        self._save(data)
+        if self.cache is not None:
+            self.cache.set(f"{MASTER_CACHE_KEY}:{data['date']}", data, MASTER_CACHE_TTL)
+        return {
+            "stocks": len(self._stocks),
+            "industries": len(industries),
+            "members": len(members),
+        }
+
+    def _save(self, data: Dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # 다른 프로세스가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체합니다.
+        temp = self.path.with_name(f".{self.path.name}.{os.getpid()}")
+        temp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(temp, self.path)
+
+    def load(self) -> bool:
+        """
+        오늘 데이터가 공유 캐시나 스냅샷 파일에 있으면 읽어 들입니다.
+
+        Returns:
+            bool: 읽었으면 True
+        """
+        today = now_kst().strftime("%Y%m%d")
+        data = (
+            self.cache.get(f"{MASTER_CACHE_KEY}:{today}")
+            if self.cache is not None
+            else None
+        )
+        if data is None:
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                return False
+        if data.get("date") != today:
+            return False
+        with self._lock:
+            self._apply(data)
+        return True
+
+    def ensure_loaded(self) -> None:
+        """
+        메모리에 오늘 데이터가 없으면 공유 캐시/스냅샷 파일, 그래도 없으면 키움에서
+        가져옵니다.
+        """
+        if self.date == now_kst().strftime("%Y%m%d"):
+            return
+        if not self.load():
+            self.refresh()
+
+    def stocks(self) -> List[Dict[str, Any]]:
+        self.ensure_loaded()
+        with self._lock:
+            return list(self._stocks.values())
+
+    def stock(self, code: str) -> Optional[Dict[str, Any]]:
+        self.ensure_loaded()
+        with self._lock:
+            return self._stocks.get(code)
+
+    def industries(self) -> List[Dict[str, Any]]:
+        self.ensure_loaded()
+        with self._lock:
+            return list(self._industries)
+
+    def members(self) -> List[Dict[str, Any]]:
+        self.ensure_loaded()
+        with self._lock:
+            return list(self._members)
+
+
+_master_data: ProcessLocal[MasterDataService] = ProcessLocal(
+    lambda: MasterDataService(
+        get_stock_service().api, cache=create_shared_cache_backend()
+    )
+)
+
+
+def get_master_data() -> MasterDataService:
+    """
+    현재 워커 프로세스의 MasterDataService 를 반환합니다.
+    """
+    return _master_data.get()
@@ -0,0 +1,497 @@
+"""
+모의투자 주문 체결 시뮬레이터
+
+관심종목정보요청(ka10095) 시세의 최우선 매도/매수호가로 인메모리 주문장(OrderBook)의
+미체결 주문을 체결합니다.
+
+- 계좌(PaperAccount)와 주문(PaperOrder)은 DB 에 저장하므로 모든 워커가 같은 계좌와
+  주문 번호를 봅니다. 쓰기는 계좌 행을 먼저 갱신해 잠근 트랜잭션 안에서 하고, 그때
+  계좌 version 을 올립니다. 워커는 version 이 바뀌었으면 계좌와 미체결 주문을 다시
+  읽어 주문장을 만듭니다. 여러 워커의 폴링 스레드가 같은 주문을 두 번 체결하지
+  않습니다.
+
+- 매수 지정가 주문은 매도호가가 지정가 이하가 되면 매도호가에, 매도 지정가 주문은
+  매수호가가 지정가 이상이 되면 매수호가에 전량 체결됩니다. 시장가 주문은 다음
+  시세에 바로 체결됩니다.
+- 지정가 매수는 접수 시 주문금액 + 수수료만큼 현금을, 매도는 수량만큼 보유 주식을
+  묶어 둡니다. 시장가 매수는 체결 시점에 현금이 부족하면 거부됩니다.
+- 수수료/세금은 백테스트와 같은 CostModel 을 씁니다. 호가로 체결하므로 기본
+  슬리피지는 0 입니다.
+- 미체결 주문이 있는 종목만 배치로 조회하는 폴링 스레드를 두고, 미체결 주문이
+  없어지면 스레드를 종료합니다. 평가에 쓰는 마지막 시세는 워커 메모리에만 둡니다.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from a_stocks._service.provider import ProcessLocal
+from a_stocks._service.stock_service import get_stock_service
+from a_stocks._utils.backtest import CostModel
+from a_stocks._utils.krx_calendar import COMBINED, refresh_interval
+from a_stocks._utils.order_book import (
+    BUY,
+    CANCELLED,
+    FILLED,
+    LIMIT,
+    MARKET,
+    OPEN,
+    REJECTED,
+    Order,
+    OrderBook,
+    validate_order,
+)
+from a_stocks.models import PaperAccount, PaperOrder
+
+logger = logging.getLogger(__name__)
+
+Quote = Dict[str, Any]
+QuoteFetcher = Callable[[List[str]], List[Quote]]
+
+# 모의 계좌 행 번호 (계좌는 하나)
+ACCOUNT_ID = 1
+
+
+def _to_order(row: PaperOrder) -> Order:
+    order = Order(
+        row.id,
+        row.code,
+        row.side,
+        row.order_type,
+        row.price,
+        row.quantity,
+        row.created_at,
+    )
+    order.status = row.status
+    order.fill_price = row.fill_price
+    order.updated_at = row.updated_at
+    order.reason = row.reason or None
+    return order
+
+
+class Position:
+    """
+    종목별 보유 수량과 평균 매입가입니다.
+    """
+
+    __slots__ = ("code", "quantity", "reserved", "average_price")
+
+    def __init__(self, code: str) -> None:
+        self.code = code
+        self.quantity = 0
+        # 미체결 매도 주문에 묶인 수량
+        self.reserved = 0
+        self.average_price = 0.0
+
+    @property
+    def available(self) -> int:
+        return self.quantity - self.reserved
+
+
+class PaperTradingService:
+    """
+    모의 계좌와 주문장을 관리하고 시세로 주문을 체결합니다.
+    """
+
+    def __init__(
+        self,
+        fetch: QuoteFetcher,
+        initial_cash: Optional[float] = None,
+        costs: Optional[CostModel] = None,
+        interval: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._fetch = fetch
+        self.initial_cash = (
+            initial_cash
+            if initial_cash is not None
+            else getattr(settings, "KIWOOM_PAPER_INITIAL_CASH", 100_000_000.0)
+        )
+        self.costs = costs or CostModel(slippage=0.0)
+        self.interval = (
+            interval
+            if interval is not None
+            else getattr(settings, "KIWOOM_STREAM_POLL_INTERVAL", 1.0)
+        )
+        self.batch_size: int = (
+            batch_size
+            if batch_size is not None
+            else getattr(settings, "KIWOOM_STREAM_BATCH_SIZE", 100)
+        )
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # 마지막으로 읽은 계좌 version (None 이면 다음 호출에서 DB 에서 읽습니다.)
+        self._version: Optional[int] = None
+        self.last_quotes: Dict[str, Quote] = {}
+        self._clear()
+
+    def _clear(self) -> None:
+        self.book = OrderBook()
+        self.cash = float(self.initial_cash)
+        # 미체결 지정가 매수 주문에 묶인 현금
+        self.reserved_cash = 0.0
+        self.positions: Dict[str, Position] = {}
+        self._reservations: Dict[int, float] = {}
+
+    def _account(self) -> PaperAccount:
+        account, _ = PaperAccount.objects.get_or_create(
+            pk=ACCOUNT_ID, defaults={"cash": float(self.initial_cash)}
+        )
+        return account
+
+    def _load(self, account: PaperAccount) -> None:
+        """
+        DB 의 계좌와 미체결 주문으로 메모리 상태를 다시 만듭니다.
+        """
+        self._clear()
+        self.cash = account.cash
+        for code, (quantity, average_price) in account.positions.items():
+            position = self._position(code)
+            position.quantity = int(quantity)
+            position.average_price = float(average_price)
+        # 접수순으로 올려야 같은 가격의 우선순위가 유지됩니다.
+        for row in PaperOrder.objects.filter(status=OPEN).order_by("id"):
+            self.book.add(
+                row.code, row.side, row.quantity, row.price, row.created_at, row.id
+            )
+            if row.side == BUY:
+                if row.reserved_cash:
+                    self.reserved_cash += row.reserved_cash
+                    self._reservations[row.id] = row.reserved_cash
+            else:
+                self._position(row.code).reserved += row.quantity
+        self._version = account.version
+        if self.book.codes():
+            # 다른 워커가 접수한 주문도 체결되도록 폴링을 시작합니다.
+            self.ensure_running()
+
+    def _sync(self) -> None:
+        """
+        다른 워커가 계좌를 바꿨으면 다시 읽습니다. (self._lock 을 잡고 호출)
+        """
+        version = (
+            PaperAccount.objects.filter(pk=ACCOUNT_ID)
+            .values_list("version", flat=True)
+            .first()
+        )
+        if version is None or version != self._version:
+            self._load(self._account())
+
+    def _save(self, orders: List[Order]) -> None:
+        PaperOrder.objects.bulk_update(
+            [
+                PaperOrder(
+                    id=order.order_id,
+                    status=order.status,
+                    fill_price=order.fill_price,
+                    reason=order.reason or "",
+                    updated_at=order.updated_at,
+                )
+                for order in orders
+            ],
+            ["status", "fill_price", "reason", "updated_at"],
+        )
+        version = (self._version or 0) + 1
+        PaperAccount.objects.filter(pk=ACCOUNT_ID).update(
+            cash=self.cash,
+            positions={
+                code: [position.quantity, position.average_price]
+                for code, position in self.positions.items()
+                if position.quantity
+            },
+            version=version,
+            updated_at=timezone.now(),
+        )
+        self._version = version
+
+    @contextmanager
+    def _writing(self) -> Iterator[List[Order]]:
+        """
+        계좌를 잠근 트랜잭션 안에서 최신 상태를 읽고, 바뀐 주문을 모아 저장합니다.
+        """
+        with self._lock:
+            try:
+                with transaction.atomic():
+                    # 같은 값으로 갱신해 트랜잭션이 끝날 때까지 다른 워커의 쓰기를 막습니다.
+                    if not PaperAccount.objects.filter(pk=ACCOUNT_ID).update(
+                        version=F("version")
+                    ):
+                        self._account()
+                    self._sync()
+                    changed: List[Order] = []
+                    yield changed
+                    self._save(changed)
+            except (KeyError, ValueError):
+                # 주문 검증 오류는 메모리 상태를 바꾸기 전에 납니다.
+                raise
+            except BaseException:
+                # 메모리 상태가 DB 와 어긋났을 수 있으므로 다음 호출에서 다시 읽습니다.
+                self._version = None
+                raise
+
+    def reset(self) -> None:
+        """
+        계좌와 주문을 모두 지우고 초기 상태로 되돌립니다.
+        """
+        with self._writing():
+            PaperOrder.objects.all().delete()
+            self._clear()
+
+    def _position(self, code: str) -> Position:
+        position = self.positions.get(code)
+        if position is None:
+            position = self.positions[code] = Position(code)
+        return position
+
+    def submit(
+        self, code: str, side: str, quantity: int, price: Optional[float] = None
+    ) -> Order:
+        """
+        주문을 접수합니다. price 가 없으면 시장가 주문입니다.
+
+        Raises:
+            ValueError: 주문 값이 잘못되었거나 주문가능금액/수량이 부족한 경우
+        """
+        validate_order(side, quantity, price)
+        with self._writing() as changed:
+            reserve = 0.0
+            if side == BUY:
+                if price is not None:
+                    reserve = price * quantity * (1 + self.costs.buy_rate)
+                    if reserve > self.cash - self.reserved_cash:
+                        raise ValueError("주문가능금액이 부족합니다.")
+            else:
+                position = self.positions.get(code)
+                if position is None or position.available < quantity:
+                    raise ValueError("매도가능수량이 부족합니다.")
+            now = self._clock()
+            row = PaperOrder.objects.create(
+                code=code,
+                side=side,
+                order_type=MARKET if price is None else LIMIT,
+                price=price,
+                quantity=quantity,
+                status=OPEN,
+                reserved_cash=reserve,
+                created_at=now,
+                updated_at=now,
+            )
+            order = self.book.add(code, side, quantity, price, now, row.id)
+            if side == BUY:
+                if reserve:
+                    self.reserved_cash += reserve
+                    self._reservations[order.order_id] = reserve
+            else:
+                self.positions[code].reserved += quantity
+            changed.append(order)
+        self.ensure_running()
+        return order
+
+    def _release(self, order: Order) -> None:
+        if order.side == BUY:
+            self.reserved_cash -= self._reservations.pop(order.order_id, 0.0)
+        else:
+            self.positions[order.code].reserved -= order.quantity
+
+    def cancel(self, order_id: int) -> Order:
+        """
+        미체결 주문을 취소합니다.
+
+        Raises:
+            KeyError: 주문이 없는 경우
+            ValueError: 이미 체결/취소된 주문인 경우
+        """
+        with self._writing() as changed:
+            # 미체결 주문은 모두 주문장에 있습니다. 없으면 닫힌 주문인지 DB 에서 봅니다.
+            order = self.book.get(order_id)
+            if order is None:
+                row = PaperOrder.objects.filter(pk=order_id).first()
+                if row is None:
+                    raise KeyError(f"{order_id}번 주문이 없습니다.")
+                order = _to_order(row)
+            self.book.close(order, CANCELLED, self._clock())
+            self._release(order)
+            changed.append(order)
+            return order
+
+    def _fill(self, order: Order, price: float, now: float) -> None:
+        notional = price * order.quantity
+        self._release(order)
+        if order.side == BUY:
+            total = notional * (1 + self.costs.buy_rate)
+            if total > self.cash - self.reserved_cash:
+                order.status = REJECTED
+                order.reason = "주문가능금액 부족"
+                order.updated_at = now
+                return
+            self.cash -= total
+            position = self._position(order.code)
+            held = position.quantity * position.average_price
+            position.quantity += order.quantity
+            position.average_price = (held + notional) / position.quantity
+        else:
+            self.cash += notional * (1 - self.costs.sell_rate)
+            position = self.positions[order.code]
+            position.quantity -= order.quantity
+            if position.quantity == 0 and position.reserved == 0:
+                del self.positions[order.code]
+        order.status = FILLED
+        order.fill_price = price
+        order.updated_at = now
+
+    def on_quotes(self, quotes: Iterable[Quote]) -> List[Order]:
+        """
+        시세로 미체결 주문을 체결합니다.
+
+        Returns:
+            List[Order]: 이번 시세로 체결(또는 거부)된 주문
+        """
+        prices: Dict[str, Tuple[float, float]] = {}
+        with self._lock:
+            self._sync()
+            for quote in quotes:
+                code = quote.get("code")
+                if not code:
+                    continue
+                self.last_quotes[code] = quote
+                last = float(quote.get("current_price") or 0.0)
+                # 호가가 없으면 현재가로 체결합니다.
+                ask = float(quote.get("ask") or 0.0) or last
+                bid = float(quote.get("bid") or 0.0) or last
+                best_bid, best_ask = self.book.best(code)
+                if (ask > 0 and best_bid is not None and best_bid >= ask) or (
+                    bid > 0 and best_ask is not None and best_ask <= bid
+                ):
+                    prices[code] = (bid, ask)
+        if not prices:
+            # 체결할 주문이 없으면 계좌를 잠그지 않습니다.
+            return []
+        with self._writing() as done:
+            now = self._clock()
+            for code, (bid, ask) in prices.items():
+                for order in self.book.crossing(code, bid, ask):
+                    self._fill(order, ask if order.side == BUY else bid, now)
+                    done.append(order)
+        return list(done)
+
+    def poll_once(self) -> List[Order]:
+        """
+        미체결 주문이 있는 종목의 시세를 배치로 조회해 체결합니다.
+        """
+        with self._lock:
+            self._sync()
+            codes = self.book.codes()
+        done: List[Order] = []
+        for start in range(0, len(codes), self.batch_size):
+            done.extend(
+                self.on_quotes(self._fetch(codes[start : start + self.batch_size]))
+            )
+        return done
+
+    def account(self) -> Dict[str, Any]:
+        """
+        현금, 보유 종목, 평가금액을 반환합니다. 평가는 마지막으로 받은 현재가 기준입니다.
+        """
+        with self._lock:
+            self._sync()
+            positions = []
+            equity = self.cash
+            for code, position in sorted(self.positions.items()):
+                quote = self.last_quotes.get(code, {})
+                last = float(quote.get("current_price") or position.average_price)
+                value = last * position.quantity
+                equity += value
+                positions.append(
+                    {
+                        "code": code,
+                        "quantity": position.quantity,
+                        "available": position.available,
+                        "average_price": round(position.average_price, 4),
+                        "last_price": last,
+                        "value": value,
+                    }
+                )
+            return {
+                "cash": self.cash,
+                "reserved_cash": self.reserved_cash,
+                "equity": equity,
+                "open_orders": self.book.open_count(),
+                "positions": positions,
+            }
+
+    def orders(
+        self, code: Optional[str] = None, status: Optional[str] = None
+    ) -> List[Order]:
+        rows = PaperOrder.objects.all()
+        if code is not None:
+            rows = rows.filter(code=code)
+        if status is not None:
+            rows = rows.filter(status=status)
+        return [_to_order(row) for row in rows]
+
+    def get(self, order_id: int) -> Optional[Order]:
+        row = PaperOrder.objects.filter(pk=order_id).first()
+        return _to_order(row) if row is not None else None
+
+    def ensure_running(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="kiwoom-paper-trading", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                with self._lock:
+                    if not self.book.codes():
+                        # 미체결 주문이 없으면 종료합니다. 다음 주문 접수 시 다시
+                        # 시작됩니다.
+                        self._thread = None
+                        return
+                try:
+                    self.poll_once()
+                except Exception:
+                    logger.exception("모의투자 체결 처리 중 오류 발생")
+                # 장이 닫혀 있으면 다음 세션 시작까지 기다립니다.
+                self._stop.wait(refresh_interval(self.interval, COMBINED))
+            with self._lock:
+                self._thread = None
+        finally:
+            # 이 스레드가 연 DB 연결을 닫습니다.
+            connections.close_all()
+
+    def stop(self) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=self.interval + 1.0)
+
+
+_paper_trading: ProcessLocal[PaperTradingService] = ProcessLocal(
+    lambda: PaperTradingService(
+        lambda codes: get_stock_service().get_watchlist_quotes(codes)
+    ),
+    PaperTradingService.stop,
+)
+
+
+def get_paper_trading() -> PaperTradingService:
+    """
+    현재 워커 프로세스의 모의투자 서비스를 반환합니다. 계좌와 주문은 DB 에 있으므로
+    모든 워커가 같은 계좌를 봅니다.
+    """
+    return _paper_trading.get()
@@ -0,0 +1,602 @@
+"""
+계좌 보유 종목과 손익을 증분으로 관리하는 포트폴리오 트래커
+
+- 보유 종목(수량, 평균 매입가)과 체결을 받아 평가손익/실현손익 합계를 유지합니다.
+  종목 하나의 체결이나 시세가 바뀌면 그 종목의 기여분만 빼고 다시 더하므로 틱당
+  O(1) 입니다.
+- 시세는 보유 종목만 ka10095 배치로 조회해 캐시하는 폴링 스레드가 갱신하고,
+  보유 종목이 없어지면 스레드를 종료합니다. GET /portfolio 는 키움을 호출하지 않고
+  캐시된 상태만 반환합니다.
+- 키움이 계산한 실현손익(ka10072 당일, ka10073 기간)은 일자별 합계를 받은 행으로
+  바꿔 쓰므로 같은 기간을 다시 조회해도 한 번만 반영됩니다. 트래커가 체결로 계산한
+  실현손익과 따로 보관합니다.
+- 상태는 DB(PortfolioState 한 행)에 저장하므로 모든 워커가 같은 포트폴리오를
+  봅니다. 쓰기는 상태 행을 먼저 갱신해 잠근 트랜잭션 안에서 하고, 상태가 실제로
+  바뀐 경우에만 version 을 올립니다. 워커는 version 이 바뀌었으면 상태를 다시
+  읽습니다. 체결 번호 중복 확인은 그 거래일의 번호만 보관합니다.
+- 보유 종목이 있는 워커마다 폴링 스레드가 돌지만, 다른 워커가 주기 안에 시세를
+  반영했으면 조회를 건너뜁니다. 시세 반영 시각(quoted_at)은 version 과 따로 갱신하므로
+  가격이 그대로인 폴링은 다른 워커가 상태를 다시 읽게 하지 않습니다.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F
+
+from a_stocks._service.provider import ProcessLocal
+from a_stocks._service.stock_service import get_stock_service
+from a_stocks._utils.kiwoom_api import KiwoomAPI
+from a_stocks._utils.krx_calendar import COMBINED, KST, now_kst, refresh_interval
+from a_stocks._utils.order_book import BUY, SELL, SIDES
+from a_stocks._utils.parsers import parse_number, parse_price
+from a_stocks.models import PortfolioState
+
+logger = logging.getLogger(__name__)
+
+Quote = Dict[str, Any]
+QuoteFetcher = Callable[[List[str]], List[Quote]]
+
+# 일자별종목별실현손익 응답의 리스트 키 (ka10072 당일, ka10073 기간)
+REALIZED_DAILY_KEY = "dt_stk_div_rlzt_pl"
+REALIZED_PERIOD_KEY = "dt_stk_rlzt_pl"
+
+# 포트폴리오 상태 행 번호 (상태는 하나)
+STATE_ID = 1
+
+
+class Holding:
+    """
+    한 종목의 보유 수량, 평균 매입가, 마지막 시세입니다.
+    """
+
+    __slots__ = ("code", "name", "quantity", "average_price", "last_price", "realized")
+
+    def __init__(self, code: str, name: str = "") -> None:
+        self.code = code
+        self.name = name
+        self.quantity = 0
+        self.average_price = 0.0
+        self.last_price = 0.0
+        # 이 종목 체결로 발생한 실현손익 (수수료/세금 차감)
+        self.realized = 0.0
+
+    @property
+    def cost(self) -> float:
+        return self.quantity * self.average_price
+
+    @property
+    def value(self) -> float:
+        return self.quantity * self.last_price
+
+    def to_dict(self) -> Dict[str, Any]:
+        unrealized = self.value - self.cost
+        return {
+            "code": self.code,
+            "name": self.name,
+            "quantity": self.quantity,
+            "average_price": round(self.average_price, 4),
+            "last_price": self.last_price,
+            "cost": self.cost,
+            "value": self.value,
+            "unrealized": unrealized,
+            "unrealized_rate": (
+                round(unrealized / self.cost * 100, 4) if self.cost else None
+            ),
+            "realized": self.realized,
+        }
+
+
+class _Write:
+    """
+    _writing() 안에서 상태를 바꿨는지 표시합니다. 바꾸지 않았으면 저장하지 않습니다.
+    """
+
+    __slots__ = ("changed",)
+
+    def __init__(self) -> None:
+        self.changed = True
+
+
+class PortfolioTracker:
+    """
+    보유 종목과 손익 합계를 증분으로 유지합니다.
+    """
+
+    def __init__(
+        self,
+        api: Optional[KiwoomAPI],
+        fetch: QuoteFetcher,
+        account_number: Optional[str] = None,
+        interval: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.api = api
+        self._fetch = fetch
+        self.account_number: str = (
+            account_number
+            if account_number is not None
+            else getattr(settings, "KIWOOM_ACCOUNT_NUMBER", "")
+        )
+        self.interval = (
+            interval
+            if interval is not None
+            else getattr(settings, "KIWOOM_STREAM_POLL_INTERVAL", 1.0)
+        )
+        self.batch_size: int = (
+            batch_size
+            if batch_size is not None
+            else getattr(settings, "KIWOOM_STREAM_BATCH_SIZE", 100)
+        )
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # 마지막으로 읽은 상태 version (None 이면 다음 호출에서 DB 에서 읽습니다.)
+        self._version: Optional[int] = None
+        self._clear()
+
+    def _clear(self) -> None:
+        self.holdings: Dict[str, Holding] = {}
+        # 합계 (보유 종목 기여분의 합)
+        self._cost = 0.0
+        self._value = 0.0
+        self._realized = 0.0
+        self._fees = 0.0
+        # 키움이 보고한 일자별 실현손익: 일자 -> [실현손익, 수수료+세금, 행 수]
+        self._reported: Dict[str, List[float]] = {}
+        # 이 거래일에 반영한 체결 번호
+        self._fill_date = ""
+        self._seen_fills: Set[str] = set()
+        self.updated_at: Optional[float] = None
+        self._quoted_at: Optional[float] = None
+
+    def _state(self) -> PortfolioState:
+        state, _ = PortfolioState.objects.get_or_create(pk=STATE_ID)
+        return state
+
+    def _load(self, state: PortfolioState) -> None:
+        """
+        DB 의 상태로 메모리 상태를 다시 만듭니다.
+        """
+        self._clear()
+        for code, row in state.holdings.items():
+            holding = Holding(code, row["name"])
+            holding.quantity = int(row["quantity"])
+            holding.average_price = float(row["average_price"])
+            holding.last_price = float(row["last_price"])
+            holding.realized = float(row["realized"])
+            self.holdings[code] = holding
+        self._cost = sum(holding.cost for holding in self.holdings.values())
+        self._value = sum(holding.value for holding in self.holdings.values())
+        self._realized = state.realized
+        self._fees = state.fees
+        self._reported = {day: list(total) for day, total in state.reported.items()}
+        self._fill_date = state.fill_date
+        self._seen_fills = set(state.fill_ids)
+        self.updated_at = state.changed_at
+        self._quoted_at = state.quoted_at
+        self._version = state.version
+        if self.holdings:
+            # 다른 워커가 반영한 보유 종목도 시세를 갱신합니다.
+            self.ensure_running()
+
+    def _sync(self) -> None:
+        """
+        다른 워커가 상태를 바꿨으면 다시 읽습니다. (self._lock 을 잡고 호출)
+        """
+        row = (
+            PortfolioState.objects.filter(pk=STATE_ID)
+            .values_list("version", "quoted_at")
+            .first()
+        )
+        if row is None or row[0] != self._version:
+            self._load(self._state())
+        else:
+            # 시세 반영 시각은 version 을 올리지 않고 갱신되므로 매번 읽습니다.
+            self._quoted_at = row[1]
+
+    def _save(self) -> None:
+        version = (self._version or 0) + 1
+        PortfolioState.objects.filter(pk=STATE_ID).update(
+            holdings={
+                code: {
+                    "name": holding.name,
+                    "quantity": holding.quantity,
+                    "average_price": holding.average_price,
+                    "last_price": holding.last_price,
+                    "realized": holding.realized,
+                }
+                for code, holding in self.holdings.items()
+            },
+            realized=self._realized,
+            fees=self._fees,
+            reported=self._reported,
+            fill_date=self._fill_date,
+            fill_ids=sorted(self._seen_fills),
+            changed_at=self.updated_at,
+            version=version,
+        )
+        self._version = version
+
+    def _mark_quoted(self) -> None:
+        """
+        시세 반영 시각만 기록합니다. version 은 그대로 둡니다. (self._lock 을 잡고 호출)
+        """
+        self._quoted_at = self._clock()
+        PortfolioState.objects.filter(pk=STATE_ID).update(quoted_at=self._quoted_at)
+
+    @contextmanager
+    def _writing(self) -> Iterator[_Write]:
+        """
+        상태 행을 잠근 트랜잭션 안에서 최신 상태를 읽고, 바뀌었으면 끝나고 저장합니다.
+        """
+        with self._lock:
+            try:
+                with transaction.atomic():
+                    # 같은 값으로 갱신해 트랜잭션이 끝날 때까지 다른 워커의 쓰기를 막습니다.
+                    if not PortfolioState.objects.filter(pk=STATE_ID).update(
+                        version=F("version")
+                    ):
+                        self._state()
+                    self._sync()
+                    write = _Write()
+                    yield write
+                    if write.changed:
+                        self._save()
+            except ValueError:
+                # 체결 검증 오류는 메모리 상태를 바꾸기 전에 납니다.
+                raise
+            except BaseException:
+                # 메모리 상태가 DB 와 어긋났을 수 있으므로 다음 호출에서 다시 읽습니다.
+                self._version = None
+                raise
+
+    def _trading_date(self) -> str:
+        return datetime.fromtimestamp(self._clock(), KST).strftime("%Y%m%d")
+
+    def _detach(self, holding: Holding) -> None:
+        self._cost -= holding.cost
+        self._value -= holding.value
+
+    def _attach(self, holding: Holding) -> None:
+        self._cost += holding.cost
+        self._value += holding.value
+
+    def load_holdings(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """
+        보유 종목을 통째로 바꿉니다. 이미 받은 시세는 유지합니다.
+
+        Args:
+            rows: code, quantity, average_price, (name, last_price) 를 가진 dict 목록
+
+        Returns:
+            int: 보유 종목 수
+        """
+        with self._writing():
+            previous = self.holdings
+            self.holdings = {}
+            for row in rows:
+                code = str(row["code"])
+                quantity = int(row["quantity"])
+                if quantity <= 0:
+                    continue
+                holding = Holding(code, str(row.get("name") or ""))
+                holding.quantity = quantity
+                holding.average_price = float(row["average_price"])
+                old = previous.get(code)
+                holding.last_price = float(
+                    row.get("last_price")
+                    or (old.last_price if old is not None else 0.0)
+                    or holding.average_price
+                )
+                if old is not None:
+                    holding.realized = old.realized
+                self.holdings[code] = holding
+            # 통째로 바꿀 때는 누적 오차 없이 다시 합산합니다.
+            self._cost = sum(holding.cost for holding in self.holdings.values())
+            self._value = sum(holding.value for holding in self.holdings.values())
+            self.updated_at = self._clock()
+            count = len(self.holdings)
+        if count:
+            self.ensure_running()
+        return count
+
+    def apply_fill(
+        self,
+        code: str,
+        side: str,
+        quantity: int,
+        price: float,
+        fee: float = 0.0,
+        fill_id: Optional[str] = None,
+        name: str = "",
+    ) -> bool:
+        """
+        체결 한 건을 반영합니다. 매수는 평균 매입가를, 매도는 실현손익을 갱신합니다.
+
+        Args:
+            fee (float): 수수료와 세금 합계. 실현손익에서 차감합니다.
+            fill_id (Optional[str]): 체결 번호. 이미 반영한 번호면 무시합니다.
+
+        Returns:
+            bool: 새로 반영했으면 True
+
+        Raises:
+            ValueError: 체결 값이 잘못되었거나 보유 수량보다 많이 매도한 경우
+        """
+        if side not in SIDES:
+            raise ValueError(f"side 는 {', '.join(SIDES)} 중 하나여야 합니다.")
+        if quantity <= 0 or price <= 0:
+            raise ValueError("체결 수량과 가격은 0 보다 커야 합니다.")
+        with self._writing() as write:
+            today = self._trading_date()
+            # 검증을 모두 마친 뒤에 메모리 상태를 바꿉니다.
+            if (
+                fill_id is not None
+                and self._fill_date == today
+                and fill_id in self._seen_fills
+            ):
+                write.changed = False
+                return False
+            holding = self.holdings.get(code)
+            if side == SELL and (holding is None or holding.quantity < quantity):
+                raise ValueError("보유 수량보다 많이 매도할 수 없습니다.")
+            if self._fill_date != today:
+                # 체결 번호는 거래일마다 새로 매기므로 지난 거래일 번호는 버립니다.
+                self._fill_date = today
+                self._seen_fills = set()
+            if holding is None:
+                holding = self.holdings[code] = Holding(code, name)
+                holding.last_price = price
+            self._detach(holding)
+            if side == BUY:
+                cost = holding.cost + price * quantity
+                holding.quantity += quantity
+                holding.average_price = cost / holding.quantity
+                pnl = -fee
+            else:
+                holding.quantity -= quantity
+                pnl = (price - holding.average_price) * quantity - fee
+            holding.realized += pnl
+            self._realized += pnl
+            self._fees += fee
+            if holding.quantity == 0:
+                del self.holdings[code]
+            else:
+                self._attach(holding)
+            if fill_id is not None:
+                self._seen_fills.add(fill_id)
+            self.updated_at = self._clock()
+        if side == BUY:
+            self.ensure_running()
+        return True
+
+    def _price_changes(self, quotes: List[Quote]) -> List[Tuple[Holding, float]]:
+        changes: List[Tuple[Holding, float]] = []
+        for quote in quotes:
+            holding = self.holdings.get(quote.get("code") or "")
+            if holding is None:
+                continue
+            price = float(quote.get("current_price") or 0.0)
+            if price > 0 and price != holding.last_price:
+                changes.append((holding, price))
+        return changes
+
+    def on_quotes(self, quotes: Iterable[Quote]) -> int:
+        """
+        시세로 보유 종목의 평가금액을 갱신합니다.
+
+        가격이 바뀐 종목이 없으면 상태 행을 잠그거나 version 을 올리지 않고 시세 반영
+        시각만 기록합니다.
+
+        Returns:
+            int: 가격이 바뀐 종목 수
+        """
+        quotes = list(quotes)
+        changed = 0
+        with self._lock:
+            self._sync()
+            if self._price_changes(quotes):
+                with self._writing() as write:
+                    # 락을 잡는 사이 다른 워커가 반영했을 수 있으므로 다시 비교합니다.
+                    changes = self._price_changes(quotes)
+                    for holding, price in changes:
+                        self._value += holding.quantity * (price - holding.last_price)
+                        holding.last_price = price
+                    changed = len(changes)
+                    write.changed = bool(changed)
+                    if changed:
+                        self.updated_at = self._clock()
+            self._mark_quoted()
+        return changed
+
+    def refresh(self) -> int:
+        """
+        보유 종목의 시세를 배치로 조회해 반영합니다. 다른 워커가 주기 안에 시세를
+        반영했으면 건너뜁니다.
+        """
+        with self._lock:
+            self._sync()
+            if (
+                self._quoted_at is not None
+                and self._clock() - self._quoted_at < self.interval
+            ):
+                return 0
+            codes = sorted(self.holdings)
+        changed = 0
+        for start in range(0, len(codes), self.batch_size):
+            changed += self.on_quotes(
+                self._fetch(codes[start : start + self.batch_size])
+            )
+        return changed
+
+    def ingest_realized(self, rows: Iterable[Dict[str, Any]], date: str = "") -> int:
+        """
+        키움 일자별종목별실현손익(ka10072/ka10073) 행을 일자별 합계로 반영합니다.
+
+        응답은 조회한 일자의 행을 모두 담으므로, 행이 있는 일자의 합계를 이번 행으로
+        바꿔 씁니다. 같은 기간을 다시 조회해도 한 번만 반영되고, 중복 확인용 행
+        키를 쌓아 두지 않습니다.
+
+        Args:
+            rows: 응답 리스트 항목
+            date (str): 행에 일자(dt)가 없을 때 쓸 일자 (ka10072)
+
+        Returns:
+            int: 새로 반영한 행 수 (일자별로 전보다 늘어난 행 수의 합)
+        """
+        totals: Dict[str, List[float]] = {}
+        for row in rows:
+            total = totals.setdefault(str(row.get("dt") or date), [0.0, 0.0, 0])
+            total[0] += parse_number(row.get("tdy_sel_pl"))
+            total[1] += parse_price(row.get("tdy_trde_cmsn")) + parse_price(
+                row.get("tdy_trde_tax")
+            )
+            total[2] += 1
+        if not totals:
+            return 0
+        with self._writing() as write:
+            added = sum(
+                max(0, int(total[2]) - int(self._reported.get(day, [0, 0, 0])[2]))
+                for day, total in totals.items()
+            )
+            write.changed = any(
+                self._reported.get(day) != total for day, total in totals.items()
+            )
+            if write.changed:
+                self._reported.update(totals)
+                self.updated_at = self._clock()
+        return added
+
+    def sync(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> int:
+        """
+        키움에서 실현손익을 조회해 새 행만 반영합니다.
+
+        start_date 가 없으면 당일(ka10072), 있으면 기간(ka10073)으로 조회합니다.
+
+        Returns:
+            int: 새로 반영한 행 수
+        """
+        if self.api is None:
+            raise ValueError("키움 API 가 설정되지 않았습니다.")
+        try:
+            if start_date is None:
+                date = now_kst().strftime("%Y%m%d")
+                response = self.api.get_account_balance(self.account_number)
+                rows = response.get(REALIZED_DAILY_KEY) or []
+            else:
+                date = ""
+                response = self.api.get_order_history(
+                    self.account_number,
+                    start_date,
+                    end_date or now_kst().strftime("%Y%m%d"),
+                )
+                rows = response.get(REALIZED_PERIOD_KEY) or []
+        except Exception as e:
+            raise Exception(f"실현손익 조회 중 오류 발생: {str(e)}")
+        return self.ingest_realized(rows, date)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        캐시된 시세 기준 포트폴리오 상태를 반환합니다. 키움을 호출하지 않습니다.
+        """
+        with self._lock:
+            self._sync()
+            unrealized = self._value - self._cost
+            return {
+                "updated_at": self.updated_at,
+                "cost": self._cost,
+                "market_value": self._value,
+                "unrealized": unrealized,
+                "unrealized_rate": (
+                    round(unrealized / self._cost * 100, 4) if self._cost else None
+                ),
+                "realized": self._realized,
+                "fees": self._fees,
+                "reported_realized": sum(total[0] for total in self._reported.values()),
+                "reported_fees": sum(total[1] for total in self._reported.values()),
+                "positions": [
+                    self.holdings[code].to_dict() for code in sorted(self.holdings)
+                ],
+            }
+
+    def ensure_running(self) -> None:
+        """
+        시세 갱신 스레드가 없으면 시작합니다.
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="kiwoom-portfolio", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                with self._lock:
+                    if not self.holdings:
+                        # 보유 종목이 없으면 종료합니다. 다음 매수/잔고 반영 시 다시
+                        # 시작됩니다.
+                        self._thread = None
+                        return
+                try:
+                    self.refresh()
+                except Exception:
+                    logger.exception("포트폴리오 시세 갱신 중 오류 발생")
+                # 장이 닫혀 있으면 다음 세션 시작까지 기다립니다.
+                self._stop.wait(refresh_interval(self.interval, COMBINED))
+            with self._lock:
+                self._thread = None
+        finally:
+            # 이 스레드가 연 DB 연결을 닫습니다.
+            connections.close_all()
+
+    def stop(self) -> None:
+        """
+        시세 갱신 스레드를 멈춥니다.
+        """
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=self.interval + 1.0)
+
+
+def _create_portfolio_tracker() -> PortfolioTracker:
+    service = get_stock_service()
+    return PortfolioTracker(service.api, service.get_watchlist_quotes)
+
+
+_portfolio_tracker: ProcessLocal[PortfolioTracker] = ProcessLocal(
+    _create_portfolio_tracker, PortfolioTracker.stop
+)
+
+
+def get_portfolio_tracker() -> PortfolioTracker:
+    """
+    현재 워커 프로세스의 PortfolioTracker 를 반환합니다. 상태는 DB 에 있으므로 모든
+    워커가 같은 포트폴리오를 봅니다.
+    """
+    return _portfolio_tracker.get()
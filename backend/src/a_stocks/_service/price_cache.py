@@ -0,0 +1,68 @@
+"""
+시세 응답 캐시
+
+GET /price/{stock_code} 가 돌려주는 직렬화된 시세 본문과 ETag 를 캐시합니다.
+라우터와 워밍업이 함께 쓰므로 서비스 계층에 둡니다. 캐시 백엔드(Redis 연결 등)는
+import 시점이 아니라 워커에서 처음 쓸 때 만듭니다.
+"""
+
+from typing import Any, Dict, Iterable
+
+from django.conf import settings
+
+from a_stocks._schema.stock_schema import StockPriceOut
+from a_stocks._service.provider import ProcessLocal
+from a_stocks._utils.cache_backends import create_cache_backend
+from a_stocks._utils.krx_calendar import exchange_of, refresh_interval
+from a_stocks._utils.response_cache import CachedResponse, ResponseCache, make_etag
+
+_price_cache: ProcessLocal[ResponseCache] = ProcessLocal(
+    lambda: ResponseCache(
+        ttl=getattr(settings, "KIWOOM_QUOTE_CACHE_TTL", 1.0),
+        backend=create_cache_backend(),
+    ),
+    ResponseCache.close,
+)
+
+
+def get_price_cache() -> ResponseCache:
+    """
+    현재 워커 프로세스의 시세 응답 캐시를 반환합니다.
+    """
+    return _price_cache.get()
+
+
+def price_cache_is_shared() -> bool:
+    """
+    시세 캐시 백엔드를 다른 프로세스와 공유하는지 여부
+    """
+    return get_price_cache().backend.serialized
+
+
+def store_price(stock_code: str, result: Dict[str, Any]) -> CachedResponse:
+    """
+    시세 dict 를 직렬화해 본문과 ETag 를 캐시에 저장합니다.
+    """
+    quote = StockPriceOut.model_validate(result)
+    body = quote.model_dump_json().encode()
+    # timestamp 는 조회 시각이므로 ETag 계산에서 제외합니다.
+    etag = make_etag(quote.model_dump_json(exclude={"timestamp"}).encode())
+    cache = get_price_cache()
+    # 장이 닫혀 있으면 다음 세션 시작까지, 동시호가 중에는 더 짧게 캐시합니다.
+    ttl = refresh_interval(cache.ttl, exchange_of(stock_code))
+    return cache.set(f"price:{stock_code}", body, etag, ttl=ttl)
+
+
+def seed_price_cache(quotes: Iterable[Dict[str, Any]]) -> int:
+    """
+    미리 받은 시세(ka10095 관심종목 시세 등)로 시세 캐시를 채웁니다. (장 시작 전 워밍업)
+
+    Returns:
+        int: 캐시에 넣은 종목 수
+    """
+    count = 0
+    for quote in quotes:
+        if quote.get("code"):
+            store_price(quote["code"], quote)
+            count += 1
+    return count
@@ -0,0 +1,399 @@
+"""
+프로그램매매 수급 모니터 (ka90004 종목별프로그램매매현황, ka90003 순매수상위50)
+
+- 연속조회로 모든 페이지를 받아 장중 스냅샷을 일정 주기로 남깁니다.
+- 스냅샷은 (종목 x 스냅샷) 크기로 미리 할당한 배열에 순환 기록하므로 한 세션의
+  메모리 사용량은 설정한 종목 수 x 스냅샷 수로 고정됩니다. 날짜가 바뀌면 새
+  세션으로 초기화합니다.
+- 최근 N 스냅샷 동안 프로그램 순매수 금액 변화가 큰 종목을 벡터 연산으로 찾습니다.
+- 스냅샷 스레드는 워커마다 돌지만, 조회 결과를 공유 캐시 백엔드에 주기 동안 보관해
+  다른 워커는 같은 결과를 기록합니다. 그래서 ka90004 요청 수는 워커 수와 관계없이
+  주기마다 대략 한 번입니다. (프로세스 내 캐시 백엔드면 워커마다 조회합니다.)
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from django.conf import settings
+
+from a_stocks._service.provider import ProcessLocal
+from a_stocks._service.stock_service import get_stock_service
+from a_stocks._utils.cache_backends import CacheBackend, create_shared_cache_backend
+from a_stocks._utils.kiwoom_api import KiwoomAPI
+from a_stocks._utils.krx_calendar import KRX, now_kst, refresh_interval
+from a_stocks._utils.parsers import parse_number
+from a_stocks._utils.rate_limiter import BATCH, request_priority
+from a_stocks._utils.tr_decoders import merge_pages
+
+logger = logging.getLogger(__name__)
+
+# 시장구분 (P00101:코스피, P10102:코스닥)
+PROGRAM_MARKETS = ("P00101", "P10102")
+
+PROGRAM_STATUS_KEY = "stk_prm_trde_prst"
+PROGRAM_TOP50_KEY = "prm_netprps_upper_50"
+
+MOVER_DIRECTIONS = ("abs", "buy", "sell")
+
+PROGRAM_STATUS_CACHE_KEY = "program:status"
+
+
+class ProgramFlowMonitor:
+    """
+    종목별 프로그램 순매수 금액을 주기적으로 스냅샷하고 변화량을 계산합니다.
+    """
+
+    def __init__(
+        self,
+        api: KiwoomAPI,
+        interval: Optional[float] = None,
+        max_codes: Optional[int] = None,
+        max_snapshots: Optional[int] = None,
+        markets: Sequence[str] = PROGRAM_MARKETS,
+        clock: Callable[[], float] = time.time,
+        cache: Optional[CacheBackend] = None,
+    ) -> None:
+        self.api = api
+        self.cache = cache
+        self.interval = (
+            interval
+            if interval is not None
+            else getattr(settings, "KIWOOM_PROGRAM_SNAPSHOT_INTERVAL", 60.0)
+        )
+        self.max_codes: int = (
+            max_codes
+            if max_codes is not None
+            else getattr(settings, "KIWOOM_PROGRAM_MAX_CODES", 4000)
+        )
+        self.max_snapshots: int = (
+            max_snapshots
+            if max_snapshots is not None
+            else getattr(settings, "KIWOOM_PROGRAM_MAX_SNAPSHOTS", 420)
+        )
+        self.markets = tuple(markets)
+        self._clock = clock
+        self._lock = threading.Lock()
+        # 종목 x 스냅샷 누적 프로그램 순매수 금액 (순환 버퍼)
+        self._net = np.full((self.max_codes, self.max_snapshots), np.nan)
+        self._times = np.full(self.max_snapshots, np.nan)
+        self._codes: List[str] = []
+        self._names: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._count = 0
+        self.session: Optional[str] = None
+        # 마지막으로 기록한 조회 시각 (같은 공유 결과를 두 번 기록하지 않습니다.)
+        self._fetched_at: Optional[float] = None
+        # 스레드가 첫 스냅샷을 시도하면 설정됩니다.
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _fetch_pages(
+        self, request: Callable[..., Dict[str, Any]], list_key: str, *args: Any
+    ) -> List[Dict[str, Any]]:
+        rows: List[Dict[str, Any]] = merge_pages(
+            self.api.paginate(request, *args), list_key
+        )[list_key]
+        return rows
+
+    def fetch_status(self, date: str) -> List[Dict[str, Any]]:
+        """
+        모든 시장의 종목별 프로그램매매현황(ka90004)을 연속조회로 끝까지 가져옵니다.
+        """
+        rows: List[Dict[str, Any]] = []
+        try:
+            for market in self.markets:
+                rows.extend(
+                    self._fetch_pages(
+                        self.api.stock_wise_program_trading_status_request_ka90004,
+                        PROGRAM_STATUS_KEY,
+                        date,
+                        market,
+                        "1",
+                    )
+                )
+        except Exception as e:
+            raise Exception(f"종목별 프로그램매매현황 조회 중 오류 발생: {str(e)}")
+        return rows
+
+    def top_program_buyers(
+        self, trade_upper_type: str = "2", amount_quantity_type: str = "1"
+    ) -> List[Dict[str, Any]]:
+        """
+        시장별 프로그램 순매수(또는 순매도) 상위 50(ka90003)을 연속조회로 모두 가져옵니다.
+        """
+        rows: List[Dict[str, Any]] = []
+        try:
+            for market in self.markets:
+                rows.extend(
+                    self._fetch_pages(
+                        self.api.top_50_program_buy_request_ka90003,
+                        PROGRAM_TOP50_KEY,
+                        trade_upper_type,
+                        amount_quantity_type,
+                        market,
+                        "1",
+                    )
+                )
+        except Exception as e:
+            raise Exception(f"프로그램 순매수 상위 조회 중 오류 발생: {str(e)}")
+        return rows
+
+    def _reset(self, session: str) -> None:
+        self._net.fill(np.nan)
+        self._times.fill(np.nan)
+        self._codes.clear()
+        self._names.clear()
+        self._rows.clear()
+        self._count = 0
+        self.session = session
+
+    def _row_index(self, code: str, name: str) -> int:
+        row = self._rows.get(code)
+        if row is None:
+            if len(self._codes) >= self.max_codes:
+                return -1
+            row = len(self._codes)
+            self._rows[code] = row
+            self._codes.append(code)
+            self._names.append(name)
+        return row
+
+    def record(
+        self,
+        rows: Sequence[Dict[str, Any]],
+        session: str,
+        at: Optional[float] = None,
+    ) -> int:
+        """
+        조회한 행을 새 스냅샷으로 기록합니다.
+
+        Args:
+            at (float, optional): 조회 시각. 기본값은 현재 시각
+
+        Returns:
+            int: 기록한 종목 수
+        """
+        with self._lock:
+            if session != self.session:
+                self._reset(session)
+            index = np.fromiter(
+                (
+                    self._row_index(
+                        str(row.get("stk_cd", "")), str(row.get("stk_nm") or "")
+                    )
+                    for row in rows
+                ),
+                dtype=np.intp,
+                count=len(rows),
+            )
+            values = np.fromiter(
+                (parse_number(row.get("netprps_prica")) for row in rows),
+                dtype=np.float64,
+                count=len(rows),
+            )
+            kept = index >= 0
+            if not kept.all():
+                logger.warning(
+                    "프로그램매매 모니터 종목 수 한도(%d)를 넘어 %d개 종목을 제외합니다.",
+                    self.max_codes,
+                    int((~kept).sum()),
+                )
+            column = self._count % self.max_snapshots
+            self._net[:, column] = np.nan
+            self._net[index[kept], column] = values[kept]
+            self._times[column] = self._clock() if at is None else at
+            self._count += 1
+            return int(kept.sum())
+
+    def snapshot(self) -> int:
+        """
+        ka90004 를 끝까지 조회해 스냅샷 하나를 기록합니다.
+
+        공유 캐시에 다른 워커가 주기 안에 조회한 결과가 있으면 그 결과를 기록하고,
+        이미 기록한 결과면 건너뜁니다.
+
+        Returns:
+            int: 기록한 종목 수
+        """
+        session = now_kst().strftime("%Y%m%d")
+        key = f"{PROGRAM_STATUS_CACHE_KEY}:{session}"
+        shared = self.cache.get(key) if self.cache is not None else None
+        if shared is None:
+            shared = {"at": self._clock(), "rows": self.fetch_status(session)}
+            if self.cache is not None:
+                self.cache.set(key, shared, self.interval)
+        elif session == self.session and shared["at"] == self._fetched_at:
+            return 0
+        self._fetched_at = shared["at"]
+        return self.record(shared["rows"], session, at=shared["at"])
+
+    @property
+    def snapshots(self) -> int:
+        """
+        현재 세션에서 보관 중인 스냅샷 수
+        """
+        return min(self._count, self.max_snapshots)
+
+    def movers(
+        self, window: int = 5, limit: int = 20, direction: str = "abs"
+    ) -> Dict[str, Any]:
+        """
+        최근 window 스냅샷 동안 프로그램 순매수 금액이 가장 크게 변한 종목을 반환합니다.
+
+        스냅샷이 하나뿐이면 장 시작 이후 누적 순매수를 변화량으로 봅니다.
+
+        Args:
+            window (int): 비교할 과거 스냅샷 수
+            limit (int): 반환할 종목 수
+            direction (str): abs(절대값), buy(순매수 증가), sell(순매도 증가)
+        """
+        if direction not in MOVER_DIRECTIONS:
+            raise ValueError(
+                f"direction 은 {', '.join(MOVER_DIRECTIONS)} 중 하나여야 합니다."
+            )
+        with self._lock:
+            size = len(self._codes)
+            available = self.snapshots
+            if available == 0 or size == 0:
+                return {
+                    "session": self.session,
+                    "snapshots": available,
+                    "window": 0,
+                    "elapsed": None,
+                    "results": [],
+                }
+            steps = max(0, min(window, available - 1))
+            latest = (self._count - 1) % self.max_snapshots
+            current = self._net[:size, latest].copy()
+            if steps:
+                base_column = (self._count - 1 - steps) % self.max_snapshots
+                # 이전 스냅샷 이후 새로 잡힌 종목은 0 에서 시작한 것으로 봅니다.
+                base = np.nan_to_num(self._net[:size, base_column])
+                elapsed: Optional[float] = float(
+                    self._times[latest] - self._times[base_column]
+                )
+            else:
+                base = np.zeros(size)
+                elapsed = None
+            codes = list(self._codes)
+            names = list(self._names)
+
+        delta = current - base
+        key = {"abs": np.abs(delta), "buy": delta, "sell": -delta}[direction]
+        valid = np.flatnonzero(~np.isnan(key))
+        if limit < valid.size:
+            # 상위 limit 개만 부분 정렬합니다.
+            valid = valid[np.argpartition(-key[valid], limit - 1)[:limit]]
+        order = valid[np.argsort(-key[valid], kind="stable")]
+
+        results = []
+        for i in order:
+            rate = (
+                float(delta[i]) / (elapsed / 60.0) if elapsed and elapsed > 0 else None
+            )
+            results.append(
+                {
+                    "code": codes[i],
+                    "name": names[i],
+                    "net": float(current[i]),
+                    "delta": float(delta[i]),
+                    "rate": None if rate is None else round(rate, 4),
+                }
+            )
+        return {
+            "session": self.session,
+            "snapshots": available,
+            "window": steps,
+            "elapsed": elapsed,
+            "results": results,
+        }
+
+    def history(self, code: str) -> Dict[str, List[float]]:
+        """
+        한 종목의 현재 세션 스냅샷(시각, 누적 순매수)을 오래된 순서로 반환합니다.
+        """
+        with self._lock:
+            row = self._rows.get(code)
+            available = self.snapshots
+            columns = (
+                np.arange(self._count - available, self._count) % self.max_snapshots
+            )
+            times = self._times[columns]
+            values = (
+                self._net[row, columns]
+                if row is not None
+                else np.full(available, np.nan)
+            )
+        present = ~np.isnan(values)
+        return {"times": times[present].tolist(), "net": values[present].tolist()}
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        스냅샷 스레드가 첫 스냅샷을 시도할 때까지 기다립니다.
+
+        조회 요청이 직접 스냅샷을 찍으면 막 시작한 스레드와 ka90004 전체 조회가
+        겹치므로 스레드의 결과를 기다립니다.
+
+        Returns:
+            bool: 제한 시간 안에 첫 스냅샷을 시도했는지 여부
+        """
+        return self._ready.wait(
+            timeout
+            if timeout is not None
+            else getattr(settings, "KIWOOM_PROGRAM_READY_TIMEOUT", 10.0)
+        )
+
+    def ensure_running(self) -> None:
+        """
+        스냅샷 스레드가 없으면 시작합니다.
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="kiwoom-program-monitor", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        # 백그라운드 폴링은 배치 우선순위로 보내 대화형 요청이 먼저 토큰을 받게 합니다.
+        with request_priority(BATCH):
+            while not self._stop.is_set():
+                try:
+                    self.snapshot()
+                except Exception:
+                    logger.exception("프로그램매매 스냅샷 중 오류 발생")
+                self._ready.set()
+                # 장이 닫혀 있으면 다음 세션 시작까지 기다립니다.
+                self._stop.wait(refresh_interval(self.interval, KRX))
+        with self._lock:
+            self._thread = None
+
+    def stop(self) -> None:
+        """
+        스냅샷 스레드를 멈춥니다.
+        """
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=5.0)
+
+
+_program_monitor: ProcessLocal[ProgramFlowMonitor] = ProcessLocal(
+    lambda: ProgramFlowMonitor(
+        get_stock_service().api, cache=create_shared_cache_backend()
+    ),
+    ProgramFlowMonitor.stop,
+)
+
+
+def get_program_monitor() -> ProgramFlowMonitor:
+    """
+    현재 워커 프로세스의 ProgramFlowMonitor 를 반환합니다.
+    """
+    return _program_monitor.get()
@@ -0,0 +1,84 @@
+import os
+import threading
+from typing import Any, Callable, Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# 프로세스 종료 시 한 번에 정리하기 위해 생성된 모든 ProcessLocal 을 기록합니다.
+_registry: List["ProcessLocal[Any]"] = []
+
+
+class ProcessLocal(Generic[T]):
+    """
+    워커 프로세스마다 하나의 인스턴스를 지연 생성합니다.
+
+    모듈 import 시점에는 아무것도 만들지 않고, 최초 get() 호출 시 factory 로
+    인스턴스를 생성합니다. fork 이후 자식 프로세스에서는 부모의 인스턴스(소켓)를
+    재사용하지 않고 새 인스턴스를 만듭니다.
+    """
+
+    def __init__(
+        self, factory: Callable[[], T], close: Optional[Callable[[T], None]] = None
+    ) -> None:
+        self._factory = factory
+        self._close = close
+        self._instance: Optional[T] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def get(self) -> T:
+        """
+        현재 프로세스의 인스턴스를 반환합니다. 없으면 생성합니다.
+        """
+        pid = os.getpid()
+        instance = self._instance
+        if instance is not None and self._pid == pid:
+            return instance
+
+        with self._lock:
+            if self._instance is None or self._pid != pid:
+                # fork 된 자식에서는 부모 인스턴스를 닫지 않고 버립니다.
+                self._instance = self._factory()
+                self._pid = pid
+            return self._instance
+
+    def is_initialized(self) -> bool:
+        """
+        현재 프로세스에서 인스턴스가 생성되었는지 여부를 반환합니다.
+        """
+        return self._instance is not None and self._pid == os.getpid()
+
+    def close(self) -> None:
+        """
+        현재 프로세스의 인스턴스를 정리합니다.
+        """
+        with self._lock:
+            instance = self._instance
+            owned = self._pid == os.getpid()
+            self._instance = None
+            self._pid = None
+        if instance is not None and owned and self._close is not None:
+            self._close(instance)
+
+    def _reset_after_fork(self) -> None:
+        self._lock = threading.Lock()
+        self._instance = None
+        self._pid = None
+
+
+def close_all() -> None:
+    """
+    등록된 모든 프로세스 로컬 인스턴스를 정리합니다. (ASGI lifespan shutdown 등)
+    """
+    for provider in reversed(_registry):
+        provider.close()
+
+
+def _after_fork_in_child() -> None:
+    for provider in _registry:
+        provider._reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,258 @@
+import asyncio
+import json
+import logging
+import threading
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from django.conf import settings
+
+from a_stocks._service.provider import ProcessLocal
+from a_stocks._service.stock_service import get_stock_service
+from a_stocks._utils.krx_calendar import COMBINED, refresh_interval
+
+logger = logging.getLogger(__name__)
+
+Quote = Dict[str, Any]
+QuoteFetcher = Callable[[List[str]], List[Quote]]
+
+# 변경 여부 판단에 쓰는 필드 (timestamp 는 매 폴링마다 바뀌므로 제외)
+QUOTE_DIFF_FIELDS = (
+    "current_price",
+    "previous_close",
+    "change",
+    "change_percent",
+    "volume",
+)
+
+
+class QuoteSubscription:
+    """
+    한 SSE 클라이언트의 구독 정보입니다.
+
+    폴러 스레드가 변경된 시세를 pending 에 종목별로 덮어쓰고, 이벤트 루프에
+    알림만 보냅니다. 느린 클라이언트도 종목 수 이상의 메모리를 쓰지 않습니다.
+    """
+
+    def __init__(self, codes: FrozenSet[str], loop: asyncio.AbstractEventLoop) -> None:
+        self.codes = codes
+        self._loop = loop
+        self._event = asyncio.Event()
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Quote] = {}
+
+    def push(self, quotes: Iterable[Quote]) -> None:
+        """
+        폴러 스레드에서 호출됩니다.
+        """
+        with self._lock:
+            for quote in quotes:
+                self._pending[quote["code"]] = quote
+        try:
+            self._loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            # 이벤트 루프가 이미 닫힌 경우 (클라이언트 연결 종료)
+            pass
+
+    async def wait(self) -> None:
+        await self._event.wait()
+        self._event.clear()
+
+    def drain(self) -> List[Quote]:
+        with self._lock:
+            quotes = list(self._pending.values())
+            self._pending.clear()
+        return quotes
+
+
+class QuoteHub:
+    """
+    모든 SSE 구독자가 공유하는 시세 폴러입니다.
+
+    구독된 종목의 합집합을 ka10095 배치 요청으로 주기적으로 조회하고, 직전 결과와
+    비교해 바뀐 종목만 해당 종목을 구독한 클라이언트에게 전달합니다. 따라서
+    업스트림 호출 수는 시청자 수가 아니라 서로 다른 종목 수에 비례합니다.
+
+    폴링 주기는 장 운영 세션을 따릅니다. 장이 닫혀 있으면 다음 세션 시작까지
+    조회하지 않고, 새 종목 구독이 들어올 때만 한 번 조회합니다.
+    """
+
+    def __init__(
+        self,
+        fetch: QuoteFetcher,
+        interval: float = 1.0,
+        batch_size: int = 100,
+    ) -> None:
+        self._fetch = fetch
+        self.interval = interval
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Set[QuoteSubscription]] = {}
+        self._last: Dict[str, Tuple[Any, ...]] = {}
+        self._latest: Dict[str, Quote] = {}
+        self._stop = threading.Event()
+        # 새 종목이 구독되면 폴링 대기를 깨웁니다.
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(
+        self, codes: Iterable[str], loop: asyncio.AbstractEventLoop
+    ) -> QuoteSubscription:
+        """
+        종목 구독을 등록합니다. 이미 받은 최신 시세가 있으면 즉시 전달합니다.
+        """
+        subscription = QuoteSubscription(frozenset(codes), loop)
+        with self._lock:
+            added = not subscription.codes.issubset(self._subscribers)
+            for code in subscription.codes:
+                self._subscribers.setdefault(code, set()).add(subscription)
+            snapshot = [
+                self._latest[code]
+                for code in subscription.codes
+                if code in self._latest
+            ]
+        if snapshot:
+            subscription.push(snapshot)
+        if added:
+            self._wake.set()
+        self._ensure_running()
+        return subscription
+
+    def unsubscribe(self, subscription: QuoteSubscription) -> None:
+        with self._lock:
+            for code in subscription.codes:
+                subscribers = self._subscribers.get(code)
+                if subscribers is None:
+                    continue
+                subscribers.discard(subscription)
+                if not subscribers:
+                    # 더 이상 아무도 보지 않는 종목은 폴링 대상에서 제외합니다.
+                    del self._subscribers[code]
+                    self._last.pop(code, None)
+                    self._latest.pop(code, None)
+
+    def subscribed_codes(self) -> List[str]:
+        with self._lock:
+            return sorted(self._subscribers)
+
+    def poll_once(self) -> int:
+        """
+        구독 중인 모든 종목을 한 번 조회하고 변경분을 전달합니다.
+
+        Returns:
+            int: 변경된 종목 수
+        """
+        codes = self.subscribed_codes()
+        changed: List[Quote] = []
+        for start in range(0, len(codes), self.batch_size):
+            batch = codes[start : start + self.batch_size]
+            quotes = self._fetch(batch)
+            with self._lock:
+                for quote in quotes:
+                    code = quote.get("code")
+                    if code is None or code not in self._subscribers:
+                        continue
+                    signature = tuple(quote.get(field) for field in QUOTE_DIFF_FIELDS)
+                    if self._last.get(code) == signature:
+                        continue
+                    self._last[code] = signature
+                    self._latest[code] = quote
+                    changed.append(quote)
+
+        if changed:
+            self._fan_out(changed)
+        return len(changed)
+
+    def _fan_out(self, changed: List[Quote]) -> None:
+        per_subscription: Dict[QuoteSubscription, List[Quote]] = {}
+        with self._lock:
+            for quote in changed:
+                for subscription in self._subscribers.get(quote["code"], ()):
+                    per_subscription.setdefault(subscription, []).append(quote)
+        for subscription, quotes in per_subscription.items():
+            subscription.push(quotes)
+
+    def _ensure_running(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="kiwoom-quote-hub", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            with self._lock:
+                if not self._subscribers:
+                    # 구독자가 없으면 스레드를 종료합니다. 다음 구독 시 다시 시작됩니다.
+                    self._thread = None
+                    return
+            try:
+                self.poll_once()
+            except Exception:
+                logger.exception("시세 폴링 중 오류 발생")
+            self._wake.wait(refresh_interval(self.interval, COMBINED))
+            self._wake.clear()
+        with self._lock:
+            self._thread = None
+
+    def stop(self) -> None:
+        """
+        폴러 스레드를 멈춥니다.
+        """
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=self.interval + 1.0)
+
+
+async def stream_quotes(
+    hub: QuoteHub, codes: Iterable[str], keepalive: float = 15.0
+) -> AsyncGenerator[str, None]:
+    """
+    구독한 종목의 시세 변경을 Server-Sent Events 형식으로 내보냅니다.
+    """
+    subscription = hub.subscribe(codes, asyncio.get_running_loop())
+    try:
+        while True:
+            try:
+                await asyncio.wait_for(subscription.wait(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            for quote in subscription.drain():
+                payload = json.dumps(quote, ensure_ascii=False)
+                yield f"event: quote\ndata: {payload}\n\n"
+    finally:
+        hub.unsubscribe(subscription)
+
+
+def _create_quote_hub() -> QuoteHub:
+    return QuoteHub(
+        fetch=lambda codes: get_stock_service().get_watchlist_quotes(codes),
+        interval=getattr(settings, "KIWOOM_STREAM_POLL_INTERVAL", 1.0),
+        batch_size=getattr(settings, "KIWOOM_STREAM_BATCH_SIZE", 100),
+    )
+
+
+_quote_hub: ProcessLocal[QuoteHub] = ProcessLocal(_create_quote_hub, QuoteHub.stop)
+
+
+def get_quote_hub() -> QuoteHub:
+    """
+    현재 워커 프로세스의 QuoteHub 를 반환합니다.
+    """
+    return _quote_hub.get()
@@ -0,0 +1,346 @@
+"""
+순위 TR(ka10016/17/18/19/28) 기반 전 종목 스크리너
+
+- 표현식이 참조하는 TR 만 스레드 풀로 동시에 조회합니다. (KiwoomAPI 의 요청 제한기가
+  전체 요청 속도를 제한합니다.)
+- 각 TR 응답은 ColumnTable 로 변환해 TTL 동안 캐시하므로, 조건만 바꾼 반복 스크린은
+  API 를 호출하지 않고 메모리 내 벡터 연산만 수행합니다. TTL 은 장 운영 세션에 맞춰
+  조정되며 장 마감 후에는 다음 세션 시작까지 유지됩니다.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from django.conf import settings
+
+from a_stocks._service.provider import ProcessLocal
+from a_stocks._service.stock_service import get_stock_service
+from a_stocks._utils.columnar import ColumnTable
+from a_stocks._utils.kiwoom_api import KiwoomAPI
+from a_stocks._utils.krx_calendar import KRX, refresh_interval
+from a_stocks._utils.parsers import parse_number, parse_price
+from a_stocks._utils.screen_expr import Expr, parse_expression
+
+
+class ScreenSource:
+    """
+    스크리너가 사용할 수 있는 순위 TR 하나의 정의입니다.
+
+    컬럼은 "{name}.{field}" 로, 포함 여부는 "{name}" 불리언 컬럼으로 노출됩니다.
+    """
+
+    __slots__ = ("name", "method", "list_key", "fields", "params")
+
+    def __init__(
+        self,
+        name: str,
+        method: str,
+        list_key: str,
+        fields: Mapping[str, Callable[[Any], float]],
+        params: Mapping[str, str],
+    ) -> None:
+        self.name = name
+        self.method = method
+        self.list_key = list_key
+        self.fields = fields
+        self.params = params
+
+
+SCREEN_SOURCES: Dict[str, ScreenSource] = {
+    source.name: source
+    for source in (
+        ScreenSource(
+            "new_high",
+            "reported_low_price_request_ka10016",
+            "ntl_pric",
+            {
+                "cur_prc": parse_price,
+                "flu_rt": parse_number,
+                "trde_qty": parse_number,
+                "pred_trde_qty_pre_rt": parse_number,
+                "high_pric": parse_price,
+                "low_pric": parse_price,
+            },
+            {"market_type": "000", "new_high_low_type": "1", "period": "20"},
+        ),
+        ScreenSource(
+            "limit_up",
+            "upper_lower_limit_price_request_ka10017",
+            "updown_pric",
+            {
+                "cur_prc": parse_price,
+                "flu_rt": parse_number,
+                "trde_qty": parse_number,
+                "pred_trde_qty": parse_number,
+                "cnt": parse_number,
+            },
+            {"market_type": "000", "updown_type": "1", "sort_type": "3"},
+        ),
+        ScreenSource(
+            "near_high",
+            "near_high_low_price_request_ka10018",
+            "high_low_pric_alacc",
+            {
+                "cur_prc": parse_price,
+                "flu_rt": parse_number,
+                "trde_qty": parse_number,
+                "tdy_high_pric": parse_price,
+                "tdy_low_pric": parse_price,
+            },
+            {
+                "high_low_type": "1",
+                "proximity_rate": "10",
+                "market_type": "000",
+                "trade_qty_type": "00000",
+                "stock_condition": "0",
+                "credit_condition": "0",
+                "exchange_type": "1",
+            },
+        ),
+        ScreenSource(
+            "surge",
+            "rapid_price_change_request_ka10019",
+            "pric_jmpflu",
+            {
+                "cur_prc": parse_price,
+                "flu_rt": parse_number,
+                "trde_qty": parse_number,
+                "base_pric": parse_price,
+                "jmp_rt": parse_number,
+            },
+            {
+                "market_type": "000",
+                "fluctuation_type": "1",
+                "time_type": "1",
+                "time": "60",
+                "trade_qty_type": "00000",
+                "stock_condition": "0",
+                "credit_condition": "0",
+                "price_condition": "0",
+                "include_up_down_limit": "1",
+                "exchange_type": "1",
+            },
+        ),
+        ScreenSource(
+            "open_change",
+            "rate_of_change_compared_to_opening_price_request_ka10028",
+            "open_pric_pre_flu_rt",
+            {
+                "cur_prc": parse_price,
+                "flu_rt": parse_number,
+                "open_pric": parse_price,
+                "open_pric_pre": parse_number,
+                "now_trde_qty": parse_number,
+                "cntr_str": parse_number,
+            },
+            {
+                "sort_type": "1",
+                "trade_qty_condition": "0000",
+                "market_type": "000",
+                "include_up_down_limit": "1",
+                "stock_condition": "0",
+                "credit_condition": "0",
+                "trade_price_condition": "0",
+                "fluctuation_condition": "1",
+                "exchange_type": "1",
+            },
+        ),
+    )
+}
+
+
+def _as_expr(value: Union[str, Expr, None]) -> Optional[Expr]:
+    if value is None or isinstance(value, Expr):
+        return value
+    if not value.strip():
+        return None
+    return parse_expression(value)
+
+
+def _to_optional(value: Any) -> Optional[float]:
+    number = float(value)
+    return None if np.isnan(number) else round(number, 4)
+
+
+class ScreenerService:
+    """
+    순위 TR 을 조인한 컬럼 테이블 위에서 조건/점수 표현식으로 종목을 거릅니다.
+    """
+
+    def __init__(
+        self,
+        api: KiwoomAPI,
+        ttl: Optional[float] = None,
+        sources: Optional[Mapping[str, ScreenSource]] = None,
+    ) -> None:
+        self.api = api
+        self.ttl = (
+            ttl
+            if ttl is not None
+            else getattr(settings, "KIWOOM_SCREENER_CACHE_TTL", 5.0)
+        )
+        self.sources = dict(sources or SCREEN_SOURCES)
+        self._cache: Dict[str, Tuple[float, ColumnTable]] = {}
+        self._joined: Dict[
+            Tuple[str, ...], Tuple[Tuple[ColumnTable, ...], ColumnTable]
+        ] = {}
+        self._pull_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(self.sources), thread_name_prefix="screener"
+        )
+
+    def _pull(self, name: str) -> ColumnTable:
+        """
+        TR 하나를 조회해 ColumnTable 로 변환합니다. TTL 이내면 캐시를 반환합니다.
+
+        같은 TR 을 여러 스크린이 동시에 요청해도 실제 조회는 한 번만 일어납니다.
+        """
+        with self._lock:
+            cached = self._cache.get(name)
+            if cached is not None and cached[0] > time.monotonic():
+                return cached[1]
+            pull_lock = self._pull_locks.setdefault(name, threading.Lock())
+
+        with pull_lock:
+            cached = self._cache.get(name)
+            if cached is not None and cached[0] > time.monotonic():
+                return cached[1]
+
+            source = self.sources[name]
+            try:
+                response = getattr(self.api, source.method)(**source.params)
+            except Exception as e:
+                raise Exception(f"{source.method} 조회 중 오류 발생: {str(e)}")
+
+            table = ColumnTable.from_rows(
+                response.get(source.list_key, []),
+                source.fields,
+                prefix=name,
+                text_fields=("stk_nm",),
+            )
+            with self._lock:
+                # 장이 닫혀 있으면 다음 세션 시작까지 다시 조회하지 않습니다.
+                ttl = refresh_interval(
+                    self.ttl, source.params.get("exchange_type", KRX)
+                )
+                self._cache[name] = (time.monotonic() + ttl, table)
+            return table
+
+    def load(self, names: Sequence[str]) -> ColumnTable:
+        """
+        여러 TR 을 동시에 조회해 종목코드로 외부 조인합니다.
+        """
+        unknown = [name for name in names if name not in self.sources]
+        if unknown:
+            raise ValueError(f"알 수 없는 스크리너 소스입니다: {', '.join(unknown)}")
+        tables = list(self._executor.map(self._pull, names))
+
+        # 구성 TR 이 그대로면 이전 조인 결과를 재사용합니다.
+        key = tuple(names)
+        with self._lock:
+            joined = self._joined.get(key)
+        if joined is not None and all(a is b for a, b in zip(joined[0], tables)):
+            return joined[1]
+        table = ColumnTable.outer_join(tables)
+        with self._lock:
+            self._joined[key] = (tuple(tables), table)
+        return table
+
+    def invalidate(self) -> None:
+        """
+        캐시된 TR 응답을 모두 버립니다.
+        """
+        with self._lock:
+            self._cache.clear()
+            self._joined.clear()
+
+    def screen(
+        self,
+        where: Union[str, Expr, None] = None,
+        score: Union[str, Expr, None] = None,
+        limit: int = 50,
+        sources: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        조건을 만족하는 종목을 점수 내림차순으로 반환합니다.
+
+        Args:
+            where (str | Expr, optional): 필터 표현식 (예: "surge.jmp_rt > 2 and new_high")
+            score (str | Expr, optional): 점수 표현식. 없으면 종목코드 순으로 반환합니다.
+            limit (int): 최대 반환 종목 수
+            sources (Sequence[str], optional): 추가로 조인할 소스.
+                표현식이 참조하는 소스는 자동으로 포함됩니다.
+
+        Returns:
+            Dict[str, Any]: 사용한 소스, 조건을 만족한 전체 종목 수, 순위 결과
+        """
+        where_expr = _as_expr(where)
+        score_expr = _as_expr(score)
+
+        referenced = set()
+        for expr in (where_expr, score_expr):
+            if expr is not None:
+                referenced |= expr.columns()
+        names = list(sources or [])
+        for column in sorted(referenced):
+            name = column.split(".", 1)[0]
+            if name not in names:
+                names.append(name)
+        if not names:
+            raise ValueError("조건 또는 점수 표현식에 사용할 소스가 없습니다.")
+
+        table = self.load(names)
+
+        mask = np.ones(len(table), dtype=np.bool_)
+        if where_expr is not None:
+            mask &= np.asarray(where_expr.evaluate(table), dtype=np.bool_)
+        if score_expr is not None:
+            scores = np.asarray(score_expr.evaluate(table), dtype=np.float64)
+        else:
+            scores = np.full(len(table), np.nan)
+
+        matched = np.flatnonzero(mask)
+        codes = table.codes
+        # 점수 내림차순, NaN 은 뒤로, 같은 점수는 종목코드 순
+        order = np.lexsort(
+            (codes[matched], -scores[matched], np.isnan(scores[matched]))
+        )
+        selected = matched[order][: max(limit, 0)]
+
+        value_columns = sorted(
+            name for name in referenced if name in table and "." in name
+        )
+        names_column = table.columns.get("stk_nm")
+        results: List[Dict[str, Any]] = []
+        for i in selected:
+            results.append(
+                {
+                    "code": str(codes[i]),
+                    "name": str(names_column[i]) if names_column is not None else "",
+                    "score": _to_optional(scores[i]),
+                    "values": {
+                        name: _to_optional(table[name][i]) for name in value_columns
+                    },
+                }
+            )
+
+        return {"sources": names, "count": int(matched.size), "results": results}
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+_screener_service: ProcessLocal[ScreenerService] = ProcessLocal(
+    lambda: ScreenerService(get_stock_service().api), ScreenerService.close
+)
+
+
+def get_screener_service() -> ScreenerService:
+    """
+    현재 워커 프로세스의 ScreenerService 를 반환합니다. (TR 캐시를 요청 간 공유)
+    """
+    return _screener_service.get()
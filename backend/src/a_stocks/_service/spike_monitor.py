@@ -0,0 +1,182 @@
+"""
+거래량 급증/매물대 집중 모니터 (ka10024 거래량갱신, ka10025 매물대집중)
+
+- 백그라운드 스레드가 두 순위 TR 을 일정 주기로 조회해 SpikeDetector 에 넘깁니다.
+  기준선은 장중 값만 쓰도록 거래일이 바뀌면 초기화합니다.
+- 경보는 최근 경보 보관용 MemoryAlertSink 와 설정(KIWOOM_SPIKE_ALERT_SINKS)으로 더한
+  출력 대상에 함께 보냅니다.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Optional, Sequence
+
+from django.conf import settings
+
+from a_stocks._service.provider import ProcessLocal
+from a_stocks._service.stock_service import get_stock_service
+from a_stocks._utils.kiwoom_api import KiwoomAPI
+from a_stocks._utils.krx_calendar import KRX, now_kst, refresh_interval
+from a_stocks._utils.rate_limiter import BATCH, request_priority
+from a_stocks._utils.spike_detector import (
+    SPIKE_METRICS,
+    AlertSink,
+    FanoutAlertSink,
+    MemoryAlertSink,
+    SpikeDetector,
+    decode_concentration_ka10025,
+    decode_volume_update_ka10024,
+    load_alert_sinks,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SpikeMonitor:
+    """
+    ka10024/ka10025 를 주기적으로 조회해 이상치 경보를 만듭니다.
+    """
+
+    def __init__(
+        self,
+        api: KiwoomAPI,
+        interval: Optional[float] = None,
+        sinks: Optional[Sequence[AlertSink]] = None,
+        market_type: str = "000",
+        exchange_type: str = KRX,
+        volume_cycle: str = "5",
+        volume_qty_type: str = "5",
+        concentration_rate: str = "50",
+        concentration_count: str = "3",
+        concentration_cycle: str = "50",
+        **detector_options: Any,
+    ) -> None:
+        self.api = api
+        self.interval: float = (
+            interval
+            if interval is not None
+            else getattr(settings, "KIWOOM_SPIKE_INTERVAL", 10.0)
+        )
+        self.market_type = market_type
+        self.exchange_type = exchange_type
+        self.volume_cycle = volume_cycle
+        self.volume_qty_type = volume_qty_type
+        self.concentration_rate = concentration_rate
+        self.concentration_count = concentration_count
+        self.concentration_cycle = concentration_cycle
+        self.alerts = MemoryAlertSink()
+        extra = (
+            list(sinks)
+            if sinks is not None
+            else load_alert_sinks(getattr(settings, "KIWOOM_SPIKE_ALERT_SINKS", ""))
+        )
+        self.detector = SpikeDetector(
+            FanoutAlertSink([self.alerts, *extra]), **detector_options
+        )
+        self.session: Optional[str] = None
+        self.polls = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def poll(self) -> Dict[str, int]:
+        """
+        두 TR 을 한 번씩 조회해 탐지기에 넘깁니다.
+
+        Returns:
+            Dict[str, int]: 지표별 조회 종목 수와 새 경보 수
+        """
+        session = now_kst().strftime("%Y%m%d")
+        if session != self.session:
+            # 지난 세션의 경보는 현재 세션 조회 결과에 섞이지 않도록 함께 지웁니다.
+            self.detector.reset()
+            self.alerts.clear()
+            self.session = session
+        try:
+            volume = decode_volume_update_ka10024(
+                self.api.trading_volume_update_request_ka10024(
+                    self.market_type,
+                    self.volume_cycle,
+                    self.volume_qty_type,
+                    self.exchange_type,
+                )
+            )
+            concentration = decode_concentration_ka10025(
+                self.api.supply_concentration_request_ka10025(
+                    self.market_type,
+                    self.concentration_rate,
+                    "0",
+                    self.concentration_count,
+                    self.concentration_cycle,
+                    self.exchange_type,
+                )
+            )
+        except Exception as e:
+            raise Exception(f"거래량갱신/매물대집중 조회 중 오류 발생: {str(e)}")
+        alerts = self.detector.observe_volume(*volume)
+        alerts += self.detector.observe_concentration(*concentration)
+        self.polls += 1
+        return {
+            "volume": len(volume[0]),
+            "concentration": len(concentration[0]),
+            "alerts": len(alerts),
+        }
+
+    def recent(self, limit: int = 50, metric: Optional[str] = None) -> Dict[str, Any]:
+        """
+        현재 세션의 최근 경보를 최신 순서로 반환합니다.
+        """
+        if metric is not None and metric not in SPIKE_METRICS:
+            raise ValueError(f"지표는 {', '.join(SPIKE_METRICS)} 중 하나여야 합니다.")
+        return {
+            "session": self.session,
+            "polls": self.polls,
+            "results": self.alerts.recent(limit, metric),
+        }
+
+    def ensure_running(self) -> None:
+        """
+        폴링 스레드가 없으면 시작합니다.
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="kiwoom-spike-monitor", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        # 주기 조회는 사용자 요청보다 급하지 않으므로 배치 우선순위로 보냅니다.
+        with request_priority(BATCH):
+            while not self._stop.is_set():
+                try:
+                    self.poll()
+                except Exception:
+                    logger.exception("거래량 급증/매물대 집중 폴링 중 오류 발생")
+                # 장이 닫혀 있으면 다음 세션 시작까지 기다립니다.
+                self._stop.wait(refresh_interval(self.interval, KRX))
+        with self._lock:
+            self._thread = None
+
+    def stop(self) -> None:
+        """
+        폴링 스레드를 멈춥니다.
+        """
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=5.0)
+
+
+_spike_monitor: ProcessLocal[SpikeMonitor] = ProcessLocal(
+    lambda: SpikeMonitor(get_stock_service().api), SpikeMonitor.stop
+)
+
+
+def get_spike_monitor() -> SpikeMonitor:
+    """
+    현재 워커 프로세스의 SpikeMonitor 를 반환합니다.
+    """
+    return _spike_monitor.get()
@@ -1,7 +1,9 @@
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, List
 
+from a_stocks._service.provider import ProcessLocal
 from a_stocks._utils.kiwoom_api import KiwoomAPI
+from a_stocks._utils.parsers import parse_number, parse_price
 
 
 class StockService:
@@ -28,9 +30,58 @@ class StockService:
         except Exception as e:
             raise Exception(f"주식 시세 조회 중 오류 발생: {str(e)}")
 
-    def __del__(self) -> None:
+    def get_watchlist_quotes(self, stock_codes: List[str]) -> List[Dict[str, Any]]:
         """
-        서비스 객체가 소멸될 때 클라이언트를 닫습니다.
+        여러 종목의 시세를 관심종목정보요청(ka10095) 한 번으로 가져옵니다.
+
+        Args:
+            stock_codes (List[str]): 종목코드 목록 (NXT 는 '_NX' 접미사)
+
+        Returns:
+            List[Dict[str, Any]]: StockPriceOut 형식의 시세 목록
+                (+ 최우선 매도호가 ask, 최우선 매수호가 bid)
+        """
+        if not stock_codes:
+            return []
+
+        try:
+            data = self.api.watchlist_stock_information_request_ka10095(
+                "|".join(stock_codes)
+            )
+        except Exception as e:
+            raise Exception(f"관심종목 시세 조회 중 오류 발생: {str(e)}")
+
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return [
+            {
+                "code": row.get("stk_cd"),
+                "name": row.get("stk_nm"),
+                "current_price": parse_price(row.get("cur_prc")),
+                "previous_close": parse_price(row.get("base_pric")),
+                "change": parse_number(row.get("pred_pre")),
+                "change_percent": parse_number(row.get("flu_rt")),
+                "volume": int(parse_number(row.get("trde_qty"))),
+                "ask": parse_price(row.get("sel_bid")),
+                "bid": parse_price(row.get("buy_bid")),
+                "timestamp": timestamp,
+            }
+            for row in data.get("atn_stk_infr", [])
+        ]
+
+    def close(self) -> None:
         """
-        if hasattr(self, "client"):
-            self.client.close()
+        서비스가 사용하는 API 클라이언트를 닫습니다.
+        """
+        self.api.close()
+
+
+_stock_service: ProcessLocal[StockService] = ProcessLocal(
+    StockService, StockService.close
+)
+
+
+def get_stock_service() -> StockService:
+    """
+    현재 워커 프로세스의 StockService 를 반환합니다. 최초 호출 시 생성됩니다.
+    """
+    return _stock_service.get()
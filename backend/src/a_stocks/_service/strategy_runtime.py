@@ -0,0 +1,439 @@
+"""
+이벤트 기반 전략 런타임
+
+전략은 (피드, 종목) 단위로 구독만 선언하고, 실제 폴링은 런타임의 스케줄러가
+담당합니다.
+
+- 피드마다 모든 전략의 구독 종목 합집합을 배치로 나눠 한 번씩만 조회합니다.
+  따라서 API 호출 수는 전략 수가 아니라 서로 다른 데이터 수요에 비례합니다.
+- 조회는 asyncio.to_thread 로 실행하며, 요청 속도는 KiwoomAPI 의 요청 제한기가
+  전체적으로 제한합니다. 동시에 진행하는 조회 수는 세마포어로 묶습니다.
+- 직전 응답과 비교해 바뀐 행만 이벤트로 만들고, 전략마다 별도 큐와 소비 태스크를
+  두므로 느린 전략이 다른 전략의 콜백을 지연시키지 않습니다.
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from django.conf import settings
+
+from a_stocks._service.program_monitor import ProgramFlowMonitor, get_program_monitor
+from a_stocks._service.provider import ProcessLocal
+from a_stocks._service.quote_stream import QUOTE_DIFF_FIELDS
+from a_stocks._service.stock_service import get_stock_service
+from a_stocks._service.vi_detector import ViDetector, get_vi_detector
+from a_stocks._utils.krx_calendar import now_kst
+
+logger = logging.getLogger(__name__)
+
+Row = Dict[str, Any]
+FeedFetcher = Callable[[Optional[List[str]]], List[Tuple[str, Row]]]
+
+# 시장 전체 피드에서 모든 종목을 구독할 때 쓰는 와일드카드
+ALL_CODES = "*"
+
+
+class MarketEvent:
+    """
+    전략에 전달되는 데이터 변경 이벤트입니다.
+    """
+
+    __slots__ = ("feed", "code", "data", "received_at")
+
+    def __init__(self, feed: str, code: str, data: Row, received_at: float) -> None:
+        self.feed = feed
+        self.code = code
+        self.data = data
+        # 응답 수신 시각 (time.monotonic). 콜백 지연 측정에 사용합니다.
+        self.received_at = received_at
+
+    def __repr__(self) -> str:
+        return f"MarketEvent({self.feed!r}, {self.code!r})"
+
+
+class Strategy(ABC):
+    """
+    전략의 기본 클래스입니다.
+
+    subscriptions 에 피드 이름별 구독 종목을 선언하고 on_event 를 구현합니다.
+    시장 전체 피드(vi, program)는 종목 대신 "*" 로 모든 종목을 구독할 수 있습니다.
+    """
+
+    name = "strategy"
+    subscriptions: Mapping[str, Iterable[str]] = {}
+
+    async def on_start(self) -> None:
+        pass
+
+    @abstractmethod
+    async def on_event(self, event: MarketEvent) -> None: ...
+
+    async def on_stop(self) -> None:
+        pass
+
+
+class Feed:
+    """
+    런타임이 폴링하는 데이터 소스 하나의 정의입니다.
+
+    fetch 는 종목 배치(시장 전체 피드는 None)를 받아 (종목코드, 행) 목록을
+    반환하는 동기 함수입니다. signature 가 같은 행은 변경되지 않은 것으로 봅니다.
+    """
+
+    __slots__ = ("name", "fetch", "interval", "batch_size", "market_wide", "signature")
+
+    def __init__(
+        self,
+        name: str,
+        fetch: FeedFetcher,
+        interval: float,
+        batch_size: Optional[int] = None,
+        market_wide: bool = False,
+        signature: Optional[Callable[[Row], Tuple[Any, ...]]] = None,
+    ) -> None:
+        self.name = name
+        self.fetch = fetch
+        self.interval = interval
+        self.batch_size = batch_size
+        self.market_wide = market_wide
+        self.signature = signature or (lambda row: tuple(sorted(row.items())))
+
+
+class _StrategySlot:
+    __slots__ = ("strategy", "queue", "task")
+
+    def __init__(self, strategy: Strategy) -> None:
+        self.strategy = strategy
+        self.queue: "asyncio.Queue[MarketEvent]" = asyncio.Queue()
+        self.task: Optional["asyncio.Task[None]"] = None
+
+
+class StrategyRuntime:
+    """
+    전략 구독을 모아 피드별로 폴링하고 변경 이벤트를 전략에 전달합니다.
+    """
+
+    def __init__(self, feeds: Iterable[Feed], max_concurrency: int = 4) -> None:
+        self.feeds: Dict[str, Feed] = {feed.name: feed for feed in feeds}
+        self.max_concurrency = max_concurrency
+        self._slots: Dict[Strategy, _StrategySlot] = {}
+        # 피드 -> 종목 -> 구독 전략
+        self._subscribers: Dict[str, Dict[str, Set[Strategy]]] = {
+            name: {} for name in self.feeds
+        }
+        self._last: Dict[str, Dict[str, Tuple[Any, ...]]] = {
+            name: {} for name in self.feeds
+        }
+        self._latest: Dict[str, Dict[str, MarketEvent]] = {
+            name: {} for name in self.feeds
+        }
+        self._next_due: Dict[str, float] = {}
+        self._inflight: Dict[str, "asyncio.Task[int]"] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._changed: Optional[asyncio.Event] = None
+        self._scheduler: Optional["asyncio.Task[None]"] = None
+
+    def _wake(self) -> None:
+        if self._changed is not None:
+            self._changed.set()
+
+    async def add_strategy(self, strategy: Strategy) -> None:
+        """
+        전략을 등록하고 선언된 구독을 반영합니다.
+        """
+        if strategy in self._slots:
+            return
+        slot = _StrategySlot(strategy)
+        self._slots[strategy] = slot
+        await strategy.on_start()
+        slot.task = asyncio.create_task(
+            self._consume(slot), name=f"strategy-{strategy.name}"
+        )
+        for feed, codes in strategy.subscriptions.items():
+            self.subscribe(strategy, feed, codes)
+
+    async def remove_strategy(self, strategy: Strategy) -> None:
+        """
+        전략의 구독을 모두 해제하고 소비 태스크를 정리합니다.
+        """
+        slot = self._slots.pop(strategy, None)
+        if slot is None:
+            return
+        for feed in self._subscribers:
+            self.unsubscribe(strategy, feed)
+        if slot.task is not None:
+            slot.task.cancel()
+            try:
+                await slot.task
+            except asyncio.CancelledError:
+                pass
+        await strategy.on_stop()
+
+    def subscribe(self, strategy: Strategy, feed: str, codes: Iterable[str]) -> None:
+        """
+        전략의 구독을 추가합니다. 이미 받은 최신 값이 있으면 새 구독 전략에만
+        즉시 전달합니다.
+        """
+        if feed not in self.feeds:
+            raise ValueError(f"알 수 없는 피드입니다: {feed}")
+        subscribers = self._subscribers[feed]
+        latest = self._latest[feed]
+        snapshot: Dict[str, MarketEvent] = {}
+        for code in codes:
+            if code == ALL_CODES and not self.feeds[feed].market_wide:
+                raise ValueError(f"{feed} 피드는 전체 종목 구독을 지원하지 않습니다.")
+            subscribers.setdefault(code, set()).add(strategy)
+            if code == ALL_CODES:
+                snapshot.update(latest)
+            elif code in latest:
+                snapshot[code] = latest[code]
+        slot = self._slots.get(strategy)
+        if slot is not None:
+            for event in snapshot.values():
+                slot.queue.put_nowait(event)
+        self._wake()
+
+    def unsubscribe(
+        self, strategy: Strategy, feed: str, codes: Optional[Iterable[str]] = None
+    ) -> None:
+        """
+        전략의 구독을 해제합니다. codes 가 없으면 피드의 모든 구독을 해제합니다.
+        """
+        subscribers = self._subscribers[feed]
+        targets = list(subscribers) if codes is None else list(codes)
+        for code in targets:
+            strategies = subscribers.get(code)
+            if strategies is None:
+                continue
+            strategies.discard(strategy)
+            if not strategies:
+                # 아무도 보지 않는 종목은 폴링 대상에서 제외합니다.
+                del subscribers[code]
+                self._last[feed].pop(code, None)
+                self._latest[feed].pop(code, None)
+        if ALL_CODES not in subscribers:
+            # 전체 구독이 사라지면 개별 구독이 없는 종목의 기록을 버립니다.
+            for store in (self._last[feed], self._latest[feed]):
+                for code in [code for code in store if code not in subscribers]:
+                    del store[code]
+        self._wake()
+
+    def demand(self, feed: str) -> List[str]:
+        """
+        피드에서 조회해야 할 종목 목록(모든 전략 구독의 합집합)을 반환합니다.
+        """
+        return sorted(self._subscribers[feed])
+
+    def _batches(self, feed: Feed) -> List[Optional[List[str]]]:
+        codes = self.demand(feed.name)
+        if not codes:
+            return []
+        if feed.market_wide:
+            # 시장 전체 TR 은 구독 종목 수와 관계없이 한 번만 조회합니다.
+            return [None]
+        size = feed.batch_size or len(codes)
+        return [codes[start : start + size] for start in range(0, len(codes), size)]
+
+    async def _fetch(
+        self, feed: Feed, batch: Optional[List[str]]
+    ) -> List[Tuple[str, Row]]:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            return await asyncio.to_thread(feed.fetch, batch)
+
+    async def poll_feed(self, name: str) -> int:
+        """
+        피드를 한 번 조회하고 바뀐 행을 구독 전략에 전달합니다.
+
+        Returns:
+            int: 전달한 이벤트 수
+        """
+        feed = self.feeds[name]
+        batches = self._batches(feed)
+        if not batches:
+            return 0
+        results = await asyncio.gather(
+            *(self._fetch(feed, batch) for batch in batches), return_exceptions=True
+        )
+        received_at = time.monotonic()
+
+        subscribers = self._subscribers[name]
+        wildcard = subscribers.get(ALL_CODES, set())
+        last = self._last[name]
+        latest = self._latest[name]
+        delivered = 0
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.error("%s 피드 조회 중 오류 발생: %s", name, result)
+                continue
+            for code, row in result:
+                targets = subscribers.get(code, set()) | wildcard
+                if not targets:
+                    continue
+                signature = feed.signature(row)
+                if last.get(code) == signature:
+                    continue
+                last[code] = signature
+                event = MarketEvent(name, code, row, received_at)
+                latest[code] = event
+                for strategy in targets:
+                    slot = self._slots.get(strategy)
+                    if slot is not None:
+                        slot.queue.put_nowait(event)
+                        delivered += 1
+        return delivered
+
+    async def _consume(self, slot: _StrategySlot) -> None:
+        while True:
+            event = await slot.queue.get()
+            try:
+                await slot.strategy.on_event(event)
+            except Exception:
+                logger.exception("%s 전략 이벤트 처리 중 오류 발생", slot.strategy.name)
+
+    def _poll_done(self, name: str, task: "asyncio.Task[int]") -> None:
+        self._inflight.pop(name, None)
+        self._wake()
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("%s 피드 폴링 중 오류 발생: %s", name, task.exception())
+
+    async def run(self) -> None:
+        """
+        구독이 있는 피드를 각자의 주기로 폴링하는 스케줄러 루프입니다.
+
+        이전 폴링이 아직 끝나지 않은 피드는 건너뛰어 요청이 쌓이지 않게 합니다.
+        """
+        self._changed = asyncio.Event()
+        while True:
+            now = time.monotonic()
+            timeout: Optional[float] = None
+            for name, feed in self.feeds.items():
+                if not self._subscribers[name]:
+                    self._next_due.pop(name, None)
+                    continue
+                if name in self._inflight:
+                    # 폴링이 끝나면 _poll_done 이 스케줄러를 깨웁니다.
+                    continue
+                due = self._next_due.setdefault(name, now)
+                if due <= now:
+                    task = asyncio.create_task(self.poll_feed(name))
+                    self._inflight[name] = task
+                    task.add_done_callback(functools.partial(self._poll_done, name))
+                    # 늦어진 만큼 몰아서 조회하지 않도록 현재 시각 기준으로 잡습니다.
+                    due = max(due + feed.interval, now)
+                    self._next_due[name] = due
+                wait = max(due - now, 0.0)
+                timeout = wait if timeout is None else min(timeout, wait)
+
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> "asyncio.Task[None]":
+        """
+        현재 이벤트 루프에서 스케줄러를 시작합니다.
+        """
+        if self._scheduler is None or self._scheduler.done():
+            self._scheduler = asyncio.create_task(self.run(), name="strategy-runtime")
+        return self._scheduler
+
+    async def stop(self) -> None:
+        """
+        스케줄러와 진행 중인 폴링을 멈추고 등록된 전략을 모두 정리합니다.
+        """
+        tasks: List["asyncio.Task[Any]"] = list(self._inflight.values())
+        if self._scheduler is not None:
+            tasks.append(self._scheduler)
+            self._scheduler = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for strategy in list(self._slots):
+            await self.remove_strategy(strategy)
+
+
+def _quote_fetcher(codes: Optional[List[str]]) -> List[Tuple[str, Row]]:
+    quotes = get_stock_service().get_watchlist_quotes(codes or [])
+    return [(quote["code"], quote) for quote in quotes if quote.get("code")]
+
+
+def _vi_fetcher(detector: ViDetector) -> FeedFetcher:
+    def fetch(codes: Optional[List[str]]) -> List[Tuple[str, Row]]:
+        return [(event.code, event.to_dict()) for event in detector.poll()]
+
+    return fetch
+
+
+def _program_fetcher(monitor: ProgramFlowMonitor) -> FeedFetcher:
+    def fetch(codes: Optional[List[str]]) -> List[Tuple[str, Row]]:
+        rows = monitor.fetch_status(now_kst().strftime("%Y%m%d"))
+        return [(row["stk_cd"], row) for row in rows if row.get("stk_cd")]
+
+    return fetch
+
+
+def _fields(names: Sequence[str]) -> Callable[[Row], Tuple[Any, ...]]:
+    return lambda row: tuple(row.get(name) for name in names)
+
+
+def default_feeds() -> List[Feed]:
+    """
+    시세(ka10095), VI 발동/해제(ka10054), 종목별 프로그램매매(ka90004) 피드를 만듭니다.
+    """
+    return [
+        Feed(
+            "quote",
+            _quote_fetcher,
+            interval=getattr(settings, "KIWOOM_STREAM_POLL_INTERVAL", 1.0),
+            batch_size=getattr(settings, "KIWOOM_STREAM_BATCH_SIZE", 100),
+            signature=_fields(QUOTE_DIFF_FIELDS),
+        ),
+        Feed(
+            "vi",
+            _vi_fetcher(get_vi_detector()),
+            interval=getattr(settings, "KIWOOM_RUNTIME_VI_INTERVAL", 2.0),
+            market_wide=True,
+            # ViDetector 가 발동/해제 시점에만 행을 내보냅니다.
+            signature=_fields(("kind", "count", "event_time")),
+        ),
+        Feed(
+            "program",
+            _program_fetcher(get_program_monitor()),
+            interval=getattr(settings, "KIWOOM_RUNTIME_PROGRAM_INTERVAL", 10.0),
+            market_wide=True,
+            signature=_fields(("buy_cntr_amt", "sel_cntr_amt", "netprps_prica")),
+        ),
+    ]
+
+
+_strategy_runtime: ProcessLocal[StrategyRuntime] = ProcessLocal(
+    lambda: StrategyRuntime(
+        default_feeds(),
+        max_concurrency=getattr(settings, "KIWOOM_RUNTIME_MAX_CONCURRENCY", 4),
+    )
+)
+
+
+def get_strategy_runtime() -> StrategyRuntime:
+    """
+    현재 워커 프로세스의 StrategyRuntime 을 반환합니다.
+    """
+    return _strategy_runtime.get()
@@ -0,0 +1,184 @@
+"""
+전 종목 기본정보 스냅샷 (ka10001 주식기본정보)
+
+- ka10001 은 종목마다 한 번씩 호출해야 하므로 스레드 풀로 동시에 조회합니다. 전체
+  요청 속도는 KiwoomAPI 의 요청 제한기가 제한하고, 풀에 넣어 두는 종목 수도 작업자
+  수의 두 배로 제한합니다. 요청은 배치 우선순위로 보내 대화형 요청을 늦추지 않습니다.
+- 작업 스레드는 응답을 바로 한 행짜리 컬럼으로 변환해 넘기고, 호출한 스레드는
+  batch_size 종목마다 시계열 저장소(FUNDAMENTALS_DATASET, 종목 x 스냅샷 일자)에 병합한 뒤
+  버립니다. 그래서 전 종목 응답을 메모리에 모아 두지 않습니다.
+- 진행 보고에는 달성한 초당 요청 수와 설정된 제한(KIWOOM_RATE_LIMIT) 대비 사용률이
+  들어 있습니다.
+"""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from django.conf import settings
+
+from a_stocks._service.backfill import BackfillProgress
+from a_stocks._service.history_service import get_history_store
+from a_stocks._utils.history_store import HistoryStore
+from a_stocks._utils.kiwoom_api import KiwoomAPI
+from a_stocks._utils.krx_calendar import now_kst
+from a_stocks._utils.rate_limiter import BATCH, request_priority
+from a_stocks._utils.tr_decoders import Columns, decode_basic_info_ka10001
+
+logger = logging.getLogger(__name__)
+
+FUNDAMENTALS_DATASET = "ka10001"
+
+
+class SnapshotProgress(BackfillProgress):
+    """
+    스냅샷 처리량과 요청 제한 대비 사용률을 계산합니다. (종목 하나 = 요청 하나)
+    """
+
+    def __init__(
+        self,
+        total: int,
+        rate_limit: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(total, clock)
+        self.rate_limit = rate_limit
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict[str, Any]: BackfillProgress.report 에 초당 요청 수(requests_per_sec),
+                요청 제한(rate_limit, 0 이하는 제한 없음), 제한 대비 사용률
+                (utilization, %, 제한이 없으면 None)을 더한 보고
+        """
+        report = super().report()
+        requests_per_sec = report["units_per_sec"]
+        report["requests_per_sec"] = requests_per_sec
+        report["rate_limit"] = self.rate_limit
+        report["utilization"] = (
+            round(requests_per_sec / self.rate_limit * 100.0, 1)
+            if self.rate_limit > 0
+            else None
+        )
+        return report
+
+
+class UniverseSnapshot:
+    """
+    전 종목 ka10001 기본정보를 동시에 조회해 저장소에 흘려 넣습니다.
+    """
+
+    def __init__(
+        self,
+        api: KiwoomAPI,
+        store: Optional[HistoryStore] = None,
+        max_workers: Optional[int] = None,
+        batch_size: int = 200,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.api = api
+        self.store = store if store is not None else get_history_store()
+        self.max_workers: int = (
+            max_workers
+            if max_workers is not None
+            else getattr(settings, "KIWOOM_COLLECT_MAX_WORKERS", 4)
+        )
+        self.batch_size = batch_size
+        self._clock = clock
+
+    def fetch(self, code: str, date: str) -> Columns:
+        """
+        한 종목의 기본정보를 배치 우선순위로 조회해 한 행짜리 컬럼으로 반환합니다.
+        """
+        with request_priority(BATCH):
+            response = self.api.basic_stock_information_request_ka10001(code)
+        return decode_basic_info_ka10001(response, date)
+
+    def run(
+        self,
+        codes: Iterable[str],
+        total: int,
+        date: Optional[str] = None,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        종목들의 기본정보를 조회해 date 일자 스냅샷으로 저장소에 병합합니다.
+
+        조회에 실패한 종목은 건너뛰고 보고의 failed_codes 에 담습니다.
+
+        Args:
+            codes (Iterable[str]): 종목코드 (제너레이터여도 필요한 만큼만 꺼냅니다)
+            total (int): 전체 종목 수 (진행률/남은 시간 계산용)
+            date (str, optional): 스냅샷 일자 YYYYMMDD (기본값: 오늘)
+            on_progress (Callable, optional): 병합할 때마다 진행 보고를 받는 함수
+
+        Returns:
+            Dict[str, Any]: 마지막 진행 보고 (SnapshotProgress.report + failed_codes)
+        """
+        date = date or now_kst().strftime("%Y%m%d")
+        progress = SnapshotProgress(
+            total, self.api.rate_limiter.rate, clock=self._clock
+        )
+        queue = iter(codes)
+        running: Dict[Future[Columns], str] = {}
+        buffered: Dict[str, Columns] = {}
+        failed: List[str] = []
+
+        def submit(executor: ThreadPoolExecutor) -> None:
+            for code in queue:
+                running[executor.submit(self.fetch, code, date)] = code
+                if len(running) >= self.max_workers * 2:
+                    return
+
+        def flush() -> None:
+            if buffered:
+                self.store.merge(FUNDAMENTALS_DATASET, buffered)
+                progress.record(len(buffered), rows=len(buffered))
+                buffered.clear()
+                if on_progress is not None:
+                    on_progress(progress.report())
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="universe-snapshot"
+        ) as executor:
+            submit(executor)
+            while running:
+                finished: Set[Future[Columns]]
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    code = running.pop(future)
+                    try:
+                        buffered[code] = future.result()
+                    except Exception:
+                        logger.exception("%s 주식기본정보 조회 중 오류 발생", code)
+                        failed.append(code)
+                        progress.record(0, failed=1)
+                if len(buffered) >= self.batch_size:
+                    flush()
+                submit(executor)
+        flush()
+        return {**progress.report(), "failed_codes": failed}
+
+    def latest(self, codes: Optional[Iterable[str]] = None) -> Tuple[int, Columns]:
+        """
+        저장소의 마지막 스냅샷 일자와 그 일자의 종목별 값을 반환합니다.
+
+        Returns:
+            Tuple[int, Columns]: (일자, "code"(종목코드) 와 지표 컬럼)
+        """
+        dates = self.store.dates(FUNDAMENTALS_DATASET)
+        if not dates.size:
+            raise ValueError("저장된 기본정보 스냅샷이 없습니다.")
+        date = int(dates[-1])
+        panel = self.store.load(
+            FUNDAMENTALS_DATASET,
+            codes=list(codes) if codes is not None else None,
+            start=date,
+            end=date,
+        )
+        return date, {
+            "code": np.array(panel.codes, dtype=object),
+            **{name: values[:, -1] for name, values in panel.fields.items()},
+        }
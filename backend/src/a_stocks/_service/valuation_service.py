@@ -0,0 +1,179 @@
+"""
+PER/PBR/ROE 밴드 밸류에이션 스크린 (ka10026 + ka10001)
+
+- 거래일마다 한 번 ka10026 의 모든 PER구분(저/고 PBR, PER, ROE)과 그 종목들의
+  ka10001 기본정보를 스레드 풀로 조회해 ValuationTable 로 만들어 둡니다. 전체 요청
+  속도는 KiwoomAPI 의 요청 제한기가 제한합니다.
+- 스크린 질의는 캐시된 테이블의 정렬 인덱스로만 답하므로 조건을 바꿔도 Kiwoom 을
+  다시 조회하지 않습니다.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+from a_stocks._service.provider import ProcessLocal
+from a_stocks._service.stock_service import get_stock_service
+from a_stocks._utils.columnar import ColumnTable
+from a_stocks._utils.kiwoom_api import KiwoomAPI
+from a_stocks._utils.krx_calendar import KRX, now_kst
+from a_stocks._utils.rate_limiter import BATCH, request_priority
+from a_stocks._utils.valuation import (
+    PER_TYPES,
+    Bounds,
+    ValuationTable,
+    fundamentals_table,
+    high_low_per_table,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ValuationService:
+    """
+    거래일 단위로 캐시한 밸류에이션 테이블 위에서 범위 조건 스크린을 수행합니다.
+    """
+
+    def __init__(
+        self,
+        api: KiwoomAPI,
+        exchange_type: str = KRX,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        self.api = api
+        self.exchange_type = exchange_type
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers
+            or getattr(settings, "KIWOOM_COLLECT_MAX_WORKERS", 4),
+            thread_name_prefix="valuation",
+        )
+        self._lock = threading.Lock()
+        self._table: Optional[ValuationTable] = None
+        self.failed: List[str] = []
+
+    def _high_low_tables(self) -> List[ColumnTable]:
+        def fetch(per_type: str) -> Dict[str, Any]:
+            try:
+                return self.api.high_low_per_request_ka10026(
+                    per_type, self.exchange_type
+                )
+            except Exception as e:
+                raise Exception(f"고저PER({per_type}) 조회 중 오류 발생: {str(e)}")
+
+        per_types = [per_type for pair in PER_TYPES.values() for per_type in pair]
+        responses = list(self._executor.map(fetch, per_types))
+        return [
+            high_low_per_table(metric, responses[2 * k : 2 * k + 2])
+            for k, metric in enumerate(PER_TYPES)
+        ]
+
+    def _fundamentals(self, codes: Sequence[str]) -> Tuple[ColumnTable, List[str]]:
+        def fetch(code: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+            # 종목 수만큼 호출하므로 스크린 요청보다 뒤로 보냅니다.
+            try:
+                with request_priority(BATCH):
+                    return code, self.api.basic_stock_information_request_ka10001(code)
+            except Exception:
+                logger.exception("%s 주식기본정보 조회 중 오류 발생", code)
+                return code, None
+
+        responses: List[Dict[str, Any]] = []
+        failed: List[str] = []
+        for code, response in self._executor.map(fetch, codes):
+            if response is None:
+                failed.append(code)
+            else:
+                responses.append({**response, "stk_cd": code})
+        return fundamentals_table(responses), failed
+
+    def _build(self, codes: Optional[Sequence[str]]) -> ValuationTable:
+        # self._lock 을 잡은 채로 호출합니다.
+        ranked = ColumnTable.outer_join(self._high_low_tables())
+        targets = list(codes) if codes is not None else [str(c) for c in ranked.codes]
+        fundamentals, failed = self._fundamentals(targets)
+        # ka10026 값을 우선하고 비어 있는 지표만 ka10001 값으로 채웁니다.
+        table = ValuationTable(
+            ColumnTable.outer_join([ranked, fundamentals]),
+            now_kst().strftime("%Y%m%d"),
+        )
+        self._table, self.failed = table, failed
+        return table
+
+    def refresh(self, codes: Optional[Sequence[str]] = None) -> ValuationTable:
+        """
+        ka10026 전 구분과 기본정보(ka10001)를 조회해 테이블을 새로 만듭니다.
+
+        Args:
+            codes (Sequence[str], optional): 기본정보를 조회할 종목.
+                기본값은 ka10026 목록에 나온 모든 종목입니다.
+        """
+        with self._lock:
+            return self._build(codes)
+
+    def table(self) -> ValuationTable:
+        """
+        오늘(KST) 만든 테이블을 반환합니다. 없거나 지난 거래일 것이면 새로 만듭니다.
+
+        보통은 장 시작 전 워밍업이 미리 만들어 두므로 요청에서 조회하지 않습니다.
+        """
+        table = self._table
+        if table is not None and table.date == now_kst().strftime("%Y%m%d"):
+            return table
+        with self._lock:
+            # 락을 기다리는 동안 다른 요청이 이미 만들었으면 그 테이블을 씁니다.
+            table = self._table
+            if table is not None and table.date == now_kst().strftime("%Y%m%d"):
+                return table
+            return self._build(None)
+
+    def screen(
+        self,
+        ranges: Mapping[str, Bounds],
+        sort: Optional[str] = None,
+        ascending: bool = True,
+        limit: int = 50,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        범위 조건을 모두 만족하는 종목을 sort 컬럼 순서로 반환합니다.
+
+        Args:
+            ranges (Mapping[str, Bounds]): 컬럼 -> (하한, 상한), 경계 포함, None 은 제한 없음
+            sort (str, optional): 정렬 컬럼. 없으면 종목코드 id 순서입니다.
+            ascending (bool): 오름차순 여부
+            limit (int): 최대 반환 종목 수
+            columns (Sequence[str], optional): 결과에 담을 컬럼 (기본값: 전체 숫자 컬럼)
+        """
+        table = self.table()
+        try:
+            count, positions = table.query(ranges, sort, ascending, limit)
+        except KeyError as e:
+            raise ValueError(str(e.args[0]))
+        unknown = [name for name in columns or () if name not in table.indexes]
+        if unknown:
+            raise ValueError(f"알 수 없는 컬럼입니다: {', '.join(unknown)}")
+        return {
+            "date": table.date,
+            "total": len(table),
+            "count": count,
+            "failed": self.failed,
+            "results": table.rows(positions, columns or None),
+        }
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+_valuation_service: ProcessLocal[ValuationService] = ProcessLocal(
+    lambda: ValuationService(get_stock_service().api), ValuationService.close
+)
+
+
+def get_valuation_service() -> ValuationService:
+    """
+    현재 워커 프로세스의 ValuationService 를 반환합니다. (일별 테이블을 요청 간 공유)
+    """
+    return _valuation_service.get()
@@ -0,0 +1,281 @@
+"""
+변동성완화장치(VI) 발동/해제 이벤트 감지기
+
+ka10054 는 현재 VI 가 걸려 있는 종목 목록(motn_stk)만 돌려주므로, 연속된 스냅샷을
+비교해 변화를 이벤트로 만듭니다.
+
+- 스냅샷 전체가 직전과 같으면 (리스트 비교 한 번) 바로 반환합니다.
+- 다르면 (종목코드, 발동횟수, 체결처리시각) 키 집합의 차집합으로 새 발동을,
+  종목코드 집합의 차집합으로 해제를 찾습니다. 해시 집합 연산이므로 행 단위
+  비교 루프를 돌지 않습니다.
+- 이벤트는 numpy 구조체 배열에 고정 폭 레코드로 쌓아 메모리를 적게 씁니다.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from a_stocks._service.provider import ProcessLocal
+from a_stocks._service.stock_service import get_stock_service
+
+Row = Dict[str, Any]
+TriggerKey = Tuple[str, str, str]
+
+TRIGGER = "trigger"
+RELEASE = "release"
+_KINDS = (TRIGGER, RELEASE)
+
+EVENT_DTYPE = np.dtype(
+    [
+        ("kind", "i1"),
+        ("code", "S12"),
+        ("count", "i4"),
+        # 발동은 체결처리시각, 해제는 VI 해제시각 (HHMMSS)
+        ("event_time", "i4"),
+        ("observed_at", "f8"),
+    ]
+)
+
+
+def _to_int(value: Any) -> int:
+    try:
+        return int(str(value or "0").strip() or 0)
+    except ValueError:
+        return 0
+
+
+class ViEvent:
+    """
+    VI 발동 또는 해제 이벤트 하나입니다.
+    """
+
+    __slots__ = ("kind", "code", "count", "event_time", "observed_at", "data")
+
+    def __init__(
+        self,
+        kind: str,
+        code: str,
+        count: int,
+        event_time: int,
+        observed_at: float,
+        data: Optional[Row] = None,
+    ) -> None:
+        self.kind = kind
+        self.code = code
+        self.count = count
+        self.event_time = event_time
+        self.observed_at = observed_at
+        # 이벤트를 만든 ka10054 원본 행 (로그에서 복원한 이벤트에는 없음)
+        self.data = data
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "code": self.code,
+            "count": self.count,
+            "event_time": self.event_time,
+            "observed_at": self.observed_at,
+            "data": self.data,
+        }
+
+    def __repr__(self) -> str:
+        return f"ViEvent({self.kind!r}, {self.code!r}, count={self.count})"
+
+
+class ViEventLog:
+    """
+    VI 이벤트를 구조체 배열에 기록합니다. 용량을 넘으면 오래된 이벤트부터 버립니다.
+    """
+
+    def __init__(self, capacity: int = 100_000) -> None:
+        self.capacity = capacity
+        self._records = np.empty(min(capacity, 1024), dtype=EVENT_DTYPE)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, events: List[ViEvent]) -> None:
+        if not events:
+            return
+        batch = np.array(
+            [
+                (
+                    _KINDS.index(event.kind),
+                    event.code.encode(),
+                    event.count,
+                    event.event_time,
+                    event.observed_at,
+                )
+                for event in events
+            ],
+            dtype=EVENT_DTYPE,
+        )[-self.capacity :]
+        with self._lock:
+            # 용량을 넘으면 가장 오래된 레코드를 버리고 남길 레코드(keep)만 앞으로 옮깁니다.
+            keep = min(self._size, self.capacity - len(batch))
+            start = self._size - keep
+            needed = keep + len(batch)
+            if needed > len(self._records):
+                # 아직 용량까지 늘리지 않았으면 남길 레코드만 새 배열로 옮깁니다.
+                grown = np.empty(
+                    min(self.capacity, max(needed, 2 * len(self._records))),
+                    dtype=EVENT_DTYPE,
+                )
+                grown[:keep] = self._records[start : self._size]
+                self._records = grown
+            elif start:
+                self._records[:keep] = self._records[start : self._size]
+            self._records[keep:needed] = batch
+            self._size = needed
+
+    def records(
+        self,
+        since: Optional[float] = None,
+        code: Optional[str] = None,
+        kind: Optional[str] = None,
+    ) -> np.ndarray:
+        """
+        조건에 맞는 레코드를 구조체 배열로 반환합니다. (복사본)
+        """
+        with self._lock:
+            records = self._records[: self._size].copy()
+        mask = np.ones(len(records), dtype=np.bool_)
+        if since is not None:
+            mask &= records["observed_at"] >= since
+        if code is not None:
+            mask &= records["code"] == code.encode()
+        if kind is not None:
+            mask &= records["kind"] == _KINDS.index(kind)
+        return records[mask]
+
+    def events(
+        self,
+        since: Optional[float] = None,
+        code: Optional[str] = None,
+        kind: Optional[str] = None,
+    ) -> List[ViEvent]:
+        return [
+            ViEvent(
+                _KINDS[int(record["kind"])],
+                record["code"].decode(),
+                int(record["count"]),
+                int(record["event_time"]),
+                float(record["observed_at"]),
+            )
+            for record in self.records(since, code, kind)
+        ]
+
+
+class ViDetector:
+    """
+    ka10054 스냅샷을 비교해 VI 발동/해제 이벤트를 만듭니다.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], List[Row]],
+        log: Optional[ViEventLog] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._fetch = fetch
+        self.log = log if log is not None else ViEventLog()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._rows: List[Row] = []
+        self._keys: Set[TriggerKey] = set()
+        self._active: Dict[str, Row] = {}
+
+    @staticmethod
+    def _key(row: Row) -> TriggerKey:
+        return (
+            str(row.get("stk_cd", "")),
+            str(row.get("vimotn_cnt", "")),
+            str(row.get("trde_cntr_proc_time", "")),
+        )
+
+    def update(
+        self, rows: List[Row], observed_at: Optional[float] = None
+    ) -> List[ViEvent]:
+        """
+        새 스냅샷을 반영하고 발생한 이벤트를 반환합니다.
+
+        해제 이벤트가 같은 스냅샷의 발동 이벤트보다 먼저 옵니다.
+        """
+        with self._lock:
+            if rows == self._rows:
+                return []
+            observed = self._clock() if observed_at is None else observed_at
+            active = {row["stk_cd"]: row for row in rows if row.get("stk_cd")}
+            keys = {self._key(row) for row in active.values()}
+
+            events: List[ViEvent] = []
+            for code in self._active.keys() - active.keys():
+                row = self._active[code]
+                events.append(
+                    ViEvent(
+                        RELEASE,
+                        code,
+                        _to_int(row.get("vimotn_cnt")),
+                        _to_int(row.get("virelis_time")),
+                        observed,
+                        row,
+                    )
+                )
+            for code, count, proc_time in keys - self._keys:
+                events.append(
+                    ViEvent(
+                        TRIGGER,
+                        code,
+                        _to_int(count),
+                        _to_int(proc_time),
+                        observed,
+                        active[code],
+                    )
+                )
+
+            self._rows = rows
+            self._keys = keys
+            self._active = active
+        events.sort(key=lambda event: (event.kind != RELEASE, event.code))
+        self.log.append(events)
+        return events
+
+    def poll(self) -> List[ViEvent]:
+        """
+        ka10054 를 한 번 조회하고 이벤트를 반환합니다.
+        """
+        try:
+            rows = self._fetch()
+        except Exception as e:
+            raise Exception(f"VI 발동 종목 조회 중 오류 발생: {str(e)}")
+        return self.update(rows)
+
+    def active(self) -> Dict[str, Row]:
+        """
+        현재 VI 가 걸려 있는 종목의 마지막 행을 반환합니다.
+        """
+        with self._lock:
+            return dict(self._active)
+
+
+def _create_vi_detector() -> ViDetector:
+    api = get_stock_service().api
+    return ViDetector(
+        lambda: api.volatility_mitigation_device_triggered_stocks_request_ka10054(
+            "000", "0"
+        ).get("motn_stk", [])
+    )
+
+
+_vi_detector: ProcessLocal[ViDetector] = ProcessLocal(_create_vi_detector)
+
+
+def get_vi_detector() -> ViDetector:
+    """
+    현재 워커 프로세스의 ViDetector 를 반환합니다.
+    """
+    return _vi_detector.get()
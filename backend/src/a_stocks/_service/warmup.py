@@ -0,0 +1,175 @@
+"""
+장 시작 전 워밍업 스케줄러
+
+거래일마다 정해진 시각(KIWOOM_WARMUP_TIME, KST)에 다음을 미리 해 둡니다.
+
+- 접근 토큰 발급 (au10001)
+- 종목/업종/회원사 마스터 데이터 조회와 스냅샷 저장 (ka10099/ka10101/ka10102)
+- 설정된 관심종목(KIWOOM_WARMUP_WATCHLIST) 시세를 ka10095 배치로 받아 시세 캐시 채우기
+- PER/PBR/ROE 밸류에이션 테이블 만들기 (ka10026/ka10001)
+
+토큰은 프로세스 메모리에 있으므로 서버 워커마다 ASGI lifespan 이 worker_scheduler()
+의 run_forever() 를 asyncio 태스크로 띄워 토큰, 시세 캐시, 밸류에이션 테이블을
+채웁니다.
+(KIWOOM_WARMUP_IN_WORKERS) 마스터 데이터 스냅샷은 파일이라 모든 프로세스가
+공유하므로 `manage.py kiwoom_warmup` 으로 한 번 실행하거나(--loop 면 계속) 처음
+조회하는 워커가 받습니다. 별도 프로세스인 명령은 토큰을 발급하지 않고, 시세 캐시가
+공유 백엔드일 때만 시세를 채우며 밸류에이션 테이블은 만들지 않습니다.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from datetime import time as dtime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+from a_stocks._service.master_data import get_master_data
+from a_stocks._service.price_cache import seed_price_cache
+from a_stocks._service.stock_service import get_stock_service
+from a_stocks._service.valuation_service import get_valuation_service
+from a_stocks._utils.krx_calendar import next_occurrence, now_kst, parse_clock
+
+logger = logging.getLogger(__name__)
+
+WarmupStep = Tuple[str, Callable[[], Any]]
+
+
+def warmup_codes() -> List[str]:
+    """
+    설정된 워밍업 관심종목 코드
+    """
+    value = getattr(settings, "KIWOOM_WARMUP_WATCHLIST", "")
+    return [code.strip() for code in value.split(",") if code.strip()]
+
+
+def warm_quotes(codes: Sequence[str], batch_size: Optional[int] = None) -> int:
+    """
+    관심종목 시세를 ka10095 배치로 받아 시세 캐시를 채웁니다.
+    """
+    size: int = (
+        batch_size
+        if batch_size is not None
+        else getattr(settings, "KIWOOM_STREAM_BATCH_SIZE", 100)
+    )
+    service = get_stock_service()
+    count = 0
+    for start in range(0, len(codes), size):
+        count += seed_price_cache(
+            service.get_watchlist_quotes(list(codes[start : start + size]))
+        )
+    return count
+
+
+def default_warmup_steps(
+    codes: Optional[Sequence[str]] = None,
+    master: bool = True,
+    token: bool = True,
+    quotes: bool = True,
+    valuation: bool = True,
+) -> List[WarmupStep]:
+    """
+    토큰 → 마스터 데이터 → 관심종목 시세 → 밸류에이션 순서의 기본 워밍업 단계
+
+    토큰, 시세 캐시(프로세스 내 백엔드), 밸류에이션 테이블은 실행한 프로세스에만
+    남으므로 다른 프로세스에서 실행할 때는 token/quotes/valuation 을 끕니다.
+    """
+    codes = list(codes) if codes is not None else warmup_codes()
+    steps: List[WarmupStep] = []
+    if token:
+        steps.append(
+            ("token", lambda: bool(get_stock_service().api._get_access_token()))
+        )
+    if master:
+        steps.append(("master", lambda: get_master_data().refresh()))
+    if quotes and codes:
+        steps.append(("quotes", lambda: warm_quotes(codes)))
+    if valuation:
+        steps.append(("valuation", lambda: len(get_valuation_service().table())))
+    return steps
+
+
+class WarmupScheduler:
+    """
+    워밍업 단계를 순서대로 실행하고, 거래일마다 정해진 시각에 반복합니다.
+    """
+
+    def __init__(
+        self,
+        steps: Sequence[WarmupStep],
+        at: Optional[dtime] = None,
+        clock: Callable[[], datetime] = now_kst,
+    ) -> None:
+        self.steps = list(steps)
+        self.at = (
+            at
+            if at is not None
+            else parse_clock(getattr(settings, "KIWOOM_WARMUP_TIME", "08:30"))
+        )
+        self._clock = clock
+        self.last_report: Optional[Dict[str, Any]] = None
+
+    def run_once(self) -> Dict[str, Any]:
+        """
+        모든 단계를 실행합니다. 한 단계가 실패해도 나머지 단계는 계속 실행합니다.
+
+        Returns:
+            Dict[str, Any]: 단계별 성공 여부, 결과, 소요 시간(초)
+        """
+        started = time.perf_counter()
+        results = []
+        for name, step in self.steps:
+            step_started = time.perf_counter()
+            try:
+                result = {"name": name, "ok": True, "result": step()}
+            except Exception as e:
+                logger.exception("워밍업 단계(%s) 실행 중 오류 발생", name)
+                result = {"name": name, "ok": False, "error": str(e)}
+            result["elapsed"] = round(time.perf_counter() - step_started, 4)
+            results.append(result)
+        self.last_report = {
+            "started_at": self._clock().isoformat(),
+            "ok": all(result["ok"] for result in results),
+            "elapsed": round(time.perf_counter() - started, 4),
+            "steps": results,
+        }
+        return self.last_report
+
+    def next_run(self, now: Optional[datetime] = None) -> datetime:
+        """
+        다음 워밍업 시각 (다음 거래일의 at)
+        """
+        return next_occurrence(self.at, now or self._clock())
+
+    async def run_forever(self, stop: Optional[asyncio.Event] = None) -> None:
+        """
+        stop 이 설정될 때까지 거래일마다 워밍업을 실행합니다.
+        """
+        stop = stop or asyncio.Event()
+        target: Optional[datetime] = None
+        while not stop.is_set():
+            now = self._clock()
+            # 타이머가 조금 일찍 깨어나도 같은 시각을 두 번 실행하지 않습니다.
+            target = self.next_run(max(now, target) if target else now)
+            delay = (target - now).total_seconds()
+            logger.info("다음 워밍업: %.0f초 후", delay)
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=max(delay, 0.0))
+                return
+            except asyncio.TimeoutError:
+                pass
+            await asyncio.to_thread(self.run_once)
+
+
+def worker_scheduler() -> Optional[WarmupScheduler]:
+    """
+    서버 워커에서 띄울 워밍업 스케줄러 (토큰, 관심종목 시세, 밸류에이션 테이블)
+
+    Returns:
+        Optional[WarmupScheduler]: KIWOOM_WARMUP_IN_WORKERS 가 꺼져 있으면 None
+    """
+    if not getattr(settings, "KIWOOM_WARMUP_IN_WORKERS", True):
+        return None
+    return WarmupScheduler(default_warmup_steps(master=False))
@@ -0,0 +1,307 @@
+"""
+일봉 패널(종목 x 일자) 기반 백테스트 엔진
+
+시그널 함수는 필드 패널 전체를 받아 종목 x 일자 목표 비중(또는 불리언 보유 여부)을
+한 번에 계산합니다. 체결 시뮬레이션은 일자 순으로 진행하되 각 일자의 계산은 전
+종목에 대해 벡터 연산으로 처리하므로 10년 x 2,500종목도 수 초 안에 끝납니다.
+
+- 시그널은 t 일 종가까지의 정보로 계산되고, lag 일 뒤 종가에 체결됩니다. (기본 1일)
+- 거래정지 등으로 종가가 없는 날은 체결하지 않고 다음 거래일에 다시 시도합니다.
+- 비용: 매수/매도 수수료, 매도 시 증권거래세, 슬리피지(체결가 불리 비율)
+"""
+
+from typing import Any, Callable, Dict, Mapping, Optional, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from a_stocks._utils.history_store import HistoryStore
+from a_stocks._utils.indicators import sma
+
+FloatArray = npt.NDArray[np.float64]
+Signal = Callable[[Mapping[str, FloatArray]], npt.NDArray[Any]]
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+class CostModel:
+    """
+    거래 비용 모델입니다. 모든 값은 거래대금 대비 비율입니다.
+
+    Args:
+        commission (float): 매수/매도 각각의 위탁수수료
+        tax (float): 매도 시 증권거래세 (2026년 기준 코스피/코스닥 0.20%)
+        slippage (float): 체결가가 종가보다 불리하게 형성되는 비율
+    """
+
+    __slots__ = ("commission", "tax", "slippage")
+
+    def __init__(
+        self, commission: float = 0.00015, tax: float = 0.002, slippage: float = 0.0005
+    ) -> None:
+        self.commission = commission
+        self.tax = tax
+        self.slippage = slippage
+
+    @property
+    def buy_rate(self) -> float:
+        return self.commission + self.slippage
+
+    @property
+    def sell_rate(self) -> float:
+        return self.commission + self.tax + self.slippage
+
+
+class BacktestResult:
+    """
+    백테스트 결과 (일자별 자산, 수익률, 회전율, 비용과 요약 통계)
+    """
+
+    __slots__ = ("dates", "equity", "returns", "turnover", "costs", "weights", "stats")
+
+    def __init__(
+        self,
+        dates: npt.NDArray[Any],
+        equity: FloatArray,
+        returns: FloatArray,
+        turnover: FloatArray,
+        costs: FloatArray,
+        weights: FloatArray,
+        stats: Dict[str, float],
+    ) -> None:
+        self.dates = dates
+        self.equity = equity
+        self.returns = returns
+        self.turnover = turnover
+        self.costs = costs
+        self.weights = weights
+        self.stats = stats
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "stats": self.stats,
+            "equity": [
+                {"date": str(date), "equity": round(float(value), 2)}
+                for date, value in zip(self.dates, self.equity)
+            ],
+        }
+
+
+def to_weights(signal: npt.NDArray[Any]) -> FloatArray:
+    """
+    시그널을 목표 비중으로 변환합니다.
+
+    불리언 시그널은 일자별로 True 인 종목에 동일 비중을 배분합니다.
+    숫자 시그널은 그대로 비중으로 쓰되, 일자별 총비중이 1 을 넘으면 1 로 축소합니다.
+    """
+    if signal.dtype == np.bool_:
+        held = signal.astype(np.float64)
+        counts = held.sum(axis=0, keepdims=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(counts > 0, held / counts, 0.0)
+
+    weights = np.nan_to_num(np.asarray(signal, dtype=np.float64), nan=0.0)
+    gross = np.abs(weights).sum(axis=0, keepdims=True)
+    scaled: FloatArray = np.where(
+        gross > 1.0, weights / np.maximum(gross, 1.0), weights
+    )
+    return scaled
+
+
+def forward_fill(values: FloatArray) -> FloatArray:
+    """
+    일자 축(axis=1)으로 직전 유효값을 채웁니다. 첫 유효값 이전은 NaN 으로 남습니다.
+    """
+    valid = ~np.isnan(values)
+    index = np.where(valid, np.arange(values.shape[1]), 0)
+    np.maximum.accumulate(index, axis=1, out=index)
+    filled: FloatArray = np.take_along_axis(values, index, axis=1)
+    return filled
+
+
+def compute_stats(
+    equity: FloatArray,
+    returns: FloatArray,
+    turnover: FloatArray,
+    costs: FloatArray,
+    weights: FloatArray,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR,
+) -> Dict[str, float]:
+    """
+    자산 곡선의 요약 통계를 계산합니다.
+    """
+    periods = max(equity.size - 1, 1)
+    total_return = float(equity[-1] / equity[0] - 1) if equity.size else 0.0
+    years = periods / periods_per_year
+    cagr = float((1 + total_return) ** (1 / years) - 1) if total_return > -1 else -1.0
+    daily = returns[1:]
+    volatility = float(np.std(daily) * np.sqrt(periods_per_year)) if daily.size else 0.0
+    sharpe = (
+        float(np.mean(daily) / np.std(daily) * np.sqrt(periods_per_year))
+        if daily.size and np.std(daily) > 0
+        else 0.0
+    )
+    running_max = np.maximum.accumulate(equity)
+    max_drawdown = float(np.min(equity / running_max - 1)) if equity.size else 0.0
+    return {
+        "total_return": total_return,
+        "cagr": cagr,
+        "volatility": volatility,
+        "sharpe": sharpe,
+        "max_drawdown": max_drawdown,
+        "annual_turnover": float(turnover.sum() / years),
+        "total_costs": float(costs.sum()),
+        "exposure": float(np.abs(weights).sum(axis=0).mean()) if weights.size else 0.0,
+    }
+
+
+def run_backtest(
+    fields: Mapping[str, FloatArray],
+    signal: Union[Signal, npt.NDArray[Any]],
+    dates: Optional[npt.NDArray[Any]] = None,
+    initial_capital: float = 100_000_000,
+    costs: Optional[CostModel] = None,
+    price_field: str = "close_pric",
+    lag: int = 1,
+    rebalance: str = "signal",
+) -> BacktestResult:
+    """
+    백테스트를 실행합니다.
+
+    Args:
+        fields (Mapping[str, FloatArray]): 필드명 -> (종목 수, 일자 수) 배열
+        signal (Signal | ndarray): 시그널 함수 또는 미리 계산한 (종목 수, 일자 수) 시그널
+        dates (ndarray, optional): 일자 축 라벨
+        initial_capital (float): 초기 자본 (원)
+        costs (CostModel, optional): 거래 비용 모델
+        price_field (str): 체결 가격 필드
+        lag (int): 시그널 계산일부터 체결일까지의 일수 (0 이면 당일 종가 체결)
+        rebalance (str): "signal" 이면 목표 비중이 바뀐 종목만 거래하고,
+            "daily" 이면 매일 목표 비중으로 재조정합니다.
+
+    Returns:
+        BacktestResult: 백테스트 결과
+    """
+    if rebalance not in ("signal", "daily"):
+        raise ValueError(f"지원하지 않는 리밸런싱 방식입니다: {rebalance}")
+    costs = costs or CostModel()
+    close = np.asarray(fields[price_field], dtype=np.float64)
+    n_symbols, n_days = close.shape
+
+    raw = signal(fields) if callable(signal) else signal
+    if raw.shape != close.shape:
+        raise ValueError(
+            f"시그널 크기 {raw.shape} 가 가격 크기 {close.shape} 와 다릅니다."
+        )
+    weights = to_weights(raw)
+    target = np.zeros_like(weights)
+    target[:, lag:] = weights[:, : n_days - lag]
+
+    filled = forward_fill(close)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = np.ones_like(filled)
+        growth[:, 1:] = filled[:, 1:] / filled[:, :-1]
+    growth[~np.isfinite(growth)] = 1.0
+    # 일자별로 한 행씩 읽으므로 (일자, 종목) 연속 배열로 바꿔 둡니다.
+    growth_by_day = np.ascontiguousarray(growth.T)
+    target_by_day = np.ascontiguousarray(target.T)
+    tradeable_by_day = np.ascontiguousarray(~np.isnan(close).T)
+
+    holdings = np.zeros(n_symbols)
+    cash = float(initial_capital)
+    pending = np.zeros(n_symbols, dtype=np.bool_)
+    previous = np.zeros(n_symbols)
+
+    equity = np.empty(n_days)
+    turnover = np.zeros(n_days)
+    paid = np.zeros(n_days)
+
+    for t in range(n_days):
+        holdings *= growth_by_day[t]
+        value = cash + holdings.sum()
+
+        goal = target_by_day[t]
+        if rebalance == "daily":
+            pending[:] = True
+        else:
+            pending |= goal != previous
+        previous = goal
+
+        can_trade = pending & tradeable_by_day[t]
+        if can_trade.any():
+            trade = np.where(can_trade, goal * value - holdings, 0.0)
+            bought = trade[trade > 0].sum()
+            sold = -trade[trade < 0].sum()
+            cost = bought * costs.buy_rate + sold * costs.sell_rate
+            holdings += trade
+            cash -= trade.sum() + cost
+            pending &= ~can_trade
+            turnover[t] = (bought + sold) / value if value > 0 else 0.0
+            paid[t] = cost
+
+        equity[t] = cash + holdings.sum()
+
+    returns = np.zeros(n_days)
+    returns[1:] = equity[1:] / equity[:-1] - 1
+    labels = dates if dates is not None else np.arange(n_days)
+    return BacktestResult(
+        labels,
+        equity,
+        returns,
+        turnover,
+        paid,
+        target,
+        compute_stats(equity, returns, turnover, paid, target),
+    )
+
+
+def run_backtest_from_store(
+    store: HistoryStore,
+    signal: Signal,
+    dataset: str = "ka10015",
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    **kwargs: Any,
+) -> BacktestResult:
+    """
+    로컬 시계열 저장소의 패널(memmap)로 백테스트를 실행합니다.
+    """
+    panel = store.load(dataset, start=start, end=end)
+    return run_backtest(panel.fields, signal, dates=panel.dates, **kwargs)
+
+
+def sma_crossover(fast: int = 20, slow: int = 60, field: str = "close_pric") -> Signal:
+    """
+    단기 이동평균이 장기 이동평균 위에 있는 종목을 동일 비중으로 보유하는 시그널
+    """
+
+    def signal(fields: Mapping[str, FloatArray]) -> npt.NDArray[Any]:
+        close = np.asarray(fields[field], dtype=np.float64)
+        with np.errstate(invalid="ignore"):
+            held: npt.NDArray[Any] = sma(close, fast) > sma(close, slow)
+        return held
+
+    return signal
+
+
+def momentum_top_n(
+    lookback: int = 120, top_n: int = 20, field: str = "close_pric"
+) -> Signal:
+    """
+    lookback 일 수익률 상위 top_n 종목을 동일 비중으로 보유하는 시그널
+    """
+
+    def signal(fields: Mapping[str, FloatArray]) -> npt.NDArray[Any]:
+        close = forward_fill(np.asarray(fields[field], dtype=np.float64))
+        momentum = np.full_like(close, np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            momentum[:, lookback:] = close[:, lookback:] / close[:, :-lookback] - 1
+        # NaN 은 순위에서 제외되도록 -inf 로 바꾼 뒤 일자별 상위 종목을 고릅니다.
+        scores = np.where(np.isnan(momentum), -np.inf, momentum)
+        order = np.argsort(-scores, axis=0, kind="stable")[:top_n]
+        held = np.zeros(close.shape, dtype=np.bool_)
+        np.put_along_axis(held, order, True, axis=0)
+        held &= np.isfinite(scores)
+        return held
+
+    return signal
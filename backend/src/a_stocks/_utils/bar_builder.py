@@ -0,0 +1,242 @@
+"""
+체결 데이터(ka10084)로 분봉(OHLCV + VWAP)을 만드는 스트리밍 집계기
+
+- 종목/주기별 분봉은 고정 크기 링버퍼에 저장되므로 장이 길어져도 메모리가 늘지 않습니다.
+- 이미 처리한 체결은 (체결시각, 누적거래량) 워터마크로 걸러내므로 같은 구간을 다시
+  폴링해도 결과가 바뀌지 않습니다. 워터마크는 하루 안에서만 의미가 있으므로 체결
+  일자가 바뀌면 그 종목의 분봉과 워터마크를 초기화합니다.
+- 페이지는 제너레이터로 받으며, 이미 본 체결에 도달하면 더 이상 페이지를 소비하지
+  않습니다. (불필요한 연속조회 요청을 하지 않습니다.)
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from a_stocks._utils.parsers import parse_number, parse_price
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+
+DEFAULT_TIMEFRAMES: Tuple[int, ...] = (1, 5, 15)
+
+# (체결시각 초, 누적거래량)
+TickKey = Tuple[int, int]
+
+
+def _seconds_of_day(tm: str) -> int:
+    text = tm.strip().zfill(6)
+    return int(text[0:2]) * 3600 + int(text[2:4]) * 60 + int(text[4:6])
+
+
+class BarRing:
+    """
+    한 종목/한 주기의 분봉을 담는 고정 크기 링버퍼입니다.
+    """
+
+    FIELDS = ("open", "high", "low", "close", "volume", "value")
+
+    def __init__(self, minutes: int, capacity: int) -> None:
+        self.minutes = minutes
+        self.capacity = capacity
+        self.start = np.zeros(capacity, dtype=np.int64)
+        self.data = np.zeros((len(self.FIELDS), capacity))
+        self.head = 0
+        self.size = 0
+
+    def _last(self) -> int:
+        return (self.head - 1) % self.capacity
+
+    def add(self, seconds: IntArray, price: FloatArray, qty: FloatArray) -> None:
+        """
+        시간순으로 정렬된 체결 배열을 분봉에 반영합니다.
+        """
+        if seconds.size == 0:
+            return
+
+        width = self.minutes * 60
+        buckets = seconds - seconds % width
+        starts, first = np.unique(buckets, return_index=True)
+        last = np.append(first[1:], seconds.size) - 1
+
+        bars = np.empty((len(self.FIELDS), starts.size))
+        bars[0] = price[first]
+        bars[1] = np.maximum.reduceat(price, first)
+        bars[2] = np.minimum.reduceat(price, first)
+        bars[3] = price[last]
+        bars[4] = np.add.reduceat(qty, first)
+        bars[5] = np.add.reduceat(price * qty, first)
+
+        if self.size and starts[0] < self.start[self._last()]:
+            # 이미 지나간 봉에 대한 늦은 체결은 반영하지 않습니다.
+            keep = starts >= self.start[self._last()]
+            starts, bars = starts[keep], bars[:, keep]
+            if starts.size == 0:
+                return
+
+        if self.size and starts[0] == self.start[self._last()]:
+            i = self._last()
+            self.data[1, i] = max(self.data[1, i], bars[1, 0])
+            self.data[2, i] = min(self.data[2, i], bars[2, 0])
+            self.data[3, i] = bars[3, 0]
+            self.data[4, i] += bars[4, 0]
+            self.data[5, i] += bars[5, 0]
+            starts, bars = starts[1:], bars[:, 1:]
+
+        count = starts.size
+        if count == 0:
+            return
+        if count > self.capacity:
+            starts, bars = starts[-self.capacity :], bars[:, -self.capacity :]
+            count = self.capacity
+
+        index = (self.head + np.arange(count)) % self.capacity
+        self.start[index] = starts
+        self.data[:, index] = bars
+        self.head = int((self.head + count) % self.capacity)
+        self.size = min(self.size + count, self.capacity)
+
+    def to_columns(self, limit: Optional[int] = None) -> Dict[str, npt.NDArray[Any]]:
+        """
+        오래된 봉부터 최근 봉 순서의 컬럼을 반환합니다.
+        """
+        count = self.size if limit is None else min(limit, self.size)
+        index = (self.head - count + np.arange(count)) % self.capacity
+        columns: Dict[str, npt.NDArray[Any]] = {"start": self.start[index]}
+        for i, name in enumerate(self.FIELDS):
+            columns[name] = self.data[i, index]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            columns["vwap"] = np.where(
+                columns["volume"] > 0, columns["value"] / columns["volume"], np.nan
+            )
+        return columns
+
+
+class BarBuilder:
+    """
+    여러 종목의 체결 페이지를 받아 주기별 분봉을 증분 갱신합니다.
+    """
+
+    def __init__(
+        self, timeframes: Sequence[int] = DEFAULT_TIMEFRAMES, capacity: int = 512
+    ) -> None:
+        self.timeframes = tuple(timeframes)
+        self.capacity = capacity
+        self._rings: Dict[str, Dict[int, BarRing]] = {}
+        self._watermarks: Dict[str, TickKey] = {}
+        self._dates: Dict[str, str] = {}
+
+    def ingest(
+        self,
+        stock_code: str,
+        pages: Iterable[Mapping[str, Any]],
+        list_key: str = "tdy_pred_cntr",
+        date: Optional[str] = None,
+    ) -> int:
+        """
+        체결 페이지(최신 체결이 먼저 오는 순서)를 반영합니다.
+
+        Args:
+            stock_code (str): 종목코드
+            pages (Iterable[Mapping]): ka10084 응답 페이지 (KiwoomAPI.paginate 결과)
+            list_key (str): 체결 리스트 필드명
+            date (str, optional): 체결 일자 YYYYMMDD. 이전 호출과 다르면 그 종목을
+                초기화한 뒤 반영합니다.
+
+        Returns:
+            int: 새로 반영한 체결 수
+        """
+        if date is not None and self._dates.get(stock_code) != date:
+            self.reset(stock_code)
+            self._dates[stock_code] = date
+        watermark = self._watermarks.get(stock_code, (-1, -1))
+        fresh: Dict[TickKey, Tuple[float, float]] = {}
+
+        for page in pages:
+            reached_seen = False
+            for row in page.get(list_key, []):
+                tm = row.get("tm")
+                if not tm:
+                    continue
+                key = (_seconds_of_day(tm), int(parse_number(row.get("acc_trde_qty"))))
+                if key <= watermark:
+                    reached_seen = True
+                    continue
+                fresh[key] = (
+                    parse_price(row.get("cur_prc")),
+                    abs(parse_number(row.get("cntr_trde_qty"))),
+                )
+            if reached_seen:
+                # 이후 페이지는 모두 이미 처리한 과거 체결입니다.
+                break
+
+        if not fresh:
+            return 0
+
+        keys = sorted(fresh)
+        seconds = np.fromiter((k[0] for k in keys), dtype=np.int64, count=len(keys))
+        price = np.fromiter(
+            (fresh[k][0] for k in keys), dtype=np.float64, count=len(keys)
+        )
+        qty = np.fromiter(
+            (fresh[k][1] for k in keys), dtype=np.float64, count=len(keys)
+        )
+
+        rings = self._rings.setdefault(
+            stock_code,
+            {tf: BarRing(tf, self.capacity) for tf in self.timeframes},
+        )
+        for ring in rings.values():
+            ring.add(seconds, price, qty)
+
+        self._watermarks[stock_code] = keys[-1]
+        return len(keys)
+
+    def bars(
+        self, stock_code: str, minutes: int, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        종목의 분봉 목록을 반환합니다.
+
+        Args:
+            stock_code (str): 종목코드
+            minutes (int): 주기 (분)
+            limit (int, optional): 최근 봉 개수
+
+        Returns:
+            List[Dict[str, Any]]: 시간순 분봉 (start 는 HHMM 문자열)
+        """
+        ring = self._rings.get(stock_code, {}).get(minutes)
+        if ring is None:
+            return []
+        columns = ring.to_columns(limit)
+        result: List[Dict[str, Any]] = []
+        for i in range(columns["start"].size):
+            start = int(columns["start"][i])
+            vwap = float(columns["vwap"][i])
+            result.append(
+                {
+                    "start": f"{start // 3600:02d}{start % 3600 // 60:02d}",
+                    "open": float(columns["open"][i]),
+                    "high": float(columns["high"][i]),
+                    "low": float(columns["low"][i]),
+                    "close": float(columns["close"][i]),
+                    "volume": int(columns["volume"][i]),
+                    "vwap": None if np.isnan(vwap) else vwap,
+                }
+            )
+        return result
+
+    def reset(self, stock_code: Optional[str] = None) -> None:
+        """
+        새 거래일 시작 시 상태를 초기화합니다.
+        """
+        if stock_code is None:
+            self._rings.clear()
+            self._watermarks.clear()
+            self._dates.clear()
+        else:
+            self._rings.pop(stock_code, None)
+            self._watermarks.pop(stock_code, None)
+            self._dates.pop(stock_code, None)
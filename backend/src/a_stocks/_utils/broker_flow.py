@@ -0,0 +1,255 @@
+"""
+거래원(회원사)별 매매 흐름 (ka10002, ka10043, ka10052 + ka10102)
+
+- 각 TR 응답을 (종목, 거래원, 매수/매도, 수량) 레코드 배열(BrokerFlows)로 바꿉니다.
+  종목은 전역 CodeRegistry id, 거래원은 BrokerDirectory 의 id 입니다.
+- ka10002 는 매도/매수 거래원 5개씩을 평탄한 키(sel_trde_ori_nm_1 ... buy_trde_qty_5)로
+  주므로 (응답 x 10칸) 배열로 모은 뒤 수량이 없는 칸을 한 번에 걸러냅니다.
+- aggregate_by_broker() 는 np.unique + bincount 한 번으로 시장 전체 거래원별 매수/매도/
+  순매수/거래 종목 수/거래 비중을 계산합니다.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from a_stocks._utils.code_registry import CodeRegistry, get_code_registry
+from a_stocks._utils.parsers import parse_number
+
+IdArray = npt.NDArray[np.int32]
+FloatArray = npt.NDArray[np.float64]
+
+BUY = 1
+SELL = -1
+
+# ka10002 거래원 칸 수 (매도/매수 각각)
+AGENT_SLOTS = 5
+# 거래원 코드가 없는 칸
+EMPTY_BROKER_CODES = ("", "000")
+
+
+def _normalize_name(name: str) -> str:
+    # ka10102 회원사명은 "교  보" 처럼 글자 사이에 공백이 들어 있습니다.
+    return "".join(name.split())
+
+
+class BrokerDirectory:
+    """
+    회원사 리스트(ka10102)로 만든 거래원 코드 <-> id, 이름 조회표입니다.
+
+    목록에 없는 거래원 코드도 처음 볼 때 id 를 붙이며, 이름은 TR 응답에 있던 이름을
+    씁니다.
+    """
+
+    def __init__(self, members: Iterable[Mapping[str, Any]] = ()) -> None:
+        self.registry = CodeRegistry()
+        self._names: Dict[int, str] = {}
+        for member in members:
+            code = str(member.get("code") or "").strip()
+            if code:
+                self.add(code, str(member.get("name") or ""))
+
+    def __len__(self) -> int:
+        return len(self.registry)
+
+    def add(self, code: str, name: str = "") -> int:
+        """
+        거래원 id 를 반환합니다. 이름을 모르던 거래원이면 이름도 기록합니다.
+        """
+        broker_id = self.registry.intern(code)
+        if name and broker_id not in self._names:
+            self._names[broker_id] = _normalize_name(name)
+        return broker_id
+
+    def codes(self, ids: npt.ArrayLike) -> npt.NDArray[np.object_]:
+        return self.registry.decode(ids)
+
+    def names(self, ids: npt.ArrayLike) -> List[str]:
+        return [self._names.get(int(i), "") for i in np.asarray(ids).ravel()]
+
+
+class BrokerFlows:
+    """
+    (종목 id, 거래원 id, 매수/매도, 수량) 레코드 배열입니다.
+    """
+
+    __slots__ = ("codes", "brokers", "sides", "qty")
+
+    def __init__(
+        self,
+        codes: npt.ArrayLike,
+        brokers: npt.ArrayLike,
+        sides: npt.ArrayLike,
+        qty: npt.ArrayLike,
+    ) -> None:
+        self.codes: IdArray = np.asarray(codes, dtype=np.int32)
+        self.brokers: IdArray = np.asarray(brokers, dtype=np.int32)
+        self.sides = np.asarray(sides, dtype=np.int8)
+        self.qty: FloatArray = np.asarray(qty, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return int(self.qty.size)
+
+    @classmethod
+    def empty(cls) -> "BrokerFlows":
+        return cls([], [], [], [])
+
+    @classmethod
+    def concat(cls, parts: Sequence["BrokerFlows"]) -> "BrokerFlows":
+        if not parts:
+            return cls.empty()
+        return cls(
+            np.concatenate([part.codes for part in parts]),
+            np.concatenate([part.brokers for part in parts]),
+            np.concatenate([part.sides for part in parts]),
+            np.concatenate([part.qty for part in parts]),
+        )
+
+
+def decode_trading_agents_ka10002(
+    responses: Sequence[Mapping[str, Any]],
+    directory: BrokerDirectory,
+    registry: Optional[CodeRegistry] = None,
+) -> BrokerFlows:
+    """
+    종목별 주식거래원요청(ka10002) 응답들을 레코드 배열로 변환합니다.
+
+    응답마다 매도 5칸, 매수 5칸을 (응답 x 10) 배열로 모으고 거래원 코드가 없거나
+    수량이 0 인 칸을 제외합니다.
+    """
+    registry = registry if registry is not None else get_code_registry()
+    slots = [("sel", SELL, i) for i in range(1, AGENT_SLOTS + 1)] + [
+        ("buy", BUY, i) for i in range(1, AGENT_SLOTS + 1)
+    ]
+    # (응답 x 10칸) 순서로 펼친 (거래원 코드, 거래원명, 수량)
+    cells = [
+        (
+            str(response.get(f"{prefix}_trde_ori_{i}") or "").strip(),
+            str(response.get(f"{prefix}_trde_ori_nm_{i}") or ""),
+            response.get(f"{prefix}_trde_qty_{i}"),
+        )
+        for response in responses
+        for prefix, _, i in slots
+    ]
+    shape = (len(responses), len(slots))
+    broker_ids = np.fromiter(
+        (
+            directory.add(code, name) if code not in EMPTY_BROKER_CODES else -1
+            for code, name, _ in cells
+        ),
+        dtype=np.int32,
+        count=len(cells),
+    ).reshape(shape)
+    qty = np.fromiter(
+        (abs(parse_number(value)) for _, _, value in cells),
+        dtype=np.float64,
+        count=len(cells),
+    ).reshape(shape)
+    code_ids = registry.encode(
+        str(response.get("stk_cd") or "") for response in responses
+    )
+    sides = np.array([side for _, side, _ in slots], dtype=np.int8)
+
+    keep = (broker_ids >= 0) & (qty > 0)
+    rows, cols = np.nonzero(keep)
+    return BrokerFlows(code_ids[rows], broker_ids[keep], sides[cols], qty[keep])
+
+
+def decode_agent_analysis_ka10043(
+    response: Mapping[str, Any],
+    stock_code: str,
+    member_code: str,
+    directory: BrokerDirectory,
+    registry: Optional[CodeRegistry] = None,
+) -> BrokerFlows:
+    """
+    거래원매물대분석요청(ka10043, 한 종목 x 한 거래원의 일자별 매수/매도량) 응답을
+    기간 합계 매수/매도 두 레코드로 변환합니다.
+    """
+    registry = registry if registry is not None else get_code_registry()
+    rows = response.get("trde_ori_prps_anly", [])
+    buy = sum(abs(parse_number(row.get("buy_qty"))) for row in rows)
+    sell = sum(abs(parse_number(row.get("sel_qty"))) for row in rows)
+    broker_id = directory.add(member_code)
+    code_id = registry.intern(stock_code)
+    records = [(side, qty) for side, qty in ((BUY, buy), (SELL, sell)) if qty > 0]
+    return BrokerFlows(
+        [code_id] * len(records),
+        [broker_id] * len(records),
+        [side for side, _ in records],
+        [qty for _, qty in records],
+    )
+
+
+def decode_instant_volume_ka10052(
+    response: Mapping[str, Any],
+    member_code: str,
+    directory: BrokerDirectory,
+    registry: Optional[CodeRegistry] = None,
+) -> BrokerFlows:
+    """
+    거래원순간거래량요청(ka10052) 응답을 레코드 배열로 변환합니다.
+
+    응답에는 거래원 이름만 있으므로 요청한 회원사코드를 거래원으로 씁니다. 순간거래량의
+    부호(또는 구분의 매수/매도)로 방향을 정합니다.
+    """
+    registry = registry if registry is not None else get_code_registry()
+    rows = [
+        row
+        for row in response.get("trde_ori_mont_trde_qty", [])
+        if row.get("stk_cd") and parse_number(row.get("mont_trde_qty"))
+    ]
+    signed = np.fromiter(
+        (parse_number(row.get("mont_trde_qty")) for row in rows),
+        dtype=np.float64,
+        count=len(rows),
+    )
+    sells = np.fromiter(
+        ("매도" in str(row.get("tp") or "") for row in rows),
+        dtype=np.bool_,
+        count=len(rows),
+    )
+    name = next((row.get("trde_ori_nm") for row in rows if row.get("trde_ori_nm")), "")
+    broker_id = directory.add(member_code, str(name or ""))
+    sides = np.where(sells | (signed < 0), SELL, BUY)
+    return BrokerFlows(
+        registry.encode(str(row["stk_cd"]) for row in rows),
+        np.full(len(rows), broker_id, dtype=np.int32),
+        sides,
+        np.abs(signed),
+    )
+
+
+def aggregate_by_broker(flows: BrokerFlows) -> Dict[str, npt.NDArray[Any]]:
+    """
+    거래원별 매수/매도/순매수/거래량 합, 거래 종목 수, 전체 거래량 대비 비중(%)을
+    한 번에 계산합니다.
+
+    Returns:
+        Dict[str, ndarray]: "broker"(거래원 id, 오름차순), "buy", "sell", "net",
+            "total", "symbols", "share" 컬럼
+    """
+    brokers, inverse = np.unique(flows.brokers, return_inverse=True)
+    size = brokers.size
+    buy_qty = np.where(flows.sides == BUY, flows.qty, 0.0)
+    buy = np.bincount(inverse, weights=buy_qty, minlength=size)
+    total = np.bincount(inverse, weights=flows.qty, minlength=size)
+    sell = total - buy
+
+    # (거래원, 종목) 쌍의 고유 개수 = 거래원별 거래 종목 수
+    stride = int(flows.codes.max(initial=0)) + 1
+    pairs = np.unique(inverse.astype(np.int64) * stride + flows.codes)
+    symbols = np.bincount(pairs // stride, minlength=size)
+
+    market_total = float(total.sum())
+    share = total / market_total * 100.0 if market_total else np.zeros(size)
+    return {
+        "broker": brokers.astype(np.int32),
+        "buy": buy,
+        "sell": sell,
+        "net": buy - sell,
+        "total": total,
+        "symbols": symbols,
+        "share": share,
+    }
@@ -0,0 +1,425 @@
+"""
+캐시 백엔드 (프로세스 내 LRU / 같은 호스트 공유 메모리 / Redis 프로토콜)
+
+- LocalCacheBackend: 값을 객체 그대로 보관하므로 직렬화하지 않습니다.
+- SharedMemoryCacheBackend: 키마다 파일 하나를 /dev/shm 같은 메모리 파일시스템에 쓰고
+  mmap 으로 읽습니다. 같은 호스트의 uvicorn 워커들이 캐시를 공유합니다.
+- RedisCacheBackend: Redis 프로토콜 서버(redis, fakeredis 등)에 SET PX/GET 으로
+  저장합니다. redis 패키지는 이 백엔드를 쓸 때만 필요합니다.
+
+직렬화 백엔드는 encode_value/decode_value 형식을 씁니다. 헤더와 JSON 메타데이터 뒤에
+버퍼를 8바이트 경계에 맞춰 이어 붙이며, 버퍼는 쓸 때 그대로 넘기고(연결 복사 없음)
+읽을 때 memoryview 조각/np.frombuffer 로 돌려주므로 큰 본문과 배열도 복사하지 않습니다.
+"""
+
+import hashlib
+import json
+import math
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+_MAGIC = b"AC1"
+# magic, 종류, 메타데이터 길이
+_HEADER = struct.Struct("<3sBI")
+_ALIGN = 8
+_PADDING = bytes(_ALIGN)
+
+KIND_JSON = 0
+KIND_BYTES = 1
+KIND_PAYLOAD = 2
+KIND_ARRAY = 3
+KIND_ARRAYS = 4
+
+
+class Payload:
+    """
+    JSON 메타데이터와 본문 바이트 한 덩어리입니다.
+
+    디코딩한 Payload 의 body 는 캐시 버퍼를 가리키는 읽기 전용 memoryview 입니다.
+    """
+
+    __slots__ = ("meta", "body")
+
+    def __init__(self, meta: Dict[str, Any], body: Buffer) -> None:
+        self.meta = meta
+        self.body = body
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def _array_buffer(values: np.ndarray) -> Tuple[Dict[str, Any], memoryview]:
+    meta: Dict[str, Any] = {"shape": list(values.shape)}
+    if values.dtype == object:
+        # 문자열 컬럼(종목코드 등)은 고정 길이 유니코드로 바꿔 저장합니다.
+        values = values.astype(str)
+        meta["object"] = True
+    values = np.ascontiguousarray(values)
+    meta["dtype"] = values.dtype.str
+    return meta, memoryview(values.reshape(-1).view(np.uint8))
+
+
+def _array_from(meta: Mapping[str, Any], buffer: memoryview) -> np.ndarray:
+    values = np.frombuffer(buffer, dtype=np.dtype(meta["dtype"])).reshape(meta["shape"])
+    return values.astype(object) if meta.get("object") else values
+
+
+def encode_value(value: Any) -> List[Buffer]:
+    """
+    값을 직렬화 프레임 목록으로 만듭니다. 프레임을 차례로 쓰면 한 값이 됩니다.
+
+    - Payload: 메타데이터 + 본문
+    - bytes/bytearray/memoryview: 본문
+    - np.ndarray, Mapping[str, np.ndarray](Columns): 배열 버퍼
+    - 그 밖의 값: JSON
+    """
+    meta: Dict[str, Any] = {}
+    buffers: List[Buffer]
+    if isinstance(value, Payload):
+        kind, meta["meta"], buffers = KIND_PAYLOAD, value.meta, [value.body]
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        kind, buffers = KIND_BYTES, [value]
+    elif isinstance(value, np.ndarray):
+        array_meta, buffer = _array_buffer(value)
+        kind, meta["arrays"], buffers = KIND_ARRAY, [array_meta], [buffer]
+    elif (
+        isinstance(value, Mapping)
+        and value
+        and all(isinstance(v, np.ndarray) for v in value.values())
+    ):
+        kind, meta["arrays"], buffers = KIND_ARRAYS, [], []
+        for name, values in value.items():
+            array_meta, buffer = _array_buffer(values)
+            meta["arrays"].append({"name": name, **array_meta})
+            buffers.append(buffer)
+    else:
+        kind = KIND_JSON
+        buffers = [json.dumps(value, ensure_ascii=False).encode("utf-8")]
+
+    meta["sizes"] = [memoryview(buffer).nbytes for buffer in buffers]
+    encoded_meta = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+    frames: List[Buffer] = [_HEADER.pack(_MAGIC, kind, len(encoded_meta)), encoded_meta]
+    offset = _HEADER.size + len(encoded_meta)
+    for frame, size in zip(buffers, meta["sizes"]):
+        if _aligned(offset) != offset:
+            frames.append(_PADDING[: _aligned(offset) - offset])
+            offset = _aligned(offset)
+        frames.append(frame)
+        offset += size
+    return frames
+
+
+def decode_value(view: memoryview) -> Any:
+    """
+    encode_value 로 만든 버퍼를 값으로 되돌립니다.
+
+    본문과 숫자 배열은 view 를 가리키는 읽기 전용 memoryview/배열이며 복사하지
+    않습니다. (view 는 값이 살아 있는 동안 유지됩니다)
+    """
+    if view.nbytes < _HEADER.size:
+        raise ValueError("캐시 값이 너무 짧습니다.")
+    magic, kind, meta_size = _HEADER.unpack_from(view)
+    if magic != _MAGIC:
+        raise ValueError("알 수 없는 캐시 값 형식입니다.")
+    offset = _HEADER.size
+    meta = json.loads(bytes(view[offset : offset + meta_size]))
+    offset += meta_size
+    buffers: List[memoryview] = []
+    for size in meta["sizes"]:
+        offset = _aligned(offset)
+        if offset + size > view.nbytes:
+            raise ValueError("캐시 값이 잘려 있습니다.")
+        buffers.append(view[offset : offset + size])
+        offset += size
+
+    if kind == KIND_JSON:
+        return json.loads(bytes(buffers[0]))
+    if kind == KIND_BYTES:
+        return buffers[0]
+    if kind == KIND_PAYLOAD:
+        return Payload(meta["meta"], buffers[0])
+    if kind == KIND_ARRAY:
+        return _array_from(meta["arrays"][0], buffers[0])
+    if kind == KIND_ARRAYS:
+        return {
+            array["name"]: _array_from(array, buffer)
+            for array, buffer in zip(meta["arrays"], buffers)
+        }
+    raise ValueError(f"알 수 없는 캐시 값 종류입니다: {kind}")
+
+
+class CacheBackend(ABC):
+    """
+    키 -> 값 TTL 캐시 백엔드의 기본 클래스입니다.
+
+    serialized 가 True 인 백엔드는 값을 encode_value 로 직렬화해 저장하므로
+    get 이 돌려주는 값은 저장한 객체가 아니라 디코딩한 값입니다.
+    """
+
+    serialized = True
+
+    @abstractmethod
+    def get(self, key: str) -> Any:
+        """
+        Returns:
+            Any: 저장된 값. 없거나 만료되었으면 None
+        """
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        ttl(초)이 None 이면 만료 없이 저장합니다.
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+    def close(self) -> None:
+        pass
+
+
+class LocalCacheBackend(CacheBackend):
+    """
+    프로세스 내 TTL + LRU 캐시입니다. 값을 직렬화하지 않고 그대로 보관합니다.
+    """
+
+    serialized = False
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl is not None else math.inf
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def default_cache_dir() -> Path:
+    """
+    공유 메모리 캐시 기본 경로입니다. (/dev/shm 이 있으면 그 아래, 없으면 임시 디렉터리)
+    """
+    base = Path("/dev/shm")
+    if not base.is_dir():
+        base = Path(tempfile.gettempdir())
+    return base / "a_stocks_cache"
+
+
+class SharedMemoryCacheBackend(CacheBackend):
+    """
+    같은 호스트의 프로세스들이 공유하는 파일 + mmap 캐시입니다.
+
+    항목 파일은 만료 시각(time.time, float64) 8바이트 뒤에 encode_value 프레임을
+    이어 쓴 것입니다. 임시 파일에 쓴 뒤 os.replace 로 교체하므로 다른 프로세스가 쓰다 만
+    파일을 읽지 않으며, 읽는 쪽은 교체 전 파일의 mmap 을 계속 쓸 수 있습니다.
+    만료된 항목은 읽을 때와 prune_every 번 쓸 때마다 지웁니다.
+    """
+
+    _EXPIRY = struct.Struct("<d")
+
+    def __init__(
+        self,
+        directory: Optional[Union[str, Path]] = None,
+        prune_every: int = 256,
+    ) -> None:
+        self.directory = Path(directory) if directory else default_cache_dir()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prune_every = prune_every
+        self._writes = 0
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+        return self.directory / digest
+
+    def get(self, key: str) -> Any:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_size <= self._EXPIRY.size:
+                    return None
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+        (expires_at,) = self._EXPIRY.unpack_from(mapped)
+        if expires_at <= time.time():
+            mapped.close()
+            path.unlink(missing_ok=True)
+            return None
+        # 디코딩한 값이 mmap 을 가리키므로 닫지 않고 참조가 사라질 때 해제되게 둡니다.
+        return decode_value(memoryview(mapped)[self._EXPIRY.size :])
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        path = self._path(key)
+        expires_at = time.time() + ttl if ttl is not None else math.inf
+        temp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}")
+        with open(temp, "wb") as f:
+            f.write(self._EXPIRY.pack(expires_at))
+            for frame in encode_value(value):
+                f.write(frame)
+        os.replace(temp, path)
+        self._writes += 1
+        if self.prune_every > 0 and self._writes % self.prune_every == 0:
+            self.prune()
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def prune(self) -> int:
+        """
+        만료된 항목 파일을 지웁니다.
+
+        Returns:
+            int: 지운 항목 수
+        """
+        now = time.time()
+        removed = 0
+        for path in self.directory.iterdir():
+            if path.name.startswith("."):
+                continue
+            try:
+                with open(path, "rb") as f:
+                    header = f.read(self._EXPIRY.size)
+            except FileNotFoundError:
+                continue
+            if len(header) < self._EXPIRY.size or self._EXPIRY.unpack(header)[0] <= now:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def clear(self) -> None:
+        for path in self.directory.iterdir():
+            if not path.name.startswith("."):
+                path.unlink(missing_ok=True)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Redis 프로토콜 서버에 저장하는 캐시입니다.
+
+    client 는 bytes 를 돌려주는(decode_responses=False) redis.Redis 호환 객체이며,
+    주지 않으면 url 로 redis.Redis 를 만듭니다. GET 으로 받은 bytes 를 복사 없이
+    디코딩합니다.
+    """
+
+    def __init__(
+        self,
+        client: Any = None,
+        url: Optional[str] = None,
+        prefix: str = "a_stocks:",
+    ) -> None:
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise Exception(f"Redis 캐시 백엔드 생성 중 오류 발생: {str(e)}")
+            client = redis.Redis.from_url(
+                url
+                if url is not None
+                else getattr(settings, "KIWOOM_REDIS_URL", "redis://localhost:6379/0")
+            )
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Any:
+        data = self.client.get(self.prefix + key)
+        if data is None:
+            return None
+        return decode_value(memoryview(data))
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        if ttl is not None and ttl <= 0:
+            self.delete(key)
+            return
+        self.client.set(
+            self.prefix + key,
+            b"".join(encode_value(value)),
+            px=max(int(ttl * 1000), 1) if ttl is not None else None,
+        )
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=f"{self.prefix}*"))
+        for start in range(0, len(keys), 500):
+            self.client.delete(*keys[start : start + 500])
+
+    def close(self) -> None:
+        self.client.close()
+
+
+def create_cache_backend(name: Optional[str] = None, **options: Any) -> CacheBackend:
+    """
+    이름으로 캐시 백엔드를 만듭니다.
+
+    Args:
+        name (str, optional): local, shared, redis 또는 CacheBackend 클래스 경로
+            (기본값: KIWOOM_CACHE_BACKEND)
+        **options: 백엔드 생성자 인자
+    """
+    name = (
+        name if name is not None else getattr(settings, "KIWOOM_CACHE_BACKEND", "local")
+    )
+    if name == "local":
+        return LocalCacheBackend(**options)
+    if name == "shared":
+        options.setdefault(
+            "directory", getattr(settings, "KIWOOM_CACHE_DIR", "") or None
+        )
+        return SharedMemoryCacheBackend(**options)
+    if name == "redis":
+        return RedisCacheBackend(**options)
+    backend: CacheBackend = import_string(name)(**options)
+    return backend
+
+
+def create_shared_cache_backend() -> Optional[CacheBackend]:
+    """
+    설정된 캐시 백엔드가 워커 사이에 공유되면 만들어 반환합니다.
+
+    프로세스 내 캐시는 서비스가 이미 메모리에 들고 있는 데이터와 중복되므로 None 을
+    반환합니다.
+    """
+    backend = create_cache_backend()
+    return backend if backend.serialized else None
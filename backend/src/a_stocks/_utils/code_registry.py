@@ -0,0 +1,162 @@
+"""
+종목코드 <-> 조밀한 int32 id 레지스트리
+
+- 처음 보는 종목코드에 0 부터 차례로 id 를 붙입니다. 컬럼 테이블과 시계열 패널은
+  문자열 대신 id 배열을 키로 쓰므로 조인/그룹화가 정수 배열 연산이 됩니다.
+- 역방향 조회용 코드 문자열은 sys.intern 으로 한 객체만 유지합니다.
+- NXT(_NX), 통합(_AL) 종목코드는 별도 id 를 가지며, base_ids() 로 KRX 종목코드의
+  id 를 얻을 수 있습니다.
+- id 는 프로세스마다 다르므로 디스크에는 저장하지 않습니다. (저장소는 종목코드
+  문자열을 저장하고 읽을 때 id 로 바꿉니다.)
+"""
+
+import sys
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+IdArray = npt.NDArray[np.int32]
+
+# 거래소 접미사 (NXT, 통합)
+VENUE_SUFFIXES = ("_NX", "_AL")
+
+MISSING_ID = -1
+
+
+def base_code(code: str) -> str:
+    """
+    거래소 접미사를 뗀 KRX 종목코드
+    """
+    for suffix in VENUE_SUFFIXES:
+        if code.endswith(suffix):
+            return code[: -len(suffix)]
+    return code
+
+
+class CodeRegistry:
+    """
+    종목코드와 id 를 양방향으로 매핑합니다. 스레드 안전합니다.
+    """
+
+    def __init__(self, codes: Iterable[str] = ()) -> None:
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self._codes: List[str] = []
+        self._bases: List[int] = []
+        # decode 용 배열 캐시 (코드가 늘어나면 다시 만듭니다)
+        self._code_array: Optional[npt.NDArray[np.object_]] = None
+        self._base_array: Optional[IdArray] = None
+        for code in codes:
+            self.intern(code)
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __contains__(self, code: object) -> bool:
+        return code in self._ids
+
+    def _add(self, code: str) -> int:
+        # self._lock 을 잡은 상태에서 호출합니다.
+        code_id = self._ids.get(code)
+        if code_id is not None:
+            return code_id
+        base = base_code(code)
+        base_id = self._add(base) if base != code else len(self._codes)
+        code_id = len(self._codes)
+        if code_id > np.iinfo(np.int32).max:
+            raise OverflowError("종목코드 id 가 int32 범위를 넘었습니다.")
+        self._codes.append(sys.intern(code))
+        self._bases.append(base_id)
+        self._ids[self._codes[-1]] = code_id
+        return code_id
+
+    def intern(self, code: str) -> int:
+        """
+        종목코드의 id 를 반환합니다. 처음 보는 코드면 새 id 를 붙입니다.
+        """
+        code_id = self._ids.get(code)
+        if code_id is not None:
+            return code_id
+        with self._lock:
+            return self._add(code)
+
+    def id_of(self, code: str) -> int:
+        """
+        종목코드의 id. 등록되지 않은 코드면 -1 입니다.
+        """
+        return self._ids.get(code, MISSING_ID)
+
+    def code_of(self, code_id: int) -> str:
+        return self._codes[code_id]
+
+    def encode(self, codes: Iterable[str], add: bool = True) -> IdArray:
+        """
+        종목코드 목록을 id 배열로 바꿉니다.
+
+        Args:
+            add (bool): False 면 등록되지 않은 코드는 새로 붙이지 않고 -1 로 둡니다.
+        """
+        lookup = self.intern if add else self.id_of
+        return np.fromiter((lookup(code) for code in codes), dtype=np.int32)
+
+    def _arrays(self) -> Tuple[npt.NDArray[np.object_], IdArray]:
+        codes, bases = self._code_array, self._base_array
+        if codes is None or bases is None or codes.size != len(self._codes):
+            with self._lock:
+                codes = np.array(self._codes, dtype=object)
+                bases = np.array(self._bases, dtype=np.int32)
+                self._code_array, self._base_array = codes, bases
+        return codes, bases
+
+    def decode(self, ids: npt.ArrayLike) -> npt.NDArray[np.object_]:
+        """
+        id 배열을 종목코드(object) 배열로 바꿉니다. -1 은 빈 문자열입니다.
+        """
+        index = np.asarray(ids, dtype=np.intp)
+        codes, _ = self._arrays()
+        result: npt.NDArray[np.object_] = np.full(index.shape, "", dtype=object)
+        known = index >= 0
+        result[known] = codes[index[known]]
+        return result
+
+    def base_ids(self, ids: npt.ArrayLike) -> IdArray:
+        """
+        NXT/통합 종목코드 id 를 KRX 종목코드 id 로 바꿉니다. (그 외는 그대로)
+        """
+        index = np.asarray(ids, dtype=np.intp)
+        _, bases = self._arrays()
+        result = np.full(index.shape, MISSING_ID, dtype=np.int32)
+        known = index >= 0
+        result[known] = bases[index[known]]
+        return result
+
+
+def locate(keys: npt.ArrayLike, ids: npt.ArrayLike) -> npt.NDArray[np.intp]:
+    """
+    ids 각각이 keys 의 몇 번째 위치인지 반환합니다. keys 에 없으면 -1 입니다.
+
+    keys 는 정렬되어 있지 않아도 됩니다. (정렬 + searchsorted, O((n + m) log n))
+    """
+    key_array = np.asarray(keys, dtype=np.int32)
+    id_array = np.asarray(ids, dtype=np.int32)
+    result = np.full(id_array.shape, -1, dtype=np.intp)
+    if key_array.size == 0:
+        return result
+    order = np.argsort(key_array, kind="stable")
+    sorted_keys = key_array[order]
+    positions = np.minimum(np.searchsorted(sorted_keys, id_array), key_array.size - 1)
+    found = sorted_keys[positions] == id_array
+    result[found] = order[positions[found]]
+    return result
+
+
+_registry = CodeRegistry()
+
+
+def get_code_registry() -> CodeRegistry:
+    """
+    프로세스 전체가 공유하는 레지스트리를 반환합니다.
+    """
+    return _registry
@@ -0,0 +1,158 @@
+"""
+종목코드(stk_cd)를 키로 하는 컬럼형 테이블
+
+여러 순위 TR 응답을 행(dict) 단위로 합치지 않고, 정렬된 키 배열과 컬럼 배열로
+변환한 뒤 searchsorted 로 한 번에 외부 조인(outer join)합니다. 키는 종목코드
+문자열 대신 CodeRegistry 의 int32 id 이므로 정렬/조인이 정수 배열 연산입니다.
+"""
+
+from functools import reduce
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from a_stocks._utils.code_registry import CodeRegistry, get_code_registry
+
+Row = Mapping[str, Any]
+Array = npt.NDArray[Any]
+
+
+def _missing_like(values: Array, size: int) -> Array:
+    """
+    조인 시 값이 없는 자리를 채울 배열을 만듭니다. (숫자: NaN, 불리언: False, 문자: "")
+    """
+    if values.dtype == np.bool_:
+        return np.zeros(size, dtype=np.bool_)
+    if np.issubdtype(values.dtype, np.number):
+        return np.full(size, np.nan)
+    return np.full(size, "", dtype=object)
+
+
+def _is_missing(values: Array) -> Array:
+    missing: Array
+    if values.dtype == np.bool_:
+        missing = ~values
+    elif np.issubdtype(values.dtype, np.number):
+        missing = np.isnan(values)
+    else:
+        missing = values == ""
+    return missing
+
+
+class ColumnTable:
+    """
+    정렬된 고유 키(종목코드 id)와 키별 컬럼 배열로 이루어진 테이블입니다.
+    """
+
+    def __init__(
+        self,
+        keys: Array,
+        columns: Optional[Dict[str, Array]] = None,
+        registry: Optional[CodeRegistry] = None,
+    ) -> None:
+        self.keys = keys
+        self.columns: Dict[str, Array] = columns or {}
+        self.registry = registry if registry is not None else get_code_registry()
+
+    @property
+    def codes(self) -> npt.NDArray[np.object_]:
+        """
+        키의 종목코드 배열 (키와 같은 순서)
+        """
+        return self.registry.decode(self.keys)
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[Row],
+        fields: Mapping[str, Callable[[Any], float]],
+        key: str = "stk_cd",
+        prefix: str = "",
+        text_fields: Sequence[str] = (),
+        registry: Optional[CodeRegistry] = None,
+    ) -> "ColumnTable":
+        """
+        TR 응답의 행 목록을 컬럼 테이블로 변환합니다.
+
+        같은 키가 여러 번 나오면 먼저 나온(순위가 높은) 행을 사용합니다.
+
+        Args:
+            rows (Iterable[Row]): TR 응답의 리스트 항목
+            fields (Mapping[str, Callable]): 숫자 필드명 -> 변환 함수
+            key (str): 키 필드명
+            prefix (str): 숫자 컬럼 이름 앞에 붙일 접두어 ("{prefix}.{field}").
+                접두어가 있으면 해당 이름의 불리언 포함 여부 컬럼도 추가합니다.
+            text_fields (Sequence[str]): 접두어 없이 그대로 담을 문자열 필드
+            registry (CodeRegistry, optional): 종목코드 id 레지스트리 (기본값: 공용)
+
+        Returns:
+            ColumnTable: 키(id) 오름차순 테이블
+        """
+        registry = registry if registry is not None else get_code_registry()
+        materialized: List[Row] = [row for row in rows if row.get(key)]
+        raw_keys = registry.encode(str(row[key]) for row in materialized)
+        keys, first = np.unique(raw_keys, return_index=True)
+        selected = [materialized[i] for i in first]
+
+        columns: Dict[str, Array] = {}
+        if prefix:
+            columns[prefix] = np.ones(len(selected), dtype=np.bool_)
+        for name, parser in fields.items():
+            column = f"{prefix}.{name}" if prefix else name
+            columns[column] = np.fromiter(
+                (parser(row.get(name)) for row in selected),
+                dtype=np.float64,
+                count=len(selected),
+            )
+        for name in text_fields:
+            columns[name] = np.array(
+                [str(row.get(name) or "").strip() for row in selected], dtype=object
+            )
+        return cls(keys, columns, registry)
+
+    def __len__(self) -> int:
+        return int(self.keys.size)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.columns
+
+    def __getitem__(self, name: str) -> Array:
+        return self.columns[name]
+
+    def take(self, index: Array) -> "ColumnTable":
+        """
+        주어진 위치(또는 불리언 마스크)의 행만 남긴 테이블을 반환합니다.
+        """
+        return ColumnTable(
+            self.keys[index],
+            {name: values[index] for name, values in self.columns.items()},
+            self.registry,
+        )
+
+    @classmethod
+    def outer_join(cls, tables: Sequence["ColumnTable"]) -> "ColumnTable":
+        """
+        여러 테이블을 키 기준으로 외부 조인합니다.
+
+        같은 이름의 컬럼은 앞선 테이블의 값을 우선하고, 비어 있는 자리만 뒤 테이블의
+        값으로 채웁니다. (예: 여러 TR 에 공통으로 있는 종목명)
+        """
+        if not tables:
+            return cls(np.array([], dtype=np.int32))
+        if len(tables) == 1:
+            return tables[0]
+
+        keys = reduce(np.union1d, [table.keys for table in tables])
+        columns: Dict[str, Array] = {}
+        for table in tables:
+            positions = np.searchsorted(keys, table.keys)
+            for name, values in table.columns.items():
+                merged = columns.get(name)
+                if merged is None:
+                    merged = columns[name] = _missing_like(values, keys.size)
+                    merged[positions] = values
+                else:
+                    empty = _is_missing(merged[positions])
+                    merged[positions[empty]] = values[empty]
+        return cls(keys, columns, tables[0].registry)
@@ -0,0 +1,243 @@
+"""
+신용융자/대주/대차 잔고 분석 (종목 x 일자 패널 기준, 벡터 연산)
+
+- 시간 축은 오래된 날짜 -> 최근 날짜 순서입니다.
+- 잔고는 수준값이므로 값이 없는 날(NaN)은 직전 값을 이어 씁니다.
+
+CreditSurgeIndex 는 종목별 최근 max(windows) + 1 일치 잔고만 들고 있다가 새 일자가
+들어오면 열 하나를 밀어 넣고 마지막 시점의 기간별 증감/증감률과 정렬 순서만 다시
+계산합니다. 그래서 "신용잔고 5일 급증 상위" 질의는 정렬 없이 슬라이스로 응답하고,
+갱신할 때 전체 패널을 다시 읽지 않습니다.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+FloatArray = npt.NDArray[np.float64]
+
+DEFAULT_WINDOWS = (1, 5, 20)
+SURGE_SORT_KEYS = ("change_pct", "change")
+
+
+def forward_fill(values: npt.ArrayLike) -> FloatArray:
+    """
+    시간 축(axis=1)을 따라 NaN 을 직전 값으로 채웁니다. 첫 값 이전의 NaN 은 그대로입니다.
+    """
+    array = np.asarray(values, dtype=np.float64)
+    if array.ndim == 1:
+        array = array[np.newaxis, :]
+    index = np.where(~np.isnan(array), np.arange(array.shape[1]), 0)
+    np.maximum.accumulate(index, axis=1, out=index)
+    filled: FloatArray = np.take_along_axis(array, index, axis=1)
+    return filled
+
+
+def balance_change(values: npt.ArrayLike, window: int) -> FloatArray:
+    """
+    window 일 전 대비 잔고 증감. 기간이 채워지지 않은 위치는 NaN 입니다.
+    """
+    if window < 1:
+        raise ValueError("window 는 1 이상이어야 합니다.")
+    filled = forward_fill(values)
+    result = np.full(filled.shape, np.nan)
+    result[:, window:] = filled[:, window:] - filled[:, :-window]
+    return result
+
+
+def change_ratio(values: npt.ArrayLike, window: int) -> FloatArray:
+    """
+    window 일 전 대비 잔고 증감률(%). 이전 잔고가 0 이하이면 NaN 입니다.
+    """
+    filled = forward_fill(values)
+    change = balance_change(filled, window)
+    previous = np.full(filled.shape, np.nan)
+    previous[:, window:] = filled[:, :-window]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(previous > 0, change / previous * 100.0, np.nan)
+    return ratio
+
+
+def _optional(value: Any) -> Optional[float]:
+    number = float(value)
+    return None if np.isnan(number) else round(number, 4)
+
+
+class CreditSurgeIndex:
+    """
+    최근 잔고 꼬리(tail)와 기간별 급증 지표/정렬 순서를 들고 있는 인덱스입니다.
+
+    advance() 로 일자를 하나씩 더하며, 같은 일자를 다시 넣으면 그 일자 값을
+    덮어씁니다. 마지막 일자보다 이전 일자는 무시합니다.
+    """
+
+    def __init__(self, windows: Sequence[int] = DEFAULT_WINDOWS) -> None:
+        if not windows or min(windows) < 1:
+            raise ValueError("windows 는 1 이상의 기간이어야 합니다.")
+        self.windows = tuple(sorted(set(windows)))
+        self.depth = self.windows[-1] + 1
+        self.codes: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self.dates = np.empty(0, dtype=np.int32)
+        # 종목 x 최근 일자 잔고 (직전 값으로 채움)
+        self.balance = np.empty((0, 0), dtype=np.float64)
+        # 종목별 마지막 잔고 비율 (예: ka10013 잔고비율)
+        self.ratio = np.empty(0, dtype=np.float64)
+        self.metrics: Dict[int, Dict[str, FloatArray]] = {}
+        self.orders: Dict[int, Dict[str, npt.NDArray[np.intp]]] = {}
+
+    @property
+    def date(self) -> Optional[int]:
+        return int(self.dates[-1]) if self.dates.size else None
+
+    def _locate(self, codes: Sequence[str]) -> npt.NDArray[np.intp]:
+        new = [code for code in dict.fromkeys(codes) if code not in self._rows]
+        if new:
+            for code in new:
+                self._rows[code] = len(self.codes)
+                self.codes.append(code)
+            pad = len(new)
+            self.balance = np.vstack(
+                [self.balance, np.full((pad, self.balance.shape[1]), np.nan)]
+            )
+            self.ratio = np.concatenate([self.ratio, np.full(pad, np.nan)])
+        return np.fromiter(
+            (self._rows[code] for code in codes), dtype=np.intp, count=len(codes)
+        )
+
+    def advance(
+        self,
+        date: int,
+        codes: Sequence[str],
+        balance: npt.ArrayLike,
+        ratio: Optional[npt.ArrayLike] = None,
+        recompute: bool = True,
+    ) -> bool:
+        """
+        한 일자의 종목별 잔고를 더하고 지표를 다시 계산합니다.
+
+        넣지 않은 종목과 NaN 값은 직전 잔고를 이어 씁니다.
+
+        Returns:
+            bool: 반영했으면 True (마지막 일자보다 이전이면 False)
+        """
+        last = self.date
+        if last is not None and date < last:
+            return False
+        rows = self._locate(codes)
+        values = np.asarray(balance, dtype=np.float64)
+        if last is None or date > last:
+            carried = (
+                self.balance[:, -1:]
+                if self.balance.shape[1]
+                else np.full((len(self.codes), 1), np.nan)
+            )
+            self.balance = np.hstack([self.balance, carried])[:, -self.depth :]
+            self.dates = np.append(self.dates, np.int32(date))[-self.depth :]
+        known = ~np.isnan(values)
+        self.balance[rows[known], -1] = values[known]
+        if ratio is not None:
+            ratios = np.asarray(ratio, dtype=np.float64)
+            known = ~np.isnan(ratios)
+            self.ratio[rows[known]] = ratios[known]
+        if recompute:
+            self._recompute()
+        return True
+
+    def extend(
+        self,
+        dates: npt.ArrayLike,
+        codes: Sequence[str],
+        balance: npt.ArrayLike,
+        ratio: Optional[npt.ArrayLike] = None,
+    ) -> int:
+        """
+        (종목 x 일자) 패널을 일자 순서대로 advance 합니다.
+
+        Returns:
+            int: 반영한 일자 수
+        """
+        date_array = np.asarray(dates, dtype=np.int32)
+        values = np.asarray(balance, dtype=np.float64).reshape(len(codes), -1)
+        ratios = (
+            np.asarray(ratio, dtype=np.float64).reshape(len(codes), -1)
+            if ratio is not None
+            else None
+        )
+        # 지표는 필요한 꼬리만 남으므로 마지막 depth 일만 넣어도 결과가 같습니다.
+        start = max(date_array.size - self.depth, 0)
+        applied = 0
+        for j in range(start, date_array.size):
+            applied += self.advance(
+                int(date_array[j]),
+                codes,
+                values[:, j],
+                ratios[:, j] if ratios is not None else None,
+                recompute=False,
+            )
+        if applied:
+            self._recompute()
+        return applied
+
+    def _recompute(self) -> None:
+        current = self.balance[:, -1]
+        metrics: Dict[int, Dict[str, FloatArray]] = {}
+        orders: Dict[int, Dict[str, npt.NDArray[np.intp]]] = {}
+        for window in self.windows:
+            previous = (
+                self.balance[:, -1 - window]
+                if self.balance.shape[1] > window
+                else np.full(current.shape, np.nan)
+            )
+            change = current - previous
+            with np.errstate(divide="ignore", invalid="ignore"):
+                change_pct = np.where(previous > 0, change / previous * 100.0, np.nan)
+            metrics[window] = {"change": change, "change_pct": change_pct}
+            orders[window] = {}
+            for key, values in metrics[window].items():
+                # 내림차순, NaN 은 제외
+                valid = np.flatnonzero(~np.isnan(values))
+                orders[window][key] = valid[np.argsort(-values[valid], kind="stable")]
+        self.metrics, self.orders = metrics, orders
+
+    def _row(self, window: int, i: int) -> Dict[str, Any]:
+        metric = self.metrics[window]
+        return {
+            "code": self.codes[i],
+            "balance": _optional(self.balance[i, -1]),
+            "change": _optional(metric["change"][i]),
+            "change_pct": _optional(metric["change_pct"][i]),
+            "ratio": _optional(self.ratio[i]),
+        }
+
+    def top(
+        self,
+        window: int,
+        limit: int = 20,
+        by: str = "change_pct",
+        ascending: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        기간 잔고 급증 상위(ascending=True 면 급감 상위) 종목을 반환합니다.
+        """
+        if window not in self.windows:
+            raise KeyError(f"{window}일 인덱스가 없습니다.")
+        if by not in SURGE_SORT_KEYS:
+            raise KeyError(
+                f"정렬 기준은 {', '.join(SURGE_SORT_KEYS)} 중 하나여야 합니다."
+            )
+        if window not in self.orders:
+            return []
+        order = self.orders[window][by]
+        selected = order[::-1][:limit] if ascending else order[:limit]
+        return [self._row(window, int(i)) for i in selected]
+
+    def lookup(self, code: str) -> Dict[str, Dict[str, Any]]:
+        """
+        한 종목의 기간별 지표를 반환합니다.
+        """
+        i = self._rows.get(code)
+        if i is None or not self.metrics:
+            return {}
+        return {str(window): self._row(window, i) for window in self.windows}
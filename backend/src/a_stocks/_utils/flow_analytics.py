@@ -0,0 +1,196 @@
+"""
+투자자별 순매수 분석 (종목 x 일자 패널 기준, 벡터 연산)
+
+- 시간 축은 오래된 날짜 -> 최근 날짜 순서입니다.
+- 순매수 값이 없는 날(NaN)은 거래가 없었던 것으로 보고 0 으로 취급합니다.
+
+FlowIndex 는 투자자 x 기간 조합별로 최근 누적 순매수, 연속 순매수 일수, z-score,
+횡단면 순위와 정렬 순서를 미리 계산해 두어 "외국인 20일 순매수 상위" 같은
+질의를 정렬 없이 슬라이스로 응답합니다.
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from a_stocks._utils.indicators import rolling_std, sma
+
+FloatArray = npt.NDArray[np.float64]
+
+DEFAULT_INVESTORS = ("frgnr_invsr", "orgn", "ind_invsr")
+DEFAULT_WINDOWS = (5, 20, 60)
+
+
+def rolling_sum(values: npt.ArrayLike, window: int) -> FloatArray:
+    """
+    기간 누적 순매수를 계산합니다. 기간이 채워지지 않은 위치는 NaN 입니다.
+    """
+    if window < 1:
+        raise ValueError("window 는 1 이상이어야 합니다.")
+    array = np.nan_to_num(np.asarray(values, dtype=np.float64))
+    result = np.full(array.shape, np.nan)
+    if array.shape[1] < window:
+        return result
+    total = np.cumsum(array, axis=1)
+    total[:, window:] -= total[:, :-window].copy()
+    result[:, window - 1 :] = total[:, window - 1 :]
+    return result
+
+
+def net_buy_streak(values: npt.ArrayLike) -> npt.NDArray[np.int32]:
+    """
+    각 시점까지 이어진 연속 순매수(+)/순매도(-) 일수를 계산합니다.
+
+    순매수가 3일 이어졌으면 3, 순매도가 2일 이어졌으면 -2, 0 이면 0 입니다.
+    """
+    array = np.nan_to_num(np.asarray(values, dtype=np.float64))
+    index = np.arange(array.shape[1])
+
+    def run_length(mask: npt.NDArray[np.bool_]) -> npt.NDArray[np.intp]:
+        # 마지막으로 조건이 끊긴 위치를 누적 최대값으로 전파합니다.
+        last_break = np.maximum.accumulate(np.where(mask, -1, index), axis=1)
+        return np.where(mask, index - last_break, 0)
+
+    streak = run_length(array > 0) - run_length(array < 0)
+    return streak.astype(np.int32)
+
+
+def flow_zscore(values: npt.ArrayLike, window: int) -> FloatArray:
+    """
+    당일 순매수가 최근 window 일 평균에서 표준편차 몇 배만큼 벗어났는지 계산합니다.
+    """
+    array = np.nan_to_num(np.asarray(values, dtype=np.float64))
+    std = rolling_std(array, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        score = (array - sma(array, window)) / std
+    score[~np.isfinite(score)] = np.nan
+    return score
+
+
+def cross_sectional_rank(values: npt.ArrayLike) -> FloatArray:
+    """
+    시점별 종목 간 백분위 순위(0~1, 클수록 큼)를 계산합니다. NaN 은 NaN 입니다.
+    """
+    array = np.asarray(values, dtype=np.float64)
+    if array.ndim == 1:
+        array = array[:, np.newaxis]
+    valid = ~np.isnan(array)
+    # NaN 은 argsort 에서 맨 뒤로 가므로 유효 값의 순위는 0..n-1 입니다.
+    order = np.argsort(array, axis=0, kind="stable")
+    ranks = np.empty(array.shape, dtype=np.float64)
+    np.put_along_axis(
+        ranks, order, np.arange(array.shape[0], dtype=np.float64)[:, None], axis=0
+    )
+    count = valid.sum(axis=0, keepdims=True).astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ranks = np.where(count > 1, ranks / (count - 1), 1.0)
+    ranks[~valid] = np.nan
+    return ranks
+
+
+def _optional(value: Any) -> Optional[float]:
+    number = float(value)
+    return None if np.isnan(number) else round(number, 4)
+
+
+class FlowIndex:
+    """
+    투자자 x 기간별 최근 순매수 지표와 정렬 순서를 미리 계산한 인덱스입니다.
+    """
+
+    def __init__(
+        self,
+        codes: Sequence[str],
+        date: Optional[int],
+        metrics: Dict[Tuple[str, int], Dict[str, npt.NDArray[Any]]],
+        orders: Dict[Tuple[str, int], npt.NDArray[np.intp]],
+    ) -> None:
+        self.codes = list(codes)
+        self.date = date
+        self.metrics = metrics
+        self.orders = orders
+        self._rows = {code: i for i, code in enumerate(self.codes)}
+
+    @classmethod
+    def build(
+        cls,
+        codes: Sequence[str],
+        dates: npt.NDArray[np.int32],
+        fields: Mapping[str, npt.ArrayLike],
+        investors: Sequence[str] = DEFAULT_INVESTORS,
+        windows: Sequence[int] = DEFAULT_WINDOWS,
+    ) -> "FlowIndex":
+        """
+        패널의 마지막 일자 기준으로 인덱스를 만듭니다.
+
+        Args:
+            codes (Sequence[str]): 패널 행의 종목코드
+            dates (ndarray): 패널 열의 일자 (YYYYMMDD)
+            fields (Mapping): 투자자 필드명 -> (종목 x 일자) 순매수 배열
+            investors (Sequence[str]): 인덱싱할 투자자 필드
+            windows (Sequence[int]): 누적 기간(일)
+        """
+        metrics: Dict[Tuple[str, int], Dict[str, npt.NDArray[Any]]] = {}
+        orders: Dict[Tuple[str, int], npt.NDArray[np.intp]] = {}
+        if not len(dates):
+            return cls(codes, None, metrics, orders)
+        for investor in investors:
+            if investor not in fields:
+                continue
+            values = np.asarray(fields[investor], dtype=np.float64)
+            observed = ~np.isnan(values).all(axis=1)
+            streak = net_buy_streak(values)[:, -1]
+            for window in windows:
+                total = rolling_sum(values, window)[:, -1]
+                # 데이터가 전혀 없는 종목은 순위에서 제외합니다.
+                total[~observed] = np.nan
+                key = (investor, window)
+                metrics[key] = {
+                    "net": total,
+                    "rank": cross_sectional_rank(total).ravel(),
+                    "zscore": flow_zscore(values, window)[:, -1],
+                    "streak": streak,
+                }
+                # 순매수 내림차순, NaN 은 제외
+                valid = np.flatnonzero(~np.isnan(total))
+                orders[key] = valid[np.argsort(-total[valid], kind="stable")]
+        return cls(codes, int(dates[-1]), metrics, orders)
+
+    def keys(self) -> List[Tuple[str, int]]:
+        return sorted(self.metrics)
+
+    def _row(self, key: Tuple[str, int], i: int) -> Dict[str, Any]:
+        metric = self.metrics[key]
+        return {
+            "code": self.codes[i],
+            "net": _optional(metric["net"][i]),
+            "rank": _optional(metric["rank"][i]),
+            "zscore": _optional(metric["zscore"][i]),
+            "streak": int(metric["streak"][i]),
+        }
+
+    def top(
+        self, investor: str, window: int, limit: int = 20, ascending: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        기간 누적 순매수 상위(ascending=True 면 순매도 상위) 종목을 반환합니다.
+        """
+        key = (investor, window)
+        if key not in self.orders:
+            raise KeyError(f"{investor} {window}일 인덱스가 없습니다.")
+        order = self.orders[key]
+        selected = order[::-1][:limit] if ascending else order[:limit]
+        return [self._row(key, int(i)) for i in selected]
+
+    def lookup(self, code: str) -> Dict[str, Dict[str, Any]]:
+        """
+        한 종목의 모든 투자자 x 기간 지표를 반환합니다.
+        """
+        i = self._rows.get(code)
+        if i is None:
+            return {}
+        return {
+            f"{investor}:{window}": self._row((investor, window), i)
+            for investor, window in self.keys()
+        }
@@ -0,0 +1,372 @@
+"""
+종목 x 일자 2차원 배열로 저장하는 로컬 시계열 저장소
+
+데이터셋(예: "ka10015")마다 디렉터리 하나를 두고, 필드별로 float64 .npy 파일을
+저장합니다. 읽을 때는 memmap 으로 열기 때문에 10년 x 2,500종목 규모도 필요한
+구간만 페이지 단위로 읽습니다.
+
+    root/
+      ka10015 -> .ka10015.v3   # 현재 버전 디렉터리를 가리키는 심볼릭 링크
+      .ka10015.v3/
+        codes.json        # 행 순서의 종목코드 목록
+        dates.npy         # 열 순서의 일자 (int32 YYYYMMDD, 오름차순)
+        close_pric.npy    # (종목 수, 일자 수) float64, 값이 없으면 NaN
+        ...
+      .ka10015.lock       # 병합용 프로세스 간 잠금 파일
+
+- 기존 종목/일자/필드만 바꾸는 병합은 r+ memmap 으로 그 자리에서 씁니다.
+- 종목/일자/필드 축이 늘어날 때만 새 버전 디렉터리에 전체를 다시 쓰고, 링크를
+  원자적으로 바꿔 반영합니다. 직전 버전은 남겨 두므로 교체 직전에 링크를 따라간
+  읽기도 끝까지 읽을 수 있습니다.
+- 병합 전체(읽기-수정-쓰기)는 fcntl 파일 잠금으로 감싸 여러 프로세스(백필, 스냅샷,
+  워커)가 같은 데이터셋에 병합해도 서로의 행을 잃지 않습니다.
+"""
+
+import fcntl
+import json
+import os
+import re
+import shutil
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+import numpy.typing as npt
+
+from a_stocks._utils.code_registry import (
+    CodeRegistry,
+    IdArray,
+    get_code_registry,
+    locate,
+)
+
+FloatArray = npt.NDArray[np.float64]
+DateArray = npt.NDArray[np.int32]
+Columns = Mapping[str, npt.NDArray[Any]]
+
+
+class HistoryPanel:
+    """
+    저장소에서 읽은 종목 x 일자 패널입니다.
+
+    ids 는 행 순서의 종목코드 id (CodeRegistry) 입니다.
+    """
+
+    __slots__ = ("codes", "ids", "dates", "fields")
+
+    def __init__(
+        self,
+        codes: List[str],
+        dates: DateArray,
+        fields: Dict[str, FloatArray],
+        ids: Optional[IdArray] = None,
+    ) -> None:
+        self.codes = codes
+        self.ids = ids if ids is not None else get_code_registry().encode(codes)
+        self.dates = dates
+        self.fields = fields
+
+    def __getitem__(self, name: str) -> FloatArray:
+        return self.fields[name]
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return (len(self.codes), int(self.dates.size))
+
+
+class HistoryStore:
+    """
+    .npy 파일 기반의 종목 x 일자 시계열 저장소입니다.
+
+    파일에는 종목코드 문자열을 저장하고, 읽을 때 행을 종목코드 id 로 찾습니다.
+    """
+
+    def __init__(
+        self, root: Union[str, Path], registry: Optional[CodeRegistry] = None
+    ) -> None:
+        self.root = Path(root)
+        self.registry = registry if registry is not None else get_code_registry()
+        self._lock = threading.Lock()
+
+    def _path(self, dataset: str) -> Path:
+        return self.root / dataset
+
+    def _current(self, dataset: str) -> Path:
+        # 링크를 한 번만 따라가 같은 버전의 파일들만 읽습니다.
+        return self._path(dataset).resolve()
+
+    @staticmethod
+    def _codes_at(base: Path) -> List[str]:
+        path = base / "codes.json"
+        if not path.exists():
+            return []
+        codes: List[str] = json.loads(path.read_text(encoding="utf-8"))
+        return codes
+
+    @staticmethod
+    def _dates_at(base: Path) -> DateArray:
+        path = base / "dates.npy"
+        if not path.exists():
+            return np.array([], dtype=np.int32)
+        dates: DateArray = np.load(path)
+        return dates
+
+    @staticmethod
+    def _field_names_at(base: Path) -> List[str]:
+        if not base.exists():
+            return []
+        return sorted(p.stem for p in base.glob("*.npy") if p.stem != "dates")
+
+    def exists(self, dataset: str) -> bool:
+        return (self._path(dataset) / "dates.npy").exists()
+
+    def codes(self, dataset: str) -> List[str]:
+        return self._codes_at(self._current(dataset))
+
+    def dates(self, dataset: str) -> DateArray:
+        return self._dates_at(self._current(dataset))
+
+    def field_names(self, dataset: str) -> List[str]:
+        return self._field_names_at(self._current(dataset))
+
+    def load(
+        self,
+        dataset: str,
+        fields: Optional[Sequence[str]] = None,
+        codes: Optional[Sequence[str]] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> HistoryPanel:
+        """
+        패널을 읽습니다.
+
+        종목을 지정하지 않으면 memmap 뷰를 그대로 반환하므로 복사가 일어나지
+        않습니다. (읽기 전용)
+
+        Args:
+            dataset (str): 데이터셋 이름
+            fields (Sequence[str], optional): 읽을 필드. 기본값은 전체
+            codes (Sequence[str], optional): 읽을 종목. 저장소에 없는 종목은 NaN 행
+            start (int, optional): 시작일자 YYYYMMDD (포함)
+            end (int, optional): 종료일자 YYYYMMDD (포함)
+
+        Returns:
+            HistoryPanel: 종목 x 일자 패널
+        """
+        base = self._current(dataset)
+        stored_codes = self._codes_at(base)
+        stored_ids = self.registry.encode(stored_codes)
+        dates = self._dates_at(base)
+        lo = 0 if start is None else int(np.searchsorted(dates, start, side="left"))
+        hi = (
+            dates.size
+            if end is None
+            else int(np.searchsorted(dates, end, side="right"))
+        )
+
+        rows: Optional[npt.NDArray[np.intp]] = None
+        missing: Optional[npt.NDArray[np.bool_]] = None
+        ids = stored_ids
+        if codes is not None:
+            ids = self.registry.encode(codes)
+            rows = locate(stored_ids, ids)
+            missing = rows < 0
+            rows[missing] = 0
+
+        result: Dict[str, FloatArray] = {}
+        for name in fields or self._field_names_at(base):
+            path = base / f"{name}.npy"
+            if not path.exists():
+                raise KeyError(f"{dataset} 데이터셋에 {name} 필드가 없습니다.")
+            values: FloatArray = np.load(path, mmap_mode="r")[:, lo:hi]
+            if rows is not None and missing is not None:
+                if stored_codes:
+                    values = values[rows]
+                    values[missing] = np.nan
+                else:
+                    values = np.full((rows.size, hi - lo), np.nan)
+            result[name] = values
+
+        return HistoryPanel(
+            list(codes) if codes is not None else stored_codes,
+            dates[lo:hi],
+            result,
+            ids,
+        )
+
+    @contextmanager
+    def _locked(self, dataset: str) -> Iterator[None]:
+        """
+        같은 프로세스의 스레드와 다른 프로세스의 병합을 모두 막는 잠금입니다.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.root / f".{dataset}.lock", "a+b") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def merge(self, dataset: str, updates: Mapping[str, Columns]) -> int:
+        """
+        종목별 컬럼(일자 "dt" + 필드 배열)을 저장소에 병합합니다.
+
+        같은 종목/일자의 값은 새 값으로 덮어씁니다. 모든 종목/일자/필드가 이미 있으면
+        해당 값만 그 자리에서 쓰고, 축이 늘어날 때만 새 버전에 전체 배열을 다시 씁니다.
+
+        Args:
+            dataset (str): 데이터셋 이름
+            updates (Mapping[str, Columns]): 종목코드 -> decode_* 함수 결과
+
+        Returns:
+            int: 병합한 (종목, 일자) 값의 수
+        """
+        updates = {code: cols for code, cols in updates.items() if cols["dt"].size}
+        if not updates:
+            return 0
+
+        with self._locked(dataset):
+            base = self._current(dataset)
+            old_codes = self._codes_at(base)
+            old_dates = self._dates_at(base)
+            old_fields = set(self._field_names_at(base))
+            field_names = set(old_fields)
+            for cols in updates.values():
+                field_names.update(name for name in cols if name != "dt")
+            new_dates = np.setdiff1d(
+                np.concatenate(
+                    [np.asarray(c["dt"], dtype=np.int32) for c in updates.values()]
+                ),
+                old_dates,
+            )
+
+            if (
+                old_codes
+                and set(updates) <= set(old_codes)
+                and not new_dates.size
+                and field_names == old_fields
+            ):
+                self._write_in_place(base, old_codes, old_dates, updates)
+            else:
+                self._rebuild(
+                    dataset,
+                    base,
+                    old_codes,
+                    old_dates,
+                    sorted(field_names),
+                    new_dates,
+                    updates,
+                )
+            return sum(int(cols["dt"].size) for cols in updates.values())
+
+    @staticmethod
+    def _write_in_place(
+        base: Path,
+        codes: List[str],
+        dates: DateArray,
+        updates: Mapping[str, Columns],
+    ) -> None:
+        row_of = {code: i for i, code in enumerate(codes)}
+        names = sorted({name for cols in updates.values() for name in cols} - {"dt"})
+        for name in names:
+            target = np.load(base / f"{name}.npy", mmap_mode="r+")
+            for code, cols in updates.items():
+                if name in cols:
+                    positions = np.searchsorted(dates, cols["dt"])
+                    target[row_of[code], positions] = cols[name]
+            target.flush()
+            del target
+
+    def _rebuild(
+        self,
+        dataset: str,
+        base: Path,
+        old_codes: List[str],
+        old_dates: DateArray,
+        field_names: List[str],
+        new_dates: DateArray,
+        updates: Mapping[str, Columns],
+    ) -> None:
+        codes = old_codes + sorted(set(updates) - set(old_codes))
+        dates = np.union1d(old_dates, new_dates).astype(np.int32)
+        row_of = {code: i for i, code in enumerate(codes)}
+        old_cols = np.searchsorted(dates, old_dates)
+
+        version = self._next_version(dataset)
+        staging = self.root / version
+        staging.mkdir(parents=True)
+        for name in field_names:
+            target = np.lib.format.open_memmap(
+                staging / f"{name}.npy",
+                mode="w+",
+                dtype=np.float64,
+                shape=(len(codes), dates.size),
+            )
+            target[:] = np.nan
+            old_path = base / f"{name}.npy"
+            if old_path.exists() and old_codes:
+                target[: len(old_codes), old_cols] = np.load(old_path, mmap_mode="r")
+            for code, cols in updates.items():
+                if name not in cols:
+                    continue
+                positions = np.searchsorted(dates, cols["dt"])
+                target[row_of[code], positions] = cols[name]
+            target.flush()
+            del target
+
+        np.save(staging / "dates.npy", dates)
+        (staging / "codes.json").write_text(
+            json.dumps(codes, ensure_ascii=False), encoding="utf-8"
+        )
+        self._swap(dataset, version)
+
+    def _versions(self, dataset: str) -> List[Tuple[int, Path]]:
+        pattern = re.compile(rf"^\.{re.escape(dataset)}\.v(\d+)$")
+        versions = []
+        for path in self.root.iterdir():
+            match = pattern.match(path.name)
+            if match:
+                versions.append((int(match.group(1)), path))
+        return sorted(versions)
+
+    def _next_version(self, dataset: str) -> str:
+        versions = self._versions(dataset)
+        return f".{dataset}.v{versions[-1][0] + 1 if versions else 1}"
+
+    def _swap(self, dataset: str, version: str) -> None:
+        path = self._path(dataset)
+        previous = os.readlink(path) if path.is_symlink() else None
+        if path.exists() and not path.is_symlink():
+            # 링크 도입 전의 일반 디렉터리는 한 번만 버전 디렉터리로 옮깁니다.
+            previous = f".{dataset}.v0"
+            os.replace(path, self.root / previous)
+        link = self.root / f".{dataset}.link-{os.getpid()}"
+        link.unlink(missing_ok=True)
+        os.symlink(version, link)
+        # 링크 교체는 원자적이므로 읽는 쪽은 항상 이전 또는 새 버전을 봅니다.
+        os.replace(link, path)
+        for _, old in self._versions(dataset):
+            if old.name not in (version, previous):
+                shutil.rmtree(old, ignore_errors=True)
+
+    def drop(self, dataset: str) -> None:
+        with self._locked(dataset):
+            path = self._path(dataset)
+            if path.is_symlink():
+                path.unlink()
+            else:
+                shutil.rmtree(path, ignore_errors=True)
+            for _, old in self._versions(dataset):
+                shutil.rmtree(old, ignore_errors=True)
@@ -0,0 +1,369 @@
+"""
+기술적 지표 계산 모듈
+
+모든 함수는 (종목 수 x 기간) 2차원 float64 배열을 받아 같은 모양의 배열을 반환합니다.
+한 종목만 계산할 때는 (1 x 기간) 배열을 넘기면 됩니다.
+
+- 시간 축은 오래된 날짜 -> 최근 날짜 순서입니다.
+- 상장 전 구간처럼 앞쪽에 비어 있는 값은 NaN 으로 넘깁니다. 중간에 빠진 값은
+  호출하는 쪽에서 직전 값으로 채워야 합니다.
+- 계산에 필요한 기간이 채워지지 않은 위치는 NaN 입니다.
+
+IndicatorState 는 같은 결과를 하루 단위로 갱신합니다. 과거 구간을 다시 계산하지
+않고 새 종가 한 열만으로 모든 지표를 갱신합니다.
+"""
+
+from typing import Any, Dict, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+FloatArray = npt.NDArray[np.float64]
+
+
+def _as_2d(values: npt.ArrayLike) -> FloatArray:
+    array = np.asarray(values, dtype=np.float64)
+    if array.ndim == 1:
+        array = array[np.newaxis, :]
+    if array.ndim != 2:
+        raise ValueError("지표 입력은 (종목 x 기간) 2차원 배열이어야 합니다.")
+    return array
+
+
+def _rolling_moments(
+    values: npt.ArrayLike, window: int
+) -> Tuple[FloatArray, FloatArray]:
+    """
+    누적합으로 이동평균과 이동분산을 한 번에 계산합니다.
+
+    자릿수 손실을 줄이기 위해 종목별 평균을 빼고 누적합을 구합니다. 윈도우 안에
+    NaN 이 하나라도 있으면 결과는 NaN 입니다.
+    """
+    if window < 1:
+        raise ValueError("window 는 1 이상이어야 합니다.")
+    array = _as_2d(values)
+    mean = np.full(array.shape, np.nan)
+    variance = np.full(array.shape, np.nan)
+    if array.shape[1] < window:
+        return mean, variance
+
+    def window_sum(x: npt.NDArray[Any]) -> FloatArray:
+        total = np.cumsum(x, axis=1, dtype=np.float64)
+        total[:, window:] -= total[:, :-window].copy()
+        return total[:, window - 1 :]
+
+    missing = np.isnan(array)
+    has_missing = bool(missing.any())
+    if has_missing:
+        with np.errstate(invalid="ignore"):
+            offset = np.nan_to_num(np.nanmean(array, axis=1, keepdims=True))
+        centered = np.where(missing, 0.0, array - offset)
+    else:
+        offset = array[:, :1]
+        centered = array - offset
+
+    s1 = window_sum(centered) / window
+    s2 = window_sum(centered * centered) / window
+    mean[:, window - 1 :] = s1 + offset
+    variance[:, window - 1 :] = np.maximum(s2 - s1 * s1, 0.0)
+
+    if has_missing:
+        incomplete = window_sum(missing) > 0
+        mean[:, window - 1 :][incomplete] = np.nan
+        variance[:, window - 1 :][incomplete] = np.nan
+    return mean, variance
+
+
+def sma(values: npt.ArrayLike, window: int) -> FloatArray:
+    """
+    단순이동평균(SMA)을 계산합니다.
+    """
+    return _rolling_moments(values, window)[0]
+
+
+def rolling_std(values: npt.ArrayLike, window: int) -> FloatArray:
+    """
+    이동표준편차(모표준편차, ddof=0)를 계산합니다.
+    """
+    return np.sqrt(_rolling_moments(values, window)[1])
+
+
+class _EMA:
+    """
+    지수이동평균 상태입니다. 처음 span 개 값의 평균으로 시작하며 그 전에는 NaN 입니다.
+    """
+
+    def __init__(self, n_symbols: int, span: int) -> None:
+        if span < 1:
+            raise ValueError("span 은 1 이상이어야 합니다.")
+        self.span = span
+        self.alpha = 2.0 / (span + 1.0)
+        self.value = np.full(n_symbols, np.nan)
+        self.count = np.zeros(n_symbols, dtype=np.int64)
+        self._seed = np.zeros(n_symbols)
+
+    def update(self, x: FloatArray) -> FloatArray:
+        valid = ~np.isnan(x)
+        warming = valid & (self.count < self.span)
+        self._seed[warming] += x[warming]
+        self.count[valid] += 1
+
+        seeded = warming & (self.count == self.span)
+        self.value[seeded] = self._seed[seeded] / self.span
+
+        ready = valid & ~warming
+        self.value[ready] += self.alpha * (x[ready] - self.value[ready])
+        return self.value.copy()
+
+
+class _Wilder:
+    """
+    RSI 계산용 Wilder 평활 상태입니다.
+    """
+
+    def __init__(self, n_symbols: int, period: int) -> None:
+        if period < 1:
+            raise ValueError("period 는 1 이상이어야 합니다.")
+        self.period = period
+        self.prev = np.full(n_symbols, np.nan)
+        self.count = np.zeros(n_symbols, dtype=np.int64)
+        self.avg_gain = np.zeros(n_symbols)
+        self.avg_loss = np.zeros(n_symbols)
+
+    def update(self, x: FloatArray) -> FloatArray:
+        has_prev = ~np.isnan(self.prev)
+        valid = ~np.isnan(x) & has_prev
+        delta = np.where(valid, x - self.prev, 0.0)
+        gain = np.maximum(delta, 0.0)
+        loss = np.maximum(-delta, 0.0)
+
+        warming = valid & (self.count < self.period)
+        self.avg_gain[warming] += gain[warming] / self.period
+        self.avg_loss[warming] += loss[warming] / self.period
+
+        ready = valid & ~warming
+        n = self.period
+        self.avg_gain[ready] = (self.avg_gain[ready] * (n - 1) + gain[ready]) / n
+        self.avg_loss[ready] = (self.avg_loss[ready] * (n - 1) + loss[ready]) / n
+
+        self.count[valid] += 1
+        self.prev = np.where(np.isnan(x), self.prev, x)
+
+        out = np.full(x.shape, np.nan)
+        done = self.count >= self.period
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = self.avg_gain / self.avg_loss
+            out[done] = 100.0 - 100.0 / (1.0 + rs[done])
+        # 하락이 한 번도 없으면 RSI 는 100 입니다.
+        out[done & (self.avg_loss == 0.0)] = 100.0
+        out[done & (self.avg_loss == 0.0) & (self.avg_gain == 0.0)] = 50.0
+        return out
+
+
+class _Rolling:
+    """
+    고정 크기 링버퍼로 이동평균/이동표준편차를 갱신합니다.
+
+    합계와 제곱합을 누적하며, 버퍼가 한 바퀴 돌 때마다 버퍼에서 다시 계산해
+    부동소수점 오차가 쌓이지 않게 합니다.
+    """
+
+    def __init__(self, n_symbols: int, window: int) -> None:
+        if window < 1:
+            raise ValueError("window 는 1 이상이어야 합니다.")
+        self.window = window
+        self.buffer = np.zeros((n_symbols, window))
+        self.pos = np.zeros(n_symbols, dtype=np.int64)
+        self.count = np.zeros(n_symbols, dtype=np.int64)
+        self.total = np.zeros(n_symbols)
+        self.total_sq = np.zeros(n_symbols)
+
+    def update(self, x: FloatArray) -> Tuple[FloatArray, FloatArray]:
+        valid = np.flatnonzero(~np.isnan(x))
+        slot = self.pos[valid]
+        old = self.buffer[valid, slot]
+        new = x[valid]
+        self.buffer[valid, slot] = new
+        self.total[valid] += new - old
+        self.total_sq[valid] += new * new - old * old
+        self.count[valid] += 1
+        self.pos[valid] = (slot + 1) % self.window
+
+        wrapped = valid[self.pos[valid] == 0]
+        if wrapped.size:
+            self.total[wrapped] = self.buffer[wrapped].sum(axis=1)
+            self.total_sq[wrapped] = (self.buffer[wrapped] ** 2).sum(axis=1)
+
+        mean = np.full(x.shape, np.nan)
+        std = np.full(x.shape, np.nan)
+        full = self.count >= self.window
+        mean[full] = self.total[full] / self.window
+        variance = self.total_sq[full] / self.window - mean[full] ** 2
+        std[full] = np.sqrt(np.maximum(variance, 0.0))
+        return mean, std
+
+
+def ema(values: npt.ArrayLike, span: int) -> FloatArray:
+    """
+    지수이동평균(EMA)을 계산합니다. 처음 span 개 값의 SMA 로 시작합니다.
+    """
+    array = _as_2d(values)
+    state = _EMA(array.shape[0], span)
+    # 시간 축으로 순회하므로 (기간 x 종목) 연속 메모리로 바꿔 계산합니다.
+    columns = np.ascontiguousarray(array.T)
+    out = np.empty(columns.shape)
+    for t in range(columns.shape[0]):
+        out[t] = state.update(columns[t])
+    return out.T
+
+
+def rsi(close: npt.ArrayLike, period: int = 14) -> FloatArray:
+    """
+    Wilder 방식의 상대강도지수(RSI)를 계산합니다.
+    """
+    array = _as_2d(close)
+    state = _Wilder(array.shape[0], period)
+    # 시간 축으로 순회하므로 (기간 x 종목) 연속 메모리로 바꿔 계산합니다.
+    columns = np.ascontiguousarray(array.T)
+    out = np.empty(columns.shape)
+    for t in range(columns.shape[0]):
+        out[t] = state.update(columns[t])
+    return out.T
+
+
+def macd(
+    close: npt.ArrayLike, fast: int = 12, slow: int = 26, signal: int = 9
+) -> Tuple[FloatArray, FloatArray, FloatArray]:
+    """
+    MACD 선, 시그널 선, 히스토그램을 계산합니다.
+    """
+    array = _as_2d(close)
+    line = ema(array, fast) - ema(array, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def bollinger(
+    close: npt.ArrayLike, window: int = 20, num_std: float = 2.0
+) -> Tuple[FloatArray, FloatArray, FloatArray]:
+    """
+    볼린저 밴드의 (상단, 중심, 하단)을 계산합니다.
+    """
+    middle, variance = _rolling_moments(close, window)
+    width = np.sqrt(variance) * num_std
+    return middle + width, middle, middle - width
+
+
+def compute_indicators(
+    close: npt.ArrayLike,
+    sma_window: int = 20,
+    ema_span: int = 20,
+    rsi_period: int = 14,
+    macd_fast: int = 12,
+    macd_slow: int = 26,
+    macd_signal: int = 9,
+    bb_window: int = 20,
+    bb_std: float = 2.0,
+) -> Dict[str, FloatArray]:
+    """
+    기본 지표 묶음을 한 번에 계산합니다.
+
+    Returns:
+        Dict[str, FloatArray]: 지표 이름별 (종목 x 기간) 배열
+    """
+    array = _as_2d(close)
+    macd_line, macd_signal_line, macd_hist = macd(
+        array, macd_fast, macd_slow, macd_signal
+    )
+    bb_upper, bb_middle, bb_lower = bollinger(array, bb_window, bb_std)
+    return {
+        # 기간이 같으면 볼린저 중심선이 곧 SMA 입니다.
+        "sma": bb_middle if sma_window == bb_window else sma(array, sma_window),
+        "ema": ema(array, ema_span),
+        "rsi": rsi(array, rsi_period),
+        "macd": macd_line,
+        "macd_signal": macd_signal_line,
+        "macd_hist": macd_hist,
+        "bb_upper": bb_upper,
+        "bb_middle": bb_middle,
+        "bb_lower": bb_lower,
+    }
+
+
+class IndicatorState:
+    """
+    compute_indicators 와 같은 지표를 하루씩 증분 갱신합니다.
+
+    전체 시장의 하루치 종가 벡터(종목 수 길이)를 update() 에 넘기면 과거 구간을
+    다시 계산하지 않고 모든 지표의 최신 값을 반환합니다.
+    """
+
+    def __init__(
+        self,
+        n_symbols: int,
+        sma_window: int = 20,
+        ema_span: int = 20,
+        rsi_period: int = 14,
+        macd_fast: int = 12,
+        macd_slow: int = 26,
+        macd_signal: int = 9,
+        bb_window: int = 20,
+        bb_std: float = 2.0,
+    ) -> None:
+        self.n_symbols = n_symbols
+        self.bb_std = bb_std
+        self._sma = _Rolling(n_symbols, sma_window)
+        self._bb = (
+            self._sma if bb_window == sma_window else _Rolling(n_symbols, bb_window)
+        )
+        self._ema = _EMA(n_symbols, ema_span)
+        self._rsi = _Wilder(n_symbols, rsi_period)
+        self._fast = _EMA(n_symbols, macd_fast)
+        self._slow = _EMA(n_symbols, macd_slow)
+        self._signal = _EMA(n_symbols, macd_signal)
+
+    @classmethod
+    def from_history(cls, close: npt.ArrayLike, **params: Any) -> "IndicatorState":
+        """
+        과거 종가 (종목 x 기간) 배열로 상태를 만듭니다.
+        """
+        array = _as_2d(close)
+        state = cls(array.shape[0], **params)
+        for t in range(array.shape[1]):
+            state.update(array[:, t])
+        return state
+
+    def update(self, close: npt.ArrayLike) -> Dict[str, FloatArray]:
+        """
+        하루치 종가로 지표를 갱신합니다.
+
+        Args:
+            close (ArrayLike): 종목별 종가 (길이 n_symbols, 거래가 없으면 NaN)
+
+        Returns:
+            Dict[str, FloatArray]: 지표 이름별 종목 벡터
+        """
+        x = np.asarray(close, dtype=np.float64)
+        if x.shape != (self.n_symbols,):
+            raise ValueError("종가 벡터의 길이가 종목 수와 다릅니다.")
+
+        sma_value, sma_std = self._sma.update(x)
+        if self._bb is self._sma:
+            bb_middle, bb_std = sma_value, sma_std
+        else:
+            bb_middle, bb_std = self._bb.update(x)
+
+        line = self._fast.update(x) - self._slow.update(x)
+        signal_line = self._signal.update(line)
+        width = bb_std * self.bb_std
+        return {
+            "sma": sma_value,
+            "ema": self._ema.update(x),
+            "rsi": self._rsi.update(x),
+            "macd": line,
+            "macd_signal": signal_line,
+            "macd_hist": line - signal_line,
+            "bb_upper": bb_middle + width,
+            "bb_middle": bb_middle,
+            "bb_lower": bb_middle - width,
+        }
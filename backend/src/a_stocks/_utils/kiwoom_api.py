@@ -1,9 +1,12 @@
+import threading
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
 
 import httpx
 from django.conf import settings
 
+from a_stocks._utils.rate_limiter import PriorityRateLimiter
+
 
 class KiwoomAPI:
     def __init__(self) -> None:
@@ -17,6 +20,13 @@ class KiwoomAPI:
         self.client = httpx.Client(
             timeout=10.0, headers={"Content-Type": "application/json;charset=UTF-8"}
         )
+        # 스레드별 마지막 응답의 연속조회 헤더 (cont-yn, next-key)
+        self._continuation = threading.local()
+        # 동시에 여러 TR 을 요청해도 초당 요청 수를 넘지 않도록 제한합니다. 토큰은
+        # 대화형 요청에 먼저 주고 배치(request_priority(BATCH)) 요청은 남는 토큰을 씁니다.
+        self.rate_limiter = PriorityRateLimiter(
+            getattr(settings, "KIWOOM_RATE_LIMIT", 5.0)
+        )
 
     def _get_access_token(self) -> str:
         """
@@ -82,6 +92,7 @@ class KiwoomAPI:
         # API 요청 데이터 구성
         request_data = kwargs.get("json", {})
 
+        self.rate_limiter.acquire()
         response = self.client.request(
             method=method, url=url, headers=headers, json=request_data
         )
@@ -91,8 +102,57 @@ class KiwoomAPI:
         if result.get("return_code") != 0:
             raise Exception(f"API 요청 실패: {result.get('return_msg')}")
 
+        self._continuation.value = (
+            response.headers.get("cont-yn", "N"),
+            response.headers.get("next-key", ""),
+        )
         return result
 
+    def last_continuation(self) -> Tuple[str, str]:
+        """
+        현재 스레드에서 마지막으로 받은 응답의 연속조회 정보를 반환합니다.
+
+        Returns:
+            Tuple[str, str]: (cont-yn, next-key)
+        """
+        value: Tuple[str, str] = getattr(self._continuation, "value", ("N", ""))
+        return value
+
+    def paginate(
+        self,
+        request: Callable[..., Dict[str, Any]],
+        *args: Any,
+        max_pages: Optional[int] = None,
+        **kwargs: Any,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        연속조회를 지원하는 TR 을 페이지 단위로 순회합니다.
+
+        제너레이터이므로 소비하는 쪽이 멈추면 다음 페이지를 요청하지 않습니다.
+        연속조회 정보는 yield 전에 읽어 두므로 페이지 사이에 같은 스레드에서 다른 TR 을
+        요청하거나 다른 스레드에서 이어서 소비해도 다음 페이지 요청이 바뀌지 않습니다.
+
+        Args:
+            request (Callable): cont_yn, next_key 인자를 받는 TR 메서드
+                (예: api.today_vs_previous_day_execution_request_ka10084)
+            *args: TR 메서드 인자
+            max_pages (int, optional): 최대 페이지 수
+            **kwargs: TR 메서드 인자
+
+        Yields:
+            Dict[str, Any]: 페이지별 API 응답
+        """
+        cont_yn, next_key = "N", ""
+        pages = 0
+        while max_pages is None or pages < max_pages:
+            result = request(*args, cont_yn=cont_yn, next_key=next_key, **kwargs)
+            cont_yn, next_key = self.last_continuation()
+            pages += 1
+            yield result
+
+            if cont_yn != "Y" or not next_key:
+                return
+
     def basic_stock_information_request_ka10001(
         self, stock_code: str
     ) -> Dict[str, Any]:
@@ -221,15 +281,21 @@ class KiwoomAPI:
         return self._make_request("POST", "ka10013", url=url, json=data)
 
     def daily_transaction_details_request_ka10015(
-        self, stock_code: str, date: str
+        self, stock_code: str, date: str, cont_yn: str = "N", next_key: str = ""
     ) -> Dict[str, Any]:
         """
         일별거래상세요청: 일별 거래 상세 정보를 조회합니다.
         API ID: ka10015
 
+        date(strt_dt)는 조회 범위의 가장 오래된 일자입니다. 응답은 최근 거래일부터
+        과거 방향(최신 순서)으로 오고, 연속조회로 date 까지 이어 받습니다. 특정 기간만
+        필요해도 최근 거래일부터 그 기간의 시작일까지 페이지를 넘겨야 합니다.
+
         Args:
             stock_code (str): 종목코드 (예: '005930')
-            date (str): 시작일자 (YYYYMMDD)
+            date (str): 시작일자 (YYYYMMDD, 조회 범위의 가장 오래된 일자)
+            cont_yn (str, optional): 연속조회여부 (기본값: "N")
+            next_key (str, optional): 연속조회키 (기본값: "")
 
         Returns:
             Dict[str, Any]: 일별 거래 상세 정보
@@ -261,7 +327,14 @@ class KiwoomAPI:
         """
         url = f"{self.base_url}/api/dostk/stkinfo"
         data = {"stk_cd": stock_code, "strt_dt": date}
-        return self._make_request("POST", "ka10015", url=url, json=data)
+        return self._make_request(
+            "POST",
+            "ka10015",
+            url=url,
+            json=data,
+            cont_yn=cont_yn,
+            next_key=next_key,
+        )
 
     def reported_low_price_request_ka10016(
         self,
@@ -1468,9 +1541,15 @@ class KiwoomAPI:
         data = {"stk_cd": account_number, "strt_dt": start_date, "end_dt": end_date}
         return self._make_request("POST", "ka10073", json=data)
 
-    def __del__(self) -> None:
+    def close(self) -> None:
         """
         클라이언트 연결을 종료합니다.
         """
         if hasattr(self, "client"):
             self.client.close()
+
+    def __del__(self) -> None:
+        """
+        명시적으로 close() 되지 않은 경우를 위한 안전장치입니다.
+        """
+        self.close()
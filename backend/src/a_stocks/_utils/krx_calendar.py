@@ -0,0 +1,337 @@
+"""
+KRX/NXT 거래일과 장 운영 시간(세션)
+
+- 모든 시각은 한국 표준시(KST, UTC+9) 기준입니다.
+- 주말, 내장 휴장일(KRX_HOLIDAYS), 설정(KIWOOM_MARKET_HOLIDAYS)의 휴장일을 제외한
+  날을 거래일로 봅니다.
+- 거래소 구분은 키움 TR 의 stex_tp 값(1:KRX, 2:NXT, 3:통합)을 그대로 씁니다. 통합은
+  두 거래소 중 더 활발한 세션을 따릅니다.
+- 연초 첫 거래일(개장 1시간 지연)과 수능일(개장/마감 1시간 지연)은 세션 시각을
+  밀어서 계산합니다.
+- refresh_interval() 은 세션에 맞춘 캐시 TTL/폴링 주기를 돌려줍니다. 장이 닫혀
+  있으면 다음 세션 시작까지, 동시호가 중에는 더 짧게 잡습니다.
+"""
+
+import functools
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from django.conf import settings
+
+KST = timezone(timedelta(hours=9), "KST")
+
+# 거래소구분 (stex_tp)
+KRX = "1"
+NXT = "2"
+COMBINED = "3"
+EXCHANGES = (KRX, NXT, COMBINED)
+
+CLOSED = "closed"
+PRE_MARKET = "pre_market"
+OPENING_AUCTION = "opening_auction"
+CONTINUOUS = "continuous"
+CLOSING_AUCTION = "closing_auction"
+POST_MARKET = "post_market"
+AFTER_HOURS = "after_hours"
+AUCTIONS = (OPENING_AUCTION, CLOSING_AUCTION)
+
+# 통합 구분에서 두 거래소 세션이 겹칠 때 고르는 순서 (클수록 활발)
+_ACTIVITY = {
+    CLOSED: 0,
+    AFTER_HOURS: 1,
+    PRE_MARKET: 2,
+    POST_MARKET: 2,
+    OPENING_AUCTION: 3,
+    CLOSING_AUCTION: 3,
+    CONTINUOUS: 4,
+}
+
+SessionTemplate = Tuple[time, time, str]
+Session = Tuple[datetime, datetime, str]
+
+SESSION_TEMPLATES: Dict[str, Tuple[SessionTemplate, ...]] = {
+    KRX: (
+        # 장 시작 동시호가 (장전 시간외 종가 08:30~08:40 포함)
+        (time(8, 30), time(9, 0), OPENING_AUCTION),
+        (time(9, 0), time(15, 20), CONTINUOUS),
+        (time(15, 20), time(15, 30), CLOSING_AUCTION),
+        # 장후 시간외 종가
+        (time(15, 40), time(16, 0), POST_MARKET),
+        # 시간외 단일가 (10분 단위 체결)
+        (time(16, 0), time(18, 0), AFTER_HOURS),
+    ),
+    NXT: (
+        # 프리마켓
+        (time(8, 0), time(8, 50), PRE_MARKET),
+        # 메인마켓
+        (time(9, 0, 30), time(15, 20), CONTINUOUS),
+        # 애프터마켓
+        (time(15, 30), time(20, 0), POST_MARKET),
+    ),
+}
+
+# 이 시각 이전의 세션 경계는 개장 지연, 이후는 마감 지연만큼 밀립니다.
+_OPEN_SIDE = time(9, 0, 30)
+
+# KRX 휴장일 (주말 제외). 매년 갱신하고, 임시 휴장일은 KIWOOM_MARKET_HOLIDAYS 로 더합니다.
+KRX_HOLIDAYS: FrozenSet[date] = frozenset(
+    [
+        date(2025, 1, 1),
+        date(2025, 1, 27),
+        date(2025, 1, 28),
+        date(2025, 1, 29),
+        date(2025, 1, 30),
+        date(2025, 3, 3),
+        date(2025, 5, 1),
+        date(2025, 5, 5),
+        date(2025, 5, 6),
+        date(2025, 6, 3),
+        date(2025, 6, 6),
+        date(2025, 8, 15),
+        date(2025, 10, 3),
+        date(2025, 10, 6),
+        date(2025, 10, 7),
+        date(2025, 10, 8),
+        date(2025, 10, 9),
+        date(2025, 12, 25),
+        date(2025, 12, 31),
+        date(2026, 1, 1),
+        date(2026, 2, 16),
+        date(2026, 2, 17),
+        date(2026, 2, 18),
+        date(2026, 3, 2),
+        date(2026, 5, 1),
+        date(2026, 5, 5),
+        date(2026, 5, 25),
+        date(2026, 6, 3),
+        date(2026, 8, 17),
+        date(2026, 9, 24),
+        date(2026, 9, 25),
+        date(2026, 10, 5),
+        date(2026, 10, 9),
+        date(2026, 12, 25),
+        date(2026, 12, 31),
+    ]
+)
+
+# 개장/마감 지연일: 날짜 -> (개장 지연 분, 마감 지연 분). 수능일은 1시간씩 늦춰집니다.
+SHIFTED_DAYS: Dict[date, Tuple[int, int]] = {
+    date(2025, 11, 13): (60, 60),
+    date(2026, 11, 19): (60, 60),
+}
+
+# 연초 첫 거래일 개장 지연 (분)
+NEW_YEAR_OPEN_DELAY = 60
+
+
+def now_kst() -> datetime:
+    """
+    현재 KST 시각
+    """
+    return datetime.now(KST)
+
+
+@functools.lru_cache(maxsize=8)
+def parse_dates(value: str) -> FrozenSet[date]:
+    """
+    쉼표로 구분된 YYYYMMDD 문자열을 날짜 집합으로 변환합니다.
+    """
+    return frozenset(
+        datetime.strptime(text.strip(), "%Y%m%d").date()
+        for text in value.split(",")
+        if text.strip()
+    )
+
+
+def holidays() -> FrozenSet[date]:
+    """
+    내장 휴장일과 설정된 휴장일
+    """
+    extra = parse_dates(getattr(settings, "KIWOOM_MARKET_HOLIDAYS", ""))
+    return KRX_HOLIDAYS | extra if extra else KRX_HOLIDAYS
+
+
+def is_trading_day(day: date, closed: Optional[FrozenSet[date]] = None) -> bool:
+    """
+    주말/휴장일이 아니면 거래일입니다.
+    """
+    if day.weekday() >= 5:
+        return False
+    return day not in (closed if closed is not None else holidays())
+
+
+def next_trading_day(day: date, closed: Optional[FrozenSet[date]] = None) -> date:
+    """
+    day 를 포함해 가장 가까운 다음 거래일을 반환합니다.
+    """
+    closed = closed if closed is not None else holidays()
+    while not is_trading_day(day, closed):
+        day += timedelta(days=1)
+    return day
+
+
+def next_occurrence(
+    at: time, now: Optional[datetime] = None, closed: Optional[FrozenSet[date]] = None
+) -> datetime:
+    """
+    now 이후 처음 오는 거래일의 at(KST) 시각을 반환합니다.
+    """
+    now = (now or now_kst()).astimezone(KST)
+    day = next_trading_day(now.date(), closed)
+    moment = datetime.combine(day, at, KST)
+    if moment <= now:
+        day = next_trading_day(day + timedelta(days=1), closed)
+        moment = datetime.combine(day, at, KST)
+    return moment
+
+
+def parse_clock(value: str) -> time:
+    """
+    "HH:MM" 문자열을 time 으로 변환합니다.
+    """
+    return datetime.strptime(value.strip(), "%H:%M").time()
+
+
+def exchange_of(stock_code: str) -> str:
+    """
+    종목코드 접미사로 거래소 구분을 판단합니다. (_NX: NXT, _AL: 통합, 그 외 KRX)
+    """
+    if stock_code.endswith("_NX"):
+        return NXT
+    if stock_code.endswith("_AL"):
+        return COMBINED
+    return KRX
+
+
+def day_shift(day: date, closed: Optional[FrozenSet[date]] = None) -> Tuple[int, int]:
+    """
+    그날의 (개장 지연 분, 마감 지연 분)
+    """
+    shift = SHIFTED_DAYS.get(day)
+    if shift is not None:
+        return shift
+    if next_trading_day(date(day.year, 1, 1), closed) == day:
+        return NEW_YEAR_OPEN_DELAY, 0
+    return 0, 0
+
+
+def _sessions(day: date, exchange: str, shift: Tuple[int, int]) -> List[Session]:
+    sessions: List[Session] = []
+    for start, end, phase in SESSION_TEMPLATES[exchange]:
+        bounds = []
+        for moment in (start, end):
+            delay = shift[0] if moment <= _OPEN_SIDE else shift[1]
+            bounds.append(datetime.combine(day, moment, KST) + timedelta(minutes=delay))
+        if bounds[0] < bounds[1]:
+            sessions.append((bounds[0], bounds[1], phase))
+    return sessions
+
+
+def _phase_in(sessions: List[Session], moment: datetime) -> str:
+    for start, end, phase in sessions:
+        if start <= moment < end:
+            return phase
+    return CLOSED
+
+
+def day_sessions(
+    day: date, exchange: str = KRX, closed: Optional[FrozenSet[date]] = None
+) -> List[Session]:
+    """
+    그날의 세션 목록 (시작, 끝, 세션). 거래일이 아니면 빈 목록입니다.
+    """
+    if exchange not in EXCHANGES:
+        raise ValueError(f"거래소 구분은 {', '.join(EXCHANGES)} 중 하나여야 합니다.")
+    closed = closed if closed is not None else holidays()
+    if not is_trading_day(day, closed):
+        return []
+    shift = day_shift(day, closed)
+    if exchange != COMBINED:
+        return _sessions(day, exchange, shift)
+
+    parts = [_sessions(day, KRX, shift), _sessions(day, NXT, shift)]
+    bounds = sorted(
+        {
+            moment
+            for sessions in parts
+            for start, end, _ in sessions
+            for moment in (start, end)
+        }
+    )
+    merged: List[Session] = []
+    for start, end in zip(bounds, bounds[1:]):
+        phase = max(
+            (_phase_in(sessions, start) for sessions in parts),
+            key=_ACTIVITY.__getitem__,
+        )
+        if phase == CLOSED:
+            continue
+        if merged and merged[-1][1] == start and merged[-1][2] == phase:
+            merged[-1] = (merged[-1][0], end, phase)
+        else:
+            merged.append((start, end, phase))
+    return merged
+
+
+def session_at(
+    now: Optional[datetime] = None,
+    exchange: str = KRX,
+    closed: Optional[FrozenSet[date]] = None,
+) -> str:
+    """
+    now 시각의 세션
+    """
+    now = (now or now_kst()).astimezone(KST)
+    return _phase_in(day_sessions(now.date(), exchange, closed), now)
+
+
+def next_change(
+    now: Optional[datetime] = None,
+    exchange: str = KRX,
+    closed: Optional[FrozenSet[date]] = None,
+) -> datetime:
+    """
+    now 이후 세션이 처음 바뀌는 시각
+    """
+    now = (now or now_kst()).astimezone(KST)
+    closed = closed if closed is not None else holidays()
+    for start, end, _ in day_sessions(now.date(), exchange, closed):
+        if now < start:
+            return start
+        if now < end:
+            return end
+    day = next_trading_day(now.date() + timedelta(days=1), closed)
+    return day_sessions(day, exchange, closed)[0][0]
+
+
+def refresh_interval(
+    base: float,
+    exchange: str = KRX,
+    now: Optional[datetime] = None,
+    closed: Optional[FrozenSet[date]] = None,
+) -> float:
+    """
+    세션에 맞춘 캐시 TTL / 폴링 주기(초)를 반환합니다.
+
+    - 정규장: base
+    - 동시호가: min(base, KIWOOM_AUCTION_CACHE_TTL)
+    - 시간외/프리·애프터마켓: max(base, KIWOOM_OFF_HOURS_CACHE_TTL)
+    - 장 마감 후/휴장일: 다음 세션 시작까지 (그동안 바뀔 수 있는 값이 없습니다)
+
+    어느 경우든 세션이 바뀌는 시각을 넘지 않습니다. base 가 0 이하이면 캐시를
+    쓰지 않는다는 뜻이므로 그대로 돌려줍니다.
+    """
+    if base <= 0:
+        return base
+    now = (now or now_kst()).astimezone(KST)
+    phase = session_at(now, exchange, closed)
+    remaining = (next_change(now, exchange, closed) - now).total_seconds()
+    if phase == CLOSED:
+        return remaining
+    if phase == CONTINUOUS:
+        interval = base
+    elif phase in AUCTIONS:
+        interval = min(base, getattr(settings, "KIWOOM_AUCTION_CACHE_TTL", 0.5))
+    else:
+        interval = max(base, getattr(settings, "KIWOOM_OFF_HOURS_CACHE_TTL", 30.0))
+    return min(interval, remaining)
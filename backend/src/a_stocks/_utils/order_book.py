@@ -0,0 +1,288 @@
+"""
+모의 주문용 종목별 인메모리 주문장
+
+- 종목마다 매수 주문은 (가격 내림차순, 접수순), 매도 주문은 (가격 오름차순, 접수순)
+  힙으로 관리합니다. 접수와 체결은 O(log n) 입니다.
+- 취소는 주문 상태만 바꾸고 힙에서는 나중에 꺼낼 때 버립니다(지연 삭제). 버려야 할
+  항목이 절반을 넘으면 힙을 다시 만들어 메모리를 회수합니다.
+- 체결은 시세(최우선 매도/매수호가)와 교차하는 주문만 힙의 위에서부터 꺼내므로
+  체결 수 k 에 대해 O(k log n) 입니다.
+"""
+
+import heapq
+import itertools
+import math
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+BUY = "buy"
+SELL = "sell"
+SIDES = (BUY, SELL)
+
+LIMIT = "limit"
+MARKET = "market"
+ORDER_TYPES = (LIMIT, MARKET)
+
+OPEN = "open"
+FILLED = "filled"
+CANCELLED = "cancelled"
+REJECTED = "rejected"
+
+HeapEntry = Tuple[float, int, "Order"]
+
+
+def validate_order(side: str, quantity: int, price: Optional[float]) -> None:
+    """
+    Raises:
+        ValueError: 매매구분, 수량, 지정가가 잘못된 경우
+    """
+    if side not in SIDES:
+        raise ValueError(f"side 는 {', '.join(SIDES)} 중 하나여야 합니다.")
+    if quantity <= 0:
+        raise ValueError("주문 수량은 1 이상이어야 합니다.")
+    if price is not None and price <= 0:
+        raise ValueError("지정가는 0 보다 커야 합니다.")
+
+
+class Order:
+    """
+    모의 주문 한 건입니다.
+    """
+
+    __slots__ = (
+        "order_id",
+        "code",
+        "side",
+        "order_type",
+        "price",
+        "quantity",
+        "status",
+        "fill_price",
+        "created_at",
+        "updated_at",
+        "reason",
+    )
+
+    def __init__(
+        self,
+        order_id: int,
+        code: str,
+        side: str,
+        order_type: str,
+        price: Optional[float],
+        quantity: int,
+        created_at: float,
+    ) -> None:
+        self.order_id = order_id
+        self.code = code
+        self.side = side
+        self.order_type = order_type
+        # 시장가 주문은 None
+        self.price = price
+        self.quantity = quantity
+        self.status = OPEN
+        self.fill_price: Optional[float] = None
+        self.created_at = created_at
+        self.updated_at = created_at
+        # 거부 사유
+        self.reason: Optional[str] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.status == OPEN
+
+    def limit_key(self) -> float:
+        """
+        힙 정렬에 쓰는 가격입니다. 시장가 주문은 항상 가장 앞에 섭니다.
+        """
+        if self.price is None:
+            return math.inf if self.side == BUY else 0.0
+        return self.price
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class SymbolBook:
+    """
+    한 종목의 미체결 주문 힙입니다.
+    """
+
+    __slots__ = ("code", "_bids", "_asks", "_stale", "open_count")
+
+    def __init__(self, code: str) -> None:
+        self.code = code
+        # 매수는 가격을 음수로 넣어 최대 힙으로 씁니다.
+        self._bids: List[HeapEntry] = []
+        self._asks: List[HeapEntry] = []
+        self._stale = 0
+        self.open_count = 0
+
+    def add(self, order: Order, seq: int) -> None:
+        if order.side == BUY:
+            heapq.heappush(self._bids, (-order.limit_key(), seq, order))
+        else:
+            heapq.heappush(self._asks, (order.limit_key(), seq, order))
+        self.open_count += 1
+
+    def discard(self) -> None:
+        """
+        주문 하나가 힙 밖에서 닫혔음을 기록합니다. (취소 등)
+        """
+        self.open_count -= 1
+        self._stale += 1
+        if self._stale > max(64, self.open_count):
+            self._compact()
+
+    def _compact(self) -> None:
+        self._bids = [entry for entry in self._bids if entry[2].is_open]
+        self._asks = [entry for entry in self._asks if entry[2].is_open]
+        heapq.heapify(self._bids)
+        heapq.heapify(self._asks)
+        self._stale = 0
+
+    def _pop_crossing(
+        self, heap: List[HeapEntry], crosses: Callable[[float], bool]
+    ) -> Iterator[Order]:
+        while heap:
+            key, _, order = heap[0]
+            if not order.is_open:
+                heapq.heappop(heap)
+                self._stale -= 1
+                continue
+            if not crosses(key):
+                return
+            heapq.heappop(heap)
+            self.open_count -= 1
+            yield order
+
+    def crossing_buys(self, ask: float) -> Iterator[Order]:
+        """
+        매도호가 ask 에 살 수 있는(지정가 >= ask) 매수 주문을 우선순위대로 꺼냅니다.
+        """
+        return self._pop_crossing(self._bids, lambda key: -key >= ask)
+
+    def crossing_sells(self, bid: float) -> Iterator[Order]:
+        """
+        매수호가 bid 에 팔 수 있는(지정가 <= bid) 매도 주문을 우선순위대로 꺼냅니다.
+        """
+        return self._pop_crossing(self._asks, lambda key: key <= bid)
+
+    def best(self) -> Tuple[Optional[float], Optional[float]]:
+        """
+        가장 높은 매수 지정가와 가장 낮은 매도 지정가를 반환합니다.
+        """
+        for heap in (self._bids, self._asks):
+            while heap and not heap[0][2].is_open:
+                heapq.heappop(heap)
+                self._stale -= 1
+        bid = -self._bids[0][0] if self._bids else None
+        ask = self._asks[0][0] if self._asks else None
+        return bid, ask
+
+
+class OrderBook:
+    """
+    종목별 SymbolBook 과 주문 번호 색인을 묶은 주문장입니다.
+    """
+
+    def __init__(self) -> None:
+        self._books: Dict[str, SymbolBook] = {}
+        self._orders: Dict[int, Order] = {}
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def get(self, order_id: int) -> Optional[Order]:
+        return self._orders.get(order_id)
+
+    def add(
+        self,
+        code: str,
+        side: str,
+        quantity: int,
+        price: Optional[float],
+        created_at: float,
+        order_id: Optional[int] = None,
+    ) -> Order:
+        """
+        주문을 접수합니다. price 가 없으면 시장가 주문입니다.
+
+        order_id 가 없으면 주문장이 번호를 매깁니다. (저장된 주문을 다시 올릴 때 지정)
+        """
+        validate_order(side, quantity, price)
+        order = Order(
+            order_id if order_id is not None else next(self._ids),
+            code,
+            side,
+            MARKET if price is None else LIMIT,
+            price,
+            quantity,
+            created_at,
+        )
+        self._orders[order.order_id] = order
+        book = self._books.get(code)
+        if book is None:
+            book = self._books[code] = SymbolBook(code)
+        book.add(order, next(self._seq))
+        return order
+
+    def close(self, order: Order, status: str, updated_at: float) -> None:
+        """
+        아직 힙에 있는 주문을 닫습니다. (취소/거부)
+        """
+        if not order.is_open:
+            raise ValueError(
+                f"{order.order_id}번 주문은 이미 {order.status} 상태입니다."
+            )
+        order.status = status
+        order.updated_at = updated_at
+        book = self._books[order.code]
+        book.discard()
+        if book.open_count == 0:
+            del self._books[order.code]
+
+    def crossing(self, code: str, bid: float, ask: float) -> List[Order]:
+        """
+        호가와 교차하는 미체결 주문을 힙에서 꺼내 반환합니다. (접수 우선순위 순)
+
+        꺼낸 주문의 상태는 호출하는 쪽이 체결/거부로 바꿔야 합니다.
+        """
+        book = self._books.get(code)
+        if book is None:
+            return []
+        orders: List[Order] = []
+        if ask > 0:
+            orders.extend(book.crossing_buys(ask))
+        if bid > 0:
+            orders.extend(book.crossing_sells(bid))
+        if book.open_count == 0:
+            del self._books[code]
+        return orders
+
+    def open_count(self) -> int:
+        """
+        미체결 주문 수
+        """
+        return sum(book.open_count for book in self._books.values())
+
+    def codes(self) -> List[str]:
+        """
+        미체결 주문이 있는 종목코드
+        """
+        return sorted(self._books)
+
+    def best(self, code: str) -> Tuple[Optional[float], Optional[float]]:
+        book = self._books.get(code)
+        return book.best() if book is not None else (None, None)
+
+    def orders(
+        self, code: Optional[str] = None, status: Optional[str] = None
+    ) -> List[Order]:
+        return [
+            order
+            for order in self._orders.values()
+            if (code is None or order.code == code)
+            and (status is None or order.status == status)
+        ]
@@ -0,0 +1,65 @@
+import math
+from typing import Any
+
+
+def parse_number(value: Any) -> float:
+    """
+    키움 REST API 의 숫자 문자열을 float 로 변환합니다.
+
+    부호가 붙은 값("+74800", "-0", "--28837")과 빈 문자열을 처리합니다.
+    빈 값은 0.0 으로 취급합니다.
+
+    Args:
+        value (Any): API 응답 필드 값
+
+    Returns:
+        float: 변환된 숫자
+    """
+    if value is None:
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    text = str(value).strip().replace(",", "")
+    if not text:
+        return 0.0
+
+    negative = False
+    while text and text[0] in "+-":
+        # "--28837" 처럼 부호가 중복된 값은 음수로 봅니다.
+        negative = negative or text[0] == "-"
+        text = text[1:]
+
+    if not text:
+        return 0.0
+    number = float(text)
+    return -number if negative else number
+
+
+def parse_price(value: Any) -> float:
+    """
+    가격 필드를 변환합니다. 가격의 부호는 전일대비 방향을 뜻하므로 절대값을 사용합니다.
+
+    Args:
+        value (Any): API 응답 가격 필드 값 (예: "+156600", "-85200")
+
+    Returns:
+        float: 가격
+    """
+    return abs(parse_number(value))
+
+
+def parse_optional(value: Any) -> float:
+    """
+    값이 없을 수 있는 지표 필드를 변환합니다. 빈 값(적자 기업의 PER 등)은 0 이 아니라
+    NaN 입니다.
+
+    Args:
+        value (Any): API 응답 필드 값
+
+    Returns:
+        float: 변환된 숫자 (빈 값이면 NaN)
+    """
+    if value is None or not str(value).strip():
+        return math.nan
+    return parse_number(value)
@@ -0,0 +1,210 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Sequence
+
+import numpy as np
+
+# 요청 우선순위 클래스 (앞쪽이 높은 우선순위)
+INTERACTIVE = "interactive"
+BATCH = "batch"
+PRIORITY_CLASSES = (INTERACTIVE, BATCH)
+
+_priority: ContextVar[str] = ContextVar("kiwoom_request_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def request_priority(priority: str) -> Iterator[None]:
+    """
+    블록 안에서 보내는 TR 요청의 우선순위 클래스를 정합니다.
+
+    컨텍스트 변수이므로 스레드 풀에 넘긴 작업에는 이어지지 않습니다. 작업 함수
+    안에서 감싸야 합니다.
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    """
+    현재 컨텍스트의 요청 우선순위 클래스입니다. (기본값: INTERACTIVE)
+    """
+    return _priority.get()
+
+
+class TokenBucket:
+    """
+    스레드 안전한 토큰 버킷 요청 제한기입니다.
+
+    여러 스레드가 동시에 TR 을 요청해도 초당 rate 개(순간 최대 burst 개)를 넘지
+    않도록 호출 순서대로 대기 시간을 배정합니다. rate 가 0 이하이면 제한하지 않습니다.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        토큰을 예약하고, 사용 전에 기다려야 하는 시간(초)을 반환합니다.
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            # 잔량이 음수가 되도록 미리 차감해 두면 뒤이은 호출은 그만큼 더 기다립니다.
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """
+        토큰을 사용할 수 있을 때까지 대기합니다.
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            self._sleep(wait)
+
+
+class WaitStats:
+    """
+    최근 samples 개 대기 시간으로 백분위수를 계산합니다.
+    """
+
+    def __init__(self, samples: int = 2048) -> None:
+        self._waits: Deque[float] = deque(maxlen=samples)
+        self.count = 0
+
+    def record(self, wait: float) -> None:
+        self._waits.append(wait)
+        self.count += 1
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict[str, Any]: 누적 허용 수(count)와 최근 표본의 대기 시간 p50/p99/최대(ms)
+        """
+        if not self._waits:
+            return {"count": self.count, "p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        waits = np.fromiter(self._waits, dtype=np.float64) * 1000.0
+        p50, p99 = np.percentile(waits, [50, 99])
+        return {
+            "count": self.count,
+            "p50_ms": round(float(p50), 3),
+            "p99_ms": round(float(p99), 3),
+            "max_ms": round(float(waits.max()), 3),
+        }
+
+
+class PriorityRateLimiter:
+    """
+    우선순위 클래스별 대기열을 둔 스레드 안전한 토큰 버킷입니다. (strict priority)
+
+    TokenBucket 처럼 호출 순서대로 미래의 토큰을 예약하지 않고, 토큰이 생길 때마다
+    대기 중인 가장 높은 우선순위 클래스의 가장 먼저 온 요청에게 줍니다. 그래서 배치
+    요청이 아무리 많이 밀려 있어도 대화형 요청은 다음 토큰(최대 1/rate 초)만 기다립니다.
+    클래스 안에서는 도착 순서를 지킵니다. rate 가 0 이하이면 제한하지 않습니다.
+
+    acquire 의 priority 를 생략하면 current_priority() 를 씁니다.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        priorities: Sequence[str] = PRIORITY_CLASSES,
+        clock: Callable[[], float] = time.monotonic,
+        samples: int = 2048,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        self.priorities = tuple(priorities)
+        self._clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+        self._cond = threading.Condition()
+        self._queues: Dict[str, Deque[object]] = {p: deque() for p in self.priorities}
+        self._stats = {p: WaitStats(samples) for p in self.priorities}
+
+    def _head(self) -> Optional[object]:
+        for queue in self._queues.values():
+            if queue:
+                return queue[0]
+        return None
+
+    def acquire(self, tokens: float = 1.0, priority: Optional[str] = None) -> float:
+        """
+        우선순위 차례가 되고 토큰을 사용할 수 있을 때까지 대기합니다.
+
+        Returns:
+            float: 기다린 시간(초)
+        """
+        priority = priority if priority is not None else current_priority()
+        if priority not in self._queues:
+            raise ValueError(f"알 수 없는 요청 우선순위입니다: {priority}")
+        start = self._clock()
+        with self._cond:
+            if self.rate <= 0:
+                self._stats[priority].record(0.0)
+                return 0.0
+            queue = self._queues[priority]
+            ticket = object()
+            queue.append(ticket)
+            # 새 요청이 대기 중인 낮은 우선순위 요청보다 먼저 깨어나 차례를 확인합니다.
+            self._cond.notify_all()
+            try:
+                while True:
+                    timeout: Optional[float] = None
+                    if self._head() is ticket:
+                        now = self._clock()
+                        self._tokens = min(
+                            self.burst, self._tokens + (now - self._updated) * self.rate
+                        )
+                        self._updated = now
+                        if self._tokens >= tokens:
+                            self._tokens -= tokens
+                            waited = now - start
+                            self._stats[priority].record(waited)
+                            return waited
+                        timeout = (tokens - self._tokens) / self.rate
+                    self._cond.wait(timeout)
+            finally:
+                queue.remove(ticket)
+                self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict[str, Any]: rate 와 클래스별 대기 중 요청 수(waiting) + WaitStats.report
+        """
+        with self._cond:
+            return {
+                "rate": self.rate,
+                "classes": [
+                    {
+                        "priority": priority,
+                        "waiting": len(self._queues[priority]),
+                        **self._stats[priority].report(),
+                    }
+                    for priority in self.priorities
+                ],
+            }
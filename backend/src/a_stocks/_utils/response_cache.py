@@ -0,0 +1,132 @@
+import hashlib
+import time
+from typing import Callable, Optional
+
+from django.http import HttpRequest, HttpResponse
+
+from a_stocks._utils.cache_backends import CacheBackend, LocalCacheBackend, Payload
+
+
+class CachedResponse:
+    """
+    직렬화가 끝난 응답 본문과 ETag 입니다.
+    """
+
+    __slots__ = ("body", "etag", "expires_at")
+
+    def __init__(self, body: bytes, etag: str, expires_at: float) -> None:
+        self.body = body
+        self.etag = etag
+        self.expires_at = expires_at
+
+
+class ResponseCache:
+    """
+    TTL 응답 캐시입니다.
+
+    JSON 으로 직렬화된 본문을 그대로 보관하므로 캐시 적중 시 업스트림 호출과
+    JSON 인코딩을 모두 건너뜁니다. 저장은 backend 에 맡기며 기본값은 프로세스 내
+    LRU(max_entries 개)입니다. 공유 백엔드를 주면 워커 프로세스들이 캐시를 함께 씁니다.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 1.0,
+        max_entries: int = 4096,
+        backend: Optional[CacheBackend] = None,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.backend = (
+            backend if backend is not None else LocalCacheBackend(max_entries)
+        )
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        value = self.backend.get(key)
+        if value is None or isinstance(value, CachedResponse):
+            return value
+        # 직렬화 백엔드는 벽시계 만료 시각을 저장하므로 이 프로세스의 monotonic 으로
+        # 옮깁니다.
+        remaining = value.meta["expires_at"] - time.time()
+        return CachedResponse(
+            bytes(value.body), value.meta["etag"], time.monotonic() + remaining
+        )
+
+    def set(
+        self, key: str, body: bytes, etag: str, ttl: Optional[float] = None
+    ) -> CachedResponse:
+        """
+        ttl 을 주면 이 항목만 기본 TTL 대신 그 시간 동안 유지합니다.
+        """
+        ttl = ttl if ttl is not None else self.ttl
+        entry = CachedResponse(body, etag, time.monotonic() + ttl)
+        self.backend.set(
+            key,
+            Payload({"etag": etag, "expires_at": time.time() + ttl}, body)
+            if self.backend.serialized
+            else entry,
+            ttl,
+        )
+        return entry
+
+    def delete(self, key: str) -> None:
+        self.backend.delete(key)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def close(self) -> None:
+        self.backend.close()
+
+
+def make_etag(content: bytes) -> str:
+    """
+    내용 기반의 약한(weak) ETag 를 만듭니다.
+
+    시세 응답의 timestamp 처럼 의미 없이 바뀌는 필드는 호출하는 쪽에서 제외한
+    content 를 넘겨야 같은 시세에 같은 ETag 가 붙습니다.
+    """
+    return f'W/"{hashlib.blake2b(content, digest_size=8).hexdigest()}"'
+
+
+def etag_matches(request: HttpRequest, etag: str) -> bool:
+    """
+    If-None-Match 헤더가 주어진 ETag 와 (약한 비교로) 일치하는지 확인합니다.
+    """
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in header.split(",")
+    )
+
+
+def conditional_json_response(
+    request: HttpRequest,
+    cache: ResponseCache,
+    key: str,
+    produce: Callable[[], CachedResponse],
+) -> HttpResponse:
+    """
+    캐시된 JSON 응답을 ETag/Cache-Control 과 함께 돌려줍니다.
+
+    캐시에 없으면 produce() 로 본문과 ETag 를 만들고, If-None-Match 가 일치하면
+    본문 없이 304 를 반환합니다.
+    """
+    entry = cache.get(key)
+    if entry is None:
+        entry = produce()
+
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": (
+            f"private, max-age={max(int(entry.expires_at - time.monotonic()), 0)}"
+        ),
+    }
+    if etag_matches(request, entry.etag):
+        return HttpResponse(status=304, headers=headers)
+    return HttpResponse(entry.body, content_type="application/json", headers=headers)
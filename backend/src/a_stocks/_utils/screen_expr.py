@@ -0,0 +1,319 @@
+"""
+스크리너 조건/점수 표현식
+
+표현식은 ColumnTable 의 컬럼 배열 전체에 대해 한 번에 평가됩니다.
+파이썬 연산자로 조합하거나(col("surge.jmp_rt") > 3) 문자열로 받아 파싱할 수
+있습니다. 문자열은 ast 로 파싱한 뒤 허용된 노드만 표현식으로 변환하므로
+eval 을 사용하지 않습니다.
+
+    parse_expression("surge.jmp_rt > 2 and open_change.cntr_str >= 120")
+    parse_expression("rank(surge.jmp_rt) + rank(open_change.cntr_str)")
+"""
+
+import ast
+import operator
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Set, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from a_stocks._utils.columnar import ColumnTable
+
+Array = npt.NDArray[Any]
+Operand = Union["Expr", float, int, bool]
+
+
+class Expr(ABC):
+    """
+    컬럼 단위로 평가되는 표현식의 기본 클래스입니다.
+    """
+
+    @abstractmethod
+    def evaluate(self, table: ColumnTable) -> Array: ...
+
+    def columns(self) -> Set[str]:
+        """
+        표현식이 참조하는 컬럼 이름 목록을 반환합니다.
+        """
+        return set()
+
+    def _binary(self, op: Callable[[Any, Any], Any], other: Operand) -> "Expr":
+        return BinaryOp(op, self, _wrap(other))
+
+    def _reflected(self, op: Callable[[Any, Any], Any], other: Operand) -> "Expr":
+        return BinaryOp(op, _wrap(other), self)
+
+    def __add__(self, other: Operand) -> "Expr":
+        return self._binary(operator.add, other)
+
+    def __radd__(self, other: Operand) -> "Expr":
+        return self._reflected(operator.add, other)
+
+    def __sub__(self, other: Operand) -> "Expr":
+        return self._binary(operator.sub, other)
+
+    def __rsub__(self, other: Operand) -> "Expr":
+        return self._reflected(operator.sub, other)
+
+    def __mul__(self, other: Operand) -> "Expr":
+        return self._binary(operator.mul, other)
+
+    def __rmul__(self, other: Operand) -> "Expr":
+        return self._reflected(operator.mul, other)
+
+    def __truediv__(self, other: Operand) -> "Expr":
+        return self._binary(operator.truediv, other)
+
+    def __rtruediv__(self, other: Operand) -> "Expr":
+        return self._reflected(operator.truediv, other)
+
+    def __neg__(self) -> "Expr":
+        return UnaryOp(operator.neg, self)
+
+    def __gt__(self, other: Operand) -> "Expr":
+        return self._binary(operator.gt, other)
+
+    def __ge__(self, other: Operand) -> "Expr":
+        return self._binary(operator.ge, other)
+
+    def __lt__(self, other: Operand) -> "Expr":
+        return self._binary(operator.lt, other)
+
+    def __le__(self, other: Operand) -> "Expr":
+        return self._binary(operator.le, other)
+
+    def __and__(self, other: Operand) -> "Expr":
+        return self._binary(np.logical_and, other)
+
+    def __rand__(self, other: Operand) -> "Expr":
+        return self._reflected(np.logical_and, other)
+
+    def __or__(self, other: Operand) -> "Expr":
+        return self._binary(np.logical_or, other)
+
+    def __ror__(self, other: Operand) -> "Expr":
+        return self._reflected(np.logical_or, other)
+
+    def __invert__(self) -> "Expr":
+        return UnaryOp(np.logical_not, self)
+
+
+class Column(Expr):
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def evaluate(self, table: ColumnTable) -> Array:
+        if self.name not in table:
+            raise ValueError(f"알 수 없는 컬럼입니다: {self.name}")
+        return table[self.name]
+
+    def columns(self) -> Set[str]:
+        return {self.name}
+
+    def __repr__(self) -> str:
+        return f"col({self.name!r})"
+
+
+class Literal(Expr):
+    def __init__(self, value: float) -> None:
+        self.value = value
+
+    def evaluate(self, table: ColumnTable) -> Array:
+        return np.full(len(table), self.value)
+
+    def __repr__(self) -> str:
+        return repr(self.value)
+
+
+class UnaryOp(Expr):
+    def __init__(self, op: Callable[[Any], Any], operand: Expr) -> None:
+        self.op = op
+        self.operand = operand
+
+    def evaluate(self, table: ColumnTable) -> Array:
+        result: Array = self.op(self.operand.evaluate(table))
+        return result
+
+    def columns(self) -> Set[str]:
+        return self.operand.columns()
+
+
+class BinaryOp(Expr):
+    def __init__(self, op: Callable[[Any, Any], Any], left: Expr, right: Expr) -> None:
+        self.op = op
+        self.left = left
+        self.right = right
+
+    def evaluate(self, table: ColumnTable) -> Array:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result: Array = self.op(
+                self.left.evaluate(table), self.right.evaluate(table)
+            )
+        return result
+
+    def columns(self) -> Set[str]:
+        return self.left.columns() | self.right.columns()
+
+
+class Call(Expr):
+    def __init__(self, name: str, *args: Expr) -> None:
+        if name not in FUNCTIONS:
+            raise ValueError(f"지원하지 않는 함수입니다: {name}")
+        self.name = name
+        self.args = args
+
+    def evaluate(self, table: ColumnTable) -> Array:
+        return FUNCTIONS[self.name](*(arg.evaluate(table) for arg in self.args))
+
+    def columns(self) -> Set[str]:
+        names: Set[str] = set()
+        for arg in self.args:
+            names |= arg.columns()
+        return names
+
+
+def _wrap(value: Operand) -> Expr:
+    return value if isinstance(value, Expr) else Literal(float(value))
+
+
+def col(name: str) -> Expr:
+    """
+    컬럼 참조 표현식을 만듭니다. (예: col("surge.jmp_rt"))
+    """
+    return Column(name)
+
+
+def _rank(values: Array) -> Array:
+    """
+    0~1 사이의 백분위 순위. NaN 은 NaN 으로 남습니다.
+    """
+    values = values.astype(np.float64)
+    valid = ~np.isnan(values)
+    result = np.full(values.size, np.nan)
+    count = int(valid.sum())
+    if count == 0:
+        return result
+    order = np.argsort(values[valid], kind="stable")
+    ranks = np.empty(count)
+    ranks[order] = np.arange(count)
+    result[valid] = ranks / max(count - 1, 1)
+    return result
+
+
+def _zscore(values: Array) -> Array:
+    values = values.astype(np.float64)
+    if np.isnan(values).all():
+        return values
+    std = np.nanstd(values)
+    if std == 0:
+        return np.where(np.isnan(values), np.nan, 0.0)
+    result: Array = (values - np.nanmean(values)) / std
+    return result
+
+
+def _fillna(values: Array, fill: Array) -> Array:
+    return np.where(np.isnan(values), fill, values)
+
+
+FUNCTIONS: Dict[str, Callable[..., Array]] = {
+    "abs": np.abs,
+    "rank": _rank,
+    "zscore": _zscore,
+    "fillna": _fillna,
+    "isnull": np.isnan,
+    "min": np.fmin,
+    "max": np.fmax,
+}
+
+_BINARY_OPERATORS: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+
+_COMPARE_OPERATORS: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+
+
+def _column_name(node: ast.expr) -> str:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return f"{_column_name(node.value)}.{node.attr}"
+    raise ValueError("컬럼 이름이 올바르지 않습니다.")
+
+
+def _convert_compare(node: ast.Compare) -> Expr:
+    # a < b < c 는 (a < b) and (b < c) 로 변환합니다.
+    operands = [_convert(node.left)] + [_convert(c) for c in node.comparators]
+    comparisons: List[Expr] = []
+    for i, op in enumerate(node.ops):
+        if type(op) not in _COMPARE_OPERATORS:
+            raise ValueError(f"지원하지 않는 비교 연산입니다: {type(op).__name__}")
+        comparisons.append(
+            BinaryOp(_COMPARE_OPERATORS[type(op)], operands[i], operands[i + 1])
+        )
+    result = comparisons[0]
+    for comparison in comparisons[1:]:
+        result = BinaryOp(np.logical_and, result, comparison)
+    return result
+
+
+def _convert(node: ast.expr) -> Expr:
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return Literal(float(node.value))
+    if isinstance(node, (ast.Name, ast.Attribute)):
+        return Column(_column_name(node))
+    if isinstance(node, ast.BoolOp):
+        logical: Callable[[Any, Any], Any] = (
+            np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+        )
+        result = _convert(node.values[0])
+        for value in node.values[1:]:
+            result = BinaryOp(logical, result, _convert(value))
+        return result
+    if isinstance(node, ast.UnaryOp):
+        if isinstance(node.op, ast.Not):
+            return UnaryOp(np.logical_not, _convert(node.operand))
+        if isinstance(node.op, ast.USub):
+            return UnaryOp(operator.neg, _convert(node.operand))
+        if isinstance(node.op, ast.UAdd):
+            return _convert(node.operand)
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+        return BinaryOp(
+            _BINARY_OPERATORS[type(node.op)], _convert(node.left), _convert(node.right)
+        )
+    if isinstance(node, ast.Compare):
+        return _convert_compare(node)
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and not node.keywords
+    ):
+        return Call(node.func.id, *(_convert(arg) for arg in node.args))
+    raise ValueError(f"지원하지 않는 표현식입니다: {ast.dump(node)[:60]}")
+
+
+def parse_expression(text: str) -> Expr:
+    """
+    문자열 표현식을 Expr 로 변환합니다.
+
+    지원: 숫자, 컬럼(이름 또는 "source.field"), + - * /, 비교 연산,
+    and/or/not, FUNCTIONS 의 함수 호출
+
+    Raises:
+        ValueError: 문법 오류 또는 지원하지 않는 구문
+    """
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"표현식 문법 오류: {e.msg}")
+    return _convert(tree.body)
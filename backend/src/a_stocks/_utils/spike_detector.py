@@ -0,0 +1,453 @@
+"""
+거래량 급증/매물대 집중 이상치 탐지 (ka10024 거래량갱신, ka10025 매물대집중)
+
+- 순위 TR 을 폴링할 때마다 종목별 지표 값을 (종목 x window) 순환 버퍼에 기록하고,
+  종목별 합/제곱합/개수도 함께 갱신합니다. 기준선(평균/표준편차)은 이 누적값에서 바로
+  계산하므로 폴링 한 번의 작업량은 window 와 무관하게 O(종목 수) 입니다.
+- 새 값은 버퍼에 넣기 전의 기준선과 비교해 z-score 가 임계값 이상이면 경보를 만듭니다.
+- 경보는 AlertSink 로 폴링당 한 번에 넘깁니다. 종목명은 TR 응답에서 받아 메모리에 들고
+  있으므로 경보를 만들 때 DB 를 조회하지 않습니다.
+"""
+
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+import numpy.typing as npt
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from a_stocks._utils.parsers import parse_number
+
+logger = logging.getLogger(__name__)
+
+FloatArray = npt.NDArray[np.float64]
+
+VOLUME_UPDATE_KEY = "trde_qty_updt"
+CONCENTRATION_KEY = "prps_cnctr"
+
+# 지표별 표준편차 하한. 거래량은 log1p(분당 거래량) 척도, 매물비는 % 척도입니다.
+SPIKE_METRICS: Dict[str, float] = {"volume": 0.1, "concentration": 1.0}
+
+Alert = Dict[str, Any]
+
+
+def decode_volume_update_ka10024(
+    response: Mapping[str, Any],
+) -> Tuple[List[str], List[str], FloatArray]:
+    """
+    거래량갱신요청(ka10024) 응답을 (종목코드, 종목명, 현재 누적 거래량)으로 변환합니다.
+    """
+    rows = [row for row in response.get(VOLUME_UPDATE_KEY, []) if row.get("stk_cd")]
+    volume = np.fromiter(
+        (abs(parse_number(row.get("now_trde_qty"))) for row in rows),
+        dtype=np.float64,
+        count=len(rows),
+    )
+    return (
+        [str(row["stk_cd"]) for row in rows],
+        [str(row.get("stk_nm") or "") for row in rows],
+        volume,
+    )
+
+
+def decode_concentration_ka10025(
+    response: Mapping[str, Any],
+) -> Tuple[List[str], List[str], FloatArray]:
+    """
+    매물대집중요청(ka10025) 응답을 (종목코드, 종목명, 매물비 %)로 변환합니다.
+
+    한 종목이 여러 가격대로 나오면 가장 큰 매물비를 씁니다.
+    """
+    rows = [row for row in response.get(CONCENTRATION_KEY, []) if row.get("stk_cd")]
+    codes, first, inverse = np.unique(
+        np.array([str(row["stk_cd"]) for row in rows], dtype=object),
+        return_index=True,
+        return_inverse=True,
+    )
+    ratio = np.fromiter(
+        (parse_number(row.get("prps_rt")) for row in rows),
+        dtype=np.float64,
+        count=len(rows),
+    )
+    best = np.full(codes.size, -np.inf)
+    np.maximum.at(best, inverse, ratio)
+    return (
+        [str(code) for code in codes],
+        [str(rows[i].get("stk_nm") or "") for i in first],
+        best,
+    )
+
+
+class RollingBaseline:
+    """
+    종목별 최근 window 개 값의 평균/표준편차를 O(종목 수)로 갱신하는 순환 버퍼입니다.
+
+    push() 마다 열 하나를 덮어쓰며, 그 열에 있던 값을 누적 합에서 빼고 새 값을
+    더합니다. 부동소수 오차가 쌓이지 않도록 window 번 기록할 때마다 버퍼에서 누적값을
+    다시 계산합니다(평균 O(종목 수)).
+    """
+
+    def __init__(self, max_codes: int, window: int) -> None:
+        if window < 2:
+            raise ValueError("window 는 2 이상이어야 합니다.")
+        self.window = window
+        self._values = np.full((max_codes, window), np.nan)
+        self._sum = np.zeros(max_codes)
+        self._sumsq = np.zeros(max_codes)
+        self._n = np.zeros(max_codes, dtype=np.int64)
+        self._count = 0
+
+    def reset(self) -> None:
+        self._values.fill(np.nan)
+        self._sum.fill(0.0)
+        self._sumsq.fill(0.0)
+        self._n.fill(0)
+        self._count = 0
+
+    def stats(
+        self, rows: npt.NDArray[np.intp]
+    ) -> Tuple[FloatArray, FloatArray, npt.NDArray[np.int64]]:
+        """
+        종목 행들의 (평균, 표준편차, 값 개수). 값이 없는 종목의 평균/표준편차는 NaN 입니다.
+        """
+        n = self._n[rows]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = np.where(n > 0, self._sum[rows] / n, np.nan)
+            variance = np.where(n > 0, self._sumsq[rows] / n - mean * mean, np.nan)
+        return mean, np.sqrt(np.maximum(variance, 0.0)), n
+
+    def push(self, rows: npt.NDArray[np.intp], values: FloatArray) -> None:
+        """
+        이번 폴링 값을 새 열로 기록합니다. 넣지 않은 종목과 NaN 값은 비워 둡니다.
+        """
+        column = self._count % self.window
+        old = self._values[:, column]
+        known = ~np.isnan(old)
+        self._sum[known] -= old[known]
+        self._sumsq[known] -= old[known] * old[known]
+        self._n[known] -= 1
+        old.fill(np.nan)
+
+        present = ~np.isnan(values)
+        rows, values = rows[present], values[present]
+        self._values[rows, column] = values
+        self._sum[rows] += values
+        self._sumsq[rows] += values * values
+        self._n[rows] += 1
+        self._count += 1
+        if self._count % self.window == 0:
+            self._sum = np.nansum(self._values, axis=1)
+            self._sumsq = np.nansum(self._values * self._values, axis=1)
+            self._n = np.count_nonzero(~np.isnan(self._values), axis=1)
+
+
+class AlertSink(ABC):
+    """
+    이상치 경보를 받는 출력 대상의 기본 클래스입니다.
+
+    emit() 은 폴링 스레드에서 호출되므로 오래 걸리는 작업은 구현체가 따로 넘겨야 합니다.
+    """
+
+    @abstractmethod
+    def emit(self, alerts: Sequence[Alert]) -> None: ...
+
+
+class LoggingAlertSink(AlertSink):
+    """
+    경보를 로그(WARNING)로 남깁니다.
+    """
+
+    def emit(self, alerts: Sequence[Alert]) -> None:
+        for alert in alerts:
+            logger.warning(
+                "%s %s(%s) 이상치: 값 %.2f, 기준 %.2f, z %.2f",
+                alert["metric"],
+                alert["name"],
+                alert["code"],
+                alert["value"],
+                alert["baseline"],
+                alert["zscore"],
+            )
+
+
+class MemoryAlertSink(AlertSink):
+    """
+    최근 경보를 개수 제한이 있는 큐에 보관합니다.
+    """
+
+    def __init__(self, maxlen: int = 1000) -> None:
+        self._alerts: Deque[Alert] = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def emit(self, alerts: Sequence[Alert]) -> None:
+        with self._lock:
+            self._alerts.extend(alerts)
+
+    def clear(self) -> None:
+        """
+        보관한 경보를 모두 지웁니다.
+        """
+        with self._lock:
+            self._alerts.clear()
+
+    def recent(self, limit: int = 50, metric: Optional[str] = None) -> List[Alert]:
+        """
+        최근 경보를 최신 순서로 반환합니다.
+        """
+        with self._lock:
+            alerts = list(self._alerts)
+        selected = [
+            alert
+            for alert in reversed(alerts)
+            if metric is None or alert["metric"] == metric
+        ]
+        return selected[:limit]
+
+
+class CallbackAlertSink(AlertSink):
+    """
+    경보 목록을 함수에 넘깁니다.
+    """
+
+    def __init__(self, callback: Callable[[Sequence[Alert]], None]) -> None:
+        self.callback = callback
+
+    def emit(self, alerts: Sequence[Alert]) -> None:
+        self.callback(alerts)
+
+
+class FanoutAlertSink(AlertSink):
+    """
+    여러 출력 대상에 경보를 넘깁니다. 한 대상이 실패해도 나머지에는 넘깁니다.
+    """
+
+    def __init__(self, sinks: Sequence[AlertSink]) -> None:
+        self.sinks = list(sinks)
+
+    def emit(self, alerts: Sequence[Alert]) -> None:
+        for sink in self.sinks:
+            try:
+                sink.emit(alerts)
+            except Exception:
+                logger.exception("%s 경보 전달 중 오류 발생", type(sink).__name__)
+
+
+def load_alert_sinks(paths: str) -> List[AlertSink]:
+    """
+    쉼표로 구분한 클래스 경로(예: "a_stocks._utils.spike_detector.LoggingAlertSink")로
+    출력 대상을 만듭니다. 인자 없이 생성할 수 있는 클래스여야 합니다.
+    """
+    sinks: List[AlertSink] = []
+    for path in paths.split(","):
+        if path.strip():
+            sinks.append(import_string(path.strip())())
+    return sinks
+
+
+class SpikeDetector:
+    """
+    종목별 순환 기준선과 비교해 거래량 급증/매물대 집중 이상치를 찾습니다.
+
+    종목 행은 지표끼리 공유하며 max_codes 개까지만 추적합니다. 같은 종목/지표의 경보는
+    cooldown 초 안에 다시 보내지 않습니다.
+    """
+
+    def __init__(
+        self,
+        sink: Optional[AlertSink] = None,
+        window: Optional[int] = None,
+        threshold: Optional[float] = None,
+        max_codes: Optional[int] = None,
+        cooldown: Optional[float] = None,
+        min_periods: int = 5,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.sink = sink if sink is not None else LoggingAlertSink()
+        self.window: int = (
+            window
+            if window is not None
+            else getattr(settings, "KIWOOM_SPIKE_WINDOW", 30)
+        )
+        self.threshold: float = (
+            threshold
+            if threshold is not None
+            else getattr(settings, "KIWOOM_SPIKE_THRESHOLD", 3.0)
+        )
+        self.max_codes: int = (
+            max_codes
+            if max_codes is not None
+            else getattr(settings, "KIWOOM_SPIKE_MAX_CODES", 4000)
+        )
+        self.cooldown: float = (
+            cooldown
+            if cooldown is not None
+            else getattr(settings, "KIWOOM_SPIKE_COOLDOWN", 300.0)
+        )
+        self.min_periods = max(2, min(min_periods, self.window))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._codes: List[str] = []
+        self._names: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._baselines = {
+            metric: RollingBaseline(self.max_codes, self.window)
+            for metric in SPIKE_METRICS
+        }
+        self._last_alert = {
+            metric: np.full(self.max_codes, -np.inf) for metric in SPIKE_METRICS
+        }
+        # 분당 거래량을 구하기 위한 종목별 직전 누적 거래량과 시각
+        self._last_volume = np.full(self.max_codes, np.nan)
+        self._last_time = np.full(self.max_codes, np.nan)
+
+    def reset(self) -> None:
+        """
+        추적 종목과 기준선을 모두 비웁니다(새 거래일 시작 등).
+        """
+        with self._lock:
+            self._codes.clear()
+            self._names.clear()
+            self._rows.clear()
+            for baseline in self._baselines.values():
+                baseline.reset()
+            for last in self._last_alert.values():
+                last.fill(-np.inf)
+            self._last_volume.fill(np.nan)
+            self._last_time.fill(np.nan)
+
+    def _row_index(self, code: str, name: str) -> int:
+        row = self._rows.get(code)
+        if row is None:
+            if len(self._codes) >= self.max_codes:
+                return -1
+            row = len(self._codes)
+            self._rows[code] = row
+            self._codes.append(code)
+            self._names.append(name)
+        return row
+
+    def _locate(
+        self, codes: Sequence[str], names: Sequence[str]
+    ) -> npt.NDArray[np.intp]:
+        index = np.fromiter(
+            (self._row_index(code, name) for code, name in zip(codes, names)),
+            dtype=np.intp,
+            count=len(codes),
+        )
+        if (index < 0).any():
+            logger.warning(
+                "이상치 탐지 종목 수 한도(%d)를 넘어 %d개 종목을 제외합니다.",
+                self.max_codes,
+                int((index < 0).sum()),
+            )
+        return index
+
+    def _detect(
+        self,
+        metric: str,
+        rows: npt.NDArray[np.intp],
+        scores: FloatArray,
+        values: FloatArray,
+        now: float,
+        to_value: Callable[[float], float],
+    ) -> List[Alert]:
+        baseline = self._baselines[metric]
+        mean, std, n = baseline.stats(rows)
+        with np.errstate(invalid="ignore"):
+            zscore = (scores - mean) / np.maximum(std, SPIKE_METRICS[metric])
+            flagged = np.flatnonzero(
+                (n >= self.min_periods)
+                & (zscore >= self.threshold)
+                & (now - self._last_alert[metric][rows] >= self.cooldown)
+            )
+        baseline.push(rows, scores)
+        self._last_alert[metric][rows[flagged]] = now
+        return [
+            {
+                "code": self._codes[rows[i]],
+                "name": self._names[rows[i]],
+                "metric": metric,
+                "value": round(float(values[i]), 4),
+                "baseline": round(to_value(float(mean[i])), 4),
+                "zscore": round(float(zscore[i]), 4),
+                "at": now,
+            }
+            for i in flagged
+        ]
+
+    def _emit(self, alerts: List[Alert]) -> List[Alert]:
+        if alerts:
+            try:
+                self.sink.emit(alerts)
+            except Exception:
+                logger.exception("이상치 경보 전달 중 오류 발생")
+        return alerts
+
+    def observe_volume(
+        self,
+        codes: Sequence[str],
+        names: Sequence[str],
+        volume: npt.ArrayLike,
+        now: Optional[float] = None,
+    ) -> List[Alert]:
+        """
+        누적 거래량(ka10024)을 직전 폴링 대비 분당 거래량으로 바꿔 기준선과 비교합니다.
+
+        처음 본 종목이나 누적 거래량이 줄어든 종목은 이번 폴링에서 값을 만들지 않습니다.
+        기준선은 log1p(분당 거래량) 척도로 계산합니다.
+        """
+        now = now if now is not None else self._clock()
+        cumulative = np.asarray(volume, dtype=np.float64)
+        with self._lock:
+            index = self._locate(codes, names)
+            kept = index >= 0
+            rows, cumulative = index[kept], cumulative[kept]
+            elapsed = now - self._last_time[rows]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                rate = np.where(
+                    (elapsed > 0) & (cumulative >= self._last_volume[rows]),
+                    (cumulative - self._last_volume[rows]) / elapsed * 60.0,
+                    np.nan,
+                )
+            self._last_volume[rows] = cumulative
+            self._last_time[rows] = now
+            alerts = self._detect(
+                "volume", rows, np.log1p(rate), rate, now, lambda x: float(np.expm1(x))
+            )
+        return self._emit(alerts)
+
+    def observe_concentration(
+        self,
+        codes: Sequence[str],
+        names: Sequence[str],
+        ratio: npt.ArrayLike,
+        now: Optional[float] = None,
+    ) -> List[Alert]:
+        """
+        매물비(ka10025, %)를 기준선과 비교합니다.
+        """
+        now = now if now is not None else self._clock()
+        values = np.asarray(ratio, dtype=np.float64)
+        with self._lock:
+            index = self._locate(codes, names)
+            kept = index >= 0
+            rows, values = index[kept], values[kept]
+            alerts = self._detect(
+                "concentration", rows, values, values, now, lambda x: x
+            )
+        return self._emit(alerts)
@@ -0,0 +1,413 @@
+"""
+프로세스 풀 기반 파라미터 스윕 / 워크포워드 실행기
+
+시장 데이터는 워커에 피클로 복사하지 않습니다. 각 워커는 초기화 시 한 번만
+공유 메모리(SharedPanel) 또는 시계열 저장소의 memmap(StorePanelSpec)에 붙고,
+작업으로는 (파라미터, 구간) 묶음만 전달됩니다. 작업은 워커 수의 몇 배 크기의
+샤드로 나눠 보내므로 프로세스 간 통신 비용이 실행 시간에 비해 작게 유지됩니다.
+
+    with SharedPanel(panel.fields, panel.dates) as shared:
+        table = run_sweep(
+            shared.spec(), sma_crossover, param_grid(fast=[5, 10, 20], slow=[60, 120])
+        )
+"""
+
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.context import BaseContext
+from multiprocessing.shared_memory import SharedMemory
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+import numpy.typing as npt
+
+from a_stocks._utils.backtest import Signal, run_backtest
+from a_stocks._utils.history_store import HistoryStore
+
+FloatArray = npt.NDArray[np.float64]
+SignalFactory = Callable[..., Signal]
+Window = Tuple[int, int]
+
+
+def _attach(name: str) -> SharedMemory:
+    """
+    기존 공유 메모리 블록에 붙습니다.
+
+    워커는 부모의 resource_tracker 를 공유하므로 3.12 이하에서 붙을 때 생기는
+    재등록은 같은 이름이 한 번 더 기록될 뿐이고, 해제는 생성한 프로세스가
+    unlink 할 때 한 번만 일어납니다.
+    """
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+    return SharedMemory(name=name)
+
+
+class SharedPanelSpec:
+    """
+    워커가 공유 메모리 패널에 붙기 위한 정보입니다. (피클 크기가 작습니다)
+    """
+
+    def __init__(
+        self,
+        blocks: Dict[str, Tuple[str, Tuple[int, ...], str]],
+        dates: List[int],
+    ) -> None:
+        self.blocks = blocks
+        self.dates = dates
+
+    def attach(self) -> Tuple[Dict[str, FloatArray], npt.NDArray[Any], List[Any]]:
+        fields: Dict[str, FloatArray] = {}
+        handles: List[Any] = []
+        for name, (block, shape, dtype) in self.blocks.items():
+            shm = _attach(block)
+            handles.append(shm)
+            view: FloatArray = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+            view.flags.writeable = False
+            fields[name] = view
+        return fields, np.asarray(self.dates), handles
+
+
+class StorePanelSpec:
+    """
+    워커가 시계열 저장소의 .npy 파일을 memmap 으로 직접 여는 패널 정보입니다.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        dataset: str = "ka10015",
+        fields: Optional[Sequence[str]] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> None:
+        self.root = root
+        self.dataset = dataset
+        self.fields = list(fields) if fields is not None else None
+        self.start = start
+        self.end = end
+
+    def attach(self) -> Tuple[Dict[str, FloatArray], npt.NDArray[Any], List[Any]]:
+        panel = HistoryStore(self.root).load(
+            self.dataset, fields=self.fields, start=self.start, end=self.end
+        )
+        return panel.fields, panel.dates, []
+
+
+PanelSpec = Union[SharedPanelSpec, StorePanelSpec]
+
+
+class SharedPanel:
+    """
+    필드 배열을 공유 메모리로 복사해 두는 패널입니다. with 블록을 벗어나면 해제됩니다.
+    """
+
+    def __init__(
+        self, fields: Mapping[str, FloatArray], dates: Optional[Sequence[Any]] = None
+    ) -> None:
+        self._blocks: Dict[str, SharedMemory] = {}
+        self._specs: Dict[str, Tuple[str, Tuple[int, ...], str]] = {}
+        n_days = 0
+        for name, values in fields.items():
+            array = np.ascontiguousarray(values, dtype=np.float64)
+            n_days = array.shape[-1]
+            shm = SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+            self._blocks[name] = shm
+            self._specs[name] = (shm.name, array.shape, array.dtype.str)
+        self._dates = (
+            [int(d) for d in dates] if dates is not None else list(range(n_days))
+        )
+
+    def spec(self) -> SharedPanelSpec:
+        return SharedPanelSpec(dict(self._specs), self._dates)
+
+    def close(self) -> None:
+        for shm in self._blocks.values():
+            shm.close()
+            shm.unlink()
+        self._blocks.clear()
+
+    def __enter__(self) -> "SharedPanel":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class SweepTable:
+    """
+    스윕 결과 행들을 모은 표입니다.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]]) -> None:
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def columns(self) -> Dict[str, npt.NDArray[Any]]:
+        """
+        열 이름별 배열로 변환합니다.
+        """
+        names: List[str] = []
+        for row in self.rows:
+            names.extend(name for name in row if name not in names)
+        return {name: np.array([row.get(name) for row in self.rows]) for name in names}
+
+    def sort(self, metric: str, descending: bool = True) -> "SweepTable":
+        return SweepTable(
+            sorted(
+                self.rows,
+                key=lambda row: _sort_key(row.get(metric)),
+                reverse=descending,
+            )
+        )
+
+    def best(self, metric: str = "sharpe") -> Optional[Dict[str, Any]]:
+        ordered = self.sort(metric).rows
+        return ordered[0] if ordered else None
+
+
+def _sort_key(value: Any) -> float:
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return -np.inf
+    return float(value)
+
+
+def param_grid(**choices: Sequence[Any]) -> List[Dict[str, Any]]:
+    """
+    파라미터별 후보의 모든 조합을 만듭니다.
+
+        param_grid(fast=[5, 10], slow=[60, 120])  # 4개 조합
+    """
+    names = list(choices)
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*(choices[name] for name in names))
+    ]
+
+
+def walk_forward_windows(
+    n_days: int, train: int, test: int, step: Optional[int] = None
+) -> List[Tuple[Window, Window]]:
+    """
+    (학습 구간, 검증 구간) 쌍을 만듭니다. 구간은 [시작, 끝) 일자 인덱스입니다.
+
+    Args:
+        n_days (int): 전체 일자 수
+        train (int): 학습 구간 길이
+        test (int): 검증 구간 길이
+        step (int, optional): 창 이동 간격. 기본값은 test
+    """
+    step = step or test
+    windows: List[Tuple[Window, Window]] = []
+    start = 0
+    while start + train + test <= n_days:
+        windows.append(((start, start + train), (start + train, start + train + test)))
+        start += step
+    return windows
+
+
+# 워커 프로세스 상태 (초기화 시 한 번 설정)
+_worker_fields: Dict[str, FloatArray] = {}
+_worker_dates: npt.NDArray[Any] = np.array([])
+_worker_handles: List[Any] = []
+
+
+def _init_worker(spec: PanelSpec) -> None:
+    global _worker_fields, _worker_dates, _worker_handles
+    _worker_fields, _worker_dates, _worker_handles = spec.attach()
+
+
+def _evaluate(
+    fields: Mapping[str, FloatArray],
+    dates: npt.NDArray[Any],
+    factory: SignalFactory,
+    params: Mapping[str, Any],
+    window: Window,
+    warmup: int,
+    backtest_kwargs: Mapping[str, Any],
+) -> Dict[str, Any]:
+    """
+    한 파라미터 조합을 한 구간에서 평가합니다.
+
+    시그널은 구간 시작 warmup 일 전부터 계산해 이동평균 등의 초기 구간이 평가 구간에
+    섞이지 않도록 합니다.
+    """
+    start, stop = window
+    signal_start = max(0, start - warmup)
+    history = {name: values[:, signal_start:stop] for name, values in fields.items()}
+    raw = factory(**params)(history)[:, start - signal_start :]
+    result = run_backtest(
+        {name: values[:, start:stop] for name, values in fields.items()},
+        raw,
+        dates=dates[start:stop],
+        **backtest_kwargs,
+    )
+    return {
+        **params,
+        "start": int(dates[start]),
+        "end": int(dates[stop - 1]),
+        **result.stats,
+    }
+
+
+def _run_shard(
+    factory: SignalFactory,
+    tasks: Sequence[Tuple[Dict[str, Any], Window]],
+    warmup: int,
+    backtest_kwargs: Mapping[str, Any],
+) -> List[Dict[str, Any]]:
+    return [
+        _evaluate(
+            _worker_fields,
+            _worker_dates,
+            factory,
+            params,
+            window,
+            warmup,
+            backtest_kwargs,
+        )
+        for params, window in tasks
+    ]
+
+
+def _shards(tasks: List[Any], workers: int, per_worker: int = 4) -> List[List[Any]]:
+    size = max(1, -(-len(tasks) // (workers * per_worker)))
+    return [tasks[i : i + size] for i in range(0, len(tasks), size)]
+
+
+class SweepRunner:
+    """
+    공유 패널에 붙은 워커 풀로 (파라미터, 구간) 작업을 실행합니다.
+
+    같은 Runner 로 여러 번 스윕하면 워커와 공유 데이터 연결을 재사용합니다.
+    """
+
+    def __init__(
+        self,
+        spec: PanelSpec,
+        max_workers: Optional[int] = None,
+        mp_context: Optional[BaseContext] = None,
+    ) -> None:
+        self.spec = spec
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(spec,),
+        )
+
+    def run(
+        self,
+        factory: SignalFactory,
+        tasks: Sequence[Tuple[Dict[str, Any], Window]],
+        warmup: int = 250,
+        **backtest_kwargs: Any,
+    ) -> SweepTable:
+        """
+        작업들을 샤드로 나눠 병렬 실행하고 결과를 한 표로 모읍니다.
+
+        Args:
+            factory (SignalFactory): 파라미터를 받아 시그널 함수를 만드는 모듈 수준 함수
+            tasks (Sequence): (파라미터, (시작, 끝)) 목록
+            warmup (int): 시그널 계산에 추가로 사용할 이전 일수
+            **backtest_kwargs: run_backtest 인자 (costs, lag, rebalance ...)
+        """
+        shards = _shards(list(tasks), self.max_workers)
+        futures = [
+            self._executor.submit(_run_shard, factory, shard, warmup, backtest_kwargs)
+            for shard in shards
+        ]
+        rows: List[Dict[str, Any]] = []
+        for future in futures:
+            rows.extend(future.result())
+        return SweepTable(rows)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "SweepRunner":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def _n_days(spec: PanelSpec) -> int:
+    if isinstance(spec, SharedPanelSpec):
+        return len(spec.dates)
+    _, dates, _ = spec.attach()
+    return int(dates.size)
+
+
+def run_sweep(
+    spec: PanelSpec,
+    factory: SignalFactory,
+    grid: Sequence[Dict[str, Any]],
+    window: Optional[Window] = None,
+    max_workers: Optional[int] = None,
+    **backtest_kwargs: Any,
+) -> SweepTable:
+    """
+    전체(또는 지정) 구간에서 파라미터 그리드를 병렬로 평가합니다.
+    """
+    window = window or (0, _n_days(spec))
+    with SweepRunner(spec, max_workers) as runner:
+        return runner.run(
+            factory, [(dict(params), window) for params in grid], **backtest_kwargs
+        )
+
+
+def run_walk_forward(
+    spec: PanelSpec,
+    factory: SignalFactory,
+    grid: Sequence[Dict[str, Any]],
+    train: int,
+    test: int,
+    step: Optional[int] = None,
+    metric: str = "sharpe",
+    max_workers: Optional[int] = None,
+    **backtest_kwargs: Any,
+) -> Dict[str, SweepTable]:
+    """
+    워크포워드 최적화를 실행합니다.
+
+    각 창의 학습 구간에서 모든 파라미터를 평가해 metric 이 가장 좋은 조합을 고르고,
+    그 조합을 바로 다음 검증 구간에서 평가합니다.
+
+    Returns:
+        Dict[str, SweepTable]: "train"(전체 학습 결과), "test"(창별 표본 외 결과)
+    """
+    windows = walk_forward_windows(_n_days(spec), train, test, step)
+    with SweepRunner(spec, max_workers) as runner:
+        train_tasks = [
+            (dict(params), train_window)
+            for train_window, _ in windows
+            for params in grid
+        ]
+        train_table = runner.run(factory, train_tasks, **backtest_kwargs)
+
+        per_window = len(grid)
+        test_tasks = []
+        for i, (_, test_window) in enumerate(windows):
+            rows = SweepTable(train_table.rows[i * per_window : (i + 1) * per_window])
+            best = rows.best(metric)
+            if best is not None:
+                test_tasks.append(({name: best[name] for name in grid[0]}, test_window))
+        test_table = runner.run(factory, test_tasks, **backtest_kwargs)
+
+    return {"train": train_table, "test": test_table}
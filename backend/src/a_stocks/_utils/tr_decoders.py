@@ -0,0 +1,237 @@
+"""
+키움 TR 응답(dict 리스트)을 NumPy 컬럼 배열로 변환하는 함수 모음
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Mapping
+
+import numpy as np
+import numpy.typing as npt
+
+from a_stocks._utils.parsers import parse_number, parse_optional, parse_price
+
+Row = Mapping[str, Any]
+Columns = Dict[str, npt.NDArray[Any]]
+
+
+def decode_rows(
+    rows: Iterable[Row], fields: Mapping[str, Callable[[Any], float]]
+) -> Columns:
+    """
+    행 목록에서 지정한 숫자 필드를 float64 컬럼으로 변환합니다.
+
+    Args:
+        rows (Iterable[Row]): TR 응답의 리스트 항목
+        fields (Mapping[str, Callable]): 필드명 -> 변환 함수 (parse_number, parse_price)
+
+    Returns:
+        Columns: 필드명별 1차원 배열
+    """
+    materialized: List[Row] = list(rows)
+    return {
+        name: np.fromiter(
+            (parser(row.get(name)) for row in materialized),
+            dtype=np.float64,
+            count=len(materialized),
+        )
+        for name, parser in fields.items()
+    }
+
+
+def merge_pages(pages: Iterable[Mapping[str, Any]], list_key: str) -> Dict[str, Any]:
+    """
+    연속조회 페이지들의 리스트 필드를 하나의 응답으로 합칩니다.
+    """
+    rows: List[Any] = []
+    for page in pages:
+        rows.extend(page.get(list_key, []))
+    return {list_key: rows}
+
+
+def decode_dates(rows: Iterable[Row], field: str = "dt") -> npt.NDArray[np.int32]:
+    """
+    YYYYMMDD 문자열 필드를 int32 배열로 변환합니다.
+    """
+    materialized = list(rows)
+    return np.fromiter(
+        (int(row.get(field) or 0) for row in materialized),
+        dtype=np.int32,
+        count=len(materialized),
+    )
+
+
+DAILY_TRANSACTION_FIELDS: Dict[str, Callable[[Any], float]] = {
+    "close_pric": parse_price,
+    "pred_pre": parse_number,
+    "flu_rt": parse_number,
+    "trde_qty": parse_number,
+    "trde_prica": parse_number,
+    "for_netprps": parse_number,
+    "orgn_netprps": parse_number,
+    "ind_netprps": parse_number,
+    "crd_remn_rt": parse_number,
+}
+
+
+def decode_daily_rows(
+    rows: Iterable[Row], fields: Mapping[str, Callable[[Any], float]]
+) -> Columns:
+    """
+    일자("dt") 가 있는 행 목록을 날짜 오름차순 컬럼으로 변환합니다.
+
+    같은 날짜가 여러 번 나오면 마지막 값을 사용합니다.
+
+    Returns:
+        Columns: "dt"(int32 YYYYMMDD) 와 fields 컬럼
+    """
+    rows = [row for row in rows if row.get("dt")]
+    dates = decode_dates(rows)
+    columns = decode_rows(rows, fields)
+
+    # 날짜 오름차순 정렬 + 중복 제거 (마지막 값 유지)
+    order = np.argsort(dates, kind="stable")
+    sorted_dates = dates[order]
+    keep = np.ones(sorted_dates.size, dtype=bool)
+    keep[:-1] = sorted_dates[1:] != sorted_dates[:-1]
+    index = order[keep]
+
+    decoded: Columns = {"dt": dates[index]}
+    for name, values in columns.items():
+        decoded[name] = values[index]
+    return decoded
+
+
+def decode_daily_transactions_ka10015(response: Mapping[str, Any]) -> Columns:
+    """
+    일별거래상세요청(ka10015) 응답을 날짜 오름차순 컬럼으로 변환합니다.
+
+    Returns:
+        Columns: "dt"(int32 YYYYMMDD) 와 DAILY_TRANSACTION_FIELDS 컬럼
+    """
+    return decode_daily_rows(
+        response.get("daly_trde_dtl", []), DAILY_TRANSACTION_FIELDS
+    )
+
+
+# 신용매매동향 (조회구분에 따라 융자 또는 대주)
+CREDIT_TREND_FIELDS: Dict[str, Callable[[Any], float]] = {
+    "cur_prc": parse_price,
+    "pred_pre": parse_number,
+    "trde_qty": parse_number,
+    "new": parse_number,
+    "rpya": parse_number,
+    "remn": parse_number,
+    "amt": parse_number,
+    "pre": parse_number,
+    "shr_rt": parse_number,
+    "remn_rt": parse_number,
+}
+
+
+def decode_credit_trend_ka10013(response: Mapping[str, Any]) -> Columns:
+    """
+    신용매매동향요청(ka10013) 응답을 날짜 오름차순 컬럼으로 변환합니다.
+
+    Returns:
+        Columns: "dt"(int32 YYYYMMDD) 와 CREDIT_TREND_FIELDS 컬럼
+    """
+    return decode_daily_rows(response.get("crd_trde_trend", []), CREDIT_TREND_FIELDS)
+
+
+# 대차거래내역 (주수, 잔고금액은 백만원)
+LENDING_FIELDS: Dict[str, Callable[[Any], float]] = {
+    "dbrt_trde_cntrcnt": parse_number,
+    "dbrt_trde_rpy": parse_number,
+    "rmnd": parse_number,
+    "remn_amt": parse_number,
+}
+
+
+def decode_lending_ka90012(
+    response: Mapping[str, Any], date: str
+) -> Dict[str, Columns]:
+    """
+    대차거래내역요청(ka90012) 응답(한 일자의 전 종목)을 종목별 한 일자 컬럼으로 변환합니다.
+
+    Returns:
+        Dict[str, Columns]: 종목코드 -> "dt"(int32 YYYYMMDD) 와 LENDING_FIELDS 컬럼
+    """
+    rows = [row for row in response.get("dbrt_trde_prps", []) if row.get("stk_cd")]
+    columns = decode_rows(rows, LENDING_FIELDS)
+    dates = np.array([int(date)], dtype=np.int32)
+    return {
+        row["stk_cd"]: {
+            "dt": dates,
+            **{name: values[i : i + 1] for name, values in columns.items()},
+        }
+        for i, row in enumerate(rows)
+    }
+
+
+# 주식기본정보(ka10001) 지표. 빈 값(적자 기업의 PER 등)은 NaN 입니다.
+BASIC_INFO_FIELDS: Dict[str, Callable[[Any], float]] = {
+    "fav": parse_optional,  # 액면가
+    "cap": parse_optional,  # 자본금
+    "flo_stk": parse_optional,  # 상장주식
+    "dstr_stk": parse_optional,  # 유통주식
+    "dstr_rt": parse_optional,  # 유통비율
+    "mac": parse_optional,  # 시가총액
+    "for_exh_rt": parse_optional,  # 외인소진률
+    "per": parse_optional,
+    "eps": parse_optional,
+    "roe": parse_optional,
+    "pbr": parse_optional,
+    "ev": parse_optional,
+    "bps": parse_optional,
+    "sale_amt": parse_optional,  # 매출액
+    "bus_pro": parse_optional,  # 영업이익
+    "cup_nga": parse_optional,  # 당기순이익
+    "cur_prc": parse_price,  # 현재가
+}
+
+
+def decode_basic_info_ka10001(response: Mapping[str, Any], date: str) -> Columns:
+    """
+    주식기본정보(ka10001) 응답(한 종목)을 한 일자짜리 컬럼으로 변환합니다.
+
+    Returns:
+        Columns: "dt"(int32 YYYYMMDD) 와 BASIC_INFO_FIELDS 컬럼 (길이 1)
+    """
+    return {
+        "dt": np.array([int(date)], dtype=np.int32),
+        **decode_rows([response], BASIC_INFO_FIELDS),
+    }
+
+
+# 투자자 유형별 순매수 (금액수량구분에 따라 금액 또는 수량)
+INVESTOR_FIELDS: Dict[str, Callable[[Any], float]] = {
+    "ind_invsr": parse_number,
+    "frgnr_invsr": parse_number,
+    "orgn": parse_number,
+    "fnnc_invt": parse_number,
+    "insrnc": parse_number,
+    "invtrt": parse_number,
+    "etc_fnnc": parse_number,
+    "bank": parse_number,
+    "penfnd_etc": parse_number,
+    "samo_fund": parse_number,
+    "natn": parse_number,
+    "etc_corp": parse_number,
+    "natfor": parse_number,
+}
+
+INVESTOR_FLOW_FIELDS: Dict[str, Callable[[Any], float]] = {
+    "cur_prc": parse_price,
+    "acc_trde_qty": parse_number,
+    "acc_trde_prica": parse_number,
+    **INVESTOR_FIELDS,
+}
+
+
+def decode_investor_flow_ka10059(response: Mapping[str, Any]) -> Columns:
+    """
+    종목별투자자기관별요청(ka10059) 응답을 날짜 오름차순 컬럼으로 변환합니다.
+
+    Returns:
+        Columns: "dt"(int32 YYYYMMDD) 와 INVESTOR_FLOW_FIELDS 컬럼
+    """
+    return decode_daily_rows(response.get("stk_invsr_orgn", []), INVESTOR_FLOW_FIELDS)
@@ -0,0 +1,213 @@
+"""
+PER/PBR/ROE 밴드 밸류에이션 테이블 (ka10026 고저PER + ka10001 주식기본정보)
+
+- ka10026 은 pertp 별(저/고 PBR, PER, ROE) 순위 목록을 주고, 값은 모두 "per" 필드에
+  담겨 옵니다. 지표별로 저/고 목록을 합쳐 컬럼 하나로 만들고 ka10001 기본정보
+  (액면가, 자본금, 시가총액 등)와 종목코드로 외부 조인합니다.
+- ValuationTable 은 숫자 컬럼마다 정렬 순서(SortedIndex)를 미리 만들어 두므로
+  "PER 5~10 이고 ROE 15 이상" 같은 범위 질의는 searchsorted 로 후보를 잘라 낸 뒤
+  나머지 조건만 후보에 대해 비교합니다. 조건을 바꿔도 TR 을 다시 조회하지 않습니다.
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from a_stocks._utils.code_registry import CodeRegistry
+from a_stocks._utils.columnar import ColumnTable
+from a_stocks._utils.parsers import parse_optional
+from a_stocks._utils.tr_decoders import BASIC_INFO_FIELDS
+
+FloatArray = npt.NDArray[np.float64]
+IndexArray = npt.NDArray[np.intp]
+Bounds = Tuple[Optional[float], Optional[float]]
+
+HIGH_LOW_PER_KEY = "high_low_per"
+
+# 지표 -> ka10026 PER구분 (저, 고)
+PER_TYPES: Dict[str, Tuple[str, str]] = {
+    "pbr": ("1", "2"),
+    "per": ("3", "4"),
+    "roe": ("5", "6"),
+}
+
+
+def high_low_per_table(
+    metric: str,
+    responses: Sequence[Mapping[str, Any]],
+    registry: Optional[CodeRegistry] = None,
+) -> ColumnTable:
+    """
+    한 지표의 저/고 ka10026 응답들을 "{metric}" 컬럼 하나짜리 테이블로 합칩니다.
+    """
+    rows = [row for response in responses for row in response.get(HIGH_LOW_PER_KEY, [])]
+    table = ColumnTable.from_rows(
+        rows, {"per": parse_optional}, text_fields=("stk_nm",), registry=registry
+    )
+    table.columns[metric] = table.columns.pop("per")
+    return table
+
+
+def fundamentals_table(
+    responses: Sequence[Mapping[str, Any]], registry: Optional[CodeRegistry] = None
+) -> ColumnTable:
+    """
+    종목별 ka10001 응답들을 기본정보 테이블로 변환합니다.
+    """
+    return ColumnTable.from_rows(
+        responses,
+        BASIC_INFO_FIELDS,
+        text_fields=("stk_nm",),
+        registry=registry,
+    )
+
+
+def parse_ranges(text: str) -> Dict[str, Bounds]:
+    """
+    "per:5:10,pbr::1,roe:15:" 형식의 범위 조건을 파싱합니다. 빈 경계는 제한 없음입니다.
+    """
+    ranges: Dict[str, Bounds] = {}
+    for part in text.split(","):
+        if not part.strip():
+            continue
+        name, sep, bounds = part.partition(":")
+        low, colon, high = bounds.partition(":")
+        if not sep or not colon or not name.strip():
+            raise ValueError(f"범위 조건 형식이 올바르지 않습니다: {part.strip()}")
+        try:
+            ranges[name.strip()] = (
+                float(low) if low.strip() else None,
+                float(high) if high.strip() else None,
+            )
+        except ValueError:
+            raise ValueError(f"범위 경계는 숫자여야 합니다: {part.strip()}")
+    return ranges
+
+
+class SortedIndex:
+    """
+    한 숫자 컬럼의 NaN 이 아닌 값의 오름차순 정렬 순서입니다.
+    """
+
+    __slots__ = ("order", "values", "rank")
+
+    def __init__(self, column: FloatArray) -> None:
+        valid = np.flatnonzero(~np.isnan(column))
+        self.order: IndexArray = valid[np.argsort(column[valid], kind="stable")]
+        self.values: FloatArray = column[self.order]
+        # 행 위치 -> 정렬 순위 (NaN 은 맨 뒤)
+        self.rank = np.full(column.size, column.size, dtype=np.intp)
+        self.rank[self.order] = np.arange(self.order.size)
+
+    def span(self, low: Optional[float], high: Optional[float]) -> Tuple[int, int]:
+        """
+        low <= 값 <= high 인 정렬 구간 [start, stop)
+        """
+        start = (
+            int(np.searchsorted(self.values, low, side="left"))
+            if low is not None
+            else 0
+        )
+        stop = (
+            int(np.searchsorted(self.values, high, side="right"))
+            if high is not None
+            else self.values.size
+        )
+        return start, max(start, stop)
+
+
+class ValuationTable:
+    """
+    밸류에이션 컬럼 테이블과 컬럼별 정렬 인덱스입니다.
+    """
+
+    def __init__(self, table: ColumnTable, date: Optional[str] = None) -> None:
+        self.table = table
+        self.date = date
+        self.codes = table.codes
+        self.names = table.columns.get("stk_nm")
+        self.indexes: Dict[str, SortedIndex] = {
+            name: SortedIndex(values)
+            for name, values in table.columns.items()
+            if values.dtype == np.float64
+        }
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def _index(self, name: str) -> SortedIndex:
+        index = self.indexes.get(name)
+        if index is None:
+            raise KeyError(
+                f"알 수 없는 컬럼입니다: {name} (사용 가능: {', '.join(self.indexes)})"
+            )
+        return index
+
+    def query(
+        self,
+        ranges: Mapping[str, Bounds],
+        sort: Optional[str] = None,
+        ascending: bool = True,
+        limit: int = 50,
+    ) -> Tuple[int, IndexArray]:
+        """
+        모든 범위 조건(경계 포함)을 만족하는 행을 sort 컬럼 순서로 반환합니다.
+
+        가장 좁은 조건의 정렬 구간을 후보로 삼고 나머지 조건은 후보에만 적용합니다.
+
+        Returns:
+            Tuple[int, ndarray]: (조건을 만족한 전체 행 수, 정렬된 상위 limit 개 행 위치)
+        """
+        spans = {
+            name: self._index(name).span(*bounds) for name, bounds in ranges.items()
+        }
+        sort_index = self._index(sort) if sort is not None else None
+        limit = max(limit, 0)
+        if not spans:
+            if sort_index is None:
+                return len(self), np.arange(min(limit, len(self)), dtype=np.intp)
+            # 조건이 없으면 정렬 순서를 그대로 쓰고 값이 없는 행은 뒤에 붙입니다.
+            order = sort_index.order if ascending else sort_index.order[::-1]
+            missing = np.flatnonzero(sort_index.rank == len(self))
+            return len(self), np.concatenate([order, missing])[:limit]
+
+        narrowest = min(spans, key=lambda name: spans[name][1] - spans[name][0])
+        start, stop = spans[narrowest]
+        candidates = self.indexes[narrowest].order[start:stop]
+        for name, (low, high) in ranges.items():
+            if name == narrowest:
+                continue
+            # NaN 과의 비교는 항상 False 이므로 값이 없는 행은 빠집니다.
+            values = self.table[name][candidates]
+            keep = np.ones(candidates.size, dtype=np.bool_)
+            if low is not None:
+                keep &= values >= low
+            if high is not None:
+                keep &= values <= high
+            candidates = candidates[keep]
+
+        if sort_index is not None:
+            ranks = sort_index.rank[candidates]
+            if not ascending:
+                # 내림차순에서도 값이 없는 행(순위 = 행 수)은 뒤로 보냅니다.
+                ranks = np.where(ranks == len(self), 1, -ranks)
+            candidates = candidates[np.argsort(ranks, kind="stable")]
+        return int(candidates.size), candidates[:limit]
+
+    def row(self, i: int, columns: Sequence[str]) -> Dict[str, Any]:
+        values = {}
+        for name in columns:
+            value = float(self.table[name][i])
+            values[name] = None if np.isnan(value) else round(value, 4)
+        return {
+            "code": str(self.codes[i]),
+            "name": str(self.names[i]) if self.names is not None else "",
+            "values": values,
+        }
+
+    def rows(
+        self, positions: IndexArray, columns: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        selected = list(columns) if columns is not None else list(self.indexes)
+        return [self.row(int(i), selected) for i in positions]
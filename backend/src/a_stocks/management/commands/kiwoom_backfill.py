@@ -0,0 +1,120 @@
+from typing import Any, Dict, List
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from a_stocks._service.backfill import BACKFILL_TRS, BackfillService, backfill_status
+from a_stocks._service.master_data import get_master_data
+from a_stocks._service.stock_service import get_stock_service
+from a_stocks._utils.krx_calendar import now_kst
+
+
+def _split(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _format_seconds(seconds: float) -> str:
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+
+
+class Command(BaseCommand):
+    help = (
+        "일별거래상세(ka10015), 신용매매동향(ka10013), 종목별투자자기관별(ka10059) "
+        "과거 데이터를 시계열 저장소에 적재합니다. 진행 상황은 DB 에 기록되므로 "
+        "중단된 뒤 같은 인자로 다시 실행하면 이어서 처리합니다."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--codes",
+            help="쉼표로 구분된 종목코드 (기본값: 마스터 데이터의 전 종목)",
+        )
+        parser.add_argument(
+            "--trs",
+            default=",".join(BACKFILL_TRS),
+            help=f"쉼표로 구분된 TR (기본값: {','.join(BACKFILL_TRS)})",
+        )
+        parser.add_argument("--start", help="시작일자 (YYYYMMDD)")
+        parser.add_argument("--end", help="종료일자 (YYYYMMDD, 기본값: 오늘)")
+        parser.add_argument(
+            "--chunk-days",
+            type=int,
+            default=90,
+            help="작업 단위 하나의 기간(일) (기본값: 90)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="동시 조회 수 (기본값: KIWOOM_COLLECT_MAX_WORKERS)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="저장소에 한 번에 병합할 단위 수 (기본값: 50)",
+        )
+        parser.add_argument(
+            "--retry-failed",
+            action="store_true",
+            help="실패한 단위도 다시 처리합니다.",
+        )
+        parser.add_argument(
+            "--status",
+            action="store_true",
+            help="적재하지 않고 TR 별 단위 상태만 출력합니다.",
+        )
+
+    def _report(self, report: Dict[str, Any]) -> None:
+        finished = report["done"] + report["failed"]
+        percent = finished / report["total"] * 100 if report["total"] else 100.0
+        eta = _format_seconds(report["eta"]) if report["eta"] is not None else "-"
+        self.stdout.write(
+            f"{finished}/{report['total']} ({percent:.1f}%) "
+            f"실패 {report['failed']}, "
+            f"{report['units_per_sec']:.2f} 단위/s, "
+            f"{report['rows_per_sec']:.1f} 행/s, "
+            f"경과 {_format_seconds(report['elapsed'])}, 남은 시간 {eta}"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["status"]:
+            for tr, counts in sorted(backfill_status().items()):
+                summary = ", ".join(f"{k} {v}" for k, v in sorted(counts.items()))
+                self.stdout.write(f"{tr}: {summary}")
+            return
+        if not options["start"]:
+            raise CommandError("--start 를 지정해야 합니다.")
+
+        codes = (
+            _split(options["codes"])
+            if options["codes"]
+            else [row["code"] for row in get_master_data().stocks()]
+        )
+        service = BackfillService(
+            get_stock_service().api,
+            max_workers=options["workers"],
+            batch_size=options["batch_size"],
+        )
+        try:
+            units = service.plan(
+                _split(options["trs"]),
+                codes,
+                options["start"],
+                options["end"] or now_kst().strftime("%Y%m%d"),
+                chunk_days=options["chunk_days"],
+                retry_failed=options["retry_failed"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(f"처리할 단위: {len(units)}")
+        if not units:
+            return
+        report = service.run(units, on_progress=self._report)
+        self._report(report)
+        if report["failed"]:
+            raise CommandError(
+                f"{report['failed']}개 단위가 실패했습니다. "
+                "--retry-failed 로 다시 실행하세요."
+            )
@@ -0,0 +1,86 @@
+from typing import Any, Dict, List, Optional
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from a_stocks._service.credit_service import (
+    CREDIT_KINDS,
+    CREDIT_QUERY_TYPES,
+    get_credit_service,
+)
+from a_stocks._service.investor_flow_service import (
+    FLOW_DATASET,
+    get_investor_flow_service,
+)
+from a_stocks._service.master_data import get_master_data
+
+# flow: 투자자 순매수(ka10059), loan/short: 신용융자/대주(ka10013), lending: 대차(ka90012)
+COLLECT_DATASETS = ("flow", *CREDIT_QUERY_TYPES, "lending")
+
+
+def _split(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+class Command(BaseCommand):
+    help = (
+        f"장 마감 후 종목별 투자자 순매수({FLOW_DATASET}), 신용융자/대주"
+        f"({CREDIT_KINDS['loan'][0]}), 대차 잔고({CREDIT_KINDS['lending'][0]})를 "
+        "조회해 시계열 저장소에 병합합니다. 서버 워커는 조회할 때 저장소의 새 일자를 "
+        "읽어 인덱스를 갱신합니다. cron 등으로 거래일마다 실행하세요."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--codes",
+            help="쉼표로 구분된 종목코드 (기본값: 마스터 데이터의 전 종목)",
+        )
+        parser.add_argument("--date", help="기준일자 (YYYYMMDD, 기본값: 오늘)")
+        parser.add_argument(
+            "--datasets",
+            default=",".join(COLLECT_DATASETS),
+            help=f"쉼표로 구분된 수집 대상 (기본값: {','.join(COLLECT_DATASETS)})",
+        )
+
+    def _collect(
+        self, name: str, codes: List[str], date: Optional[str]
+    ) -> Dict[str, Any]:
+        if name == "flow":
+            return get_investor_flow_service().collect(codes, date=date)
+        if name in CREDIT_QUERY_TYPES:
+            return get_credit_service().collect_credit(codes, date, kind=name)
+        # ka90012 는 시장별로 전 종목을 한 번에 받으므로 종목코드를 쓰지 않습니다.
+        return get_credit_service().collect_lending(date)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        datasets = _split(options["datasets"])
+        unknown = [name for name in datasets if name not in COLLECT_DATASETS]
+        if unknown:
+            raise CommandError(
+                f"수집 대상은 {', '.join(COLLECT_DATASETS)} 중 하나여야 합니다: "
+                f"{', '.join(unknown)}"
+            )
+        codes = (
+            _split(options["codes"])
+            if options["codes"]
+            else [row["code"] for row in get_master_data().stocks()]
+        )
+        if not codes:
+            raise CommandError("조회할 종목이 없습니다.")
+
+        # 한 대상이 실패해도 나머지 대상은 수집합니다.
+        failed: List[str] = []
+        for name in datasets:
+            try:
+                result = self._collect(name, codes, options["date"])
+            except Exception as e:
+                self.stderr.write(f"{name} 수집 중 오류 발생: {str(e)}")
+                failed.append(name)
+                continue
+            failed.extend(f"{name}:{code}" for code in result.get("failed", []))
+            self.stdout.write(
+                f"{name}: 병합 {result['merged']}, 실패 {len(result.get('failed', []))}"
+            )
+        if failed:
+            raise CommandError(
+                f"{len(failed)}개 조회에 실패했습니다: {', '.join(failed[:20])}"
+            )
@@ -0,0 +1,74 @@
+from typing import Any, Dict, List
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from a_stocks._service.master_data import get_master_data
+from a_stocks._service.stock_service import get_stock_service
+from a_stocks._service.universe_snapshot import FUNDAMENTALS_DATASET, UniverseSnapshot
+
+
+def _split(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+class Command(BaseCommand):
+    help = (
+        "전 종목 주식기본정보(ka10001)를 동시에 조회해 시계열 저장소"
+        f"({FUNDAMENTALS_DATASET})에 일자별 스냅샷으로 적재합니다."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--codes",
+            help="쉼표로 구분된 종목코드 (기본값: 마스터 데이터의 전 종목)",
+        )
+        parser.add_argument("--date", help="스냅샷 일자 (YYYYMMDD, 기본값: 오늘)")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="동시 조회 수 (기본값: KIWOOM_COLLECT_MAX_WORKERS)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="저장소에 한 번에 병합할 종목 수 (기본값: 200)",
+        )
+
+    def _report(self, report: Dict[str, Any]) -> None:
+        finished = report["done"] + report["failed"]
+        percent = finished / report["total"] * 100 if report["total"] else 100.0
+        limit = (
+            f"제한 {report['rate_limit']:g}건/s, 사용률 {report['utilization']:.1f}%"
+            if report["utilization"] is not None
+            else "제한 없음"
+        )
+        self.stdout.write(
+            f"{finished}/{report['total']} ({percent:.1f}%) "
+            f"실패 {report['failed']}, "
+            f"{report['requests_per_sec']:.2f} 요청/s ({limit}), "
+            f"경과 {report['elapsed']:.1f}s"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        codes = (
+            _split(options["codes"])
+            if options["codes"]
+            else [row["code"] for row in get_master_data().stocks()]
+        )
+        if not codes:
+            raise CommandError("조회할 종목이 없습니다.")
+        snapshot = UniverseSnapshot(
+            get_stock_service().api,
+            max_workers=options["workers"],
+            batch_size=options["batch_size"],
+        )
+        report = snapshot.run(
+            codes, len(codes), date=options["date"], on_progress=self._report
+        )
+        self._report(report)
+        if report["failed_codes"]:
+            raise CommandError(
+                f"{len(report['failed_codes'])}개 종목 조회에 실패했습니다: "
+                f"{', '.join(report['failed_codes'][:20])}"
+            )
@@ -0,0 +1,72 @@
+import asyncio
+import json
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from a_stocks._service.price_cache import price_cache_is_shared
+from a_stocks._service.warmup import WarmupScheduler, default_warmup_steps
+
+
+class Command(BaseCommand):
+    help = (
+        "장 시작 전 마스터 데이터(ka10099/ka10101/ka10102) 조회와, 시세 캐시가 "
+        "공유 백엔드면 관심종목 시세 캐시 채우기를 실행합니다. 토큰은 서버 워커가 "
+        "각자 발급합니다."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--codes",
+            help="쉼표로 구분된 관심종목 코드 (기본값: KIWOOM_WARMUP_WATCHLIST)",
+        )
+        parser.add_argument(
+            "--skip-master",
+            action="store_true",
+            help="마스터 데이터 조회를 건너뜁니다.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="종료하지 않고 거래일마다 KIWOOM_WARMUP_TIME 에 다시 실행합니다.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        codes = (
+            [code.strip() for code in options["codes"].split(",") if code.strip()]
+            if options["codes"]
+            else None
+        )
+        # 이 프로세스의 토큰, 프로세스 내 시세 캐시, 밸류에이션 테이블은 서버 워커에
+        # 보이지 않습니다.
+        shared = price_cache_is_shared()
+        if not shared:
+            self.stdout.write(
+                "시세 캐시가 공유 백엔드가 아니므로 관심종목 시세는 건너뜁니다."
+            )
+        scheduler = WarmupScheduler(
+            default_warmup_steps(
+                codes,
+                master=not options["skip_master"],
+                token=False,
+                quotes=shared,
+                valuation=False,
+            )
+        )
+        if options["loop"]:
+            self.stdout.write(f"다음 워밍업: {scheduler.next_run().isoformat()}")
+            try:
+                asyncio.run(scheduler.run_forever())
+            except KeyboardInterrupt:
+                pass
+            return
+
+        report = scheduler.run_once()
+        for step in report["steps"]:
+            detail = step["result"] if step["ok"] else step["error"]
+            self.stdout.write(
+                f"{step['name']}: {'ok' if step['ok'] else 'failed'} "
+                f"({step['elapsed']:.3f}s) {json.dumps(detail, ensure_ascii=False)}"
+            )
+        if not report["ok"]:
+            raise CommandError("일부 워밍업 단계가 실패했습니다.")
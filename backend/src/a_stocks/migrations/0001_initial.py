@@ -0,0 +1,57 @@
+# Generated by Django 4.2 on 2026-10-19 03:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="BackfillUnit",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("tr", models.CharField(max_length=10)),
+                ("code", models.CharField(max_length=20)),
+                ("start_date", models.CharField(max_length=8)),
+                ("end_date", models.CharField(max_length=8)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "대기"),
+                            ("done", "완료"),
+                            ("failed", "실패"),
+                        ],
+                        db_index=True,
+                        default="pending",
+                        max_length=10,
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("rows", models.PositiveIntegerField(default=0)),
+                ("error", models.TextField(blank=True, default="")),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "ordering": ["tr", "code", "-end_date"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="backfillunit",
+            constraint=models.UniqueConstraint(
+                fields=("tr", "code", "start_date", "end_date"),
+                name="unique_backfill_unit",
+            ),
+        ),
+    ]
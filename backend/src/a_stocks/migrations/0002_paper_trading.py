@@ -0,0 +1,58 @@
+# Generated by Django 4.2 on 2026-10-19 03:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("a_stocks", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PaperAccount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("cash", models.FloatField()),
+                ("positions", models.JSONField(default=dict)),
+                ("version", models.PositiveBigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="PaperOrder",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("code", models.CharField(max_length=20)),
+                ("side", models.CharField(max_length=4)),
+                ("order_type", models.CharField(max_length=6)),
+                ("price", models.FloatField(null=True)),
+                ("quantity", models.PositiveIntegerField()),
+                ("status", models.CharField(db_index=True, max_length=10)),
+                ("fill_price", models.FloatField(null=True)),
+                ("reserved_cash", models.FloatField(default=0.0)),
+                ("reason", models.TextField(blank=True, default="")),
+                ("created_at", models.FloatField()),
+                ("updated_at", models.FloatField()),
+            ],
+            options={
+                "ordering": ["id"],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2 on 2026-10-19 03:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("a_stocks", "0002_paper_trading"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PortfolioState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("holdings", models.JSONField(default=dict)),
+                ("realized", models.FloatField(default=0.0)),
+                ("fees", models.FloatField(default=0.0)),
+                ("reported", models.JSONField(default=dict)),
+                ("fill_date", models.CharField(blank=True, default="", max_length=8)),
+                ("fill_ids", models.JSONField(default=list)),
+                ("changed_at", models.FloatField(null=True)),
+                ("quoted_at", models.FloatField(null=True)),
+                ("version", models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -1 +1,118 @@
-# Create your models here.
+from django.db import models
+
+
+class BackfillUnit(models.Model):
+    """
+    과거 데이터 적재(kiwoom_backfill) 작업 단위: (TR, 종목코드, 기간)
+
+    저장소에 병합이 끝난 단위만 done 으로 기록하므로, 중단된 뒤 다시 실행하면
+    done 이 아닌 단위부터 이어서 처리합니다.
+    """
+
+    PENDING = "pending"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "대기"),
+        (DONE, "완료"),
+        (FAILED, "실패"),
+    ]
+
+    tr = models.CharField(max_length=10)
+    code = models.CharField(max_length=20)
+    # 기간 (YYYYMMDD, 양 끝 포함)
+    start_date = models.CharField(max_length=8)
+    end_date = models.CharField(max_length=8)
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=PENDING, db_index=True
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    rows = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tr", "code", "start_date", "end_date"],
+                name="unique_backfill_unit",
+            )
+        ]
+        ordering = ["tr", "code", "-end_date"]
+
+    def __str__(self) -> str:
+        return (
+            f"{self.tr} {self.code} {self.start_date}~{self.end_date} ({self.status})"
+        )
+
+
+class PaperAccount(models.Model):
+    """
+    모의투자 계좌 (한 행)
+
+    주문을 접수/체결/취소할 때마다 version 을 올립니다. 워커는 자기가 마지막으로
+    읽은 version 과 다르면 계좌와 미체결 주문을 다시 읽습니다.
+    """
+
+    cash = models.FloatField()
+    # 종목코드 -> [보유 수량, 평균 매입가]
+    positions = models.JSONField(default=dict)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"모의계좌 {self.cash:,.0f} (v{self.version})"
+
+
+class PaperOrder(models.Model):
+    """
+    모의 주문 한 건. id 가 주문 번호입니다.
+    """
+
+    code = models.CharField(max_length=20)
+    side = models.CharField(max_length=4)
+    order_type = models.CharField(max_length=6)
+    # 시장가 주문은 NULL
+    price = models.FloatField(null=True)
+    quantity = models.PositiveIntegerField()
+    status = models.CharField(max_length=10, db_index=True)
+    fill_price = models.FloatField(null=True)
+    # 미체결 지정가 매수 주문에 묶인 현금
+    reserved_cash = models.FloatField(default=0.0)
+    reason = models.TextField(blank=True, default="")
+    # 서비스 시계 기준 시각 (epoch 초)
+    created_at = models.FloatField()
+    updated_at = models.FloatField()
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self) -> str:
+        return f"{self.id} {self.code} {self.side} {self.quantity} ({self.status})"
+
+
+class PortfolioState(models.Model):
+    """
+    포트폴리오 트래커 상태 (한 행)
+
+    체결, 잔고, 시세, 실현손익으로 상태가 바뀔 때마다 version 을 올립니다. 워커는
+    자기가 마지막으로 읽은 version 과 다르면 상태를 다시 읽습니다. quoted_at 은
+    version 을 올리지 않고 따로 갱신합니다.
+    """
+
+    # 종목코드 -> {name, quantity, average_price, last_price, realized}
+    holdings = models.JSONField(default=dict)
+    realized = models.FloatField(default=0.0)
+    fees = models.FloatField(default=0.0)
+    # 키움이 보고한 실현손익: 일자(YYYYMMDD) -> [실현손익, 수수료+세금, 행 수]
+    reported = models.JSONField(default=dict)
+    # 체결 번호는 거래일마다 새로 매기므로 그 거래일에 반영한 번호만 보관합니다.
+    fill_date = models.CharField(max_length=8, blank=True, default="")
+    fill_ids = models.JSONField(default=list)
+    # 서비스 시계 기준 마지막 변경/시세 반영 시각 (epoch 초)
+    changed_at = models.FloatField(null=True)
+    quoted_at = models.FloatField(null=True)
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"포트폴리오 {len(self.holdings)}종목 (v{self.version})"
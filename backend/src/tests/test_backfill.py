@@ -0,0 +1,219 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import AbstractSet, Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from pytest_mock import MockerFixture
+
+from a_stocks._service.backfill import BackfillProgress, BackfillService, plan_units
+from a_stocks._utils.history_store import HistoryStore
+from a_stocks.models import BackfillUnit
+
+
+def _days_before(date: str, count: int) -> List[str]:
+    day = datetime.strptime(date, "%Y%m%d")
+    return [(day - timedelta(days=i)).strftime("%Y%m%d") for i in range(count)]
+
+
+class FakeHistoryAPI:
+    """
+    한 번에 5일치를 돌려주는 가짜 API
+
+    ka10015 는 시작일자(strt_dt)까지 latest 부터 최신 순서로 연속조회하고,
+    ka10013/ka10059 는 기준일자부터 과거 방향으로 돌려줍니다.
+    """
+
+    def __init__(
+        self,
+        fail: AbstractSet[str] = frozenset(),
+        first: str = "20250101",
+        latest: str = "20250114",
+    ) -> None:
+        self.fail = set(fail)
+        self.first = first
+        self.latest = latest
+        self.calls: List[str] = []
+
+    def _rows(self, code: str, date: str) -> List[Dict[str, Any]]:
+        if code in self.fail:
+            raise RuntimeError("요청 실패")
+        return [
+            {"dt": dt, "cur_prc": "+100", "close_pric": "-100", "remn": "7"}
+            for dt in _days_before(date, 5)
+            if dt >= self.first
+        ]
+
+    def daily_transaction_details_request_ka10015(
+        self, code: str, date: str, cont_yn: str = "N", next_key: str = ""
+    ) -> Dict[str, Any]:
+        raise AssertionError("paginate 를 통해 호출해야 합니다.")
+
+    def paginate(
+        self,
+        request: Callable[..., Dict[str, Any]],
+        code: str,
+        date: str,
+        max_pages: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        page_date = self.latest
+        pages = 0
+        while max_pages is None or pages < max_pages:
+            pages += 1
+            self.calls.append(f"ka10015:{date}")
+            rows = [row for row in self._rows(code, page_date) if row["dt"] >= date]
+            if not rows:
+                return
+            yield {"daly_trde_dtl": rows}
+            if rows[-1]["dt"] <= date:
+                return
+            page_date = _days_before(rows[-1]["dt"], 2)[1]
+
+    def credit_trading_trend_request_ka10013(
+        self, code: str, date: str, query_type: str
+    ) -> Dict[str, Any]:
+        self.calls.append(f"ka10013:{date}")
+        return {"crd_trde_trend": self._rows(code, date)}
+
+    def stock_data_by_investor_institution_request_ka10059(
+        self, date: str, code: str, *args: str
+    ) -> Dict[str, Any]:
+        self.calls.append(f"ka10059:{date}")
+        return {"stk_invsr_orgn": self._rows(code, date)}
+
+
+def test_plan_units_splits_ranges_inclusively() -> None:
+    units = plan_units(["ka10015", "ka10013"], ["005930"], "20250101", "20250110", 4)
+
+    assert units == [
+        ("ka10015", "005930", "20250101", "20250104"),
+        ("ka10015", "005930", "20250105", "20250108"),
+        ("ka10015", "005930", "20250109", "20250110"),
+        ("ka10013", "005930", "20250101", "20250104"),
+        ("ka10013", "005930", "20250105", "20250108"),
+        ("ka10013", "005930", "20250109", "20250110"),
+    ]
+    with pytest.raises(ValueError):
+        plan_units(["ka99999"], ["005930"], "20250101", "20250110")
+
+
+@pytest.mark.parametrize("tr", ["ka10013", "ka10059"])
+def test_fetch_unit_walks_back_until_range_is_covered(tr: str, tmp_path: Path) -> None:
+    api = FakeHistoryAPI()
+    service = BackfillService(api, HistoryStore(tmp_path))  # type: ignore[arg-type]
+
+    columns = service.fetch_unit(tr, "005930", "20250103", "20250114")
+
+    assert (
+        columns["dt"].tolist() == [int(d) for d in _days_before("20250114", 12)][::-1]
+    )
+    # 12일치를 5일씩 → 세 번 요청
+    assert len(api.calls) == 3
+
+
+def test_fetch_unit_pages_ka10015_newest_first_down_to_start(tmp_path: Path) -> None:
+    api = FakeHistoryAPI(latest="20250125")
+    service = BackfillService(api, HistoryStore(tmp_path))  # type: ignore[arg-type]
+
+    columns = service.fetch_unit("ka10015", "005930", "20250103", "20250114")
+
+    # 시작일자로 한 번 연속조회하고, 최근 거래일부터 온 행 중 기간 안의 것만 남깁니다.
+    assert (
+        columns["dt"].tolist() == [int(d) for d in _days_before("20250114", 12)][::-1]
+    )
+    # 25일 → 3일, 23일치를 5일씩 → 다섯 페이지
+    assert api.calls == ["ka10015:20250103"] * 5
+
+
+def test_progress_reports_throughput_and_eta() -> None:
+    now = [0.0]
+    progress = BackfillProgress(10, clock=lambda: now[0])
+    now[0] = 2.0
+    progress.record(3, rows=300)
+    progress.record(0, failed=1)
+
+    report = progress.report()
+    assert report["remaining"] == 6
+    assert report["units_per_sec"] == 2.0
+    assert report["rows_per_sec"] == 150.0
+    assert report["eta"] == 3.0
+
+
+@pytest.mark.django_db
+def test_run_merges_units_and_resumes_only_unfinished(tmp_path: Path) -> None:
+    store = HistoryStore(tmp_path)
+    api = FakeHistoryAPI(fail={"000660"})
+    service = BackfillService(
+        api,  # type: ignore[arg-type]
+        store,
+        max_workers=2,
+        batch_size=2,
+    )
+    trs = ["ka10015", "ka10013"]
+    codes = ["005930", "000660"]
+
+    units = service.plan(trs, codes, "20250101", "20250110", chunk_days=5)
+    assert len(units) == 8
+    reports: List[Dict[str, Any]] = []
+    report = service.run(units, on_progress=reports.append)
+
+    assert report["done"] == 4 and report["failed"] == 4
+    assert reports and reports[-1]["done"] == 4
+    panel = store.load("ka10013", codes=["005930"])
+    assert panel.dates.tolist() == list(range(20250101, 20250111))
+    assert np.all(panel["remn"] == 7.0)
+    assert store.load("ka10015", codes=["005930"])["close_pric"][0, 0] == 100.0
+
+    failed = BackfillUnit.objects.get(
+        tr="ka10015", code="000660", start_date="20250101"
+    )
+    assert failed.status == BackfillUnit.FAILED
+    assert failed.attempts == 1 and "요청 실패" in failed.error
+
+    # 다시 계획하면 완료된 단위는 건너뛰고, 실패한 단위는 요청할 때만 다시 처리합니다.
+    assert service.plan(trs, codes, "20250101", "20250110", chunk_days=5) == []
+    api.fail.clear()
+    retry = service.plan(
+        trs, codes, "20250101", "20250110", chunk_days=5, retry_failed=True
+    )
+    assert {unit.code for unit in retry} == {"000660"}
+    assert service.run(retry)["done"] == 4
+    failed.refresh_from_db()
+    assert failed.status == BackfillUnit.DONE
+    assert failed.attempts == 2 and failed.rows == 5
+
+
+@pytest.mark.django_db
+def test_kiwoom_backfill_command(tmp_path: Path, mocker: MockerFixture) -> None:
+    api = FakeHistoryAPI(fail={"000660"})
+    mocker.patch(
+        "a_stocks._service.backfill.get_history_store"
+    ).return_value = HistoryStore(tmp_path)
+    mocker.patch(
+        "a_stocks.management.commands.kiwoom_backfill.get_stock_service"
+    ).return_value.api = api
+
+    with pytest.raises(CommandError):
+        call_command("kiwoom_backfill")
+    with pytest.raises(CommandError):
+        call_command(
+            "kiwoom_backfill",
+            codes="005930,000660",
+            trs="ka10059",
+            start="20250101",
+            end="20250110",
+        )
+    assert BackfillUnit.objects.filter(status=BackfillUnit.DONE).count() == 1
+
+    api.fail.clear()
+    call_command(
+        "kiwoom_backfill",
+        codes="005930,000660",
+        trs="ka10059",
+        start="20250101",
+        end="20250110",
+        retry_failed=True,
+    )
+    assert BackfillUnit.objects.filter(status=BackfillUnit.DONE).count() == 2
@@ -0,0 +1,186 @@
+import multiprocessing
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+
+from a_stocks._service.history_service import HistoryService
+from a_stocks._utils.backtest import CostModel, momentum_top_n, run_backtest
+from a_stocks._utils.history_store import HistoryStore
+
+
+def _columns(dates: List[int], close: List[float]) -> Dict[str, Any]:
+    return {
+        "dt": np.array(dates, dtype=np.int32),
+        "close_pric": np.array(close, dtype=np.float64),
+    }
+
+
+def test_history_store_merges_and_loads(tmp_path: Path) -> None:
+    store = HistoryStore(tmp_path)
+    store.merge(
+        "ka10015",
+        {
+            "005930": _columns([20250102, 20250103], [100, 101]),
+            "000660": _columns([20250103], [200]),
+        },
+    )
+    # 새 일자 추가 + 기존 값 덮어쓰기 + 새 종목
+    store.merge(
+        "ka10015",
+        {
+            "005930": _columns([20250103, 20250106], [102, 103]),
+            "035720": _columns([20250106], [50]),
+        },
+    )
+
+    panel = store.load("ka10015")
+    # 기존 종목 행은 그대로 두고 새 종목은 뒤에 추가됩니다.
+    assert panel.codes == ["000660", "005930", "035720"]
+    assert panel.dates.tolist() == [20250102, 20250103, 20250106]
+    np.testing.assert_array_equal(
+        panel["close_pric"],
+        [[np.nan, 200, np.nan], [100, 102, 103], [np.nan, np.nan, 50]],
+    )
+
+    subset = store.load("ka10015", codes=["000660", "999999"], start=20250103)
+    assert subset.shape == (2, 2)
+    np.testing.assert_array_equal(
+        subset["close_pric"], [[200, np.nan], [np.nan, np.nan]]
+    )
+
+
+def test_history_store_writes_existing_cells_in_place(tmp_path: Path) -> None:
+    store = HistoryStore(tmp_path)
+    store.merge("ka10015", {"005930": _columns([20250102, 20250103], [100, 101])})
+    version = os.readlink(tmp_path / "ka10015")
+    opened = store.load("ka10015")["close_pric"]
+
+    # 종목/일자 축이 그대로면 새 버전을 만들지 않고 그 자리에서 씁니다.
+    store.merge("ka10015", {"005930": _columns([20250103], [111])})
+    assert os.readlink(tmp_path / "ka10015") == version
+    assert opened[0, 1] == 111
+
+    # 축이 늘면 새 버전으로 링크를 바꾸고 직전 버전만 남깁니다.
+    for day in (20250106, 20250107):
+        store.merge("ka10015", {"000660": _columns([day], [200])})
+    versions = sorted(p.name for p in tmp_path.iterdir() if ".v" in p.name)
+    assert versions == [".ka10015.v2", ".ka10015.v3"]
+    assert os.readlink(tmp_path / "ka10015") == ".ka10015.v3"
+    np.testing.assert_array_equal(
+        store.load("ka10015", codes=["005930"])["close_pric"],
+        [[100, 111, np.nan, np.nan]],
+    )
+
+
+def _merge_codes(root: str, prefix: str) -> None:
+    store = HistoryStore(root)
+    for i in range(8):
+        store.merge("ka10015", {f"{prefix}{i:05d}": _columns([20250102 + i], [i])})
+
+
+def test_history_store_merges_from_several_processes(tmp_path: Path) -> None:
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(target=_merge_codes, args=(str(tmp_path), prefix))
+        for prefix in "12"
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+
+    # 파일 잠금으로 병합이 직렬화되어 어느 쪽 행도 잃지 않습니다.
+    panel = HistoryStore(tmp_path).load("ka10015")
+    assert len(panel.codes) == 16
+    assert int(np.count_nonzero(~np.isnan(panel["close_pric"]))) == 16
+
+
+def test_history_store_migrates_plain_directory(tmp_path: Path) -> None:
+    legacy = tmp_path / "ka10015"
+    legacy.mkdir()
+    np.save(legacy / "dates.npy", np.array([20250102], dtype=np.int32))
+    np.save(legacy / "close_pric.npy", np.array([[100.0]]))
+    (legacy / "codes.json").write_text('["005930"]', encoding="utf-8")
+    store = HistoryStore(tmp_path)
+
+    store.merge("ka10015", {"005930": _columns([20250103], [101])})
+
+    assert (tmp_path / "ka10015").is_symlink()
+    assert store.load("ka10015")["close_pric"].tolist() == [[100.0, 101.0]]
+
+
+def test_backtest_applies_fees_tax_and_slippage() -> None:
+    close = np.array([[100.0, 100.0, 110.0, 121.0, 121.0]])
+    # t=0 에 매수 신호, t=2 에 매도 신호 -> 다음 날 종가(t=1, t=3)에 체결
+    signal = np.array([[True, True, False, False, False]])
+    costs = CostModel(commission=0.001, tax=0.002, slippage=0.0005)
+
+    result = run_backtest(
+        {"close_pric": close}, signal, initial_capital=1_000_000, costs=costs
+    )
+
+    buy_cost = 1_000_000 * (0.001 + 0.0005)
+    sell_cost = 1_210_000 * (0.001 + 0.002 + 0.0005)
+    assert result.costs.tolist() == pytest.approx([0, buy_cost, 0, sell_cost, 0])
+    assert result.equity[-1] == pytest.approx(1_210_000 - buy_cost - sell_cost)
+    assert result.stats["total_return"] == pytest.approx(
+        (1_210_000 - buy_cost - sell_cost) / 1_000_000 - 1
+    )
+    assert result.stats["max_drawdown"] < 0
+
+
+def test_backtest_defers_trades_on_missing_prices() -> None:
+    # 두 번째 종목은 t=1 에 거래정지(종가 없음)
+    close = np.array([[100.0, 100.0, 100.0, 100.0], [50.0, np.nan, 55.0, 55.0]])
+    signal = np.ones_like(close, dtype=np.bool_)
+
+    result = run_backtest(
+        {"close_pric": close}, signal, costs=CostModel(0, 0, 0), initial_capital=1000
+    )
+
+    # t=1 에는 첫 종목만 체결, t=2 에 두 번째 종목 체결
+    assert result.turnover[1] == pytest.approx(0.5)
+    assert result.turnover[2] == pytest.approx(0.5)
+    assert result.equity[-1] == pytest.approx(1000)
+
+
+def test_momentum_signal_is_cross_sectional() -> None:
+    days = np.arange(10, dtype=np.float64)
+    close = np.vstack([100 + days, 100 + 3 * days, 100 - days])
+
+    held = momentum_top_n(lookback=3, top_n=1)({"close_pric": close})
+
+    assert not held[:, :3].any()
+    assert held[1, 3:].all()
+    assert not held[[0, 2], 3:].any()
+
+
+def test_history_service_syncs_and_backtests(
+    tmp_path: Path, mocker: MockerFixture
+) -> None:
+    api = mocker.Mock()
+    pages = {
+        "005930": [
+            {"daly_trde_dtl": [{"dt": "20250106", "close_pric": "+110"}]},
+            {"daly_trde_dtl": [{"dt": "20250103", "close_pric": "100"}]},
+        ],
+        "000660": [{"daly_trde_dtl": [{"dt": "20250106", "close_pric": "-200"}]}],
+    }
+    api.paginate.side_effect = lambda request, code, start, max_pages: iter(pages[code])
+    service = HistoryService(api, HistoryStore(tmp_path))
+
+    assert service.sync_daily(["005930", "000660"], "20250101") == 3
+
+    panel = service.store.load("ka10015", fields=["close_pric"])
+    np.testing.assert_array_equal(panel["close_pric"], [[np.nan, 200], [100, 110]])
+
+    result = service.backtest(
+        lambda fields: ~np.isnan(fields["close_pric"]), lag=0, rebalance="daily"
+    )
+    assert result.dates.tolist() == [20250103, 20250106]
+    assert result.equity.size == 2
@@ -0,0 +1,189 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List
+from unittest.mock import Mock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from a_stocks._service.bar_service import BarService
+from a_stocks._utils.bar_builder import BarBuilder
+from a_stocks._utils.kiwoom_api import KiwoomAPI
+
+
+def _tick(tm: str, price: int, qty: int, acc: int) -> Dict[str, Any]:
+    return {
+        "tm": tm,
+        "cur_prc": f"+{price}",
+        "cntr_trde_qty": f"-{qty}",
+        "acc_trde_qty": str(acc),
+        "stex_tp": "KRX",
+    }
+
+
+# 시간순 체결 (09:00:10 ~ 09:06:00)
+TICKS = [
+    _tick("090010", 100, 10, 10),
+    _tick("090030", 105, 5, 15),
+    _tick("090059", 95, 5, 20),
+    _tick("090100", 101, 10, 30),
+    _tick("090430", 110, 20, 50),
+    _tick("090600", 108, 10, 60),
+]
+
+
+def _pages(ticks: List[Dict[str, Any]], page_size: int) -> List[Dict[str, Any]]:
+    # API 는 최신 체결이 먼저 오고, 연속조회로 과거 체결을 받습니다.
+    newest_first = list(reversed(ticks))
+    return [
+        {"tdy_pred_cntr": newest_first[i : i + page_size]}
+        for i in range(0, len(newest_first), page_size)
+    ]
+
+
+def test_builds_ohlcv_and_vwap_for_each_timeframe() -> None:
+    builder = BarBuilder(timeframes=(1, 5))
+
+    assert builder.ingest("005930", _pages(TICKS, 2)) == 6
+
+    one_minute = builder.bars("005930", 1)
+    assert [bar["start"] for bar in one_minute] == ["0900", "0901", "0904", "0906"]
+    first = one_minute[0]
+    assert (first["open"], first["high"], first["low"], first["close"]) == (
+        100.0,
+        105.0,
+        95.0,
+        95.0,
+    )
+    assert first["volume"] == 20
+    assert first["vwap"] == pytest.approx((100 * 10 + 105 * 5 + 95 * 5) / 20)
+
+    five_minute = builder.bars("005930", 5)
+    assert [bar["start"] for bar in five_minute] == ["0900", "0905"]
+    assert five_minute[0]["volume"] == 50
+    assert five_minute[0]["close"] == 110.0
+
+
+def test_repolling_is_idempotent_and_stops_at_seen_ticks() -> None:
+    builder = BarBuilder(timeframes=(1,))
+    builder.ingest("005930", _pages(TICKS[:4], 2))
+
+    consumed: List[int] = []
+
+    def pages() -> Iterator[Dict[str, Any]]:
+        for i, page in enumerate(_pages(TICKS, 2)):
+            consumed.append(i)
+            yield page
+
+    # 새 체결 2건만 반영되고, 이미 본 체결이 나온 페이지 이후로는 조회하지 않음
+    assert builder.ingest("005930", pages()) == 2
+    assert consumed == [0, 1]
+    assert builder.ingest("005930", _pages(TICKS, 2)) == 0
+
+    volumes = [bar["volume"] for bar in builder.bars("005930", 1)]
+    assert volumes == [20, 10, 20, 10]
+
+
+def test_new_ticks_extend_the_current_bar() -> None:
+    builder = BarBuilder(timeframes=(1,))
+    builder.ingest("005930", _pages(TICKS[:2], 5))
+    builder.ingest("005930", _pages(TICKS[:3], 5))
+
+    bar = builder.bars("005930", 1)[0]
+    assert (bar["high"], bar["low"], bar["close"], bar["volume"]) == (
+        105.0,
+        95.0,
+        95.0,
+        20,
+    )
+
+
+def test_ring_buffer_keeps_memory_bounded() -> None:
+    builder = BarBuilder(timeframes=(1,), capacity=3)
+    ticks = [
+        _tick(f"09{minute:02d}00", 100 + minute, 1, minute + 1) for minute in range(10)
+    ]
+
+    builder.ingest("005930", _pages(ticks, 4))
+
+    bars = builder.bars("005930", 1)
+    assert [bar["start"] for bar in bars] == ["0907", "0908", "0909"]
+    assert builder._rings["005930"][1].data.shape[1] == 3
+
+
+def test_bar_service_pages_through_ka10084(mocker: MockerFixture) -> None:
+    api = KiwoomAPI()
+    token_response = mocker.Mock()
+    token_response.json.return_value = {
+        "token": "test_access_token",
+        "expires_dt": (datetime.now() + timedelta(hours=1)).strftime("%Y%m%d%H%M%S"),
+        "return_code": 0,
+    }
+    responses = []
+    for page, cont_yn, next_key in zip(
+        _pages(TICKS, 3), ["Y", "N"], ["next_key_value", ""]
+    ):
+        response = mocker.Mock()
+        response.json.return_value = {**page, "return_code": 0}
+        response.headers = {"cont-yn": cont_yn, "next-key": next_key}
+        responses.append(response)
+
+    client_mock = mocker.Mock()
+    client_mock.post.return_value = token_response
+    client_mock.request = Mock(side_effect=responses)
+    api.client = client_mock
+
+    service = BarService(api)
+
+    assert service.poll("005930") == 6
+    assert client_mock.request.call_count == 2
+    second_headers = client_mock.request.call_args_list[1][1]["headers"]
+    assert second_headers["cont-yn"] == "Y"
+    assert second_headers["next-key"] == "next_key_value"
+    assert len(service.get_bars("005930", 15)) == 1
+
+
+def test_next_trading_day_resets_watermark() -> None:
+    builder = BarBuilder(timeframes=(1,))
+    builder.ingest("005930", _pages(TICKS, 3), date="20250102")
+
+    # 다음 날 이른 시각 체결은 전날 마지막 체결 시각보다 앞서도 반영합니다.
+    morning = [_tick("090005", 200, 3, 3)]
+    assert builder.ingest("005930", _pages(morning, 3), date="20250103") == 1
+    assert [bar["start"] for bar in builder.bars("005930", 1)] == ["0900"]
+    assert builder.bars("005930", 1)[0]["close"] == 200.0
+    assert builder.ingest("005930", _pages(morning, 3), date="20250103") == 0
+
+
+def test_paginate_keeps_next_key_when_other_requests_interleave(
+    mocker: MockerFixture,
+) -> None:
+    api = KiwoomAPI()
+    api.access_token = "token"
+    api.token_expires_dt = datetime.now() + timedelta(hours=1)
+
+    def response(cont_yn: str, next_key: str) -> Any:
+        result = mocker.Mock()
+        result.json.return_value = {"return_code": 0}
+        result.headers = {"cont-yn": cont_yn, "next-key": next_key}
+        return result
+
+    client_mock = mocker.Mock()
+    client_mock.request = Mock(
+        side_effect=[response("Y", "page2"), response("N", ""), response("N", "")]
+    )
+    api.client = client_mock
+
+    pages = api.paginate(
+        api.today_vs_previous_day_execution_request_ka10084,
+        stock_code="005930",
+        today_previous="0",
+        tick_minute="0",
+        time="",
+    )
+    next(pages)
+    # 페이지 사이에 같은 스레드에서 다른 TR 을 요청해도 다음 페이지 키가 유지됩니다.
+    api.basic_stock_information_request_ka10001("005930")
+    assert len(list(pages)) == 1
+
+    headers = client_mock.request.call_args_list[2][1]["headers"]
+    assert (headers["cont-yn"], headers["next-key"]) == ("Y", "page2")
@@ -0,0 +1,204 @@
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pytest
+from ninja.testing import TestClient
+from pytest_mock import MockerFixture
+
+from a_stocks._router import stocks
+from a_stocks._service.broker_flow_service import BrokerFlowService
+from a_stocks._utils.broker_flow import (
+    BUY,
+    SELL,
+    BrokerDirectory,
+    BrokerFlows,
+    aggregate_by_broker,
+    decode_agent_analysis_ka10043,
+    decode_instant_volume_ka10052,
+    decode_trading_agents_ka10002,
+)
+from a_stocks._utils.code_registry import CodeRegistry
+
+MEMBERS = [
+    {"code": "001", "name": "교  보", "gb": "0"},
+    {"code": "002", "name": "신한금융투자", "gb": "0"},
+    {"code": "003", "name": "한국투자증권", "gb": "0"},
+]
+
+
+def _agents(stock_code: str, sells: List[tuple], buys: List[tuple]) -> Dict[str, Any]:
+    response: Dict[str, Any] = {"stk_cd": stock_code}
+    for prefix, slots in (("sel", sells), ("buy", buys)):
+        for i in range(1, 6):
+            code, name, qty = slots[i - 1] if i <= len(slots) else ("000", "", "0")
+            response[f"{prefix}_trde_ori_{i}"] = code
+            response[f"{prefix}_trde_ori_nm_{i}"] = name
+            response[f"{prefix}_trde_qty_{i}"] = qty
+    return response
+
+
+def test_decode_ka10002_reshapes_flat_slots() -> None:
+    directory = BrokerDirectory(MEMBERS)
+    registry = CodeRegistry()
+    responses = [
+        _agents("005930", [("001", "교보", "-300")], [("002", "신한", "+500")]),
+        # 목록에 없는 거래원은 새 id 를 받고 응답의 이름을 씁니다.
+        _agents("000660", [("002", "", "100")], [("050", "키움증권", "700")]),
+    ]
+
+    flows = decode_trading_agents_ka10002(responses, directory, registry)
+
+    assert len(flows) == 4
+    assert registry.decode(flows.codes).tolist() == [
+        "005930",
+        "005930",
+        "000660",
+        "000660",
+    ]
+    assert directory.codes(flows.brokers).tolist() == ["001", "002", "002", "050"]
+    assert flows.sides.tolist() == [SELL, BUY, SELL, BUY]
+    assert flows.qty.tolist() == [300.0, 500.0, 100.0, 700.0]
+    assert directory.names(flows.brokers) == [
+        "교보",
+        "신한금융투자",
+        "신한금융투자",
+        "키움증권",
+    ]
+
+
+def test_aggregate_by_broker_in_one_pass() -> None:
+    flows = BrokerFlows(
+        codes=[0, 0, 1, 1, 2],
+        brokers=[5, 7, 5, 5, 7],
+        sides=[BUY, SELL, BUY, SELL, BUY],
+        qty=[100.0, 50.0, 30.0, 20.0, 300.0],
+    )
+
+    table = aggregate_by_broker(flows)
+
+    assert table["broker"].tolist() == [5, 7]
+    assert table["buy"].tolist() == [130.0, 300.0]
+    assert table["sell"].tolist() == [20.0, 50.0]
+    assert table["net"].tolist() == [110.0, 250.0]
+    assert table["symbols"].tolist() == [2, 2]
+    np.testing.assert_allclose(table["share"], [30.0, 70.0])
+    assert aggregate_by_broker(BrokerFlows.empty())["broker"].size == 0
+
+
+def test_decode_ka10043_and_ka10052() -> None:
+    directory = BrokerDirectory(MEMBERS)
+    registry = CodeRegistry()
+
+    analysis = decode_agent_analysis_ka10043(
+        {
+            "trde_ori_prps_anly": [
+                {"dt": "20241105", "sel_qty": "43", "buy_qty": "1090"},
+                {"dt": "20241104", "sel_qty": "7", "buy_qty": "0"},
+            ]
+        },
+        "005930",
+        "003",
+        directory,
+        registry,
+    )
+    assert analysis.sides.tolist() == [BUY, SELL]
+    assert analysis.qty.tolist() == [1090.0, 50.0]
+
+    instant = decode_instant_volume_ka10052(
+        {
+            "trde_ori_mont_trde_qty": [
+                {
+                    "stk_cd": "005930",
+                    "trde_ori_nm": "다이와",
+                    "tp": "-매도",
+                    "mont_trde_qty": "-399928",
+                },
+                {
+                    "stk_cd": "000660",
+                    "trde_ori_nm": "다이와",
+                    "tp": "+매수",
+                    "mont_trde_qty": "1200",
+                },
+                {"stk_cd": "035720", "mont_trde_qty": "0"},
+            ]
+        },
+        "061",
+        directory,
+        registry,
+    )
+    assert instant.sides.tolist() == [SELL, BUY]
+    assert instant.qty.tolist() == [399928.0, 1200.0]
+    assert directory.names(instant.brokers[:1]) == ["다이와"]
+
+
+class FakeMaster:
+    date: Optional[str] = "20250102"
+
+    def members(self) -> List[Dict[str, Any]]:
+        return MEMBERS
+
+
+class FakeBrokerAPI:
+    def stock_trading_agent_request_ka10002(self, stock_code: str) -> Dict[str, Any]:
+        if stock_code == "999999":
+            raise RuntimeError("조회 실패")
+        response = {
+            "005930": _agents(
+                "005930", [("001", "", "300")], [("002", "", "500"), ("003", "", "50")]
+            ),
+            "000660": _agents("000660", [("002", "", "100")], [("001", "", "40")]),
+        }[stock_code]
+        del response["stk_cd"]
+        return response
+
+
+def test_market_flows_joins_member_names() -> None:
+    service = BrokerFlowService(
+        FakeBrokerAPI(),  # type: ignore[arg-type]
+        master=FakeMaster(),  # type: ignore[arg-type]
+        max_workers=2,
+    )
+
+    result = service.market_flows(["005930", "000660", "999999"], sort="net")
+
+    assert result["failed"] == ["999999"]
+    assert result["records"] == 5 and result["brokers"] == 3
+    top = result["results"][0]
+    assert (top["broker"], top["name"]) == ("002", "신한금융투자")
+    assert (top["buy"], top["sell"], top["net"], top["symbols"]) == (
+        500.0,
+        100.0,
+        400.0,
+        2,
+    )
+    assert result["results"][-1]["name"] == "교보"
+    assert sum(row["share"] for row in result["results"]) == pytest.approx(100.0)
+
+
+def test_broker_flow_route(mocker: MockerFixture) -> None:
+    service = mocker.patch(
+        "a_stocks._router.stocks.get_broker_flow_service"
+    ).return_value
+    service.market_flows.return_value = {
+        "records": 1,
+        "brokers": 1,
+        "failed": [],
+        "results": [
+            {
+                "broker": "002",
+                "name": "신한금융투자",
+                "buy": 500.0,
+                "sell": 0.0,
+                "net": 500.0,
+                "total": 500.0,
+                "symbols": 1,
+                "share": 100.0,
+            }
+        ],
+    }
+
+    response = TestClient(stocks.router).get("/brokers/flow?codes=005930,%20000660")
+
+    assert response.status_code == 200
+    assert response.json()["results"][0]["broker"] == "002"
+    service.market_flows.assert_called_once_with(["005930", "000660"], "net", 20)
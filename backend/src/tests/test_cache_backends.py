@@ -0,0 +1,187 @@
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+
+from a_stocks._service.master_data import MasterDataService
+from a_stocks._utils.cache_backends import (
+    CacheBackend,
+    LocalCacheBackend,
+    Payload,
+    RedisCacheBackend,
+    SharedMemoryCacheBackend,
+    create_cache_backend,
+    decode_value,
+    encode_value,
+)
+from a_stocks._utils.response_cache import ResponseCache, make_etag
+
+
+def _roundtrip(value: Any) -> Any:
+    return decode_value(memoryview(b"".join(encode_value(value))))
+
+
+def test_codec_roundtrips_without_copying_buffers() -> None:
+    assert _roundtrip({"date": "20250102", "stocks": [{"name": "삼성전자"}]}) == {
+        "date": "20250102",
+        "stocks": [{"name": "삼성전자"}],
+    }
+    assert bytes(_roundtrip(b"\x00body")) == b"\x00body"
+
+    payload = _roundtrip(Payload({"etag": 'W/"1"'}, b"{}"))
+    assert payload.meta == {"etag": 'W/"1"'} and bytes(payload.body) == b"{}"
+
+    blob = b"".join(
+        encode_value(
+            {
+                "code": np.array(["005930", "000660"], dtype=object),
+                "close": np.arange(6, dtype=np.float64).reshape(2, 3),
+                "dt": np.array([20250102], dtype=np.int32),
+            }
+        )
+    )
+    columns = decode_value(memoryview(blob))
+    assert columns["code"].tolist() == ["005930", "000660"]
+    assert columns["close"].shape == (2, 3) and columns["close"][1, 2] == 5.0
+    assert columns["dt"].tolist() == [20250102]
+    # 숫자 배열은 버퍼를 그대로 가리킵니다.
+    assert np.shares_memory(columns["close"], np.frombuffer(blob, dtype=np.uint8))
+    assert not columns["close"].flags.writeable
+    assert _roundtrip(np.zeros(0)).shape == (0,)
+
+    with pytest.raises(ValueError):
+        decode_value(memoryview(b"not a cache value"))
+
+
+def test_local_backend_keeps_objects_and_evicts(mocker: MockerFixture) -> None:
+    monotonic = mocker.patch("a_stocks._utils.cache_backends.time.monotonic")
+    monotonic.return_value = 0.0
+    backend = LocalCacheBackend(max_entries=2)
+    value: List[int] = [1]
+    backend.set("a", value, ttl=1.0)
+    backend.set("b", 2)
+    assert backend.get("a") is value
+    backend.set("c", 3)
+
+    assert backend.get("b") is None
+    monotonic.return_value = 1.5
+    assert backend.get("a") is None
+    assert backend.get("c") == 3
+
+
+def test_shared_memory_backend_is_shared_between_instances(
+    tmp_path: Path, mocker: MockerFixture
+) -> None:
+    wall = mocker.patch("a_stocks._utils.cache_backends.time.time")
+    wall.return_value = 1000.0
+    writer = SharedMemoryCacheBackend(tmp_path, prune_every=0)
+    reader = SharedMemoryCacheBackend(tmp_path)
+    writer.set("price:005930", Payload({"etag": "x"}, b"body"), ttl=1.0)
+    writer.set("bars", {"close": np.arange(4.0)})
+    writer.set("stale", [1], ttl=0.5)
+
+    assert bytes(reader.get("price:005930").body) == b"body"
+    assert reader.get("bars")["close"].tolist() == [0.0, 1.0, 2.0, 3.0]
+    assert reader.get("missing") is None
+
+    wall.return_value = 1000.7
+    assert writer.prune() == 1
+    wall.return_value = 1001.5
+    assert reader.get("price:005930") is None
+    assert not any(path.name.startswith(".") for path in tmp_path.iterdir())
+
+    reader.delete("bars")
+    assert writer.get("bars") is None
+    writer.set("a", 1)
+    writer.clear()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_redis_backend_against_fakeredis() -> None:
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    backend = RedisCacheBackend(client=fakeredis.FakeRedis(server=server))
+    other = RedisCacheBackend(client=fakeredis.FakeRedis(server=server))
+
+    backend.set("price:005930", Payload({"etag": "x"}, b"body"), ttl=60.0)
+    backend.set("bars", {"close": np.arange(3.0)})
+    backend.set("gone", 1, ttl=0.0)
+
+    assert bytes(other.get("price:005930").body) == b"body"
+    assert other.get("bars")["close"].tolist() == [0.0, 1.0, 2.0]
+    assert other.get("gone") is None
+    assert 0 < backend.client.pttl("a_stocks:price:005930") <= 60000
+    other.clear()
+    assert backend.get("bars") is None
+
+
+def test_response_cache_over_shared_backend(tmp_path: Path) -> None:
+    first = ResponseCache(ttl=30.0, backend=SharedMemoryCacheBackend(tmp_path))
+    second = ResponseCache(ttl=30.0, backend=SharedMemoryCacheBackend(tmp_path))
+    etag = make_etag(b'{"a":1}')
+    first.set("price:005930", b'{"a":1}', etag)
+
+    entry = second.get("price:005930")
+
+    assert entry is not None
+    assert (entry.body, entry.etag) == (b'{"a":1}', etag)
+    assert 29.0 < entry.expires_at - time.monotonic() <= 30.0
+
+
+class FakeMasterAPI:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def paginate(self, request: Any, *args: Any) -> List[Dict[str, Any]]:
+        self.calls += 1
+        return [{"list": [{"code": f"{len(args)}-{self.calls}", "name": "A"}]}]
+
+    def stock_information_list_request_ka10099(self, market: str) -> None: ...
+
+    def industry_code_list_ka10101(self, market: str) -> None: ...
+
+    def member_company_list_ka10102(self) -> None: ...
+
+
+def test_master_data_is_shared_through_cache_backend(tmp_path: Path) -> None:
+    cache = SharedMemoryCacheBackend(tmp_path / "cache")
+    service = MasterDataService(
+        FakeMasterAPI(),  # type: ignore[arg-type]
+        path=tmp_path / "a.json",
+        stock_markets=("0",),
+        industry_markets=(),
+        cache=cache,
+    )
+    service.refresh()
+
+    # 스냅샷 파일이 없는 다른 워커도 공유 캐시에서 읽습니다.
+    api = FakeMasterAPI()
+    other = MasterDataService(
+        api,  # type: ignore[arg-type]
+        path=tmp_path / "missing.json",
+        cache=SharedMemoryCacheBackend(tmp_path / "cache"),
+    )
+    assert [row["code"] for row in other.stocks()] == ["1-1"]
+    assert api.calls == 0
+
+
+def test_create_cache_backend(tmp_path: Path) -> None:
+    assert isinstance(create_cache_backend(), LocalCacheBackend)
+    shared = create_cache_backend("shared", directory=tmp_path)
+    assert isinstance(shared, SharedMemoryCacheBackend) and shared.serialized
+    custom = create_cache_backend(
+        "a_stocks._utils.cache_backends.LocalCacheBackend", max_entries=3
+    )
+    assert isinstance(custom, LocalCacheBackend) and custom.max_entries == 3
+
+
+def test_incomplete_backend_fails_on_creation() -> None:
+    class GetOnlyBackend(CacheBackend):
+        def get(self, key: str) -> Any:
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnlyBackend()  # type: ignore[abstract]
@@ -0,0 +1,74 @@
+from pathlib import Path
+
+import numpy as np
+
+from a_stocks._utils.code_registry import CodeRegistry, locate
+from a_stocks._utils.columnar import ColumnTable
+from a_stocks._utils.history_store import HistoryStore
+from a_stocks._utils.parsers import parse_number
+
+
+def test_registry_interns_codes_and_maps_venues_to_base() -> None:
+    registry = CodeRegistry(["005930"])
+
+    ids = registry.encode(["000660", "005930", "005930_NX", "000660"])
+    assert ids.dtype == np.int32
+    assert ids.tolist() == [1, 0, 2, 1]
+    assert registry.decode([2, -1, 0]).tolist() == ["005930_NX", "", "005930"]
+    assert registry.base_ids(ids).tolist() == [1, 0, 0, 1]
+    # 디코딩한 문자열은 같은 객체를 공유합니다.
+    assert registry.decode([0])[0] is registry.code_of(0)
+    assert registry.encode(["999999"], add=False).tolist() == [-1]
+    assert "999999" not in registry and len(registry) == 3
+
+    # 접미사가 붙은 코드를 먼저 보면 KRX 코드도 함께 등록됩니다.
+    assert registry.intern("035720_AL") == 4
+    assert registry.code_of(3) == "035720"
+    assert registry.base_ids([4]).tolist() == [3]
+
+    assert locate([7, 3, 5], [5, 4, 7, 3]).tolist() == [2, -1, 0, 1]
+    assert locate([], [1]).tolist() == [-1]
+
+
+def test_column_tables_join_on_integer_ids() -> None:
+    registry = CodeRegistry()
+    left = ColumnTable.from_rows(
+        [{"stk_cd": "000660", "x": "1"}, {"stk_cd": "005930", "x": "2"}],
+        {"x": parse_number},
+        prefix="a",
+        registry=registry,
+    )
+    right = ColumnTable.from_rows(
+        [{"stk_cd": "035720", "y": "3"}, {"stk_cd": "005930", "y": "4"}],
+        {"y": parse_number},
+        prefix="b",
+        registry=registry,
+    )
+
+    joined = ColumnTable.outer_join([left, right])
+
+    assert joined.keys.dtype == np.int32
+    assert joined.codes.tolist() == ["000660", "005930", "035720"]
+    np.testing.assert_array_equal(joined["a.x"], [1.0, 2.0, np.nan])
+    np.testing.assert_array_equal(joined["b.y"], [np.nan, 4.0, 3.0])
+    assert joined.take(joined["b"]).codes.tolist() == ["005930", "035720"]
+
+
+def test_history_panel_rows_are_located_by_id(tmp_path: Path) -> None:
+    registry = CodeRegistry()
+    store = HistoryStore(tmp_path, registry=registry)
+    dates = np.array([20250102, 20250103], dtype=np.int32)
+    store.merge(
+        "flows",
+        {
+            code: {"dt": dates, "v": np.array([i, i + 0.5])}
+            for i, code in enumerate(["005930", "000660"])
+        },
+    )
+
+    panel = store.load("flows", codes=["000660", "111111", "005930"])
+
+    assert registry.decode(panel.ids).tolist() == panel.codes
+    np.testing.assert_array_equal(
+        panel["v"], [[1.0, 1.5], [np.nan, np.nan], [0.0, 0.5]]
+    )
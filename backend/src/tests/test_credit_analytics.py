@@ -0,0 +1,231 @@
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pytest
+from django.core.management import CommandError, call_command
+from ninja.testing import TestClient
+from pytest_mock import MockerFixture
+
+from a_stocks._router import stocks
+from a_stocks._service.credit_service import CreditService
+from a_stocks._utils.credit_analytics import (
+    CreditSurgeIndex,
+    balance_change,
+    change_ratio,
+    forward_fill,
+)
+from a_stocks._utils.history_store import HistoryStore
+from a_stocks._utils.tr_decoders import decode_lending_ka90012
+
+
+def test_balance_change_and_ratio_fill_missing_days() -> None:
+    balances = np.array([[100.0, np.nan, 120.0, 150.0], [np.nan, 0.0, 10.0, np.nan]])
+
+    np.testing.assert_array_equal(
+        forward_fill(balances), [[100, 100, 120, 150], [np.nan, 0, 10, 10]]
+    )
+    np.testing.assert_array_equal(
+        balance_change(balances, 2),
+        [[np.nan, np.nan, 20, 50], [np.nan, np.nan, np.nan, 10]],
+    )
+    # 이전 잔고가 0 이면 증감률은 NaN 입니다.
+    np.testing.assert_array_equal(
+        change_ratio(balances, 2),
+        [[np.nan, np.nan, 20, 50], [np.nan, np.nan, np.nan, np.nan]],
+    )
+
+
+def test_surge_index_advances_incrementally_like_full_rebuild() -> None:
+    rng = np.random.default_rng(7)
+    codes = [f"{i:06d}" for i in range(8)]
+    balances = rng.uniform(100, 200, size=(8, 30))
+    balances[3, -5:] *= 3  # 최근 5일 급증
+    balances[5, 10:20] = np.nan  # 중간 결측
+    dates = np.arange(20250101, 20250131, dtype=np.int32)
+
+    full = CreditSurgeIndex(windows=(5,))
+    full.extend(dates, codes, balances)
+    incremental = CreditSurgeIndex(windows=(5,))
+    incremental.extend(dates[:20], codes, balances[:, :20])
+    for j in range(20, 30):
+        incremental.advance(int(dates[j]), codes, balances[:, j])
+
+    expected = change_ratio(balances, 5)[:, -1]
+    top = incremental.top(5, limit=3)
+    assert top == full.top(5, limit=3)
+    assert top[0]["code"] == "000003"
+    assert top[0]["change_pct"] == pytest.approx(expected[3], abs=1e-4)
+    assert [row["code"] for row in top] == [codes[i] for i in np.argsort(-expected)[:3]]
+    # 꼬리만 들고 있습니다.
+    assert incremental.balance.shape == (8, 6)
+    assert incremental.date == 20250130
+
+
+def test_surge_index_overwrites_same_date_and_adds_new_codes() -> None:
+    index = CreditSurgeIndex(windows=(1,))
+    index.advance(20250102, ["A"], [100.0], ratio=[1.5])
+    index.advance(20250103, ["A", "B"], [110.0, 50.0])
+    assert index.top(1) == [
+        {
+            "code": "A",
+            "balance": 110.0,
+            "change": 10.0,
+            "change_pct": 10.0,
+            "ratio": 1.5,
+        }
+    ]
+
+    # 같은 일자를 다시 넣으면 덮어쓰고, 과거 일자는 무시합니다.
+    index.advance(20250103, ["A"], [150.0])
+    assert not index.advance(20250101, ["A"], [1.0])
+    assert index.lookup("A")["1"]["change_pct"] == 50.0
+    assert index.lookup("B")["1"]["change"] is None
+    with pytest.raises(KeyError):
+        index.top(5)
+
+
+class FakeCreditAPI:
+    def __init__(self) -> None:
+        self.remn: Dict[str, Dict[str, str]] = {
+            "005930": {"20250102": "100", "20250103": "110"},
+            "000660": {"20250102": "100", "20250103": "200"},
+        }
+        self.lending: Dict[str, List[Dict[str, Any]]] = {}
+
+    def credit_trading_trend_request_ka10013(
+        self, stock_code: str, date: str, query_type: str
+    ) -> Dict[str, Any]:
+        if stock_code == "999999":
+            raise RuntimeError("조회 실패")
+        return {
+            "crd_trde_trend": [
+                {"dt": dt, "remn": remn, "remn_rt": "0.5"}
+                for dt, remn in self.remn[stock_code].items()
+                if dt <= date
+            ]
+        }
+
+    def margin_trading_transaction_details_request_ka90012(
+        self, date: str, market_type: str
+    ) -> Dict[str, Any]:
+        raise AssertionError("paginate 를 통해 호출해야 합니다.")
+
+    def paginate(
+        self, request: Callable[..., Dict[str, Any]], date: str, market: str
+    ) -> List[Dict[str, Any]]:
+        rows = [row for row in self.lending.get(date, []) if row["market"] == market]
+        return [{"dbrt_trde_prps": rows[:1]}, {"dbrt_trde_prps": rows[1:]}]
+
+
+def test_credit_service_collects_and_refreshes_index(tmp_path: Path) -> None:
+    api = FakeCreditAPI()
+    service = CreditService(api, HistoryStore(tmp_path), max_workers=2)  # type: ignore[arg-type]
+
+    result = service.collect_credit(["005930", "000660", "999999"], "20250103")
+    assert result == {"merged": 4, "failed": ["999999"]}
+    surge = service.surge("loan", window=1)
+    assert surge["date"] == 20250103
+    assert [row["code"] for row in surge["results"]] == ["000660", "005930"]
+    assert surge["results"][0]["ratio"] == 0.5
+
+    # 새 일자가 들어오면 그 열만 읽어 인덱스를 갱신합니다.
+    api.remn["005930"]["20250106"] = "330"
+    api.remn["000660"]["20250106"] = "200"
+    service.collect_credit(["005930", "000660"], "20250106")
+    surge = service.surge("loan", window=1)
+    assert surge["date"] == 20250106
+    assert surge["results"][0] == {
+        "code": "005930",
+        "balance": 330.0,
+        "change": 220.0,
+        "change_pct": 200.0,
+        "ratio": 0.5,
+    }
+    # 새 프로세스는 저장소 꼬리로 같은 인덱스를 만듭니다.
+    fresh = CreditService(api, HistoryStore(tmp_path), max_workers=1)  # type: ignore[arg-type]
+    assert fresh.surge("loan", window=1) == surge
+
+    with pytest.raises(ValueError):
+        service.surge("unknown")
+
+
+def test_lending_snapshots_become_time_series(tmp_path: Path) -> None:
+    api = FakeCreditAPI()
+    for date, balances in (("20250102", (1000, 500)), ("20250103", (1500, 400))):
+        api.lending[date] = [
+            {"stk_cd": "005930", "rmnd": str(balances[0]), "market": "001"},
+            {"stk_cd": "035720", "rmnd": str(balances[1]), "market": "101"},
+        ]
+    service = CreditService(api, HistoryStore(tmp_path), max_workers=1)  # type: ignore[arg-type]
+
+    assert service.collect_lending("20250102") == {"merged": 2}
+    service.collect_lending("20250103")
+
+    results = service.surge("lending", window=1, by="change")["results"]
+    assert [(row["code"], row["change"]) for row in results] == [
+        ("005930", 500.0),
+        ("035720", -100.0),
+    ]
+    decoded = decode_lending_ka90012(
+        {"dbrt_trde_prps": [{"stk_cd": "005930", "rmnd": "7"}]}, "20250104"
+    )
+    assert decoded["005930"]["dt"].tolist() == [20250104]
+    assert decoded["005930"]["rmnd"].tolist() == [7.0]
+
+
+def test_index_follows_dates_merged_by_another_process(tmp_path: Path) -> None:
+    api = FakeCreditAPI()
+    reader = CreditService(api, HistoryStore(tmp_path), max_workers=1)  # type: ignore[arg-type]
+    writer = CreditService(api, HistoryStore(tmp_path), max_workers=1)  # type: ignore[arg-type]
+    writer.collect_credit(["005930", "000660"], "20250103")
+    assert reader.surge("loan", window=1)["date"] == 20250103
+
+    api.remn["005930"]["20250106"] = "330"
+    writer.collect_credit(["005930"], "20250106")
+
+    surge = reader.surge("loan", window=1)
+    assert surge["date"] == 20250106
+    assert surge["results"][0]["code"] == "005930"
+    assert reader.index("loan") is reader.index("loan")
+
+
+def test_collect_command_runs_credit_collectors(mocker: MockerFixture) -> None:
+    mocker.patch(
+        "a_stocks.management.commands.kiwoom_collect.get_investor_flow_service"
+    ).return_value.collect.return_value = {"merged": 1, "failed": []}
+    service = mocker.patch(
+        "a_stocks.management.commands.kiwoom_collect.get_credit_service"
+    ).return_value
+    service.collect_credit.return_value = {"merged": 2, "failed": []}
+    service.collect_lending.side_effect = RuntimeError("조회 실패")
+
+    # 한 대상이 실패해도 나머지는 수집하고 마지막에 실패를 알립니다.
+    with pytest.raises(CommandError, match="lending"):
+        call_command("kiwoom_collect", codes="005930", date="20250103")
+
+    assert [call.kwargs["kind"] for call in service.collect_credit.call_args_list] == [
+        "loan",
+        "short",
+    ]
+    service.collect_lending.assert_called_once_with("20250103")
+
+
+def test_credit_surge_route(mocker: MockerFixture) -> None:
+    service = mocker.patch("a_stocks._router.stocks.get_credit_service").return_value
+    service.surge.return_value = {
+        "kind": "loan",
+        "window": 5,
+        "by": "change_pct",
+        "date": 20250103,
+        "results": [{"code": "005930", "balance": 110.0, "change_pct": 10.0}],
+    }
+
+    response = TestClient(stocks.router).get("/credit/surge?kind=loan&limit=3")
+
+    assert response.status_code == 200
+    assert response.json()["results"][0]["code"] == "005930"
+    service.surge.assert_called_once_with("loan", 5, 3, "change_pct", False)
+
+    service.surge.side_effect = ValueError("잔고 종류 오류")
+    assert TestClient(stocks.router).get("/credit/surge?kind=x").status_code == 400
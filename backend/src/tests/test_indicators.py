@@ -0,0 +1,137 @@
+from typing import Any, Dict, List
+
+import numpy as np
+import pytest
+from ninja.testing import TestClient
+from pytest_mock import MockerFixture
+
+from a_stocks._router import stocks
+from a_stocks._service.indicator_service import IndicatorService
+from a_stocks._utils.indicators import (
+    IndicatorState,
+    bollinger,
+    compute_indicators,
+    ema,
+    rsi,
+    sma,
+)
+
+
+@pytest.fixture
+def close() -> np.ndarray:
+    rng = np.random.default_rng(42)
+    prices = 10000 * np.exp(np.cumsum(rng.normal(0, 0.02, size=(5, 120)), axis=1))
+    # 상장이 늦은 종목 (앞쪽 NaN)
+    prices[3, :30] = np.nan
+    return prices
+
+
+def _reference_ema(values: List[float], span: int) -> List[float]:
+    alpha = 2 / (span + 1)
+    out = [float("nan")] * len(values)
+    value = sum(values[:span]) / span
+    out[span - 1] = value
+    for i in range(span, len(values)):
+        value = value + alpha * (values[i] - value)
+        out[i] = value
+    return out
+
+
+def _reference_rsi(values: List[float], period: int) -> List[float]:
+    deltas = [b - a for a, b in zip(values, values[1:])]
+    gains = [max(d, 0.0) for d in deltas]
+    losses = [max(-d, 0.0) for d in deltas]
+    out = [float("nan")] * len(values)
+    avg_gain = sum(gains[:period]) / period
+    avg_loss = sum(losses[:period]) / period
+    out[period] = 100 - 100 / (1 + avg_gain / avg_loss)
+    for i in range(period, len(deltas)):
+        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
+        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
+        out[i + 1] = 100 - 100 / (1 + avg_gain / avg_loss)
+    return out
+
+
+def test_vectorized_indicators_match_reference_loops(close: np.ndarray) -> None:
+    row = close[0].tolist()
+
+    np.testing.assert_allclose(
+        sma(close, 20)[0, 19:],
+        [sum(row[i - 19 : i + 1]) / 20 for i in range(19, len(row))],
+    )
+    np.testing.assert_allclose(ema(close, 12)[0], _reference_ema(row, 12))
+    np.testing.assert_allclose(rsi(close, 14)[0], _reference_rsi(row, 14))
+
+    upper, middle, lower = bollinger(close, 20, 2.0)
+    np.testing.assert_allclose(upper - middle, middle - lower)
+    assert np.isnan(middle[0, :19]).all()
+
+
+def test_late_listing_only_affects_its_own_row(close: np.ndarray) -> None:
+    result = sma(close, 20)
+
+    assert np.isnan(result[3, : 30 + 19]).all()
+    assert not np.isnan(result[3, 30 + 19 :]).any()
+    np.testing.assert_allclose(result[3, 30:], sma(close[3:4, 30:], 20)[0])
+
+
+def test_incremental_update_matches_batch(close: np.ndarray) -> None:
+    batch = compute_indicators(close)
+
+    state = IndicatorState.from_history(close[:, :-1])
+    latest = state.update(close[:, -1])
+
+    for name, values in batch.items():
+        np.testing.assert_allclose(latest[name], values[:, -1], rtol=1e-7, err_msg=name)
+
+
+def test_get_indicators_service(mocker: MockerFixture) -> None:
+    api = mocker.Mock()
+    rows: List[Dict[str, Any]] = [
+        {"dt": f"2025{1 + i // 28:02d}{1 + i % 28:02d}", "close_pric": f"+{1000 + i}"}
+        for i in range(60)
+    ]
+    # API 는 최신 날짜부터 20일씩 연속조회로 반환합니다.
+    newest_first = list(reversed(rows))
+    pages = [
+        {"daly_trde_dtl": newest_first[i : i + 20], "return_code": 0}
+        for i in range(0, 60, 20)
+    ]
+    api.paginate.side_effect = lambda *args, **kwargs: iter(pages)
+
+    result = IndicatorService(api).get_indicators("005930", "20250101", limit=5)
+
+    points = result["indicators"]
+    assert [p["date"] for p in points] == [r["dt"] for r in rows[-5:]]
+    assert points[-1]["close"] == 1059.0
+    assert points[-1]["sma"] == pytest.approx(sum(range(1040, 1060)) / 20)
+    assert points[-1]["rsi"] == 100.0
+    # 세 페이지를 모두 받아 MACD(26/9) 도 값이 있습니다.
+    assert points[0]["macd_signal"] is not None
+
+    consumed: List[int] = []
+
+    def tracked(*args: Any, **kwargs: Any) -> Any:
+        for i, page in enumerate(pages):
+            consumed.append(i)
+            yield page
+
+    api.paginate.side_effect = tracked
+    IndicatorService(api).get_indicators("005930", "20250201", limit=5)
+    # 2월 1일이 든 두 번째 페이지에서 더 요청하지 않습니다.
+    assert consumed == [0, 1]
+
+
+def test_indicators_route(mocker: MockerFixture) -> None:
+    service = mocker.patch("a_stocks._router.stocks.IndicatorService").return_value
+    service.get_indicators.return_value = {
+        "code": "005930",
+        "indicators": [{"date": "20250102", "close": 1000.0, "sma": None}],
+    }
+    mocker.patch("a_stocks._router.stocks.get_stock_service")
+
+    response = TestClient(stocks.router).get("/005930/indicators?limit=1&sma_window=5")
+
+    assert response.status_code == 200
+    assert response.json()["indicators"][0]["close"] == 1000.0
+    assert service.get_indicators.call_args.kwargs["sma_window"] == 5
@@ -0,0 +1,158 @@
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pytest
+from django.core.management import CommandError, call_command
+from ninja.testing import TestClient
+from pytest_mock import MockerFixture
+
+from a_stocks._router import stocks
+from a_stocks._service.investor_flow_service import InvestorFlowService
+from a_stocks._utils.flow_analytics import (
+    FlowIndex,
+    cross_sectional_rank,
+    net_buy_streak,
+    rolling_sum,
+)
+from a_stocks._utils.history_store import HistoryStore
+
+
+def test_streak_rolling_sum_and_rank() -> None:
+    flows = np.array([[1.0, 2.0, -1.0, 3.0, 4.0], [-1.0, -2.0, 0.0, -3.0, np.nan]])
+
+    assert net_buy_streak(flows).tolist() == [[1, 2, -1, 1, 2], [-1, -2, 0, -1, 0]]
+    np.testing.assert_array_equal(
+        rolling_sum(flows, 3), [[np.nan, np.nan, 2, 4, 6], [np.nan, np.nan, -3, -5, -3]]
+    )
+    np.testing.assert_array_equal(
+        cross_sectional_rank([3.0, np.nan, 1.0, 2.0]).ravel(), [1.0, np.nan, 0.0, 0.5]
+    )
+
+
+def test_flow_index_serves_precomputed_top() -> None:
+    rng = np.random.default_rng(3)
+    flows = rng.normal(0, 10, size=(6, 30))
+    flows[2] += 50  # 꾸준한 순매수
+    flows[4, :] = np.nan  # 데이터 없음
+    codes = [f"{i:06d}" for i in range(6)]
+    dates = np.arange(20250101, 20250131, dtype=np.int32)
+
+    index = FlowIndex.build(codes, dates, {"frgnr_invsr": flows}, windows=(20,))
+    top = index.top("frgnr_invsr", 20, limit=3)
+
+    expected = np.nansum(flows[:, -20:], axis=1)
+    expected[4] = np.nan
+    order = [codes[i] for i in np.argsort(-np.nan_to_num(expected, nan=-np.inf))]
+    assert [row["code"] for row in top] == order[:3]
+    assert top[0]["code"] == "000002"
+    assert top[0]["net"] == pytest.approx(expected[2], abs=1e-4)
+    assert top[0]["rank"] == 1.0
+    assert top[0]["streak"] == net_buy_streak(flows)[2, -1]
+    # 데이터가 없는 종목은 순위에서 빠집니다.
+    assert "000004" not in [row["code"] for row in index.top("frgnr_invsr", 20, 10)]
+    assert index.lookup("000004")["frgnr_invsr:20"]["net"] is None
+    assert index.date == 20250130
+
+
+class FakeFlowAPI:
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+
+    def stock_data_by_investor_institution_request_ka10059(
+        self, date: str, code: str, *args: Any
+    ) -> Dict[str, Any]:
+        self.calls.append(code)
+        if code == "999999":
+            raise RuntimeError("boom")
+        sign = 1 if code == "005930" else -1
+        return {
+            "stk_invsr_orgn": [
+                {"dt": f"2025010{d}", "frgnr_invsr": f"{sign * d:+d}", "orgn": "0"}
+                for d in range(2, 8)
+            ]
+        }
+
+
+def test_service_collects_in_parallel_and_rebuilds_index(tmp_path: Path) -> None:
+    api = FakeFlowAPI()
+    service = InvestorFlowService(
+        api,  # type: ignore[arg-type]
+        HistoryStore(tmp_path),
+        max_workers=2,
+    )
+
+    result = service.collect(["005930", "000660", "999999"], date="20250107")
+
+    assert sorted(api.calls) == ["000660", "005930", "999999"]
+    assert result["failed"] == ["999999"]
+    top = service.top("foreign", window=5, limit=2)
+    assert top["date"] == 20250107
+    assert [row["code"] for row in top["results"]] == ["005930", "000660"]
+    assert top["results"][0]["net"] == 3 + 4 + 5 + 6 + 7
+    assert top["results"][0]["streak"] == 6
+    assert top["results"][1]["streak"] == -6
+    with pytest.raises(ValueError):
+        service.top("martian")
+    service.close()
+
+
+def test_index_follows_dates_merged_by_another_process(tmp_path: Path) -> None:
+    store = HistoryStore(tmp_path)
+    reader = InvestorFlowService(FakeFlowAPI(), store)  # type: ignore[arg-type]
+    writer = InvestorFlowService(FakeFlowAPI(), store)  # type: ignore[arg-type]
+    writer.collect(["005930"], date="20250107")
+    assert reader.index.date == 20250107
+
+    store.merge(
+        "ka10059",
+        {
+            "005930": {
+                "dt": np.array([20250108], dtype=np.int32),
+                "frgnr_invsr": np.array([100.0]),
+            }
+        },
+    )
+
+    assert reader.top("foreign", window=5)["date"] == 20250108
+    assert reader.index is reader.index
+    reader.close()
+    writer.close()
+
+
+def test_collect_command(mocker: MockerFixture) -> None:
+    service = mocker.patch(
+        "a_stocks.management.commands.kiwoom_collect.get_investor_flow_service"
+    ).return_value
+    service.collect.return_value = {"merged": 12, "failed": []}
+
+    call_command(
+        "kiwoom_collect", codes="005930, 000660", date="20250107", datasets="flow"
+    )
+
+    service.collect.assert_called_once_with(["005930", "000660"], date="20250107")
+    service.collect.return_value = {"merged": 0, "failed": ["000660"]}
+    with pytest.raises(CommandError, match="flow:000660"):
+        call_command("kiwoom_collect", codes="000660", datasets="flow")
+    with pytest.raises(CommandError):
+        call_command("kiwoom_collect", codes="000660", datasets="weather")
+
+
+def test_investor_flow_route(mocker: MockerFixture) -> None:
+    service = mocker.patch(
+        "a_stocks._router.stocks.get_investor_flow_service"
+    ).return_value
+    service.top.return_value = {
+        "investor": "frgnr_invsr",
+        "window": 20,
+        "date": 20250107,
+        "results": [
+            {"code": "005930", "net": 10.0, "rank": 1.0, "zscore": None, "streak": 3}
+        ],
+    }
+
+    response = TestClient(stocks.router).get("/investor-flow/top?window=20&limit=5")
+
+    assert response.status_code == 200
+    assert response.json()["results"][0]["code"] == "005930"
+    service.top.assert_called_once_with("foreign", 20, 5, False)
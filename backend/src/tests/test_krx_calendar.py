@@ -0,0 +1,119 @@
+from datetime import date, datetime
+
+import pytest
+from ninja.testing import TestClient
+from pytest_mock import MockerFixture
+
+from a_stocks._router import stocks
+from a_stocks._service.price_cache import get_price_cache
+from a_stocks._utils.krx_calendar import (
+    AFTER_HOURS,
+    CLOSED,
+    CLOSING_AUCTION,
+    COMBINED,
+    CONTINUOUS,
+    KRX,
+    KST,
+    NXT,
+    OPENING_AUCTION,
+    POST_MARKET,
+    PRE_MARKET,
+    day_sessions,
+    exchange_of,
+    is_trading_day,
+    next_change,
+    refresh_interval,
+    session_at,
+)
+
+
+def _kst(text: str) -> datetime:
+    return datetime.strptime(text, "%Y%m%d %H:%M:%S").replace(tzinfo=KST)
+
+
+@pytest.mark.parametrize(
+    "moment, exchange, phase",
+    [
+        ("20250602 08:10:00", KRX, CLOSED),
+        ("20250602 08:10:00", NXT, PRE_MARKET),
+        ("20250602 08:45:00", KRX, OPENING_AUCTION),
+        ("20250602 09:00:10", NXT, CLOSED),
+        ("20250602 09:00:10", COMBINED, CONTINUOUS),
+        ("20250602 15:25:00", KRX, CLOSING_AUCTION),
+        ("20250602 15:25:00", NXT, CLOSED),
+        ("20250602 15:35:00", COMBINED, POST_MARKET),
+        ("20250602 17:00:00", KRX, AFTER_HOURS),
+        ("20250602 19:59:59", COMBINED, POST_MARKET),
+        ("20250602 20:00:00", COMBINED, CLOSED),
+        # 휴장일(대통령 선거일)과 주말
+        ("20250603 10:00:00", COMBINED, CLOSED),
+        ("20250607 10:00:00", KRX, CLOSED),
+    ],
+)
+def test_session_at(moment: str, exchange: str, phase: str) -> None:
+    assert session_at(_kst(moment), exchange) == phase
+
+
+def test_shifted_days_and_holidays() -> None:
+    assert not is_trading_day(date(2025, 12, 31))
+    # 연초 첫 거래일은 1시간 늦게 개장합니다.
+    assert session_at(_kst("20260102 09:30:00"), KRX) == OPENING_AUCTION
+    assert session_at(_kst("20260102 10:00:00"), KRX) == CONTINUOUS
+    assert session_at(_kst("20260102 15:25:00"), KRX) == CLOSING_AUCTION
+    # 수능일은 개장과 마감이 모두 1시간 늦춰집니다.
+    sessions = day_sessions(date(2025, 11, 13), KRX)
+    continuous = [s for s in sessions if s[2] == CONTINUOUS][0]
+    assert continuous[0] == _kst("20251113 10:00:00")
+    assert continuous[1] == _kst("20251113 16:20:00")
+    assert exchange_of("005930_NX") == NXT and exchange_of("005930") == KRX
+
+
+def test_refresh_interval_follows_sessions() -> None:
+    # 금요일 장 마감 후에는 다음 거래일 개장까지 캐시합니다.
+    friday = _kst("20250530 18:30:00")
+    assert next_change(friday, KRX) == _kst("20250602 08:30:00")
+    assert (
+        refresh_interval(1.0, KRX, friday)
+        == (_kst("20250602 08:30:00") - friday).total_seconds()
+    )
+    # 휴장일 전날 NXT 애프터마켓이 끝나면 그다음 거래일 프리마켓까지
+    evening = _kst("20250602 20:00:00")
+    assert next_change(evening, COMBINED) == _kst("20250604 08:00:00")
+
+    assert refresh_interval(1.0, KRX, _kst("20250602 08:45:00")) == 0.5
+    assert refresh_interval(1.0, KRX, _kst("20250602 10:00:00")) == 1.0
+    assert refresh_interval(1.0, COMBINED, _kst("20250602 16:30:00")) == 30.0
+    # 세션 경계를 넘지 않습니다.
+    assert refresh_interval(1.0, KRX, _kst("20250602 15:59:50")) == 10.0
+    # 0 은 캐시를 쓰지 않는다는 뜻입니다.
+    assert refresh_interval(0.0, KRX, friday) == 0.0
+
+
+def test_price_cache_lives_until_next_session(mocker: MockerFixture) -> None:
+    get_price_cache().clear()
+    service = mocker.patch("a_stocks._router.stocks.get_stock_service").return_value
+    service.get_stock_price.return_value = {
+        "code": "005930",
+        "name": "삼성전자",
+        "current_price": 71000.0,
+        "previous_close": 70000.0,
+        "change": 1000.0,
+        "change_percent": 1.43,
+        "volume": 100,
+        "timestamp": "2025-05-30 18:30:00",
+    }
+    ttl = mocker.patch(
+        "a_stocks._service.price_cache.refresh_interval", return_value=3600.0
+    )
+    client = TestClient(stocks.router)
+
+    response = client.get("/price/005930")
+    client.get("/price/005930")
+
+    ttl.assert_called_once_with(get_price_cache().ttl, KRX)
+    assert response["Cache-Control"] in (
+        "private, max-age=3599",
+        "private, max-age=3600",
+    )
+    service.get_stock_price.assert_called_once()
+    get_price_cache().clear()
@@ -0,0 +1,185 @@
+from typing import Any, Dict, List
+
+import pytest
+from ninja.testing import TestClient
+from pytest_mock import MockerFixture
+
+from a_stocks._router import paper
+from a_stocks._service.paper_trading import PaperTradingService
+from a_stocks._utils.backtest import CostModel
+from a_stocks._utils.order_book import BUY, CANCELLED, FILLED, OPEN, SELL, OrderBook
+
+
+def _quote(code: str, bid: float, ask: float) -> Dict[str, Any]:
+    return {"code": code, "current_price": ask, "bid": bid, "ask": ask}
+
+
+def test_order_book_pops_crossing_orders_by_priority() -> None:
+    book = OrderBook()
+    low = book.add("005930", BUY, 1, 100.0, 0.0)
+    high = book.add("005930", BUY, 1, 102.0, 1.0)
+    same = book.add("005930", BUY, 1, 102.0, 2.0)
+    market = book.add("005930", BUY, 1, None, 3.0)
+    ask = book.add("005930", SELL, 1, 105.0, 4.0)
+
+    assert book.best("005930") == (float("inf"), 105.0)
+    # 시장가 > 높은 지정가(접수순) 순서로 체결되고 101 미만 지정가는 남습니다.
+    assert book.crossing("005930", bid=0.0, ask=101.0) == [market, high, same]
+    # 꺼낸 주문의 상태 변경은 호출하는 쪽 몫입니다.
+    assert market.status == OPEN
+    assert book.open_count() == 2 and book.best("005930") == (100.0, 105.0)
+    assert book.crossing("005930", bid=105.0, ask=0.0) == [ask]
+    assert book.codes() == ["005930"] and low.is_open
+    with pytest.raises(ValueError):
+        book.add("005930", "hold", 1, 100.0, 0.0)
+    with pytest.raises(ValueError):
+        book.add("005930", BUY, 0, 100.0, 0.0)
+
+
+def test_order_book_cancels_lazily_and_compacts() -> None:
+    book = OrderBook()
+    orders = [book.add("005930", BUY, 1, 1000.0 + i, float(i)) for i in range(5000)]
+
+    for order in orders[:-10]:
+        book.close(order, CANCELLED, 1.0)
+    symbol = book._books["005930"]
+    assert book.open_count() == 10
+    # 버려야 할 항목이 쌓이면 힙을 다시 만듭니다.
+    assert len(symbol._bids) < 200
+    with pytest.raises(ValueError):
+        book.close(orders[0], CANCELLED, 2.0)
+
+    filled = book.crossing("005930", bid=0.0, ask=0.0 + 5995.0)
+    assert [order.price for order in filled] == [5999.0, 5998.0, 5997.0, 5996.0, 5995.0]
+    assert book.open_count() == 5
+
+
+@pytest.mark.django_db
+def test_service_reserves_fills_and_applies_costs() -> None:
+    quotes: List[Dict[str, Any]] = []
+    service = PaperTradingService(
+        lambda codes: [quote for quote in quotes if quote["code"] in codes],
+        initial_cash=1_000_000.0,
+        costs=CostModel(commission=0.001, tax=0.002, slippage=0.0),
+        clock=lambda: 0.0,
+    )
+    service.ensure_running = lambda: None  # type: ignore[method-assign]
+
+    buy = service.submit("005930", BUY, 10, 50_000.0)
+    assert service.reserved_cash == pytest.approx(500_500.0)
+    with pytest.raises(ValueError):
+        service.submit("005930", BUY, 10, 50_000.0)
+    with pytest.raises(ValueError):
+        service.submit("005930", SELL, 1, 60_000.0)
+
+    quotes.append(_quote("005930", 49_800.0, 50_100.0))
+    assert service.poll_once() == []
+    quotes[0] = _quote("005930", 49_700.0, 49_900.0)
+    assert service.poll_once() == [buy]
+    assert buy.status == FILLED and buy.fill_price == 49_900.0
+    assert service.reserved_cash == 0.0
+    assert service.cash == pytest.approx(1_000_000.0 - 499_000.0 * 1.001)
+
+    sell = service.submit("005930", SELL, 10, 51_000.0)
+    assert service.account()["positions"][0]["available"] == 0
+    service.cancel(sell.order_id)
+    assert sell.status == CANCELLED
+    with pytest.raises(ValueError):
+        service.cancel(sell.order_id)
+    with pytest.raises(KeyError):
+        service.cancel(999)
+
+    market = service.submit("005930", SELL, 10)
+    service.on_quotes([_quote("005930", 50_000.0, 50_200.0)])
+    assert market.status == FILLED and market.fill_price == 50_000.0
+    account = service.account()
+    assert account["positions"] == [] and account["open_orders"] == 0
+    assert account["cash"] == pytest.approx(
+        1_000_000.0 - 499_000.0 * 1.001 + 500_000.0 * (1 - 0.001 - 0.002)
+    )
+
+
+@pytest.mark.django_db
+def test_market_buy_is_rejected_without_cash() -> None:
+    service = PaperTradingService(
+        lambda codes: [], initial_cash=100_000.0, clock=lambda: 0.0
+    )
+    service.ensure_running = lambda: None  # type: ignore[method-assign]
+
+    order = service.submit("005930", BUY, 10)
+    service.on_quotes([_quote("005930", 49_900.0, 50_000.0)])
+
+    assert order.status == "rejected"
+    assert order.reason
+    assert service.cash == 100_000.0 and service.positions == {}
+
+
+@pytest.mark.django_db
+def test_paper_routes(mocker: MockerFixture) -> None:
+    service = PaperTradingService(
+        lambda codes: [], initial_cash=1_000_000.0, clock=lambda: 0.0
+    )
+    service.ensure_running = lambda: None  # type: ignore[method-assign]
+    mocker.patch("a_stocks._router.paper.get_paper_trading", return_value=service)
+    client = TestClient(paper.router)
+
+    response = client.post(
+        "/orders", json={"code": "005930", "side": "buy", "quantity": 1, "price": 1000}
+    )
+    assert response.status_code == 200
+    order_id = response.json()["order_id"]
+    assert response.json()["order_type"] == "limit"
+
+    assert client.post(
+        "/orders", json={"code": "005930", "side": "buy", "quantity": 10**6, "price": 1}
+    ).json() == {"message": "주문가능금액이 부족합니다."}
+    assert [row["order_id"] for row in client.get("/orders?status=open").json()] == [
+        order_id
+    ]
+    assert client.get(f"/orders/{order_id}").json()["status"] == "open"
+    assert client.get("/orders/999").status_code == 404
+    assert client.delete(f"/orders/{order_id}").json()["status"] == "cancelled"
+    assert client.delete(f"/orders/{order_id}").status_code == 400
+    assert client.get("/account").json()["cash"] == 1_000_000.0
+
+
+@pytest.mark.django_db
+def test_workers_share_account_and_order_ids() -> None:
+    quotes: List[Dict[str, Any]] = []
+    workers = [
+        PaperTradingService(
+            lambda codes: [quote for quote in quotes if quote["code"] in codes],
+            initial_cash=1_000_000.0,
+            costs=CostModel(commission=0.0, tax=0.0, slippage=0.0),
+            clock=lambda: 0.0,
+        )
+        for _ in range(2)
+    ]
+    for worker in workers:
+        worker.ensure_running = lambda: None  # type: ignore[method-assign]
+    first, second = workers
+
+    buy = first.submit("005930", BUY, 10, 50_000.0)
+    other = second.submit("000660", BUY, 1, 100_000.0)
+    assert other.order_id != buy.order_id
+    # 다른 워커가 묶은 현금도 주문가능금액에서 빠집니다.
+    with pytest.raises(ValueError):
+        first.submit("035720", BUY, 1, 450_000.0)
+    assert second.get(buy.order_id).status == OPEN  # type: ignore[union-attr]
+
+    # 두 워커가 같은 시세를 받아도 한 번만 체결됩니다.
+    quotes.append(_quote("005930", 49_000.0, 49_500.0))
+    assert [order.order_id for order in second.poll_once()] == [buy.order_id]
+    assert first.poll_once() == []
+    assert first.get(buy.order_id).fill_price == 49_500.0  # type: ignore[union-attr]
+    account = first.account()
+    assert account["cash"] == 1_000_000.0 - 495_000.0
+    assert account["reserved_cash"] == 100_000.0
+    assert account["positions"][0]["quantity"] == 10
+
+    first.cancel(other.order_id)
+    assert second.account()["reserved_cash"] == 0.0
+    with pytest.raises(ValueError):
+        second.cancel(other.order_id)
+    second.reset()
+    assert first.orders() == [] and first.account()["cash"] == 1_000_000.0
@@ -0,0 +1,213 @@
+from typing import Any, Dict, List
+
+import pytest
+from ninja.testing import TestClient
+from pytest_mock import MockerFixture
+
+from a_stocks._router import portfolio
+from a_stocks._service.portfolio_service import STATE_ID, PortfolioTracker
+from a_stocks.models import PortfolioState
+
+
+def _tracker(
+    api: Any = None, quotes: Any = None, clock: Any = lambda: 1.0
+) -> PortfolioTracker:
+    tracker = PortfolioTracker(
+        api,
+        lambda codes: [quote for quote in quotes or [] if quote["code"] in codes],
+        account_number="12345678",
+        interval=1.0,
+        clock=clock,
+    )
+    tracker.ensure_running = lambda: None  # type: ignore[method-assign]
+    return tracker
+
+
+@pytest.mark.django_db
+def test_fills_and_quotes_update_pnl_incrementally() -> None:
+    quotes: List[Dict[str, Any]] = []
+    tracker = _tracker(quotes=quotes)
+    tracker.load_holdings([{"code": "005930", "quantity": 10, "average_price": 50_000}])
+
+    assert tracker.apply_fill("005930", "buy", 10, 60_000.0, fee=100.0, fill_id="1")
+    assert not tracker.apply_fill("005930", "buy", 10, 60_000.0, fill_id="1")
+    tracker.apply_fill("000660", "buy", 5, 100_000.0)
+
+    quotes.extend(
+        [
+            {"code": "005930", "current_price": 58_000.0},
+            {"code": "000660", "current_price": 90_000.0},
+            {"code": "035720", "current_price": 1.0},
+        ]
+    )
+    assert tracker.refresh() == 2
+    snapshot = tracker.snapshot()
+    assert snapshot["cost"] == 20 * 55_000.0 + 5 * 100_000.0
+    assert snapshot["market_value"] == 20 * 58_000.0 + 5 * 90_000.0
+    assert snapshot["unrealized"] == 60_000.0 - 50_000.0
+    assert snapshot["realized"] == -100.0
+
+    tracker.apply_fill("005930", "sell", 5, 57_000.0, fee=50.0)
+    with pytest.raises(ValueError):
+        tracker.apply_fill("005930", "sell", 100, 57_000.0)
+    tracker.apply_fill("000660", "sell", 5, 95_000.0)
+
+    snapshot = tracker.snapshot()
+    assert snapshot["realized"] == pytest.approx(-100 + 5 * 2_000 - 50 - 5 * 5_000)
+    assert snapshot["fees"] == 150.0
+    assert [row["code"] for row in snapshot["positions"]] == ["005930"]
+    position = snapshot["positions"][0]
+    assert position["quantity"] == 15 and position["average_price"] == 55_000.0
+    # 남은 종목의 합계는 전체 재계산 결과와 같아야 합니다.
+    assert snapshot["cost"] == pytest.approx(15 * 55_000.0)
+    assert snapshot["market_value"] == pytest.approx(15 * 58_000.0)
+
+
+class FakeAccountAPI:
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+
+    def get_account_balance(self, account_number: str) -> Dict[str, Any]:
+        self.calls.append("ka10072")
+        return {
+            "dt_stk_div_rlzt_pl": [
+                {
+                    "stk_cd": "005930",
+                    "cntr_qty": "10",
+                    "buy_uv": "50000",
+                    "cntr_pric": "+52000",
+                    "tdy_sel_pl": "+19000",
+                    "tdy_trde_cmsn": "500",
+                    "tdy_trde_tax": "500",
+                }
+            ]
+        }
+
+    def get_order_history(
+        self, account_number: str, start_date: str, end_date: str
+    ) -> Dict[str, Any]:
+        self.calls.append("ka10073")
+        return {
+            "dt_stk_rlzt_pl": [
+                {"dt": "20250102", "stk_cd": "000660", "tdy_sel_pl": "-3000"},
+                {"dt": "20250103", "stk_cd": "000660", "tdy_sel_pl": "-3000"},
+            ]
+        }
+
+
+@pytest.mark.django_db
+def test_sync_ingests_reported_realized_rows_once() -> None:
+    api = FakeAccountAPI()
+    tracker = _tracker(api=api)
+
+    assert tracker.sync() == 1
+    assert tracker.sync() == 0
+    assert tracker.sync("20250101", "20250103") == 2
+    assert tracker.sync("20250101", "20250103") == 0
+
+    snapshot = tracker.snapshot()
+    assert api.calls == ["ka10072", "ka10072", "ka10073", "ka10073"]
+    assert snapshot["reported_realized"] == 19_000.0 - 6_000.0
+    assert snapshot["reported_fees"] == 1_000.0
+    assert snapshot["realized"] == 0.0
+
+
+@pytest.mark.django_db
+def test_portfolio_routes(mocker: MockerFixture) -> None:
+    tracker = _tracker()
+    mocker.patch(
+        "a_stocks._router.portfolio.get_portfolio_tracker", return_value=tracker
+    )
+    client = TestClient(portfolio.router)
+
+    response = client.put(
+        "/holdings",
+        json=[
+            {"code": "005930", "quantity": 2, "average_price": 1000, "last_price": 1100}
+        ],
+    )
+    assert response.status_code == 200
+    assert response.json()["unrealized"] == 200.0
+
+    response = client.post(
+        "/fills", json={"code": "005930", "side": "sell", "quantity": 1, "price": 1200}
+    )
+    assert response.json()["realized"] == 200.0
+    assert (
+        client.post(
+            "/fills",
+            json={"code": "005930", "side": "sell", "quantity": 5, "price": 1200},
+        ).status_code
+        == 400
+    )
+
+    body = client.get("").json()
+    assert body["positions"][0]["quantity"] == 1
+    assert client.post("/sync").json() == {
+        "message": "키움 API 가 설정되지 않았습니다."
+    }
+
+
+@pytest.mark.django_db
+def test_workers_share_state_and_dedupe_fills_per_trading_day() -> None:
+    now = [1_735_776_000.0]  # 2025-01-02 09:00 KST
+    quotes = [{"code": "005930", "current_price": 52_000.0}]
+    first = _tracker(quotes=quotes, clock=lambda: now[0])
+    second = _tracker(quotes=quotes, clock=lambda: now[0])
+
+    first.load_holdings([{"code": "005930", "quantity": 10, "average_price": 50_000}])
+    assert first.apply_fill("005930", "buy", 10, 50_000.0, fill_id="0001")
+    # 다른 워커가 같은 체결을 받아도 한 번만 반영됩니다.
+    assert not second.apply_fill("005930", "buy", 10, 50_000.0, fill_id="0001")
+    assert second.snapshot()["positions"][0]["quantity"] == 20
+
+    assert second.refresh() == 1
+    # 다른 워커가 주기 안에 시세를 반영했으면 조회하지 않습니다.
+    quotes[0] = {"code": "005930", "current_price": 53_000.0}
+    assert first.refresh() == 0
+    assert first.snapshot()["market_value"] == 20 * 52_000.0
+
+    # 다음 거래일에는 같은 체결 번호도 새 체결입니다.
+    now[0] += 86_400.0
+    assert second.apply_fill("005930", "sell", 5, 53_000.0, fill_id="0001")
+    assert first.snapshot()["positions"][0]["quantity"] == 15
+    assert first._seen_fills == {"0001"} and first._fill_date == "20250103"
+
+
+def _version() -> int:
+    return PortfolioState.objects.get(pk=STATE_ID).version
+
+
+@pytest.mark.django_db
+def test_version_only_moves_when_state_changes(mocker: MockerFixture) -> None:
+    now = [1_735_776_000.0]  # 2025-01-02 09:00 KST
+    quotes = [{"code": "005930", "current_price": 50_000.0}]
+    first = _tracker(quotes=quotes, clock=lambda: now[0])
+    second = _tracker(quotes=quotes, clock=lambda: now[0])
+    first.load_holdings([{"code": "005930", "quantity": 10, "average_price": 50_000}])
+    assert first.apply_fill("005930", "buy", 10, 50_000.0, fill_id="0001")
+    version = _version()
+
+    # 중복 체결과 매도 초과는 상태를 바꾸지 않습니다.
+    assert not first.apply_fill("005930", "buy", 10, 50_000.0, fill_id="0001")
+    now[0] += 86_400.0
+    with pytest.raises(ValueError):
+        first.apply_fill("005930", "sell", 100, 50_000.0, fill_id="0002")
+    assert first._fill_date == "20250102" and first._seen_fills == {"0001"}
+    assert _version() == version
+
+    # 가격이 그대로인 폴링은 시세 반영 시각만 남기고 version 은 그대로 둡니다.
+    assert first.refresh() == 0
+    assert _version() == version
+    assert PortfolioState.objects.get(pk=STATE_ID).quoted_at == now[0]
+    # 다른 워커도 상태를 다시 읽지 않고 주기 안의 조회를 건너뜁니다.
+    second.snapshot()
+    load = mocker.spy(second, "_load")
+    quotes[0] = {"code": "005930", "current_price": 51_000.0}
+    assert second.refresh() == 0
+    load.assert_not_called()
+
+    now[0] += 1.0
+    assert second.refresh() == 1
+    assert _version() == version + 1
+    assert first.snapshot()["market_value"] == 20 * 51_000.0
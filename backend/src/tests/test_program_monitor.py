@@ -0,0 +1,182 @@
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+from ninja.testing import TestClient
+from pytest_mock import MockerFixture
+
+from a_stocks._router import stocks
+from a_stocks._service.program_monitor import ProgramFlowMonitor
+from a_stocks._utils.cache_backends import SharedMemoryCacheBackend
+
+
+def _row(code: str, net: int) -> Dict[str, Any]:
+    return {"stk_cd": code, "stk_nm": f"종목{code}", "netprps_prica": f"{net:+d}"}
+
+
+class FakeProgramAPI:
+    """
+    ka90004 를 시장별로 두 페이지에 나눠 돌려줍니다.
+    """
+
+    def __init__(self) -> None:
+        self.net: Dict[str, Dict[str, int]] = {"P00101": {}, "P10102": {}}
+        self.requests: List[str] = []
+
+    def stock_wise_program_trading_status_request_ka90004(
+        self, date: str, market: str, exchange: str, **kwargs: Any
+    ) -> Dict[str, Any]:
+        raise AssertionError("paginate 를 통해 호출해야 합니다.")
+
+    def paginate(
+        self, request: Callable[..., Dict[str, Any]], date: str, market: str, *args: Any
+    ) -> Iterator[Dict[str, Any]]:
+        self.requests.append(market)
+        rows = [_row(code, net) for code, net in sorted(self.net[market].items())]
+        half = len(rows) // 2
+        yield {"stk_prm_trde_prst": rows[:half]}
+        yield {"stk_prm_trde_prst": rows[half:]}
+
+
+def test_monitor_pages_all_markets_and_ranks_movers() -> None:
+    api = FakeProgramAPI()
+    clock = iter([0.0, 60.0, 120.0])
+    monitor = ProgramFlowMonitor(
+        api,  # type: ignore[arg-type]
+        max_codes=10,
+        max_snapshots=5,
+        clock=lambda: next(clock),
+    )
+
+    api.net["P00101"] = {"005930": 100, "000660": -50}
+    api.net["P10102"] = {"035720": 10, "247540": 0}
+    assert monitor.snapshot() == 4
+    assert api.requests == ["P00101", "P10102"]
+
+    # 스냅샷이 하나뿐이면 장 시작 이후 누적 순매수를 변화량으로 봅니다.
+    first = monitor.movers(limit=2)
+    assert [row["code"] for row in first["results"]] == ["005930", "000660"]
+    assert first["window"] == 0 and first["results"][0]["rate"] is None
+
+    api.net["P00101"] = {"005930": 110, "000660": -250}
+    api.net["P10102"] = {"035720": 400, "247540": 0, "091990": 30}
+    monitor.snapshot()
+    api.net["P10102"]["035720"] = 520
+    monitor.snapshot()
+
+    movers = monitor.movers(window=2, limit=3)
+    assert movers["snapshots"] == 3 and movers["window"] == 2
+    assert movers["elapsed"] == 120.0
+    assert [(row["code"], row["delta"]) for row in movers["results"]] == [
+        ("035720", 510.0),
+        ("000660", -200.0),
+        ("091990", 30.0),
+    ]
+    assert movers["results"][0]["rate"] == 255.0
+
+    buyers = monitor.movers(window=1, direction="buy")
+    assert buyers["results"][0]["code"] == "035720"
+    assert buyers["results"][0]["delta"] == 120.0
+    sellers = monitor.movers(window=2, limit=1, direction="sell")
+    assert [row["code"] for row in sellers["results"]] == ["000660"]
+
+
+def test_monitor_memory_is_bounded_per_session() -> None:
+    api = FakeProgramAPI()
+    monitor = ProgramFlowMonitor(
+        api,  # type: ignore[arg-type]
+        max_codes=2,
+        max_snapshots=3,
+        clock=lambda: 0.0,
+    )
+    allocated = monitor._net.nbytes
+
+    for i in range(5):
+        monitor.record([_row("005930", i), _row("000660", -i)], "20250102")
+    # 종목 수 한도를 넘는 종목은 기록하지 않습니다.
+    assert monitor.record([_row("035720", 1), _row("005930", 9)], "20250102") == 1
+
+    assert monitor.snapshots == 3
+    assert monitor.history("005930")["net"] == [3.0, 4.0, 9.0]
+    assert monitor.history("035720")["net"] == []
+    assert monitor._net.nbytes == allocated
+
+    # 날짜가 바뀌면 새 세션으로 초기화됩니다.
+    monitor.record([_row("035720", 5)], "20250103")
+    assert monitor.session == "20250103"
+    assert monitor.snapshots == 1
+    assert monitor.history("005930")["net"] == []
+    assert monitor.history("035720")["net"] == [5.0]
+
+
+def test_workers_share_one_status_fetch_per_interval(tmp_path: Path) -> None:
+    api = FakeProgramAPI()
+    api.net["P00101"] = {"005930": 100}
+    monitors = [
+        ProgramFlowMonitor(
+            api,  # type: ignore[arg-type]
+            interval=60.0,
+            max_codes=10,
+            max_snapshots=5,
+            clock=lambda: 1000.0,
+            cache=SharedMemoryCacheBackend(tmp_path),
+        )
+        for _ in range(3)
+    ]
+
+    assert [monitor.snapshot() for monitor in monitors] == [1, 1, 1]
+    # 이미 기록한 공유 결과는 다시 기록하지 않습니다.
+    assert monitors[1].snapshot() == 0
+
+    assert api.requests == ["P00101", "P10102"]
+    assert all(monitor.snapshots == 1 for monitor in monitors)
+    assert monitors[2].history("005930") == {"times": [1000.0], "net": [100.0]}
+
+
+def test_first_request_waits_for_the_thread_snapshot() -> None:
+    api = FakeProgramAPI()
+    api.net["P00101"] = {"005930": 100}
+    monitor = ProgramFlowMonitor(
+        api,  # type: ignore[arg-type]
+        interval=60.0,
+        max_codes=10,
+        max_snapshots=5,
+    )
+    try:
+        monitor.ensure_running()
+        assert monitor.wait_ready(timeout=5.0)
+    finally:
+        monitor.stop()
+
+    # 스레드의 첫 스냅샷 한 번만 ka90004 를 조회합니다.
+    assert api.requests == ["P00101", "P10102"]
+    assert monitor.snapshots == 1
+
+
+def test_program_flow_route(mocker: MockerFixture) -> None:
+    monitor = mocker.patch("a_stocks._router.stocks.get_program_monitor").return_value
+    monitor.snapshots = 0
+    monitor.movers.return_value = {
+        "session": "20250102",
+        "snapshots": 1,
+        "window": 0,
+        "elapsed": None,
+        "results": [
+            {
+                "code": "005930",
+                "name": "삼성전자",
+                "net": 1.0,
+                "delta": 1.0,
+                "rate": None,
+            }
+        ],
+    }
+
+    response = TestClient(stocks.router).get("/program-flow/movers?limit=1")
+
+    assert response.status_code == 200
+    assert response.json()["results"][0]["code"] == "005930"
+    monitor.ensure_running.assert_called_once()
+    # 요청에서 직접 스냅샷을 찍지 않고 스레드의 첫 스냅샷을 기다립니다.
+    monitor.wait_ready.assert_called_once_with()
+    monitor.snapshot.assert_not_called()
+    monitor.movers.assert_called_once_with(window=5, limit=1, direction="abs")
@@ -0,0 +1,125 @@
+import asyncio
+import importlib
+from typing import Any, Dict, List, Mapping
+
+from pytest_mock import MockerFixture
+
+from a_stocks._service import provider
+from a_stocks._service.provider import ProcessLocal
+
+
+def test_process_local_is_lazy_and_cached() -> None:
+    created: List[object] = []
+
+    def factory() -> object:
+        instance = object()
+        created.append(instance)
+        return instance
+
+    holder: ProcessLocal[object] = ProcessLocal(factory)
+
+    # 생성 전에는 아무것도 만들지 않음
+    assert created == []
+    assert not holder.is_initialized()
+
+    first = holder.get()
+    second = holder.get()
+
+    assert first is second
+    assert len(created) == 1
+
+
+def test_process_local_recreates_after_fork(mocker: MockerFixture) -> None:
+    closed: List[object] = []
+    holder: ProcessLocal[object] = ProcessLocal(object, closed.append)
+
+    parent_instance = holder.get()
+
+    # fork 된 자식 프로세스처럼 pid 가 바뀐 상황
+    mocker.patch("a_stocks._service.provider.os.getpid", return_value=-1)
+    child_instance = holder.get()
+
+    assert child_instance is not parent_instance
+    # 부모의 인스턴스는 자식에서 닫지 않음
+    assert closed == []
+
+
+def test_close_all_closes_initialized_instances() -> None:
+    closed: List[object] = []
+    holder: ProcessLocal[object] = ProcessLocal(object, closed.append)
+    instance = holder.get()
+
+    provider.close_all()
+
+    assert closed == [instance]
+    assert not holder.is_initialized()
+
+
+def test_stocks_router_import_does_not_create_service(mocker: MockerFixture) -> None:
+    kiwoom_cls = mocker.patch("a_stocks._service.stock_service.KiwoomAPI")
+
+    import a_stocks._router.stocks as stocks
+
+    importlib.reload(stocks)
+
+    kiwoom_cls.assert_not_called()
+
+
+def test_asgi_lifespan_shutdown_closes_services(mocker: MockerFixture) -> None:
+    from _core.asgi import application
+
+    close_all = mocker.patch("a_stocks._service.provider.close_all")
+    messages = iter([{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}])
+    sent: List[Mapping[str, Any]] = []
+
+    async def receive() -> Dict[str, Any]:
+        return next(messages)
+
+    async def send(message: Mapping[str, Any]) -> None:
+        sent.append(message)
+
+    asyncio.run(application({"type": "lifespan"}, receive, send))
+
+    assert [m["type"] for m in sent] == [
+        "lifespan.startup.complete",
+        "lifespan.shutdown.complete",
+    ]
+    close_all.assert_called_once()
+
+
+def test_asgi_lifespan_runs_warmup_scheduler_until_shutdown(
+    mocker: MockerFixture,
+) -> None:
+    from _core.asgi import application
+
+    mocker.patch("a_stocks._service.provider.close_all")
+    events: List[str] = []
+
+    class FakeScheduler:
+        async def run_forever(self, stop: asyncio.Event) -> None:
+            events.append("started")
+            await stop.wait()
+            events.append("stopped")
+
+    mocker.patch(
+        "a_stocks._service.warmup.worker_scheduler", return_value=FakeScheduler()
+    )
+
+    async def scenario() -> None:
+        queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+        sent: List[Mapping[str, Any]] = []
+
+        async def send(message: Mapping[str, Any]) -> None:
+            sent.append(message)
+
+        task = asyncio.create_task(application({"type": "lifespan"}, queue.get, send))
+        await queue.put({"type": "lifespan.startup"})
+        while not sent:
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert events == ["started"]
+        await queue.put({"type": "lifespan.shutdown"})
+        await task
+
+    asyncio.run(scenario())
+    assert events == ["started", "stopped"]
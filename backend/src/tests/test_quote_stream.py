@@ -0,0 +1,136 @@
+import asyncio
+import json
+from typing import Any, Dict, List
+
+from pytest_mock import MockerFixture
+
+from a_stocks._service.quote_stream import QuoteHub, stream_quotes
+from a_stocks._service.stock_service import StockService
+
+
+def _quote(code: str, price: float) -> Dict[str, Any]:
+    return {
+        "code": code,
+        "name": code,
+        "current_price": price,
+        "previous_close": 100.0,
+        "change": price - 100.0,
+        "change_percent": price - 100.0,
+        "volume": 10,
+        "timestamp": "2025-01-02 09:00:00",
+    }
+
+
+class FakeFetcher:
+    def __init__(self) -> None:
+        self.prices: Dict[str, float] = {}
+        self.calls: List[List[str]] = []
+
+    def __call__(self, codes: List[str]) -> List[Dict[str, Any]]:
+        self.calls.append(list(codes))
+        return [_quote(code, self.prices.get(code, 100.0)) for code in codes]
+
+
+def test_hub_batches_distinct_codes_and_fans_out_changes() -> None:
+    async def scenario() -> None:
+        fetcher = FakeFetcher()
+        hub = QuoteHub(fetcher, interval=60.0, batch_size=2)
+        # 폴러 스레드 없이 poll_once 를 직접 호출합니다.
+        hub._ensure_running = lambda: None  # type: ignore[method-assign]
+        loop = asyncio.get_running_loop()
+
+        first = hub.subscribe(["005930", "000660"], loop)
+        second = hub.subscribe(["005930", "035420"], loop)
+
+        assert hub.poll_once() == 3
+        # 구독자가 둘이어도 종목당 한 번만 조회하고, batch_size 로 나눠서 조회
+        assert fetcher.calls == [["000660", "005930"], ["035420"]]
+
+        await asyncio.sleep(0)
+        assert {q["code"] for q in first.drain()} == {"005930", "000660"}
+        assert {q["code"] for q in second.drain()} == {"005930", "035420"}
+
+        # 변화가 없으면 아무것도 전달하지 않음
+        assert hub.poll_once() == 0
+
+        # 한 종목만 바뀌면 해당 종목 구독자에게만 전달
+        fetcher.prices["000660"] = 101.0
+        assert hub.poll_once() == 1
+        assert [q["code"] for q in first.drain()] == ["000660"]
+        assert second.drain() == []
+
+    asyncio.run(scenario())
+
+
+def test_unsubscribe_removes_codes_from_polling() -> None:
+    async def scenario() -> None:
+        hub = QuoteHub(FakeFetcher(), interval=60.0)
+        hub._ensure_running = lambda: None  # type: ignore[method-assign]
+        subscription = hub.subscribe(["005930"], asyncio.get_running_loop())
+
+        hub.unsubscribe(subscription)
+
+        assert hub.subscribed_codes() == []
+
+    asyncio.run(scenario())
+
+
+def test_stream_quotes_emits_sse_events() -> None:
+    async def scenario() -> List[str]:
+        fetcher = FakeFetcher()
+        hub = QuoteHub(fetcher, interval=60.0)
+        hub._ensure_running = lambda: None  # type: ignore[method-assign]
+        stream = stream_quotes(hub, ["005930"], keepalive=0.01)
+
+        # 구독 전에는 keep-alive 만 전달
+        frames = [await stream.__anext__()]
+        hub.poll_once()
+        frames.append(await stream.__anext__())
+        await stream.aclose()
+
+        assert hub.subscribed_codes() == []
+        return frames
+
+    frames = asyncio.run(scenario())
+
+    assert frames[0] == ": keep-alive\n\n"
+    event, data = frames[1].strip().split("\n")
+    assert event == "event: quote"
+    assert json.loads(data.removeprefix("data: "))["code"] == "005930"
+
+
+def test_get_watchlist_quotes_uses_single_ka10095_call(mocker: MockerFixture) -> None:
+    api = mocker.patch("a_stocks._service.stock_service.KiwoomAPI").return_value
+    api.watchlist_stock_information_request_ka10095.return_value = {
+        "atn_stk_infr": [
+            {
+                "stk_cd": "005930",
+                "stk_nm": "삼성전자",
+                "cur_prc": "+156600",
+                "base_pric": "121700",
+                "pred_pre": "+34900",
+                "flu_rt": "+28.68",
+                "trde_qty": "118636",
+            },
+            {
+                "stk_cd": "000660",
+                "stk_nm": "SK하이닉스",
+                "cur_prc": "-85200",
+                "base_pric": "90000",
+                "pred_pre": "-4800",
+                "flu_rt": "-5.33",
+                "trde_qty": "1000",
+            },
+        ],
+        "return_code": 0,
+    }
+
+    quotes = StockService().get_watchlist_quotes(["005930", "000660"])
+
+    api.watchlist_stock_information_request_ka10095.assert_called_once_with(
+        "005930|000660"
+    )
+    assert quotes[0]["current_price"] == 156600.0
+    assert quotes[0]["volume"] == 118636
+    assert quotes[1]["current_price"] == 85200.0
+    assert quotes[1]["change"] == -4800.0
@@ -0,0 +1,223 @@
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import pytest
+from ninja.testing import TestClient
+from pytest_mock import MockerFixture
+
+from a_stocks._router import stocks
+from a_stocks._service.credit_service import CreditService
+from a_stocks._service.investor_flow_service import InvestorFlowService
+from a_stocks._service.program_monitor import ProgramFlowMonitor
+from a_stocks._service.spike_monitor import SpikeMonitor
+from a_stocks._service.universe_snapshot import UniverseSnapshot
+from a_stocks._service.valuation_service import ValuationService
+from a_stocks._utils.history_store import HistoryStore
+from a_stocks._utils.rate_limiter import (
+    BATCH,
+    INTERACTIVE,
+    PriorityRateLimiter,
+    current_priority,
+    request_priority,
+)
+
+
+def _wait_for(limiter: PriorityRateLimiter, priority: str, waiting: int) -> None:
+    deadline = time.monotonic() + 5.0
+    while time.monotonic() < deadline:
+        classes = {row["priority"]: row for row in limiter.stats()["classes"]}
+        if classes[priority]["waiting"] >= waiting:
+            return
+        time.sleep(0.001)
+    raise AssertionError("대기열이 차지 않았습니다.")
+
+
+def test_interactive_request_preempts_queued_batch() -> None:
+    limiter = PriorityRateLimiter(rate=20.0, burst=1.0)
+    limiter.acquire(priority=BATCH)
+    order: List[str] = []
+    lock = threading.Lock()
+
+    def request(name: str, priority: str) -> None:
+        with request_priority(priority):
+            limiter.acquire()
+        with lock:
+            order.append(name)
+
+    threads = [
+        threading.Thread(target=request, args=(f"batch{i}", BATCH)) for i in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    _wait_for(limiter, BATCH, 4)
+    interactive = threading.Thread(target=request, args=("interactive", INTERACTIVE))
+    interactive.start()
+    for thread in [*threads, interactive]:
+        thread.join()
+
+    # 먼저 기다리던 배치 요청 4개보다 앞서거나, 이미 토큰을 받은 하나 바로 뒤에 처리됩니다.
+    assert order.index("interactive") <= 1
+    # 같은 클래스 안에서는 도착 순서를 지킵니다.
+    batches = [name for name in order if name != "interactive"]
+    assert batches == sorted(batches)
+
+
+def test_interactive_p99_is_isolated_from_batch_load() -> None:
+    limiter = PriorityRateLimiter(rate=200.0, burst=1.0)
+    stop = threading.Event()
+
+    def backfill() -> None:
+        with request_priority(BATCH):
+            while not stop.is_set():
+                limiter.acquire()
+
+    workers = [threading.Thread(target=backfill) for _ in range(6)]
+    for worker in workers:
+        worker.start()
+    try:
+        for _ in range(40):
+            limiter.acquire()
+            time.sleep(0.004)
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join()
+
+    classes: Dict[str, Dict[str, Any]] = {
+        row["priority"]: row for row in limiter.stats()["classes"]
+    }
+    assert classes[INTERACTIVE]["count"] == 40
+    assert classes[BATCH]["waiting"] == 0
+    # 배치는 작업자 수만큼 순서를 기다리지만 대화형은 다음 토큰만 기다립니다.
+    assert classes[INTERACTIVE]["p99_ms"] < classes[BATCH]["p50_ms"]
+
+
+def test_priority_defaults_and_validation() -> None:
+    assert current_priority() == INTERACTIVE
+    with request_priority(BATCH):
+        assert current_priority() == BATCH
+    assert current_priority() == INTERACTIVE
+
+    unlimited = PriorityRateLimiter(rate=0.0)
+    assert unlimited.acquire() == 0.0
+    assert unlimited.stats()["classes"][0]["count"] == 1
+    with pytest.raises(ValueError):
+        unlimited.acquire(priority="urgent")
+
+
+def test_universe_snapshot_sends_batch_priority() -> None:
+    seen: List[str] = []
+
+    class RecordingAPI:
+        def basic_stock_information_request_ka10001(
+            self, stock_code: str
+        ) -> Dict[str, Any]:
+            seen.append(current_priority())
+            return {"per": "1"}
+
+    snapshot = UniverseSnapshot(RecordingAPI(), store=object())  # type: ignore[arg-type]
+    snapshot.fetch("005930", "20250102")
+
+    assert seen == [BATCH]
+    assert current_priority() == INTERACTIVE
+
+
+class CollectorAPI:
+    def __init__(self) -> None:
+        self.seen: Dict[str, List[str]] = {}
+
+    def _record(self, tr: str) -> None:
+        self.seen.setdefault(tr, []).append(current_priority())
+
+    def stock_data_by_investor_institution_request_ka10059(
+        self, *args: str
+    ) -> Dict[str, Any]:
+        self._record("ka10059")
+        return {}
+
+    def aggregate_stock_data_by_investor_institution_request_ka10061(
+        self, *args: str
+    ) -> Dict[str, Any]:
+        self._record("ka10061")
+        return {}
+
+    def credit_trading_trend_request_ka10013(self, *args: str) -> Dict[str, Any]:
+        self._record("ka10013")
+        return {}
+
+    def margin_trading_transaction_details_request_ka90012(
+        self, *args: str
+    ) -> Dict[str, Any]:
+        return {}
+
+    def paginate(
+        self, request: Callable[..., Dict[str, Any]], *args: Any
+    ) -> List[Dict[str, Any]]:
+        self._record(request.__name__.rsplit("_", 1)[-1])
+        return [{}]
+
+    def basic_stock_information_request_ka10001(
+        self, stock_code: str
+    ) -> Dict[str, Any]:
+        self._record("ka10001")
+        return {}
+
+
+def test_collectors_send_batch_priority(tmp_path: Path) -> None:
+    api = CollectorAPI()
+    store = HistoryStore(tmp_path)
+    flow = InvestorFlowService(api, store=store, max_workers=2)  # type: ignore[arg-type]
+    credit = CreditService(api, store=store, max_workers=2)  # type: ignore[arg-type]
+    valuation = ValuationService(api, max_workers=2)  # type: ignore[arg-type]
+    codes = ["005930", "000660"]
+
+    flow.collect(codes, date="20250102")
+    flow.collect_totals(codes, "20250102", "20250103")
+    credit.collect_credit(codes, "20250102")
+    credit.collect_lending("20250102", markets=("001",))
+    valuation._fundamentals(codes)
+
+    assert api.seen == {
+        "ka10059": [BATCH, BATCH],
+        "ka10061": [BATCH, BATCH],
+        "ka10013": [BATCH, BATCH],
+        "ka90012": [BATCH],
+        "ka10001": [BATCH, BATCH],
+    }
+    assert current_priority() == INTERACTIVE
+
+
+def test_pollers_send_batch_priority(mocker: MockerFixture) -> None:
+    seen: List[str] = []
+    program = ProgramFlowMonitor(object(), interval=0.0)  # type: ignore[arg-type]
+    spike = SpikeMonitor(object(), interval=0.0, sinks=[])  # type: ignore[arg-type]
+
+    def poll(stop: threading.Event) -> None:
+        seen.append(current_priority())
+        stop.set()
+
+    mocker.patch.object(program, "snapshot", side_effect=lambda: poll(program._stop))
+    mocker.patch.object(spike, "poll", side_effect=lambda: poll(spike._stop))
+
+    program._run()
+    spike._run()
+
+    assert seen == [BATCH, BATCH]
+    assert current_priority() == INTERACTIVE
+
+
+def test_rate_limiter_stats_route(mocker: MockerFixture) -> None:
+    limiter = PriorityRateLimiter(rate=5.0)
+    limiter.acquire()
+    service = mocker.patch("a_stocks._router.stocks.get_stock_service").return_value
+    service.api.rate_limiter = limiter
+
+    response = TestClient(stocks.router).get("/limiter/stats")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["rate"] == 5.0
+    assert [row["priority"] for row in body["classes"]] == [INTERACTIVE, BATCH]
+    assert body["classes"][0]["count"] == 1
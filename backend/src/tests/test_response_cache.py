@@ -0,0 +1,108 @@
+from typing import Any, Dict, Iterator
+
+import pytest
+from ninja.testing import TestClient
+from pytest_mock import MockerFixture
+
+from a_stocks._router import stocks
+from a_stocks._service.price_cache import get_price_cache
+from a_stocks._utils.response_cache import ResponseCache, make_etag
+
+
+def _price(price: float, timestamp: str) -> Dict[str, Any]:
+    return {
+        "code": "005930",
+        "name": "삼성전자",
+        "current_price": price,
+        "previous_close": 70000.0,
+        "change": price - 70000.0,
+        "change_percent": 1.0,
+        "volume": 100,
+        "timestamp": timestamp,
+    }
+
+
+@pytest.fixture
+def client() -> Iterator[TestClient]:
+    get_price_cache().clear()
+    yield TestClient(stocks.router)
+    get_price_cache().clear()
+
+
+def test_price_is_served_from_cache_with_etag(
+    client: TestClient, mocker: MockerFixture
+) -> None:
+    service = mocker.patch("a_stocks._router.stocks.get_stock_service").return_value
+    service.get_stock_price.return_value = _price(71000.0, "2025-01-02 09:00:00")
+
+    first = client.get("/price/005930")
+    second = client.get("/price/005930")
+
+    assert first.status_code == 200
+    assert first.json()["current_price"] == 71000.0
+    assert first["ETag"].startswith('W/"')
+    assert "max-age" in first["Cache-Control"]
+    # 두 번째 요청은 캐시에서 응답 (업스트림 호출 없음)
+    assert second["ETag"] == first["ETag"]
+    service.get_stock_price.assert_called_once_with("005930")
+
+
+def test_if_none_match_returns_304_without_body(
+    client: TestClient, mocker: MockerFixture
+) -> None:
+    service = mocker.patch("a_stocks._router.stocks.get_stock_service").return_value
+    service.get_stock_price.return_value = _price(71000.0, "2025-01-02 09:00:00")
+    etag = client.get("/price/005930")["ETag"]
+
+    response = client.get("/price/005930", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response["ETag"] == etag
+
+
+def test_etag_ignores_timestamp_after_cache_expiry(
+    client: TestClient, mocker: MockerFixture
+) -> None:
+    service = mocker.patch("a_stocks._router.stocks.get_stock_service").return_value
+    service.get_stock_price.return_value = _price(71000.0, "2025-01-02 09:00:00")
+    etag = client.get("/price/005930")["ETag"]
+
+    # 캐시가 만료되어 다시 조회했지만 시세는 그대로인 경우
+    get_price_cache().clear()
+    service.get_stock_price.return_value = _price(71000.0, "2025-01-02 09:00:05")
+    unchanged = client.get("/price/005930", headers={"If-None-Match": etag})
+
+    get_price_cache().clear()
+    service.get_stock_price.return_value = _price(71100.0, "2025-01-02 09:00:10")
+    changed = client.get("/price/005930", headers={"If-None-Match": etag})
+
+    assert unchanged.status_code == 304
+    assert changed.status_code == 200
+    assert changed["ETag"] != etag
+
+
+def test_upstream_error_returns_400(client: TestClient, mocker: MockerFixture) -> None:
+    service = mocker.patch("a_stocks._router.stocks.get_stock_service").return_value
+    service.get_stock_price.side_effect = Exception("조회 실패")
+
+    response = client.get("/price/005930")
+
+    assert response.status_code == 400
+    assert response.json() == {"message": "조회 실패"}
+
+
+def test_response_cache_expires_and_evicts(mocker: MockerFixture) -> None:
+    monotonic = mocker.patch("a_stocks._utils.response_cache.time.monotonic")
+    monotonic.return_value = 0.0
+    cache = ResponseCache(ttl=1.0, max_entries=2)
+    cache.set("a", b"1", make_etag(b"1"))
+    cache.set("b", b"2", make_etag(b"2"))
+    cache.set("c", b"3", make_etag(b"3"))
+
+    # LRU: 가장 오래된 항목이 제거됨
+    assert cache.get("a") is None
+    assert cache.get("c") is not None
+
+    monotonic.return_value = 1.5
+    assert cache.get("c") is None
@@ -0,0 +1,162 @@
+import threading
+import time
+from typing import Any, Dict, List
+
+import pytest
+from ninja.testing import TestClient
+from pytest_mock import MockerFixture
+
+from a_stocks._router import stocks
+from a_stocks._service.screener_service import ScreenerService
+from a_stocks._utils.rate_limiter import TokenBucket
+from a_stocks._utils.screen_expr import Expr, col, parse_expression
+
+
+class FakeRankingAPI:
+    """
+    순위 TR 응답을 돌려주며 호출 횟수와 동시 실행 수를 기록합니다.
+    """
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.calls: Dict[str, int] = {}
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def _respond(self, api_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            self.calls[api_id] = self.calls.get(api_id, 0) + 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return {**payload, "return_code": 0}
+
+    def reported_low_price_request_ka10016(self, **kwargs: Any) -> Dict[str, Any]:
+        rows = [{"stk_cd": "005930", "stk_nm": "삼성전자", "cur_prc": "+74800"}]
+        return self._respond("ka10016", {"ntl_pric": rows})
+
+    def rapid_price_change_request_ka10019(self, **kwargs: Any) -> Dict[str, Any]:
+        rows: List[Dict[str, Any]] = [
+            {"stk_cd": "000660", "stk_nm": "SK하이닉스", "jmp_rt": "+4.10"},
+            {"stk_cd": "005930", "stk_nm": "삼성전자", "jmp_rt": "+2.50"},
+            {"stk_cd": "035720", "stk_nm": "카카오", "jmp_rt": "+1.20"},
+        ]
+        return self._respond("ka10019", {"pric_jmpflu": rows})
+
+    def rate_of_change_compared_to_opening_price_request_ka10028(
+        self, **kwargs: Any
+    ) -> Dict[str, Any]:
+        rows = [
+            {"stk_cd": "005930", "open_pric_pre": "+3.00", "cntr_str": "180.00"},
+            {"stk_cd": "000660", "open_pric_pre": "+1.00", "cntr_str": "90.00"},
+            {"stk_cd": "035720", "open_pric_pre": "-0.50", "cntr_str": "150.00"},
+        ]
+        return self._respond("ka10028", {"open_pric_pre_flu_rt": rows})
+
+
+def test_screen_joins_sources_and_ranks() -> None:
+    service = ScreenerService(FakeRankingAPI())  # type: ignore[arg-type]
+
+    result = service.screen(
+        where="surge.jmp_rt > 1 and open_change.cntr_str >= 100",
+        score="rank(surge.jmp_rt) + rank(open_change.cntr_str)",
+    )
+
+    assert result["sources"] == ["open_change", "surge"]
+    assert result["count"] == 2
+    assert [r["code"] for r in result["results"]] == ["005930", "035720"]
+    first = result["results"][0]
+    # 종목명은 종목명이 없는 TR(ka10028)이 아니라 다른 TR 에서 채워집니다.
+    assert first["name"] == "삼성전자"
+    assert first["values"] == {"open_change.cntr_str": 180.0, "surge.jmp_rt": 2.5}
+
+
+def test_membership_and_python_expressions() -> None:
+    service = ScreenerService(FakeRankingAPI())  # type: ignore[arg-type]
+
+    result = service.screen(
+        where=col("new_high") & (col("surge.jmp_rt") > 2), score=col("surge.jmp_rt")
+    )
+
+    assert [r["code"] for r in result["results"]] == ["005930"]
+
+
+def test_repeated_screens_reuse_concurrent_pulls() -> None:
+    api = FakeRankingAPI(delay=0.05)
+    service = ScreenerService(api, ttl=60)  # type: ignore[arg-type]
+
+    started = time.perf_counter()
+    service.screen(where="new_high or surge.jmp_rt > 0 or open_change.cntr_str > 0")
+    # 세 TR 을 동시에 조회하므로 순차 조회(0.15초)보다 빨라야 합니다.
+    assert time.perf_counter() - started < 0.14
+    assert api.max_active == 3
+
+    for threshold in range(5):
+        service.screen(where=f"surge.jmp_rt > {threshold}", score="surge.jmp_rt")
+    assert api.calls == {"ka10016": 1, "ka10019": 1, "ka10028": 1}
+
+    service.invalidate()
+    service.screen(where="surge.jmp_rt > 0")
+    assert api.calls["ka10019"] == 2
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "__import__('os').system('ls')",
+        "surge.jmp_rt.__class__",
+        "[1, 2]",
+        "surge.jmp_rt in (1, 2)",
+        "surge.jmp_rt >",
+    ],
+)
+def test_rejects_unsupported_expressions(text: str) -> None:
+    service = ScreenerService(FakeRankingAPI())  # type: ignore[arg-type]
+
+    with pytest.raises(ValueError):
+        service.screen(where=parse_expression(text))
+
+
+def test_expression_requires_evaluate() -> None:
+    class Constant(Expr):
+        pass
+
+    with pytest.raises(TypeError):
+        Constant()  # type: ignore[abstract]
+
+
+def test_token_bucket_spaces_requests() -> None:
+    now = [0.0]
+    waits: List[float] = []
+    bucket = TokenBucket(rate=2, burst=2, clock=lambda: now[0], sleep=waits.append)
+
+    for _ in range(4):
+        bucket.acquire()
+
+    # 버스트 2개는 즉시, 이후 요청은 0.5초 간격으로 예약됩니다.
+    assert waits == [0.5, 1.0]
+
+
+def test_screener_route(mocker: MockerFixture) -> None:
+    service = mocker.patch("a_stocks._router.stocks.get_screener_service").return_value
+    service.screen.return_value = {
+        "sources": ["surge"],
+        "count": 1,
+        "results": [{"code": "005930", "name": "삼성전자", "score": 2.5, "values": {}}],
+    }
+
+    response = TestClient(stocks.router).get(
+        "/screener?where=surge.jmp_rt%20%3E%202&limit=5&sources=surge,new_high"
+    )
+
+    assert response.status_code == 200
+    assert response.json()["results"][0]["code"] == "005930"
+    assert service.screen.call_args.kwargs == {
+        "where": "surge.jmp_rt > 2",
+        "score": None,
+        "limit": 5,
+        "sources": ["surge", "new_high"],
+    }
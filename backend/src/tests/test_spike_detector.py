@@ -0,0 +1,257 @@
+import warnings
+from datetime import datetime
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+import pytest
+from ninja.testing import TestClient
+from pytest_mock import MockerFixture
+
+from a_stocks._router import stocks
+from a_stocks._service.spike_monitor import SpikeMonitor
+from a_stocks._utils.spike_detector import (
+    AlertSink,
+    CallbackAlertSink,
+    FanoutAlertSink,
+    LoggingAlertSink,
+    MemoryAlertSink,
+    RollingBaseline,
+    SpikeDetector,
+    decode_concentration_ka10025,
+    decode_volume_update_ka10024,
+    load_alert_sinks,
+)
+
+
+def test_rolling_baseline_matches_window_statistics() -> None:
+    rng = np.random.default_rng(3)
+    window = 7
+    baseline = RollingBaseline(max_codes=5, window=window)
+    history = np.full((5, 40), np.nan)
+    for j in range(40):
+        rows = rng.choice(5, size=3, replace=False).astype(np.intp)
+        values = rng.normal(100.0, 10.0, size=3)
+        values[0] = np.nan if j % 5 == 0 else values[0]
+        baseline.push(rows, values)
+        history[rows, j] = values
+
+        tail = history[:, max(0, j + 1 - window) : j + 1]
+        mean, std, n = baseline.stats(np.arange(5, dtype=np.intp))
+        np.testing.assert_array_equal(n, np.count_nonzero(~np.isnan(tail), axis=1))
+        # 값이 하나도 없는 종목(빈 슬라이스)은 NaN 으로 비교합니다.
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            np.testing.assert_allclose(mean, np.nanmean(tail, axis=1))
+            np.testing.assert_allclose(std, np.nanstd(tail, axis=1), atol=1e-6)
+
+
+def test_concentration_spike_alerts_once_per_cooldown() -> None:
+    received: List[Sequence[Dict[str, Any]]] = []
+    detector = SpikeDetector(
+        CallbackAlertSink(received.append),
+        window=10,
+        threshold=3.0,
+        max_codes=10,
+        cooldown=60.0,
+    )
+    codes, names = ["005930", "000660"], ["삼성전자", "SK하이닉스"]
+    for t in range(10):
+        assert (
+            detector.observe_concentration(
+                codes, names, [20.0 + t % 3, 30.0 - t % 2], now=float(t)
+            )
+            == []
+        )
+
+    alerts = detector.observe_concentration(codes, names, [60.0, 30.0], now=10.0)
+
+    assert [(a["code"], a["name"], a["metric"]) for a in alerts] == [
+        ("005930", "삼성전자", "concentration")
+    ]
+    assert alerts[0]["value"] == 60.0
+    assert alerts[0]["baseline"] == pytest.approx(20.9, abs=0.01)
+    assert alerts[0]["zscore"] > 3.0
+    assert received == [alerts]
+    # cooldown 안에서는 다시 보내지 않습니다.
+    assert detector.observe_concentration(codes, names, [90.0, 30.0], now=20.0) == []
+
+
+def test_volume_spike_uses_per_minute_increments() -> None:
+    sink = MemoryAlertSink()
+    detector = SpikeDetector(sink, window=8, threshold=4.0, max_codes=4, cooldown=0.0)
+    cumulative = 0.0
+    for t in range(8):
+        cumulative += 1000.0 + 50.0 * (t % 2)
+        detector.observe_volume(["005930"], ["삼성전자"], [cumulative], now=t * 60.0)
+
+    # 1분 동안 평소의 20배가 거래되었습니다.
+    alerts = detector.observe_volume(
+        ["005930", "035720"],
+        ["삼성전자", "카카오"],
+        [cumulative + 20000.0, 5e6],
+        now=480.0,
+    )
+
+    assert [alert["code"] for alert in alerts] == ["005930"]
+    assert alerts[0]["value"] == 20000.0
+    assert alerts[0]["baseline"] == pytest.approx(1025.0, rel=0.01)
+    assert sink.recent(metric="volume") == alerts
+    assert sink.recent(metric="concentration") == []
+
+    # 새 거래일처럼 누적 거래량이 줄면 값을 만들지 않습니다.
+    assert detector.observe_volume(["005930"], [""], [10.0], now=540.0) == []
+    detector.reset()
+    assert detector.observe_volume(["005930"], [""], [10.0], now=600.0) == []
+
+
+def test_detector_caps_tracked_codes_and_survives_sink_errors() -> None:
+    def broken(alerts: Sequence[Dict[str, Any]]) -> None:
+        raise RuntimeError("전송 실패")
+
+    memory = MemoryAlertSink(maxlen=2)
+    detector = SpikeDetector(
+        FanoutAlertSink([CallbackAlertSink(broken), memory]),
+        window=4,
+        threshold=1.0,
+        max_codes=1,
+        cooldown=0.0,
+        min_periods=2,
+    )
+    for t in range(3):
+        detector.observe_concentration(["A", "B"], ["", ""], [10.0, 10.0], now=t)
+    alerts = detector.observe_concentration(["A", "B"], ["", ""], [50.0, 50.0], now=3)
+
+    assert [alert["code"] for alert in alerts] == ["A"]
+    assert memory.recent() == alerts
+
+
+def test_decoders_and_sink_loading() -> None:
+    codes, names, volume = decode_volume_update_ka10024(
+        {
+            "trde_qty_updt": [
+                {"stk_cd": "005930", "stk_nm": "삼성전자", "now_trde_qty": "435771"},
+                {"stk_cd": "", "now_trde_qty": "1"},
+            ]
+        }
+    )
+    assert (codes, names, volume.tolist()) == (["005930"], ["삼성전자"], [435771.0])
+
+    codes, names, ratio = decode_concentration_ka10025(
+        {
+            "prps_cnctr": [
+                {"stk_cd": "005930", "stk_nm": "삼성전자", "prps_rt": "+50.00"},
+                {"stk_cd": "000660", "stk_nm": "SK하이닉스", "prps_rt": "+12.50"},
+                {"stk_cd": "005930", "stk_nm": "삼성전자", "prps_rt": "+70.00"},
+            ]
+        }
+    )
+    assert codes == ["000660", "005930"]
+    assert names == ["SK하이닉스", "삼성전자"]
+    assert ratio.tolist() == [12.5, 70.0]
+
+    sinks = load_alert_sinks(" a_stocks._utils.spike_detector.LoggingAlertSink, ")
+    assert [type(sink) for sink in sinks] == [LoggingAlertSink]
+    with pytest.raises(TypeError):
+        AlertSink()  # type: ignore[abstract]
+
+
+class FakeSpikeAPI:
+    def __init__(self) -> None:
+        self.volume = 0.0
+        self.ratio = 20.0
+
+    def trading_volume_update_request_ka10024(
+        self, market_type: str, cycle_type: str, trade_qty_type: str, exchange_type: str
+    ) -> Dict[str, Any]:
+        self.volume += 1000.0
+        return {
+            "trde_qty_updt": [
+                {"stk_cd": "005930", "stk_nm": "삼성전자", "now_trde_qty": self.volume}
+            ]
+        }
+
+    def supply_concentration_request_ka10025(self, *args: str) -> Dict[str, Any]:
+        return {
+            "prps_cnctr": [
+                {"stk_cd": "005930", "stk_nm": "삼성전자", "prps_rt": str(self.ratio)}
+            ]
+        }
+
+
+def test_monitor_poll_feeds_detector_and_memory_sink() -> None:
+    api = FakeSpikeAPI()
+    extra = MemoryAlertSink()
+    monitor = SpikeMonitor(
+        api,  # type: ignore[arg-type]
+        sinks=[extra],
+        window=5,
+        threshold=3.0,
+        cooldown=0.0,
+        min_periods=3,
+    )
+    for _ in range(4):
+        assert monitor.poll()["alerts"] == 0
+    api.ratio = 80.0
+
+    assert monitor.poll() == {"volume": 1, "concentration": 1, "alerts": 1}
+    result = monitor.recent(metric="concentration")
+    assert result["polls"] == 5
+    assert result["results"][0]["value"] == 80.0
+    assert extra.recent() == result["results"]
+    with pytest.raises(ValueError):
+        monitor.recent(metric="unknown")
+
+
+def test_monitor_clears_alerts_when_session_changes(mocker: MockerFixture) -> None:
+    now_kst = mocker.patch("a_stocks._service.spike_monitor.now_kst")
+    now_kst.return_value = datetime(2025, 1, 2, 10, 0)
+    api = FakeSpikeAPI()
+    monitor = SpikeMonitor(
+        api,  # type: ignore[arg-type]
+        sinks=[],
+        window=5,
+        threshold=3.0,
+        cooldown=0.0,
+        min_periods=3,
+    )
+    for _ in range(4):
+        monitor.poll()
+    api.ratio = 80.0
+    monitor.poll()
+    assert len(monitor.recent(metric="concentration")["results"]) == 1
+
+    now_kst.return_value = datetime(2025, 1, 3, 9, 0)
+    monitor.poll()
+
+    result = monitor.recent()
+    assert result["session"] == "20250103"
+    assert result["results"] == []
+
+
+def test_spike_alerts_route(mocker: MockerFixture) -> None:
+    monitor = mocker.patch("a_stocks._router.stocks.get_spike_monitor").return_value
+    monitor.recent.return_value = {
+        "session": "20250102",
+        "polls": 3,
+        "results": [
+            {
+                "code": "005930",
+                "name": "삼성전자",
+                "metric": "volume",
+                "value": 20000.0,
+                "baseline": 1000.0,
+                "zscore": 5.2,
+                "at": 1.0,
+            }
+        ],
+    }
+
+    response = TestClient(stocks.router).get("/spikes/alerts?metric=volume&limit=5")
+
+    assert response.status_code == 200
+    assert response.json()["results"][0]["zscore"] == 5.2
+    monitor.ensure_running.assert_called_once_with()
+    monitor.recent.assert_called_once_with(5, "volume")
+
+    monitor.recent.side_effect = ValueError("지표 오류")
+    assert TestClient(stocks.router).get("/spikes/alerts?metric=x").status_code == 400
@@ -0,0 +1,155 @@
+import asyncio
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import pytest
+
+from a_stocks._service.strategy_runtime import (
+    Feed,
+    MarketEvent,
+    Strategy,
+    StrategyRuntime,
+)
+
+
+class FakeSource:
+    def __init__(self) -> None:
+        self.values: Dict[str, int] = {}
+        self.calls: List[Optional[List[str]]] = []
+
+    def __call__(self, codes: Optional[List[str]]) -> List[Tuple[str, Dict[str, Any]]]:
+        self.calls.append(codes)
+        targets = sorted(self.values) if codes is None else codes
+        return [(code, {"value": self.values.get(code, 0)}) for code in targets]
+
+
+class Recorder(Strategy):
+    def __init__(self, name: str, subscriptions: Mapping[str, List[str]]) -> None:
+        self.name = name
+        self.subscriptions = subscriptions
+        self.events: List[MarketEvent] = []
+        self.received = asyncio.Event()
+
+    async def on_event(self, event: MarketEvent) -> None:
+        self.events.append(event)
+        self.received.set()
+
+
+def _runtime(quote: FakeSource, vi: FakeSource) -> StrategyRuntime:
+    return StrategyRuntime(
+        [
+            Feed("quote", quote, interval=60.0, batch_size=2),
+            Feed("vi", vi, interval=60.0, market_wide=True),
+        ]
+    )
+
+
+def test_demand_is_deduplicated_across_strategies() -> None:
+    async def scenario() -> None:
+        quote, vi = FakeSource(), FakeSource()
+        runtime = _runtime(quote, vi)
+        first = Recorder("first", {"quote": ["005930", "000660"]})
+        second = Recorder("second", {"quote": ["005930", "035720"]})
+        await runtime.add_strategy(first)
+        await runtime.add_strategy(second)
+
+        assert runtime.demand("quote") == ["000660", "005930", "035720"]
+        assert await runtime.poll_feed("quote") == 4
+        # 전략이 둘이어도 서로 다른 종목 3개를 2개씩 나눠 두 번만 조회합니다.
+        assert quote.calls == [["000660", "005930"], ["035720"]]
+        # 구독이 없는 피드는 조회하지 않습니다.
+        assert await runtime.poll_feed("vi") == 0
+        assert vi.calls == []
+
+        await asyncio.sleep(0)
+        assert sorted(e.code for e in first.events) == ["000660", "005930"]
+        assert sorted(e.code for e in second.events) == ["005930", "035720"]
+        # 같은 응답은 두 전략이 같은 이벤트 객체로 공유합니다.
+        shared = [e for e in first.events if e.code == "005930"][0]
+        assert shared in second.events
+
+        await runtime.stop()
+
+    asyncio.run(scenario())
+
+
+def test_only_changed_rows_are_dispatched() -> None:
+    async def scenario() -> None:
+        quote, vi = FakeSource(), FakeSource()
+        runtime = _runtime(quote, vi)
+        strategy = Recorder("s", {"quote": ["005930", "000660"]})
+        await runtime.add_strategy(strategy)
+
+        assert await runtime.poll_feed("quote") == 2
+        assert await runtime.poll_feed("quote") == 0
+        quote.values["005930"] = 1
+        assert await runtime.poll_feed("quote") == 1
+
+        await asyncio.sleep(0)
+        assert [e.code for e in strategy.events][-1] == "005930"
+        assert strategy.events[-1].data == {"value": 1}
+
+        # 늦게 들어온 전략은 최신 값을 즉시 받습니다.
+        late = Recorder("late", {"quote": ["005930"]})
+        await runtime.add_strategy(late)
+        await asyncio.sleep(0)
+        assert [e.data for e in late.events] == [{"value": 1}]
+        assert len(strategy.events) == 3
+
+        await runtime.stop()
+
+    asyncio.run(scenario())
+
+
+def test_market_wide_feed_supports_wildcard_and_filters() -> None:
+    async def scenario() -> None:
+        quote, vi = FakeSource(), FakeSource()
+        vi.values = {"005930": 1, "000660": 1, "035720": 1}
+        runtime = _runtime(quote, vi)
+        everything = Recorder("all", {"vi": ["*"]})
+        samsung = Recorder("samsung", {"vi": ["005930"]})
+        await runtime.add_strategy(everything)
+        await runtime.add_strategy(samsung)
+
+        assert await runtime.poll_feed("vi") == 4
+        # 시장 전체 TR 은 구독 수와 관계없이 한 번만 조회합니다.
+        assert vi.calls == [None]
+
+        await asyncio.sleep(0)
+        assert len(everything.events) == 3
+        assert [e.code for e in samsung.events] == ["005930"]
+
+        with pytest.raises(ValueError):
+            runtime.subscribe(samsung, "quote", ["*"])
+
+        await runtime.stop()
+
+    asyncio.run(scenario())
+
+
+def test_scheduler_polls_only_feeds_with_demand() -> None:
+    async def scenario() -> None:
+        quote, vi = FakeSource(), FakeSource()
+        runtime = _runtime(quote, vi)
+        runtime.start()
+        await asyncio.sleep(0.01)
+        assert quote.calls == [] and vi.calls == []
+
+        strategy = Recorder("s", {"quote": ["005930"]})
+        await runtime.add_strategy(strategy)
+        # 구독이 생기면 스케줄러가 깨어나 주기를 기다리지 않고 바로 조회합니다.
+        await asyncio.wait_for(strategy.received.wait(), timeout=1.0)
+        assert quote.calls == [["005930"]]
+        assert vi.calls == []
+
+        await runtime.stop()
+        assert runtime.demand("quote") == []
+
+    asyncio.run(scenario())
+
+
+def test_strategy_requires_on_event() -> None:
+    class Silent(Strategy):
+        name = "silent"
+
+    with pytest.raises(TypeError):
+        Silent()  # type: ignore[abstract]
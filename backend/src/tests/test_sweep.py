@@ -0,0 +1,84 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from a_stocks._utils.backtest import run_backtest, sma_crossover
+from a_stocks._utils.history_store import HistoryStore
+from a_stocks._utils.sweep import (
+    SharedPanel,
+    StorePanelSpec,
+    param_grid,
+    run_sweep,
+    run_walk_forward,
+    walk_forward_windows,
+)
+
+
+@pytest.fixture
+def close() -> np.ndarray:
+    rng = np.random.default_rng(7)
+    return 10000 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, size=(8, 300)), axis=1))
+
+
+def test_param_grid_and_windows() -> None:
+    assert param_grid(fast=[5, 10], slow=[60]) == [
+        {"fast": 5, "slow": 60},
+        {"fast": 10, "slow": 60},
+    ]
+    assert walk_forward_windows(300, train=120, test=60) == [
+        ((0, 120), (120, 180)),
+        ((60, 180), (180, 240)),
+        ((120, 240), (240, 300)),
+    ]
+
+
+def test_shared_memory_sweep_matches_serial_backtests(close: np.ndarray) -> None:
+    grid = param_grid(fast=[5, 10], slow=[20, 40])
+
+    with SharedPanel({"close_pric": close}) as shared:
+        table = run_sweep(shared.spec(), sma_crossover, grid, max_workers=2)
+
+    assert len(table) == 4
+    for row, params in zip(table.rows, grid):
+        expected = run_backtest({"close_pric": close}, sma_crossover(**params))
+        assert (row["fast"], row["slow"]) == (params["fast"], params["slow"])
+        assert row["total_return"] == pytest.approx(expected.stats["total_return"])
+
+    columns = table.columns()
+    assert columns["sharpe"].shape == (4,)
+    best = table.best("sharpe")
+    assert best is not None and best["sharpe"] == columns["sharpe"].max()
+
+
+def test_walk_forward_over_memmapped_store(tmp_path: Path, close: np.ndarray) -> None:
+    dates = np.arange(20200101, 20200101 + close.shape[1], dtype=np.int32)
+    HistoryStore(tmp_path).merge(
+        "ka10015",
+        {f"{i:06d}": {"dt": dates, "close_pric": row} for i, row in enumerate(close)},
+    )
+    grid = param_grid(fast=[5, 10], slow=[20, 40])
+
+    result = run_walk_forward(
+        StorePanelSpec(str(tmp_path)),
+        sma_crossover,
+        grid,
+        train=120,
+        test=60,
+        max_workers=2,
+    )
+
+    assert len(result["train"]) == 3 * len(grid)
+    test_rows = result["test"].rows
+    assert [(row["start"], row["end"]) for row in test_rows] == [
+        (int(dates[120]), int(dates[179])),
+        (int(dates[180]), int(dates[239])),
+        (int(dates[240]), int(dates[299])),
+    ]
+    # 검증 구간에는 해당 창 학습 구간의 최고 파라미터가 사용됩니다.
+    first_window = result["train"].rows[: len(grid)]
+    chosen = max(first_window, key=lambda row: row["sharpe"])
+    assert (test_rows[0]["fast"], test_rows[0]["slow"]) == (
+        chosen["fast"],
+        chosen["slow"],
+    )
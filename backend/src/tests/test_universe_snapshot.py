@@ -0,0 +1,134 @@
+import math
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import numpy as np
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from pytest_mock import MockerFixture
+
+from a_stocks._service.universe_snapshot import (
+    FUNDAMENTALS_DATASET,
+    SnapshotProgress,
+    UniverseSnapshot,
+)
+from a_stocks._utils.history_store import HistoryStore
+from a_stocks._utils.parsers import parse_optional
+from a_stocks._utils.rate_limiter import TokenBucket
+from a_stocks._utils.tr_decoders import decode_basic_info_ka10001
+
+
+class FakeBasicInfoAPI:
+    def __init__(self, rate: float = 0.0, fail: frozenset = frozenset()) -> None:
+        self.rate_limiter = TokenBucket(rate)
+        self.fail = fail
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def basic_stock_information_request_ka10001(
+        self, stock_code: str
+    ) -> Dict[str, Any]:
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if stock_code in self.fail:
+                raise RuntimeError("조회 실패")
+            return {
+                "stk_cd": stock_code,
+                "per": str(int(stock_code) % 30),
+                "mac": str(int(stock_code) * 10),
+                "roe": "",
+            }
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def test_decode_basic_info_keeps_blank_metrics_missing() -> None:
+    columns = decode_basic_info_ka10001(
+        {"per": "+12.5", "pbr": "", "cur_prc": "-74800", "fav": "100"}, "20250102"
+    )
+    assert columns["dt"].tolist() == [20250102]
+    assert columns["per"].tolist() == [12.5]
+    assert columns["cur_prc"].tolist() == [74800.0]
+    assert math.isnan(columns["pbr"][0])
+    assert math.isnan(parse_optional(None)) and parse_optional("-3") == -3.0
+
+
+def test_snapshot_streams_batches_into_store(
+    tmp_path: Path, mocker: MockerFixture
+) -> None:
+    api = FakeBasicInfoAPI(fail=frozenset({"000007"}))
+    store = HistoryStore(tmp_path)
+    sizes: List[int] = []
+    merge = store.merge
+
+    def record_merge(dataset: str, updates: Dict[str, Any]) -> int:
+        # 병합 뒤 버퍼를 비우므로 호출 시점의 크기를 기록합니다.
+        sizes.append(len(updates))
+        return merge(dataset, updates)
+
+    mocker.patch.object(store, "merge", side_effect=record_merge)
+    pulled: List[str] = []
+
+    def codes() -> Iterator[str]:
+        for i in range(1, 41):
+            pulled.append(f"{i:06d}")
+            yield f"{i:06d}"
+
+    snapshot = UniverseSnapshot(api, store, max_workers=3, batch_size=8)  # type: ignore[arg-type]
+    reports: List[Dict[str, Any]] = []
+    report = snapshot.run(codes(), 40, date="20250102", on_progress=reports.append)
+
+    assert (report["done"], report["failed"]) == (39, 1)
+    assert report["failed_codes"] == ["000007"]
+    assert report["rate_limit"] == 0.0 and report["utilization"] is None
+    # 풀에 넣어 두는 종목 수와 한 번에 병합하는 종목 수가 제한됩니다.
+    assert api.max_in_flight <= 3
+    assert sum(sizes) == 39 and max(sizes) <= 8 + 3 * 2
+    assert len(reports) == len(sizes)
+    assert len(pulled) == 40
+
+    date, latest = snapshot.latest(["000010", "000031", "000007"])
+    assert date == 20250102
+    assert latest["code"].tolist() == ["000010", "000031", "000007"]
+    np.testing.assert_array_equal(latest["per"], [10.0, 1.0, np.nan])
+    assert np.isnan(latest["roe"]).all()
+    assert store.exists(FUNDAMENTALS_DATASET)
+
+
+def test_snapshot_progress_reports_rate_utilization() -> None:
+    now = [0.0]
+    progress = SnapshotProgress(100, rate_limit=5.0, clock=lambda: now[0])
+    now[0] = 10.0
+    progress.record(36, rows=36)
+    progress.record(0, failed=4)
+
+    report = progress.report()
+
+    assert report["requests_per_sec"] == 4.0
+    assert report["utilization"] == 80.0
+    assert report["eta"] == 15.0
+
+
+@pytest.mark.django_db
+def test_kiwoom_snapshot_command(tmp_path: Path, mocker: MockerFixture) -> None:
+    api = FakeBasicInfoAPI(fail=frozenset({"000660"}))
+    mocker.patch(
+        "a_stocks._service.universe_snapshot.get_history_store"
+    ).return_value = HistoryStore(tmp_path)
+    mocker.patch(
+        "a_stocks.management.commands.kiwoom_snapshot.get_stock_service"
+    ).return_value.api = api
+
+    with pytest.raises(CommandError):
+        call_command("kiwoom_snapshot", codes="005930,000660", date="20250102")
+    call_command("kiwoom_snapshot", codes="035720", date="20250103")
+
+    store = HistoryStore(tmp_path)
+    assert store.dates(FUNDAMENTALS_DATASET).tolist() == [20250102, 20250103]
+    assert sorted(store.codes(FUNDAMENTALS_DATASET)) == ["005930", "035720"]
@@ -0,0 +1,228 @@
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pytest
+from ninja.testing import TestClient
+from pytest_mock import MockerFixture
+
+from a_stocks._router import stocks
+from a_stocks._service.valuation_service import ValuationService
+from a_stocks._service.warmup import default_warmup_steps
+from a_stocks._utils.code_registry import CodeRegistry
+from a_stocks._utils.columnar import ColumnTable
+from a_stocks._utils.valuation import ValuationTable, parse_ranges
+
+
+def test_parse_ranges() -> None:
+    assert parse_ranges("per:5:10, pbr::1 ,roe:15:") == {
+        "per": (5.0, 10.0),
+        "pbr": (None, 1.0),
+        "roe": (15.0, None),
+    }
+    assert parse_ranges("") == {}
+    with pytest.raises(ValueError):
+        parse_ranges("per:5")
+    with pytest.raises(ValueError):
+        parse_ranges("per:x:10")
+
+
+def _random_table(size: int) -> Tuple[ValuationTable, Dict[str, np.ndarray]]:
+    rng = np.random.default_rng(11)
+    columns = {
+        "per": rng.uniform(-5, 40, size),
+        "roe": rng.uniform(-10, 30, size),
+        "mac": rng.uniform(100, 10000, size).round(),
+    }
+    columns["per"][rng.choice(size, 30, replace=False)] = np.nan
+    columns["roe"][rng.choice(size, 30, replace=False)] = np.nan
+    registry = CodeRegistry()
+    keys = registry.encode(f"{i:06d}" for i in range(size))
+    table = ColumnTable(
+        keys, {name: values.copy() for name, values in columns.items()}, registry
+    )
+    return ValuationTable(table), columns
+
+
+@pytest.mark.parametrize(
+    "ranges, sort, ascending",
+    [
+        ({"per": (5.0, 10.0), "roe": (15.0, None)}, "roe", False),
+        ({"roe": (None, 0.0)}, "per", True),
+        ({"mac": (1000.0, 2000.0), "per": (None, 20.0)}, None, True),
+        ({}, "per", False),
+    ],
+)
+def test_range_query_matches_brute_force(
+    ranges: Dict[str, Tuple[Optional[float], Optional[float]]],
+    sort: Optional[str],
+    ascending: bool,
+) -> None:
+    size = 300
+    table, columns = _random_table(size)
+
+    count, positions = table.query(ranges, sort, ascending, limit=size)
+
+    mask = np.ones(size, dtype=np.bool_)
+    with np.errstate(invalid="ignore"):
+        for name, (low, high) in ranges.items():
+            mask &= ~np.isnan(columns[name])
+            if low is not None:
+                mask &= columns[name] >= low
+            if high is not None:
+                mask &= columns[name] <= high
+    assert count == int(mask.sum())
+    assert sorted(positions.tolist()) == np.flatnonzero(mask).tolist()
+    if sort is not None:
+        values = columns[sort][positions]
+        present = values[~np.isnan(values)]
+        assert np.isnan(values[present.size :]).all()
+        expected = np.sort(present)
+        np.testing.assert_array_equal(
+            present, expected if ascending else expected[::-1]
+        )
+
+    assert table.query(ranges, sort, ascending, limit=3)[1].tolist() == (
+        positions[:3].tolist()
+    )
+    with pytest.raises(KeyError):
+        table.query({"unknown": (0.0, 1.0)})
+
+
+class FakeValuationAPI:
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+        self.lists: Dict[str, List[Dict[str, Any]]] = {
+            "1": [{"stk_cd": "000660", "stk_nm": "SK하이닉스", "per": "0.80"}],
+            "2": [{"stk_cd": "005930", "stk_nm": "삼성전자", "per": "1.50"}],
+            "3": [{"stk_cd": "000660", "stk_nm": "SK하이닉스", "per": "4.10"}],
+            "4": [{"stk_cd": "035720", "stk_nm": "카카오", "per": "95.00"}],
+            "5": [{"stk_cd": "035720", "stk_nm": "카카오", "per": "-3.00"}],
+            "6": [{"stk_cd": "000660", "stk_nm": "SK하이닉스", "per": "18.20"}],
+        }
+        self.basic: Dict[str, Dict[str, Any]] = {
+            "005930": {"stk_nm": "삼성전자", "fav": "100", "per": "13.0", "roe": "9.0"},
+            "000660": {"stk_nm": "SK하이닉스", "fav": "5000", "per": "99", "roe": ""},
+        }
+
+    def high_low_per_request_ka10026(
+        self, per_type: str, exchange_type: str
+    ) -> Dict[str, Any]:
+        self.calls.append(f"ka10026:{per_type}")
+        return {"high_low_per": self.lists[per_type]}
+
+    def basic_stock_information_request_ka10001(
+        self, stock_code: str
+    ) -> Dict[str, Any]:
+        self.calls.append(f"ka10001:{stock_code}")
+        if stock_code not in self.basic:
+            raise RuntimeError("조회 실패")
+        return dict(self.basic[stock_code])
+
+
+def test_service_merges_sources_and_caches_per_day(mocker: MockerFixture) -> None:
+    now = mocker.patch("a_stocks._service.valuation_service.now_kst")
+    now.return_value = datetime(2025, 1, 2, 10, 0)
+    api = FakeValuationAPI()
+    service = ValuationService(api, max_workers=2)  # type: ignore[arg-type]
+
+    result = service.screen({"per": (None, 20.0)}, sort="per", columns=["per", "fav"])
+
+    assert result["date"] == "20250102"
+    assert (result["total"], result["count"], result["failed"]) == (3, 2, ["035720"])
+    assert result["results"] == [
+        # ka10026 값을 우선합니다.
+        {"code": "000660", "name": "SK하이닉스", "values": {"per": 4.1, "fav": 5000.0}},
+        # ka10026 에 없는 지표는 ka10001 값으로 채웁니다.
+        {"code": "005930", "name": "삼성전자", "values": {"per": 13.0, "fav": 100.0}},
+    ]
+    calls = len(api.calls)
+    assert calls == 6 + 3
+
+    # 조건만 바꾼 질의는 다시 조회하지 않습니다.
+    roe = service.screen({"roe": (0.0, None)}, sort="roe", ascending=False)
+    assert [row["code"] for row in roe["results"]] == ["000660", "005930"]
+    assert roe["results"][0]["values"]["roe"] == 18.2
+    assert len(api.calls) == calls
+
+    with pytest.raises(ValueError):
+        service.screen({}, sort="unknown")
+    with pytest.raises(ValueError):
+        service.screen({}, columns=["unknown"])
+
+    # 거래일이 바뀌면 새로 만듭니다.
+    now.return_value = datetime(2025, 1, 3, 9, 0)
+    assert service.screen({})["date"] == "20250103"
+    assert len(api.calls) == 2 * calls
+
+
+def test_concurrent_requests_build_the_table_once(mocker: MockerFixture) -> None:
+    now = mocker.patch("a_stocks._service.valuation_service.now_kst")
+    now.return_value = datetime(2025, 1, 2, 10, 0)
+    api = FakeValuationAPI()
+    entered = threading.Event()
+    release = threading.Event()
+    fetch = api.high_low_per_request_ka10026
+
+    def slow_fetch(per_type: str, exchange_type: str) -> Dict[str, Any]:
+        entered.set()
+        release.wait(5.0)
+        return fetch(per_type, exchange_type)
+
+    api.high_low_per_request_ka10026 = slow_fetch  # type: ignore[method-assign]
+    service = ValuationService(api, max_workers=6)  # type: ignore[arg-type]
+    tables: List[ValuationTable] = []
+    threads = [
+        threading.Thread(target=lambda: tables.append(service.table()))
+        for _ in range(2)
+    ]
+    threads[0].start()
+    assert entered.wait(5.0)
+    threads[1].start()
+    # 두 번째 요청이 락을 기다리게 둔 뒤 첫 번째 조회를 끝냅니다.
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert tables[0] is tables[1]
+    assert len([call for call in api.calls if call.startswith("ka10026")]) == 6
+
+
+def test_warmup_builds_valuation_table(mocker: MockerFixture) -> None:
+    service = mocker.patch("a_stocks._service.warmup.get_valuation_service")
+    service.return_value.table.return_value = [1, 2, 3]
+
+    steps = dict(default_warmup_steps([], master=False, token=False))
+
+    assert steps["valuation"]() == 3
+    service.return_value.table.assert_called_once_with()
+    assert "valuation" not in dict(
+        default_warmup_steps([], master=False, token=False, valuation=False)
+    )
+
+
+def test_valuation_screen_route(mocker: MockerFixture) -> None:
+    service = mocker.patch("a_stocks._router.stocks.get_valuation_service").return_value
+    service.screen.return_value = {
+        "date": "20250102",
+        "total": 3,
+        "count": 1,
+        "failed": [],
+        "results": [{"code": "000660", "name": "SK하이닉스", "values": {"per": 4.1}}],
+    }
+
+    response = TestClient(stocks.router).get(
+        "/valuation/screen?where=per:0:10,roe:15:&sort=roe&ascending=false&columns=per"
+    )
+
+    assert response.status_code == 200
+    assert response.json()["results"][0]["values"] == {"per": 4.1}
+    service.screen.assert_called_once_with(
+        {"per": (0.0, 10.0), "roe": (15.0, None)}, "roe", False, 50, ["per"]
+    )
+    assert (
+        TestClient(stocks.router).get("/valuation/screen?where=per").status_code == 400
+    )
@@ -0,0 +1,97 @@
+from typing import Any, Dict, List
+
+from a_stocks._service.vi_detector import (
+    RELEASE,
+    TRIGGER,
+    ViDetector,
+    ViEvent,
+    ViEventLog,
+)
+
+
+def _row(code: str, count: int, proc_time: str, release: str = "") -> Dict[str, Any]:
+    return {
+        "stk_cd": code,
+        "stk_nm": code,
+        "vimotn_cnt": str(count),
+        "trde_cntr_proc_time": proc_time,
+        "virelis_time": release,
+        "viaplc_tp": "동적",
+    }
+
+
+def test_detector_emits_trigger_and_release_events() -> None:
+    snapshots: List[List[Dict[str, Any]]] = [
+        [_row("005930", 1, "090100", "090300")],
+        [_row("005930", 1, "090100", "090300")],
+        [_row("005930", 1, "090100", "090300"), _row("000660", 2, "090200")],
+        [_row("000660", 2, "090200"), _row("035720", 1, "090400")],
+        [_row("000660", 3, "091000"), _row("035720", 1, "090400")],
+    ]
+    clock = iter(range(100, 200))
+    detector = ViDetector(lambda: snapshots.pop(0), clock=lambda: next(clock))
+
+    first = detector.poll()
+    assert [(e.kind, e.code, e.count, e.event_time) for e in first] == [
+        (TRIGGER, "005930", 1, 90100)
+    ]
+    # 변화가 없으면 이벤트도 없습니다.
+    assert detector.poll() == []
+    assert [(e.kind, e.code) for e in detector.poll()] == [(TRIGGER, "000660")]
+
+    # 목록에서 빠진 종목은 해제, 새 종목은 발동 (해제가 먼저)
+    events = detector.poll()
+    assert [(e.kind, e.code, e.event_time) for e in events] == [
+        (RELEASE, "005930", 90300),
+        (TRIGGER, "035720", 90400),
+    ]
+    # 같은 종목이라도 발동횟수가 바뀌면 재발동입니다.
+    assert [(e.kind, e.code, e.count) for e in detector.poll()] == [
+        (TRIGGER, "000660", 3)
+    ]
+    assert sorted(detector.active()) == ["000660", "035720"]
+
+    assert len(detector.log) == 5
+    assert [e.code for e in detector.log.events(code="000660")] == [
+        "000660",
+        "000660",
+    ]
+    releases = detector.log.events(kind=RELEASE)
+    assert [(e.code, e.observed_at) for e in releases] == [("005930", 102.0)]
+    assert len(detector.log.records(since=102.0)) == 3
+
+
+def test_event_log_keeps_most_recent_records_within_capacity() -> None:
+    log = ViEventLog(capacity=3)
+    detector = ViDetector(lambda: [], log=log)
+    for i in range(5):
+        detector.update([_row(f"{i:06d}", 1, "090000")], observed_at=float(i))
+
+    # 5 번의 발동 + 4 번의 해제 중 마지막 3 개만 남습니다.
+    assert [(e.kind, e.code) for e in log.events()] == [
+        (TRIGGER, "000003"),
+        (RELEASE, "000003"),
+        (TRIGGER, "000004"),
+    ]
+    assert log.records().dtype.itemsize == 29
+
+
+def test_event_log_crosses_capacity_before_growing_to_it() -> None:
+    log = ViEventLog(capacity=2000)
+
+    def batch(start: int, count: int) -> List[ViEvent]:
+        return [
+            ViEvent(TRIGGER, f"{i:06d}", 1, 90000, float(i))
+            for i in range(start, start + count)
+        ]
+
+    log.append(batch(0, 1000))
+    # 버퍼가 용량(2000)보다 작은 상태에서 용량을 넘깁니다.
+    log.append(batch(1000, 1500))
+
+    assert len(log) == 2000
+    assert log.records()["observed_at"].tolist() == [float(i) for i in range(500, 2500)]
+    log.append(batch(2500, 3000))
+    assert log.records()["observed_at"].tolist() == [
+        float(i) for i in range(3500, 5500)
+    ]
@@ -0,0 +1,167 @@
+import asyncio
+from datetime import date, datetime, time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from pytest_mock import MockerFixture
+
+from a_stocks._service.master_data import MasterDataService
+from a_stocks._service.warmup import WarmupScheduler
+from a_stocks._utils.krx_calendar import KST, next_occurrence, parse_dates
+
+
+def test_next_occurrence_skips_weekends_and_holidays() -> None:
+    closed = parse_dates("20250505,20250506")
+    at = time(8, 30)
+
+    # 금요일 장 시작 전 → 당일, 이후 → 다음 주 월요일
+    friday = datetime(2025, 5, 2, 7, 0, tzinfo=KST)
+    assert next_occurrence(at, friday, closed) == datetime(
+        2025, 5, 2, 8, 30, tzinfo=KST
+    )
+    after = datetime(2025, 5, 2, 9, 0, tzinfo=KST)
+    # 월/화 휴장 → 수요일
+    assert next_occurrence(at, after, closed).date() == date(2025, 5, 7)
+    # UTC 로 주어져도 KST 로 계산합니다. (UTC 23:00 = 다음날 08:00 KST)
+    utc = datetime.fromisoformat("2025-05-06T23:00:00+00:00")
+    assert next_occurrence(at, utc, closed) == datetime(2025, 5, 7, 8, 30, tzinfo=KST)
+
+
+class FakeMasterAPI:
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+
+    def stock_information_list_request_ka10099(self, market: str) -> Dict[str, Any]:
+        raise AssertionError("paginate 를 통해 호출해야 합니다.")
+
+    def industry_code_list_ka10101(self, market: str) -> Dict[str, Any]:
+        raise AssertionError("paginate 를 통해 호출해야 합니다.")
+
+    def member_company_list_ka10102(self) -> Dict[str, Any]:
+        raise AssertionError("paginate 를 통해 호출해야 합니다.")
+
+    def paginate(
+        self, request: Callable[..., Dict[str, Any]], *args: Any
+    ) -> List[Dict[str, Any]]:
+        name = request.__name__.rsplit("_", 1)[-1]
+        self.calls.append(name)
+        if name == "ka10099":
+            return [
+                {"list": [{"code": f"{args[0]}-1", "name": "A"}]},
+                {"list": [{"code": f"{args[0]}-2", "name": "B"}]},
+            ]
+        return [{"list": [{"code": "001", "name": name}]}]
+
+
+def test_master_data_is_fetched_once_and_shared_through_snapshot(
+    tmp_path: Path,
+) -> None:
+    api = FakeMasterAPI()
+    path = tmp_path / "master.json"
+    service = MasterDataService(
+        api,  # type: ignore[arg-type]
+        path=path,
+        stock_markets=("0", "10"),
+        industry_markets=("0",),
+    )
+
+    assert service.refresh() == {"stocks": 4, "industries": 1, "members": 1}
+    assert api.calls == ["ka10099", "ka10099", "ka10101", "ka10102"]
+
+    # 다른 프로세스의 서비스는 키움을 호출하지 않고 스냅샷을 읽습니다.
+    other_api = FakeMasterAPI()
+    other = MasterDataService(other_api, path=path)  # type: ignore[arg-type]
+    assert other.stock("10-2") == {"code": "10-2", "name": "B"}
+    assert other.members()[0]["name"] == "ka10102"
+    assert other_api.calls == []
+
+
+def test_scheduler_runs_all_steps_and_waits_for_next_trading_day() -> None:
+    calls: List[str] = []
+
+    def failing() -> None:
+        calls.append("master")
+        raise RuntimeError("boom")
+
+    now = datetime(2025, 5, 2, 8, 29, 59, tzinfo=KST)
+    scheduler = WarmupScheduler(
+        [("token", lambda: calls.append("token")), ("master", failing)],
+        at=time(8, 30),
+        clock=lambda: now,
+    )
+
+    report = scheduler.run_once()
+    assert calls == ["token", "master"]
+    assert not report["ok"]
+    assert report["steps"][1] == {
+        "name": "master",
+        "ok": False,
+        "error": "boom",
+        "elapsed": report["steps"][1]["elapsed"],
+    }
+    assert scheduler.next_run() == datetime(2025, 5, 2, 8, 30, tzinfo=KST)
+
+    async def scenario() -> None:
+        stop = asyncio.Event()
+        stop.set()
+        await scheduler.run_forever(stop)
+
+    asyncio.run(scenario())
+    assert calls == ["token", "master"]
+
+
+def test_warmup_command(mocker: MockerFixture) -> None:
+    steps = mocker.patch(
+        "a_stocks.management.commands.kiwoom_warmup.default_warmup_steps",
+        return_value=[("token", lambda: True)],
+    )
+
+    call_command("kiwoom_warmup", "--codes", "005930, 000660", "--skip-master")
+
+    # 프로세스 내 시세 캐시는 서버 워커와 공유되지 않으므로 토큰/시세는 건너뜁니다.
+    steps.assert_called_once_with(
+        ["005930", "000660"], master=False, token=False, quotes=False, valuation=False
+    )
+    mocker.patch(
+        "a_stocks.management.commands.kiwoom_warmup.price_cache_is_shared",
+        return_value=True,
+    )
+    steps.reset_mock()
+    call_command("kiwoom_warmup")
+    steps.assert_called_once_with(
+        None, master=True, token=False, quotes=True, valuation=False
+    )
+
+    steps.return_value = [("token", lambda: 1 / 0)]
+    with pytest.raises(CommandError):
+        call_command("kiwoom_warmup")
+
+
+def test_warm_quotes_seeds_price_cache_in_batches(mocker: MockerFixture) -> None:
+    from a_stocks._service.price_cache import get_price_cache
+    from a_stocks._service.warmup import warm_quotes
+
+    service = mocker.patch("a_stocks._service.warmup.get_stock_service").return_value
+    service.get_watchlist_quotes.side_effect = lambda codes: [
+        {
+            "code": code,
+            "name": code,
+            "current_price": 100.0,
+            "previous_close": 99.0,
+            "change": 1.0,
+            "change_percent": 1.01,
+            "volume": 10,
+            "ask": 101.0,
+            "bid": 100.0,
+            "timestamp": "2025-05-02 08:30:00",
+        }
+        for code in codes
+    ]
+
+    assert warm_quotes(["005930", "000660", "035720"], batch_size=2) == 3
+    assert service.get_watchlist_quotes.call_count == 2
+    assert get_price_cache().get("price:035720") is not None
+    get_price_cache().clear()